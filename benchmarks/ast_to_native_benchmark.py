@@ -0,0 +1,90 @@
+"""
+Measures how the conversion from the catparser AST to the generator
+input ('ast_to_native()') scales with the size of the schema. Synthetic
+schemas with an increasing number of transaction structs are generated,
+parsed and expanded once, and only the conversion is timed.
+
+Requires catparser and must be run from the repository root:
+
+    python3 benchmarks/ast_to_native_benchmark.py
+    python3 benchmarks/ast_to_native_benchmark.py --sizes 1000 2000 4000 8000
+"""
+
+import argparse
+import contextlib
+import copy
+import io
+import sys
+import time
+
+from catparser.AstPostProcessor import AstPostProcessor
+from catparser.CatsLarkParser import create_cats_lark_parser
+
+sys.path.insert( 0, "." )
+from generator.AstToNativeConverter import ast_to_native
+
+
+
+def synthetic_schema( struct_count: int ) -> str:
+    """
+    Returns a schema with one enum value and one struct per transaction
+    type, all of which inline the same abstract header.
+    """
+
+    schema  = "using Amount = uint64\n\n"
+    schema += "enum TransactionType : uint16\n"
+    schema += "".join( f"\tTYPE_{i} = {i + 1}\n" for i in range( struct_count ) )
+
+    schema += "\n@size(size)\n"
+    schema += "@initializes(version, TRANSACTION_VERSION)\n"
+    schema += "@initializes(type, TRANSACTION_TYPE)\n"
+    schema += "@discriminator(type, version)\n"
+    schema += "abstract struct Transaction\n"
+    schema += "\tsize = uint32\n\tversion = uint8\n\ttype = TransactionType\n\tfee = Amount\n"
+
+    for i in range( struct_count ):
+        schema += f"\nstruct Transaction{i}\n"
+        schema += "\tTRANSACTION_VERSION = make_const(uint8, 1)\n"
+        schema += f"\tTRANSACTION_TYPE = make_const(TransactionType, TYPE_{i})\n"
+        schema += "\tinline Transaction\n"
+        schema += "\tamount = Amount\n\tcount = uint8\n\tvalues = array(uint32, count)\n"
+
+    return schema
+
+
+
+def main():
+    parser = argparse.ArgumentParser( description="Times ast_to_native() on synthetic schemas of increasing size." )
+    parser.add_argument( "--sizes",   type=int, nargs="+", default=[ 500, 1000, 2000, 4000 ], help="the numbers of structs in the schemas" )
+    parser.add_argument( "--repeat",  type=int, default=3, help="the number of timed conversions per size (the fastest is reported)" )
+    args = parser.parse_args()
+
+    lark_parser = create_cats_lark_parser()
+
+    print( f'{"structs":>8}{"types":>8}{"time [ms]":>12}{"us/type":>10}' )
+
+    for struct_count in args.sizes:
+        parse_result = lark_parser.parse( synthetic_schema( struct_count ) )
+        processor    = AstPostProcessor( parse_result.children )
+        processor.apply_attributes()
+        processor.expand_named_inlines()
+        processor.expand_unnamed_inlines()
+
+        best = None
+        for _ in range( args.repeat ):
+            descriptors = copy.deepcopy( processor.type_descriptors )
+
+            with contextlib.redirect_stdout( io.StringIO() ):
+                start = time.perf_counter()
+                ast_to_native( descriptors )
+                elapsed = time.perf_counter() - start
+
+            best = elapsed if best is None else min( best, elapsed )
+
+        type_count = len( processor.type_descriptors )
+        print( f'{struct_count:>8}{type_count:>8}{best*1e3:>12.1f}{best*1e6/type_count:>10.1f}' )
+
+
+
+if __name__ == "__main__":
+    main()
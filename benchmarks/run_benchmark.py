@@ -0,0 +1,105 @@
+"""
+Generates, builds and runs the C++ benchmark executable, and stores its
+results as JSON, so that generator backends and options can be compared.
+
+Must be run from the repository root:
+
+    python3 benchmarks/run_benchmark.py --label baseline
+    python3 benchmarks/run_benchmark.py --label print --generator-args="--generate-print"
+    python3 benchmarks/run_benchmark.py --compare benchmarks/results/baseline.json benchmarks/results/print.json
+"""
+
+import argparse
+import datetime
+import json
+import multiprocessing
+import shlex
+import subprocess
+import sys
+from pathlib import Path
+
+
+
+def run( args: argparse.Namespace ) -> dict:
+    build_folder  = Path( args.build_folder )
+    output_folder = build_folder / "generated"
+    cmake_folder  = output_folder / "_build"
+
+    # Generate code and benchmark
+    generator_args = [ args.yaml, str(output_folder), "--generate-benchmark" ] + shlex.split( args.generator_args )
+    subprocess.run( [ sys.executable, "-m", "generator" ] + generator_args, check=True, stdout=subprocess.DEVNULL )
+
+    # Build benchmark
+    cmake_folder.mkdir( parents=True, exist_ok=True )
+    subprocess.run( [ "cmake", "..", "-DCMAKE_BUILD_TYPE=Release" ], cwd=cmake_folder, check=True, stdout=subprocess.DEVNULL )
+    subprocess.run( [ "make", f"-j{multiprocessing.cpu_count()}", "benchmark" ], cwd=cmake_folder, check=True, stdout=subprocess.DEVNULL )
+
+    # Run benchmark
+    payloads = str( Path(args.payloads).resolve() )
+    output   = subprocess.run( [ "./benchmark", payloads, str(args.min_time) ], cwd=cmake_folder, check=True, stdout=subprocess.PIPE )
+
+    results = json.loads( output.stdout )
+    results["label"]          = args.label
+    results["yaml"]           = args.yaml
+    results["generator_args"] = args.generator_args
+    results["date"]           = datetime.datetime.now().isoformat( timespec="seconds" )
+    results["binary_size"]    = ( cmake_folder / "benchmark" ).stat().st_size
+
+    return results
+
+
+
+def compare( file_a: str, file_b: str ) -> None:
+    """
+    Prints the ratio of ns/op between two result files, for all
+    operations which are in both files.
+    """
+
+    with open( file_a ) as f:
+        results_a = { (r["name"], r["operation"]): r for r in json.load(f)["results"] }
+
+    with open( file_b ) as f:
+        results_b = { (r["name"], r["operation"]): r for r in json.load(f)["results"] }
+
+    print( f'{"name":<48}{"operation":<14}{"a [ns/op]":>12}{"b [ns/op]":>12}{"b/a":>8}' )
+
+    for key, a in results_a.items():
+        if key not in results_b:
+            continue
+
+        b = results_b[key]
+        print( f'{key[0]:<48}{key[1]:<14}{a["ns_per_op"]:>12.1f}{b["ns_per_op"]:>12.1f}{b["ns_per_op"]/a["ns_per_op"]:>8.2f}' )
+
+
+
+def main():
+    parser = argparse.ArgumentParser( description="Runs the generated C++ benchmark and stores its results." )
+    parser.add_argument( "--yaml",           default="yaml_test_inputs/symbol-all-transactions.yaml", help="the YAML schema to generate code from" )
+    parser.add_argument( "--payloads",       default="test_vectors/symbol_transactions.yml",          help="the file containing the payloads to benchmark" )
+    parser.add_argument( "--label",          default="default",                                       help="name of the result file" )
+    parser.add_argument( "--generator-args", default="",                                              help="extra arguments passed to the generator" )
+    parser.add_argument( "--min-time",       default=50.0, type=float,                                help="minimum time per measurement in ms" )
+    parser.add_argument( "--build-folder",   default="benchmarks/_build",                             help="folder where the benchmark is generated and built" )
+    parser.add_argument( "--results-folder", default="benchmarks/results",                            help="folder where the results are stored" )
+    parser.add_argument( "--compare",        nargs=2, metavar=("A", "B"),                             help="compare two result files instead of running the benchmark" )
+    args = parser.parse_args()
+
+    if args.compare:
+        compare( *args.compare )
+        return
+
+    results = run( args )
+
+    results_folder = Path( args.results_folder )
+    results_folder.mkdir( parents=True, exist_ok=True )
+
+    file_path = results_folder / f'{args.label}.json'
+    with open( file_path, "w" ) as f:
+        json.dump( results, f, indent=2 )
+
+    print( f'Results written to {file_path}' )
+
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+#include "BufferWriter.h"
+
+
+BufferWriter::BufferWriter( std::vector<uint8_t>& output )
+  : mOutput( output )
+{
+
+}
+
+
+RawBuffer BufferWriter::Append( const size_t n )
+{
+  const size_t offset = mOutput.size();
+  mOutput.resize( offset + n );
+
+  return RawBuffer( mOutput.data() + offset, n );
+}
+
+
+void BufferWriter::Truncate( const size_t size )
+{
+  if( size < mOutput.size() )
+  {
+    mOutput.resize( size );
+  }
+}
+
+
+void BufferWriter::Reserve( const size_t size )
+{
+  mOutput.reserve( size );
+}
+
+
+size_t BufferWriter::Size() const
+{
+  return mOutput.size();
+}
@@ -0,0 +1,69 @@
+#pragma once
+#include <cstdint>
+#include <stddef.h>
+#include <vector>
+
+#include "RawBuffer.h"
+
+
+
+/**
+ * A class to append serialized data to a growable byte vector. It is used for
+ * serializing many catbuffers back to back into one contiguous output, e.g.
+ * for batch sends, without having to know the total size up front.
+ *
+ *                    Size()
+ *                ______|______
+ *               |             |
+ *  byte vector:  [0|1|2|3|4|5|6|7| .... ]
+ *                               |_______|
+ *                                   |
+ *                               Append(n)
+ */
+class BufferWriter
+{
+ public:
+  BufferWriter( std::vector<uint8_t>& output );
+
+
+  /**
+   * Grows the output by 'n' bytes and returns a buffer covering the new bytes.
+   * The returned buffer is only valid until the output is grown again.
+   *
+   * @param[in] n
+   *   Number of bytes to append to the output.
+   *
+   * @return buffer of size 'n' pointing to the appended bytes
+   */
+  RawBuffer Append( const size_t n );
+
+
+  /**
+   * Shrinks the output to 'size' bytes, e.g. for dropping the data of a
+   * failed serialization. Does nothing if output is already smaller.
+   *
+   * @param[in] size
+   *   The new size of the output.
+   */
+  void Truncate( const size_t size );
+
+
+  /**
+   * Preallocates memory, so that the output can grow to 'size' bytes
+   * without reallocating.
+   *
+   * @param[in] size
+   *   Number of bytes to allocate memory for.
+   */
+  void Reserve( const size_t size );
+
+
+  /**
+   * The number of bytes written to the output.
+   */
+  size_t Size() const;
+
+
+ private:
+  std::vector<uint8_t>& mOutput; ///< The vector which data is appended to
+};
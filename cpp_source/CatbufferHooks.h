@@ -0,0 +1,46 @@
+#pragma once
+
+/**
+ * Instrumentation hooks which are called by the generated 'Deserialize()' and
+ * 'Serialize()' methods:
+ *
+ *   CATBUFFER_HOOK_DESERIALIZE( class_name, buffer )       At the start of 'Deserialize()'
+ *   CATBUFFER_HOOK_SERIALIZE( class_name, buffer )         At the start of 'Serialize()'
+ *   CATBUFFER_HOOK_FAIL( class_name, field_name, buffer )  Before returning false because of 'field_name'
+ *
+ * By default all hooks are empty, so the generated code compiles exactly as
+ * it would without hooks.
+ *
+ * Define CATBUFFER_ENABLE_HOOKS (e.g. with the CMake option of the same name)
+ * to use the reference implementation in 'CatbufferStats.h', which counts
+ * calls and bytes, measures time per class and records the field and offset
+ * of failures. Own hooks can be used by defining CATBUFFER_HOOKS_HEADER as the
+ * name of a header file which defines the macros above.
+ */
+
+#if defined(CATBUFFER_HOOKS_HEADER)
+
+  #include CATBUFFER_HOOKS_HEADER
+
+#elif defined(CATBUFFER_ENABLE_HOOKS)
+
+  #include "CatbufferStats.h"
+
+  #define CATBUFFER_HOOK_DESERIALIZE( class_name, buffer )       CatbufferStats::Scope catbuffer_hook_scope( CatbufferStats::DESERIALIZE, class_name, buffer )
+  #define CATBUFFER_HOOK_SERIALIZE( class_name, buffer )         CatbufferStats::Scope catbuffer_hook_scope( CatbufferStats::SERIALIZE,   class_name, buffer )
+  #define CATBUFFER_HOOK_FAIL( class_name, field_name, buffer )  CatbufferStats::Fail( class_name, field_name, (buffer).GetOffset() )
+
+#endif
+
+
+#ifndef CATBUFFER_HOOK_DESERIALIZE
+  #define CATBUFFER_HOOK_DESERIALIZE( class_name, buffer )
+#endif
+
+#ifndef CATBUFFER_HOOK_SERIALIZE
+  #define CATBUFFER_HOOK_SERIALIZE( class_name, buffer )
+#endif
+
+#ifndef CATBUFFER_HOOK_FAIL
+  #define CATBUFFER_HOOK_FAIL( class_name, field_name, buffer )
+#endif
@@ -0,0 +1,116 @@
+#include <mutex>
+
+#include "CatbufferStats.h"
+
+
+namespace
+{
+  std::mutex                                       gMutex;    ///< Protects 'gStats'
+  std::map<std::string, CatbufferStats::TypeStats> gStats;    ///< Statistics per class
+
+  thread_local size_t                               tDepth   = 0;                            ///< Nesting level of current call
+  thread_local CatbufferStats::Operation            tOp      = CatbufferStats::DESERIALIZE;  ///< Operation of current call
+  thread_local std::vector<CatbufferStats::Failure> tFailure;                                ///< Failure of last top level call
+
+
+  CatbufferStats::TypeStats& GetStats( const char* class_name )
+  {
+    std::map<std::string, CatbufferStats::TypeStats>::iterator it = gStats.find( class_name );
+
+    if( gStats.end() == it )
+    {
+      CatbufferStats::TypeStats stats = {};
+      it = gStats.insert( std::make_pair( std::string( class_name ), stats ) ).first;
+    }
+
+    return it->second;
+  }
+}
+
+
+CatbufferStats::Scope::Scope( const Operation op, const char* class_name, const RawBuffer& buffer )
+  : mOp          ( op                                ),
+    mClassName   ( class_name                        ),
+    mBuffer      ( buffer                            ),
+    mStartOffset ( buffer.GetOffset()                ),
+    mParentOp    ( tOp                               ),
+    mStartTime   ( std::chrono::steady_clock::now()  )
+{
+  if( 0 == tDepth )
+  {
+    tFailure.clear();
+  }
+
+  ++tDepth;
+  tOp = op;
+}
+
+
+CatbufferStats::Scope::~Scope()
+{
+  const uint64_t ns = std::chrono::duration_cast<std::chrono::nanoseconds>( std::chrono::steady_clock::now() - mStartTime ).count();
+
+  --tDepth;
+  tOp = mParentOp;
+
+  std::lock_guard<std::mutex> lock( gMutex );
+  TypeStats& stats = GetStats( mClassName );
+
+  stats.calls[mOp] += 1;
+  stats.bytes[mOp] += mBuffer.GetOffset() - mStartOffset;
+  stats.ns   [mOp] += ns;
+}
+
+
+void CatbufferStats::Fail( const char* class_name, const char* field_name, const size_t offset )
+{
+  Failure failure = { class_name, field_name, offset };
+  tFailure.push_back( failure );
+
+  std::lock_guard<std::mutex> lock( gMutex );
+  GetStats( class_name ).failures[tOp] += 1;
+}
+
+
+std::map<std::string, CatbufferStats::TypeStats> CatbufferStats::Stats()
+{
+  std::lock_guard<std::mutex> lock( gMutex );
+  return gStats;
+}
+
+
+std::vector<CatbufferStats::Failure> CatbufferStats::LastFailure()
+{
+  return tFailure;
+}
+
+
+void CatbufferStats::Reset()
+{
+  std::lock_guard<std::mutex> lock( gMutex );
+  gStats.clear();
+}
+
+
+void CatbufferStats::Print( FILE* out )
+{
+  const char* op_names[NUM_OPERATIONS] = { "Deserialize", "Serialize" };
+
+  fprintf( out, "%-48s %-12s %10s %10s %12s %12s\n", "class", "operation", "calls", "failures", "bytes", "ns/call" );
+
+  for( const std::pair<const std::string, TypeStats>& elem : Stats() )
+  {
+    const TypeStats& stats = elem.second;
+
+    for( size_t op=0; op<NUM_OPERATIONS; ++op )
+    {
+      if( 0 == stats.calls[op] )
+      {
+        continue;
+      }
+
+      fprintf( out, "%-48s %-12s %10lu %10lu %12lu %12.1f\n", elem.first.c_str(), op_names[op],
+               stats.calls[op], stats.failures[op], stats.bytes[op], (double) stats.ns[op] / stats.calls[op] );
+    }
+  }
+}
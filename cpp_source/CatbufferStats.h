@@ -0,0 +1,104 @@
+#pragma once
+#include <cstdint>
+#include <cstdio>
+#include <stddef.h>
+#include <chrono>
+#include <map>
+#include <string>
+#include <vector>
+
+#include "RawBuffer.h"
+
+
+
+/**
+ * Reference implementation of the instrumentation hooks in 'CatbufferHooks.h'.
+ * For each class it counts the calls, failures and bytes of 'Deserialize()'
+ * and 'Serialize()', and measures the time spent in them (including nested
+ * classes). When a call fails, the class, field and buffer offset of each
+ * nesting level is recorded, starting with the innermost one:
+ *
+ *   if( !tx->Deserialize( buffer ) )
+ *   {
+ *     for( const CatbufferStats::Failure& f : CatbufferStats::LastFailure() )
+ *     {
+ *       printf( "%s.%s at byte %lu\n", f.class_name, f.field_name, f.offset );
+ *     }
+ *   }
+ *
+ * Statistics are shared by all threads, failures are recorded per thread.
+ */
+class CatbufferStats
+{
+ public:
+
+  enum Operation { DESERIALIZE = 0, SERIALIZE = 1, NUM_OPERATIONS = 2 };
+
+
+  struct TypeStats
+  {
+    size_t   calls   [NUM_OPERATIONS]; ///< Number of calls
+    size_t   failures[NUM_OPERATIONS]; ///< Number of calls which returned false
+    size_t   bytes   [NUM_OPERATIONS]; ///< Number of bytes read or written
+    uint64_t ns      [NUM_OPERATIONS]; ///< Total time of calls in nanoseconds
+  };
+
+
+  struct Failure
+  {
+    const char* class_name; ///< Class which failed
+    const char* field_name; ///< Field which failed
+    size_t      offset;     ///< Buffer offset where field failed
+  };
+
+
+  /**
+   * Records a call from construction until destruction, i.e. until the
+   * instrumented method returns.
+   */
+  class Scope
+  {
+   public:
+    Scope( const Operation op, const char* class_name, const RawBuffer& buffer );
+    ~Scope();
+
+   private:
+    const Operation                                  mOp;
+    const char*                                      mClassName;
+    const RawBuffer&                                 mBuffer;
+    const size_t                                     mStartOffset;
+    const Operation                                  mParentOp;
+    const std::chrono::steady_clock::time_point      mStartTime;
+  };
+
+
+  /**
+   * Records that a field of a class failed at a buffer offset.
+   */
+  static void Fail( const char* class_name, const char* field_name, const size_t offset );
+
+
+  /**
+   * Returns the statistics of all classes, which have been called since the last reset.
+   */
+  static std::map<std::string, TypeStats> Stats();
+
+
+  /**
+   * Returns the failure of the last top level call in this thread, with the
+   * innermost class first. Empty if the last call succeeded.
+   */
+  static std::vector<Failure> LastFailure();
+
+
+  /**
+   * Resets the statistics of all classes.
+   */
+  static void Reset();
+
+
+  /**
+   * Prints the statistics of all classes as a table.
+   */
+  static void Print( FILE* out = stdout );
+};
@@ -0,0 +1,135 @@
+#include <cstring>
+
+#include "Codec.h"
+
+
+namespace
+{
+  const char kHexDigits[]    = "0123456789ABCDEF";
+  const char kBase32Digits[] = "ABCDEFGHIJKLMNOPQRSTUVWXYZ234567";
+
+
+  /**
+   * Maps characters to digit values, -1 for invalid characters.
+   */
+  struct DecodeTable
+  {
+    int8_t values[256];
+
+    DecodeTable( const char* digits )
+    {
+      memset( values, -1, sizeof(values) );
+
+      for( int8_t i=0; digits[i]; ++i )
+      {
+        values[ (uint8_t) digits[i] ] = i;
+
+        if( digits[i] >= 'A' && digits[i] <= 'Z' )
+        {
+          values[ (uint8_t) (digits[i] - 'A' + 'a') ] = i;
+        }
+      }
+    }
+  };
+
+  const DecodeTable kHexTable   ( kHexDigits    );
+  const DecodeTable kBase32Table( kBase32Digits );
+}
+
+
+void Codec::HexEncode( const uint8_t* data, const size_t size, char* out )
+{
+  for( size_t i=0; i<size; ++i )
+  {
+    *out++ = kHexDigits[ data[i] >> 4  ];
+    *out++ = kHexDigits[ data[i] & 0xF ];
+  }
+}
+
+
+bool Codec::HexDecode( const char* hex, const size_t length, uint8_t* out )
+{
+  if( length % 2 )
+  {
+    return false;
+  }
+
+  for( size_t i=0; i<length; i+=2 )
+  {
+    const int8_t high = kHexTable.values[ (uint8_t) hex[i]   ];
+    const int8_t low  = kHexTable.values[ (uint8_t) hex[i+1] ];
+
+    if( high < 0 || low < 0 )
+    {
+      return false;
+    }
+
+    *out++ = (uint8_t) ((high << 4) | low);
+  }
+
+  return true;
+}
+
+
+bool Codec::HexDecode( const std::string& hex, std::vector<uint8_t>& out )
+{
+  out.resize( hex.size() / 2 );
+  return HexDecode( hex.data(), hex.size(), out.data() );
+}
+
+
+void Codec::Base32Encode( const uint8_t* data, const size_t size, char* out )
+{
+  uint32_t buffer = 0; // bits which have not been written yet
+  size_t   bits   = 0; // number of bits in 'buffer'
+
+  for( size_t i=0; i<size; ++i )
+  {
+    buffer = (buffer << 8) | data[i];
+    bits  += 8;
+
+    while( bits >= 5 )
+    {
+      bits -= 5;
+      *out++ = kBase32Digits[ (buffer >> bits) & 0x1F ];
+    }
+  }
+
+  if( bits > 0 )
+  {
+    *out++ = kBase32Digits[ (buffer << (5 - bits)) & 0x1F ];
+  }
+}
+
+
+bool Codec::Base32Decode( const char* text, const size_t length, uint8_t* out )
+{
+  // lengths which do not correspond to whole bytes
+  if( Base32EncodedSize( Base32DecodedSize( length ) ) != length )
+  {
+    return false;
+  }
+
+  uint32_t buffer = 0; // bits which have not been written yet
+  size_t   bits   = 0; // number of bits in 'buffer'
+
+  for( size_t i=0; i<length; ++i )
+  {
+    const int8_t value = kBase32Table.values[ (uint8_t) text[i] ];
+    if( value < 0 )
+    {
+      return false;
+    }
+
+    buffer = (buffer << 5) | (uint32_t) value;
+    bits  += 5;
+
+    if( bits >= 8 )
+    {
+      bits -= 8;
+      *out++ = (uint8_t) (buffer >> bits);
+    }
+  }
+
+  return true;
+}
@@ -0,0 +1,70 @@
+#pragma once
+#include <cstdint>
+#include <stddef.h>
+#include <string>
+#include <vector>
+
+
+
+/**
+ * Hex and base32 (RFC 4648, unpadded, e.g. for addresses) encoding and
+ * decoding with lookup tables. All methods work on pointer and size pairs,
+ * without allocating memory per byte. Decoding accepts upper and lower case.
+ *
+ *   std::vector<uint8_t> payload;
+ *   if( !Codec::HexDecode( hex, payload ) ){ ... }
+ *
+ *   std::string address( Codec::Base32EncodedSize( 24 ), ' ' );
+ *   Codec::Base32Encode( data, 24, &address[0] );
+ */
+class Codec
+{
+ public:
+
+  /**
+   * Writes 2*'size' uppercase hex characters to 'out'.
+   */
+  static void HexEncode( const uint8_t* data, const size_t size, char* out );
+
+
+  /**
+   * Decodes 'length' hex characters into 'length'/2 bytes in 'out'.
+   *
+   * @return false if 'length' is odd or 'hex' contains non hex characters
+   */
+  static bool HexDecode( const char* hex, const size_t length, uint8_t* out );
+
+
+  /**
+   * Decodes a hex string into 'out', which is resized to the decoded size.
+   *
+   * @return false if 'hex' is not a valid hex string
+   */
+  static bool HexDecode( const std::string& hex, std::vector<uint8_t>& out );
+
+
+  /**
+   * Number of base32 characters needed to encode 'size' bytes.
+   */
+  static size_t Base32EncodedSize( const size_t size ){ return (size*8 + 4) / 5; }
+
+
+  /**
+   * Number of bytes encoded by 'length' base32 characters.
+   */
+  static size_t Base32DecodedSize( const size_t length ){ return length*5 / 8; }
+
+
+  /**
+   * Writes Base32EncodedSize('size') base32 characters to 'out'.
+   */
+  static void Base32Encode( const uint8_t* data, const size_t size, char* out );
+
+
+  /**
+   * Decodes 'length' base32 characters into Base32DecodedSize('length') bytes in 'out'.
+   *
+   * @return false if 'text' contains non base32 characters or has an invalid length
+   */
+  static bool Base32Decode( const char* text, const size_t length, uint8_t* out );
+};
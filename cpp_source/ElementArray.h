@@ -0,0 +1,77 @@
+#pragma once
+#include <memory>
+#include <vector>
+#include "ICatbuffer.h"
+
+
+
+/**
+ * The array of an 'array_sized' field, i.e. of polymorphic elements. It is a
+ * std::vector of the elements, which keeps the elements removed by
+ * 'Truncate()' (and so by 'Clear()') as spare elements, and hands them out
+ * again by 'Append()':
+ *
+ *  elements:  [0|1|2]           Truncate( 1 )   elements:  [0]
+ *  spare:     []               ------------->   spare:     [2|1]   (cleared)
+ *
+ *  elements:  [0]               Append()        elements:  [0|1]
+ *  spare:     [2|1]            ------------->   spare:     [2]
+ *
+ * The elements keep their position, so that deserializing a message into an
+ * object reuses the element objects of the previous message, as long as
+ * their type matches.
+ */
+class ElementArray : public std::vector<std::unique_ptr<ICatbuffer>>
+{
+ public:
+  /**
+   * Appends an element and returns it. The element is the last spare one,
+   * or empty if there is none.
+   */
+  std::unique_ptr<ICatbuffer>& Append()
+  {
+    emplace_back();
+    if( !mSpare.empty() )
+    {
+      back() = std::move( mSpare.back() );
+      mSpare.pop_back();
+    }
+    return back();
+  }
+
+
+  /**
+   * Removes the elements after the first 'count' ones. They are cleared and
+   * kept as spare elements for 'Append()'.
+   *
+   * @param[in] count
+   *   Number of elements to keep.
+   */
+  void Truncate( const size_t count )
+  {
+    while( size() > count )
+    {
+      if( back() )
+      {
+        back()->Clear();
+        mSpare.push_back( std::move( back() ) );
+      }
+      pop_back();
+    }
+  }
+
+
+  /**
+   * Returns the number of bytes which the spare elements have allocated on
+   * the heap.
+   */
+  size_t SpareBytes() const
+  {
+    size_t bytes = mSpare.capacity()*sizeof(std::unique_ptr<ICatbuffer>);
+    for( const std::unique_ptr<ICatbuffer>& element : mSpare ){ bytes += element->TotalFootprint(); }
+    return bytes;
+  }
+
+ private:
+  std::vector<std::unique_ptr<ICatbuffer>> mSpare;
+};
@@ -0,0 +1,143 @@
+#include <cstring>
+
+#include "GatherWriter.h"
+#include "ICatbuffer.h"
+
+
+GatherWriter::GatherWriter( const size_t threshold )
+  : mThreshold    ( threshold ),
+    mSize         ( 0         ),
+    mMessageStart ( 0         )
+{
+
+}
+
+
+uint8_t* GatherWriter::Append( const size_t n )
+{
+  const size_t offset = mScratch.size();
+  mScratch.resize( offset + n );
+  mSize += n;
+
+  // extend last segment if it is also in scratch area
+  if( !mSegments.empty() && nullptr == mSegments.back().mPtr )
+  {
+    mSegments.back().mSize += n;
+  }
+  else
+  {
+    Segment segment = { nullptr, offset, n };
+    mSegments.push_back( segment );
+  }
+
+  return mScratch.data() + offset;
+}
+
+
+void GatherWriter::Write( const void* data, const size_t n )
+{
+  if( 0 == n )
+  {
+    return;
+  }
+
+  if( n < mThreshold )
+  {
+    memcpy( Append( n ), data, n );
+    return;
+  }
+
+  Segment segment = { (const uint8_t*) data, 0, n };
+  mSegments.push_back( segment );
+  mSize += n;
+}
+
+
+void GatherWriter::Pad( const size_t align )
+{
+  const size_t padding = ( align - (mSize - mMessageStart)%align ) % align;
+
+  if( padding )
+  {
+    memset( Append( padding ), 0, padding );
+  }
+}
+
+
+void GatherWriter::BeginMessage()
+{
+  mMessageStart = mSize;
+}
+
+
+void GatherWriter::Truncate( const size_t size )
+{
+  while( mSize > size )
+  {
+    Segment&     last   = mSegments.back();
+    const size_t excess = ( mSize - size < last.mSize ) ? mSize - size : last.mSize;
+
+    last.mSize -= excess;
+    mSize      -= excess;
+
+    if( nullptr == last.mPtr )
+    {
+      mScratch.resize( last.mOffset + last.mSize );
+    }
+
+    if( 0 == last.mSize )
+    {
+      mSegments.pop_back();
+    }
+  }
+
+  if( mMessageStart > mSize )
+  {
+    mMessageStart = mSize;
+  }
+}
+
+
+void GatherWriter::Clear()
+{
+  mSize         = 0;
+  mMessageStart = 0;
+  mScratch.clear();
+  mSegments.clear();
+  mIovecs.clear();
+}
+
+
+size_t GatherWriter::Size() const
+{
+  return mSize;
+}
+
+
+const std::vector<iovec>& GatherWriter::Resolve()
+{
+  mIovecs.resize( mSegments.size() );
+
+  for( size_t i=0; i<mSegments.size(); ++i )
+  {
+    const Segment& segment = mSegments[i];
+    const uint8_t* ptr     = segment.mPtr ? segment.mPtr : mScratch.data() + segment.mOffset;
+
+    mIovecs[i].iov_base = (void*) ptr;
+    mIovecs[i].iov_len  = segment.mSize;
+  }
+
+  return mIovecs;
+}
+
+
+bool ICatbuffer::AppendTo( GatherWriter& writer )
+{
+  const size_t start = writer.Size();
+  writer.BeginMessage();
+
+  const bool succ = SerializeGather( writer );
+  if( !succ ){ writer.Truncate( start ); }
+
+  return succ;
+}
@@ -0,0 +1,123 @@
+#pragma once
+#include <cstdint>
+#include <stddef.h>
+#include <vector>
+
+#if defined(_WIN32)
+  // 'writev()' is POSIX only, the segments have the same layout as 'WSABUF' though
+  struct iovec
+  {
+    void*  iov_base;
+    size_t iov_len;
+  };
+#else
+  #include <sys/uio.h>
+#endif
+
+
+
+/**
+ * A class to collect serialized data as a list of segments for scatter-gather
+ * output with 'writev()'. Small fields are copied into a scratch area, while
+ * data of at least 'threshold' bytes is referenced in place, so that large
+ * payloads are never copied:
+ *
+ *  segments:  [scratch 0..40] [mMessage.data()] [scratch 40..48] ...
+ *                   |                                 |
+ *  scratch:    [0|1|2|3| ... |40|41| ... |47]  <------'
+ *
+ * Referenced data must stay unchanged until the output has been written,
+ * i.e. the serialized catbuffers must outlive the writer output.
+ */
+class GatherWriter
+{
+ public:
+  GatherWriter( const size_t threshold = 128 );
+
+
+  /**
+   * Appends 'n' bytes to the scratch area and returns a pointer to them. The
+   * pointer is only valid until the next call which appends data.
+   *
+   * @param[in] n
+   *   Number of bytes to append.
+   *
+   * @return pointer to the appended bytes
+   */
+  uint8_t* Append( const size_t n );
+
+
+  /**
+   * Appends 'n' bytes of 'data'. If 'n' is at least the threshold, the data
+   * is referenced in place, otherwise it is copied to the scratch area.
+   *
+   * @param[in] data
+   *   Pointer to data which will be appended.
+   *
+   * @param[in] n
+   *   Number of bytes to append.
+   */
+  void Write( const void* data, const size_t n );
+
+
+  /**
+   * Appends zero bytes until the size of the current message is a multiple
+   * of 'align'.
+   *
+   * @param[in] align
+   *   The alignment in bytes.
+   */
+  void Pad( const size_t align );
+
+
+  /**
+   * Marks the start of a new message. Alignment padding is relative to the
+   * start of the current message.
+   */
+  void BeginMessage();
+
+
+  /**
+   * Shrinks the output to 'size' bytes, e.g. for dropping the data of a
+   * failed serialization. Does nothing if output is already smaller.
+   *
+   * @param[in] size
+   *   The new size of the output.
+   */
+  void Truncate( const size_t size );
+
+
+  /**
+   * Removes all data, but keeps allocated memory.
+   */
+  void Clear();
+
+
+  /**
+   * The total number of bytes in the output.
+   */
+  size_t Size() const;
+
+
+  /**
+   * Returns the output as a list of iovecs, which can be passed to 'writev()'.
+   * The list is only valid until data is appended to the writer.
+   */
+  const std::vector<iovec>& Resolve();
+
+
+ private:
+  struct Segment
+  {
+    const uint8_t* mPtr;    ///< Pointer to referenced data, or nullptr if segment is in scratch area
+    size_t         mOffset; ///< Offset of segment in scratch area
+    size_t         mSize;   ///< Size of segment in bytes
+  };
+
+  const size_t         mThreshold;    ///< Data of this size or larger is referenced instead of copied
+  size_t               mSize;         ///< Total size of output
+  size_t               mMessageStart; ///< Offset of current message in output
+  std::vector<uint8_t> mScratch;      ///< Copied data
+  std::vector<Segment> mSegments;     ///< Output as list of copied and referenced segments
+  std::vector<iovec>   mIovecs;       ///< Resolved segments
+};
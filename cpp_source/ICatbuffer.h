@@ -1,7 +1,11 @@
 #pragma once
 
 #include <cstdlib>
+#include <vector>
 #include "RawBuffer.h"
+#include "BufferWriter.h"
+
+class GatherWriter; // see GatherWriter.h, which is only needed for scatter-gather output
 
 class ICatbuffer
 {
@@ -19,6 +23,18 @@ public:
   virtual bool Deserialize( RawBuffer& buffer ) = 0;
 
 
+  /**
+   * Like 'Deserialize()', but only populates the fields whose bits are set in
+   * 'mask' (see the 'FieldMask' enum of the class). The other fields are
+   * skipped and keep their values.
+   *
+   * @param[in] buffer  The raw data which will be deserialized
+   * @param[in] mask    Bits of the fields to deserialize
+   * @return            True if buffer contained enough data to skip or deserialize all fields
+   */
+  virtual bool DeserializeSelected( RawBuffer& buffer, const uint64_t mask ) = 0;
+
+
   /**
    * Takes the transaction fields and deserializes them into a raw buffer
    *
@@ -35,4 +51,88 @@ public:
    */
   virtual size_t Size() = 0;
 
+
+  /**
+   * Returns the number of bytes allocated on the heap by the class fields,
+   * i.e. the capacities of vectors and the footprints of their elements
+   *
+   * @return  Heap bytes of catbuffer
+   */
+  virtual size_t HeapBytes() = 0;
+
+
+  /**
+   * Returns the memory used by the catbuffer: the size of the class (of the
+   * actual class for polymorphic elements) plus 'HeapBytes()'
+   *
+   * @return  Memory footprint of catbuffer in bytes
+   */
+  virtual size_t TotalFootprint() = 0;
+
+
+  /**
+   * Takes the transaction fields and appends them to a gather writer. Large
+   * byte arrays are referenced in place instead of being copied, so that the
+   * output can be written with 'writev()'.
+   *
+   * @param[in] writer  The writer which the fields will be appended to
+   * @return            True if all fields were serialized
+   */
+  virtual bool SerializeGather( GatherWriter& writer ) = 0;
+
+
+  /**
+   * Resets all fields to their default values. Arrays are emptied, but keep
+   * their allocated memory, so that the instance can be reused for
+   * deserializing further buffers without reallocating. The elements of
+   * 'array_sized' fields are cleared and kept as spare elements (see
+   * ElementArray.h), which the next deserialization reuses.
+   */
+  virtual void Clear() = 0;
+
+
+  /**
+   * Serializes the fields and appends them to the output of 'writer'. The
+   * output is grown once by the serialized size, which allows serializing
+   * many catbuffers back to back into one contiguous output.
+   *
+   * @param[in] writer  The writer which the serialized fields are appended to
+   * @return            True if all fields were serialized, otherwise nothing is appended
+   */
+  bool AppendTo( BufferWriter& writer )
+  {
+    const size_t start  = writer.Size();
+    RawBuffer    buffer = writer.Append( Size() );
+
+    const bool succ = Serialize( buffer ) && 0 == buffer.RemainingSize();
+    if( !succ ){ writer.Truncate( start ); }
+
+    return succ;
+  }
+
+
+  /**
+   * Serializes the fields as a new message in 'writer'. Alignment padding
+   * is relative to the start of the message.
+   *
+   * @param[in] writer  The writer which the serialized fields are appended to
+   * @return            True if all fields were serialized, otherwise nothing is appended
+   */
+  bool AppendTo( GatherWriter& writer );
+
+
+  /**
+   * Serializes the fields into 'output', which is resized to the exact
+   * serialized size.
+   *
+   * @param[in] output  The vector where fields will be serialized
+   * @return            True if all fields were serialized
+   */
+  bool SerializeTo( std::vector<uint8_t>& output )
+  {
+    output.clear();
+    BufferWriter writer( output );
+    return AppendTo( writer );
+  }
+
 };
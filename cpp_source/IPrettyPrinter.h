@@ -1,7 +1,10 @@
 #pragma once
 
 #include <cstdlib>
+#include <cstdio>
+#include <string>
 #include "RawBuffer.h"
+#include "TextWriter.h"
 
 class IPrettyPrinter
 {
@@ -11,9 +14,54 @@ class IPrettyPrinter
   virtual ~IPrettyPrinter(){}
 
 	/**
-	 * Prints a deserialized catbuffer.
+	 * Appends a deserialized catbuffer as indented text to 'out'.
 	 *
+	 * @param[in] out    The writer which the text is appended to
 	 * @param[in] level  Controls the indentation when printing a buffer
 	 */
-  virtual void Print( const size_t level=0 ) = 0;
+  virtual void PrintTo( TextWriter& out, const size_t level=0 ) = 0;
+
+
+	/**
+	 * Appends a deserialized catbuffer as a JSON object to 'out'. Byte arrays
+	 * are hex strings (or base32/ascii strings, depending on their print hint)
+	 * and 64 bit integers are strings, so that they keep their precision.
+	 *
+	 * @param[in] out  The writer which the JSON object is appended to
+	 */
+  virtual void JsonTo( TextWriter& out ) = 0;
+
+
+	/**
+	 * Returns the name of the struct, as printed by 'PrintTo()'.
+	 */
+  virtual const char* TypeName() = 0;
+
+
+	/**
+	 * Prints a deserialized catbuffer to stdout.
+	 *
+	 * @param[in] level  Controls the indentation when printing a buffer
+	 */
+  void Print( const size_t level=0 )
+  {
+    std::string text;
+    TextWriter  out( text );
+
+    PrintTo( out, level );
+    fwrite( text.data(), 1, text.size(), stdout );
+  }
+
+
+	/**
+	 * Returns a deserialized catbuffer as a JSON object.
+	 */
+  std::string ToJson()
+  {
+    std::string json;
+    TextWriter  out( json );
+
+    JsonTo( out );
+    return json;
+  }
 };
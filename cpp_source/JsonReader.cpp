@@ -0,0 +1,313 @@
+#include <cstring>
+
+#include "JsonReader.h"
+#include "Codec.h"
+
+
+namespace
+{
+  /**
+   * Returns the largest value of an unsigned integer of 'size' bytes.
+   */
+  uint64_t MaxValue( const size_t size )
+  {
+    return size >= 8 ? ~uint64_t(0) : ( uint64_t(1) << (size*8) ) - 1;
+  }
+}
+
+
+JsonReader::JsonReader( const char* json, const size_t length )
+  : mStart( json ), mPtr( json ), mEnd( json + length ), mFirst( true )
+{
+
+}
+
+
+bool JsonReader::BeginObject()
+{
+  mFirst = true;
+  return Expect( '{' );
+}
+
+
+bool JsonReader::EndObject()
+{
+  SkipWhitespace();
+
+  if( mPtr < mEnd && ',' == *mPtr )
+  {
+    return Fail( "unexpected member after the last member of the schema, members which are not in the schema are not supported" );
+  }
+
+  mFirst = false;
+  return Expect( '}' );
+}
+
+
+bool JsonReader::Key( const char* name )
+{
+  SkipWhitespace();
+
+  if( mPtr < mEnd && '}' == *mPtr )
+  {
+    return Fail( std::string( "missing member \"" ) + name + "\"" );
+  }
+
+  const char* key;
+  size_t      length;
+  if( !Element() || !String( key, length ) )
+  {
+    return false;
+  }
+
+  if( length != strlen( name ) || 0 != memcmp( key, name, length ) )
+  {
+    mPtr = key - 1;
+    return Fail( std::string( "expected member \"" ) + name + "\" instead of \"" + std::string( key, length ) + "\", the members must be in schema order and members which are not in the schema are not supported" );
+  }
+
+  return Expect( ':' );
+}
+
+
+bool JsonReader::BeginArray()
+{
+  mFirst = true;
+  return Expect( '[' );
+}
+
+
+bool JsonReader::EndArray()
+{
+  SkipWhitespace();
+
+  if( mPtr == mEnd || ']' != *mPtr )
+  {
+    return false;
+  }
+
+  ++mPtr;
+  mFirst = false;
+  return true;
+}
+
+
+bool JsonReader::Element()
+{
+  return mFirst || Expect( ',' );
+}
+
+
+bool JsonReader::UInt( uint8_t* data, const size_t size )
+{
+  SkipWhitespace();
+
+  const bool quoted = mPtr < mEnd && '"' == *mPtr;
+  mPtr += quoted;
+
+  uint64_t value;
+  if( !Magnitude( value, MaxValue( size ), quoted ) )
+  {
+    return false;
+  }
+
+  memcpy( data, &value, size );
+  return true;
+}
+
+
+bool JsonReader::Int( uint8_t* data, const size_t size )
+{
+  SkipWhitespace();
+
+  const bool quoted = mPtr < mEnd && '"' == *mPtr;
+  mPtr += quoted;
+
+  const bool negative = mPtr < mEnd && '-' == *mPtr;
+  mPtr += negative;
+
+  // the magnitude of the smallest value is one larger than the largest value
+  const uint64_t max = MaxValue( size ) >> 1;
+
+  uint64_t magnitude;
+  if( !Magnitude( magnitude, negative ? max + 1 : max, quoted ) )
+  {
+    return false;
+  }
+
+  const int64_t value = ( negative && magnitude ) ? -static_cast<int64_t>( magnitude - 1 ) - 1 : static_cast<int64_t>( magnitude );
+  memcpy( data, &value, size );
+  return true;
+}
+
+
+bool JsonReader::Enum( uint8_t* data, const size_t size, const JsonName* names, const size_t count )
+{
+  SkipWhitespace();
+
+  if( mPtr == mEnd || '"' != *mPtr )
+  {
+    return UInt( data, size );
+  }
+
+  const char* text;
+  size_t      length;
+  if( !String( text, length ) )
+  {
+    return false;
+  }
+
+  // binary search, the names are sorted
+  size_t first = 0;
+  size_t last  = count;
+
+  while( first < last )
+  {
+    const size_t mid = first + (last - first) / 2;
+
+    int cmp = strncmp( names[mid].name, text, length );
+    if( 0 == cmp && '\0' != names[mid].name[length] )
+    {
+      cmp = 1;
+    }
+
+    if( 0 == cmp )
+    {
+      memcpy( data, &names[mid].value, size );
+      return true;
+    }
+
+    if( cmp < 0 ){ first = mid + 1; }
+    else         { last  = mid;     }
+  }
+
+  return Fail( "unknown enumerator \"" + std::string( text, length ) + "\"" );
+}
+
+
+bool JsonReader::Hex( uint8_t* data, const size_t size )
+{
+  const char* text;
+  size_t      length;
+
+  if( !String( text, length ) )
+  {
+    return false;
+  }
+
+  if( 2*size != length || !Codec::HexDecode( text, length, data ) )
+  {
+    return Fail( "expected a hex string of " + std::to_string( size ) + " bytes" );
+  }
+
+  return true;
+}
+
+
+bool JsonReader::String( const char*& text, size_t& length )
+{
+  if( !Expect( '"' ) )
+  {
+    return false;
+  }
+
+  const char* end = static_cast<const char*>( memchr( mPtr, '"', mEnd - mPtr ) );
+  if( nullptr == end )
+  {
+    return Fail( "unterminated string" );
+  }
+
+  // an escaped quote ends the search early as well, but is preceded by the backslash
+  const char* escape = static_cast<const char*>( memchr( mPtr, '\\', end - mPtr ) );
+  if( nullptr != escape )
+  {
+    mPtr = escape;
+    return Fail( "escape sequences in strings are not supported" );
+  }
+
+  text   = mPtr;
+  length = end - mPtr;
+  mPtr   = end + 1;
+  mFirst = false;
+
+  return true;
+}
+
+
+bool JsonReader::AtEnd()
+{
+  SkipWhitespace();
+  return mPtr == mEnd;
+}
+
+
+size_t JsonReader::GetOffset() const
+{
+  return mPtr - mStart;
+}
+
+
+const std::string& JsonReader::GetError() const
+{
+  return mError;
+}
+
+
+void JsonReader::SkipWhitespace()
+{
+  while( mPtr < mEnd && ( ' ' == *mPtr || '\n' == *mPtr || '\r' == *mPtr || '\t' == *mPtr ) )
+  {
+    ++mPtr;
+  }
+}
+
+
+bool JsonReader::Expect( const char c )
+{
+  SkipWhitespace();
+
+  if( mPtr == mEnd || c != *mPtr )
+  {
+    return Fail( std::string( "expected '" ) + c + "'" );
+  }
+
+  ++mPtr;
+  return true;
+}
+
+
+bool JsonReader::Magnitude( uint64_t& value, const uint64_t max, const bool quoted )
+{
+  const char* start = mPtr;
+  value = 0;
+
+  for( ; mPtr < mEnd && *mPtr >= '0' && *mPtr <= '9'; ++mPtr )
+  {
+    const uint64_t digit = *mPtr - '0';
+    if( value > ( max - digit ) / 10 )
+    {
+      return Fail( "integer out of range" );
+    }
+
+    value = value*10 + digit;
+  }
+
+  if( start == mPtr || ( quoted && ( mPtr == mEnd || '"' != *mPtr++ ) ) )
+  {
+    return Fail( "expected an integer" );
+  }
+
+  mFirst = false;
+  return true;
+}
+
+
+bool JsonReader::Fail( const std::string& error )
+{
+  if( mError.empty() )
+  {
+    mError = error;
+  }
+
+  return false;
+}
@@ -0,0 +1,159 @@
+#pragma once
+#include <cstdint>
+#include <stddef.h>
+#include <string>
+
+
+
+/**
+ * The name of an enumerator and its value, for converting enums from and to
+ * JSON strings. The generated tables are sorted by name.
+ */
+struct JsonName
+{
+  const char* name;
+  uint64_t    value;
+};
+
+
+
+/**
+ * A pull parser for JSON text, which is used by the generated 'FromJson()'
+ * methods (see 'json.h'). It does not build a document, instead the caller
+ * asks for the values it expects, in the order it expects them, and each
+ * value is parsed directly into the serialized bytes of a field:
+ *
+ *   JsonReader in( json.data(), json.size() );
+ *
+ *   uint8_t* ptr = buffer.GetOffsetPtrAndMove( sizeof(Amount) );
+ *   if( !ptr || !in.Key( "fee" ) || !in.UInt( ptr, sizeof(Amount) ) ){ ... }
+ *
+ * Object members must therefore be in the order of the schema, which is the
+ * order written by the generated 'ToJson()' methods. Members in another order
+ * and unknown members are rejected, as are strings with escape sequences
+ * (strings only hold hex data and enumerator names). All methods return
+ * false if the text does not contain the expected value, the error is then
+ * described by 'GetError()' and its position given by 'GetOffset()'.
+ */
+class JsonReader
+{
+ public:
+  JsonReader( const char* json, const size_t length );
+
+
+  /**
+   * Reads the start of an object ('{').
+   */
+  bool BeginObject();
+
+
+  /**
+   * Reads the end of an object ('}').
+   */
+  bool EndObject();
+
+
+  /**
+   * Reads the key of the next object member ("name":), preceded by a comma
+   * unless it is the first member of the object. Fails if the next member
+   * has another key, i.e. if the members are not in schema order or the
+   * object has members which are not in the schema.
+   */
+  bool Key( const char* name );
+
+
+  /**
+   * Reads the start of an array ('[').
+   */
+  bool BeginArray();
+
+
+  /**
+   * Reads the end of an array (']') if it follows, otherwise nothing is read.
+   *
+   * @return true if the end of the array was read
+   */
+  bool EndArray();
+
+
+  /**
+   * Reads the comma before the next array element, unless it is the first
+   * element of the array.
+   */
+  bool Element();
+
+
+  /**
+   * Reads an unsigned integer, which can be a number or a string (as 64 bit
+   * integers are written), and writes it to the 'size' bytes of 'data'.
+   *
+   * @return false if it is not an integer or does not fit into 'size' bytes
+   */
+  bool UInt( uint8_t* data, const size_t size );
+
+
+  /**
+   * Reads a signed integer like 'UInt()'.
+   */
+  bool Int( uint8_t* data, const size_t size );
+
+
+  /**
+   * Reads an enumerator, either its name as a string, which is looked up in
+   * the 'count' 'names', or its value as an unsigned integer.
+   */
+  bool Enum( uint8_t* data, const size_t size, const JsonName* names, const size_t count );
+
+
+  /**
+   * Reads a hex string of exactly 'size' bytes into 'data'.
+   */
+  bool Hex( uint8_t* data, const size_t size );
+
+
+  /**
+   * Reads a string, and returns the characters between the quotes. Fails if
+   * the string contains an escape sequence, as strings are not unescaped.
+   */
+  bool String( const char*& text, size_t& length );
+
+
+  /**
+   * Returns true if only whitespace is left.
+   */
+  bool AtEnd();
+
+
+  /**
+   * The number of characters read.
+   */
+  size_t GetOffset() const;
+
+
+  /**
+   * Describes the first error in the text, e.g. a member which is not in
+   * schema order. Empty if no error was found in the text (a method can also
+   * fail because the buffer which the value is written to is too small).
+   */
+  const std::string& GetError() const;
+
+
+  /**
+   * Sets the error returned by 'GetError()', unless an error was found
+   * before, and returns false. The generated code uses it for errors which
+   * the reader can not see, e.g. an array with the wrong number of elements.
+   */
+  bool Fail( const std::string& error );
+
+
+ private:
+  void SkipWhitespace();
+  bool Expect( const char c );
+  bool Magnitude( uint64_t& value, const uint64_t max, const bool quoted );
+
+  const char* mStart; ///< Start of the text
+  const char* mPtr;   ///< Next character to read
+  const char* mEnd;   ///< End of the text
+  bool        mFirst; ///< True at the start of an object or array, before its first member or element
+  std::string mError; ///< Description of the first error
+};
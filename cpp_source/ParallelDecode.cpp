@@ -0,0 +1,236 @@
+#include <atomic>
+#include <condition_variable>
+#include <exception>
+#include <mutex>
+#include <thread>
+#include <vector>
+
+#include "ParallelDecode.h"
+
+
+namespace
+{
+  /**
+   * Worker threads, which wait for a job and then take indexes of it until
+   * all are taken. The thread which started the job takes indexes as well,
+   * and waits until the workers which joined the job are done. An exception
+   * thrown by the task fails the job, and is rethrown by 'Run()' on the
+   * thread which started the job.
+   */
+  class Pool
+  {
+   public:
+    Pool() : mTask( nullptr ), mCount( 0 ), mNext( 0 ), mFailed( false ), mError( nullptr ), mActive( 0 ), mJob( 0 ), mStop( false ) { }
+    ~Pool(){ Stop(); }
+
+
+    bool Run( const size_t threads, const size_t count, const std::function<bool( size_t )>& task )
+    {
+      if( mThreads.size() + 1 != threads )
+      {
+        Stop();
+        Start( threads - 1 );
+      }
+
+      {
+        std::lock_guard<std::mutex> lock( mMutex );
+        mTask   = &task;
+        mCount  = count;
+        mNext   = 0;
+        mFailed = false;
+        mError  = nullptr;
+        ++mJob;
+      }
+      mWake.notify_all();
+
+      Work( task, count );
+
+      std::unique_lock<std::mutex> lock( mMutex );
+      mDone.wait( lock, [this]{ return 0 == mActive; } );
+      mTask = nullptr;
+
+      if( mError )
+      {
+        std::exception_ptr error = mError;
+        mError = nullptr;
+        std::rethrow_exception( error );
+      }
+
+      return !mFailed;
+    }
+
+
+   private:
+    void Start( const size_t workers )
+    {
+      mStop = false;
+      for( size_t i = 0; i < workers; ++i )
+      {
+        mThreads.emplace_back( &Pool::Worker, this );
+      }
+    }
+
+
+    void Stop()
+    {
+      {
+        std::lock_guard<std::mutex> lock( mMutex );
+        mStop = true;
+      }
+      mWake.notify_all();
+
+      for( std::thread& thread : mThreads )
+      {
+        thread.join();
+      }
+      mThreads.clear();
+    }
+
+
+    void Worker();
+
+
+    void Work( const std::function<bool( size_t )>& task, const size_t count )
+    {
+      for( size_t i = mNext++; i < count && !mFailed; i = mNext++ )
+      {
+        bool succ = false;
+        try
+        {
+          succ = task( i );
+        }
+        catch( ... )
+        {
+          std::lock_guard<std::mutex> lock( mMutex );
+          if( !mError )
+          {
+            mError = std::current_exception();
+          }
+        }
+
+        if( !succ )
+        {
+          mFailed = true;
+        }
+      }
+    }
+
+
+    std::mutex                              mMutex;    ///< Protects the job and 'mActive'
+    std::condition_variable                 mWake;     ///< Signals a new job or 'mStop' to the workers
+    std::condition_variable                 mDone;     ///< Signals that 'mActive' dropped to 0
+    std::vector<std::thread>                mThreads;  ///< Worker threads
+    const std::function<bool( size_t )>*    mTask;     ///< Task of the current job, nullptr when it is done
+    size_t                                  mCount;    ///< Number of indexes of the current job
+    std::atomic<size_t>                     mNext;     ///< Next index to take
+    std::atomic<bool>                       mFailed;   ///< True if a call of the task returned false or threw
+    std::exception_ptr                      mError;    ///< First exception thrown by the task, protected by 'mMutex'
+    size_t                                  mActive;   ///< Number of workers in the current job
+    uint64_t                                mJob;      ///< Number of started jobs
+    bool                                    mStop;     ///< True if the workers should exit
+  };
+
+
+  std::mutex          gRunMutex;                                 ///< Held while a job runs, protects 'gPool'
+  Pool                gPool;                                     ///< Thread pool, started by the first job
+  std::atomic<size_t> gThreads ( 0 );                            ///< Number of threads, 0 for hardware threads
+  std::atomic<size_t> gMinBytes( CATBUFFER_PARALLEL_MIN_BYTES ); ///< Minimum array size in bytes
+  thread_local bool   tInJob = false;                            ///< True on threads which work on a job
+
+
+  void Pool::Worker()
+  {
+    tInJob = true;
+    uint64_t job = 0;
+
+    std::unique_lock<std::mutex> lock( mMutex );
+    for(;;)
+    {
+      mWake.wait( lock, [&]{ return mStop || ( mTask && job != mJob ); } );
+      if( mStop )
+      {
+        return;
+      }
+
+      job = mJob;
+      ++mActive;
+      const std::function<bool( size_t )>& task  = *mTask;
+      const size_t                         count = mCount;
+      lock.unlock();
+
+      Work( task, count );
+
+      lock.lock();
+      if( 0 == --mActive )
+      {
+        mDone.notify_all();
+      }
+    }
+  }
+
+
+  size_t Threads()
+  {
+    const size_t threads = gThreads;
+    if( threads )
+    {
+      return threads;
+    }
+
+    const size_t hardware = std::thread::hardware_concurrency();
+    return hardware ? hardware : 1;
+  }
+}
+
+
+void ParallelDecode::SetThreads( const size_t threads )
+{
+  gThreads = threads;
+}
+
+
+void ParallelDecode::SetMinBytes( const size_t bytes )
+{
+  gMinBytes = bytes;
+}
+
+
+bool ParallelDecode::Enabled( const size_t bytes )
+{
+  return bytes >= gMinBytes && !tInJob && Threads() > 1;
+}
+
+
+bool ParallelDecode::For( const size_t count, const std::function<bool( size_t )>& task )
+{
+  const size_t threads = Threads();
+
+  std::unique_lock<std::mutex> lock( gRunMutex, std::try_to_lock );
+  if( !lock.owns_lock() || tInJob || threads < 2 || count < 2 )
+  {
+    for( size_t i = 0; i < count; ++i )
+    {
+      if( !task( i ) )
+      {
+        return false;
+      }
+    }
+    return true;
+  }
+
+  tInJob = true;
+
+  bool succ;
+  try
+  {
+    succ = gPool.Run( threads, count, task );
+  }
+  catch( ... )
+  {
+    tInJob = false;
+    throw;
+  }
+
+  tInJob = false;
+  return succ;
+}
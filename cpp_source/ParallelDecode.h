@@ -0,0 +1,63 @@
+#pragma once
+#include <cstdint>
+#include <stddef.h>
+#include <functional>
+
+
+
+/**
+ * Thread pool for the parallel decoding of 'array_sized' fields, which is
+ * generated with the '--parallel-decode' option. The generated
+ * 'Deserialize()' methods first scan the array for the boundaries of its
+ * elements (skipping over them with 'skip_type_{group}()') and create the
+ * elements, then the elements are deserialized in parallel with 'For()':
+ *
+ *   ParallelDecode::SetThreads( 4 );         // 0 (default) uses std::thread::hardware_concurrency()
+ *   ParallelDecode::SetMinBytes( 64*1024 );  // smaller arrays are decoded serially
+ *
+ *   aggregate.Deserialize( buffer );
+ *
+ * The calling thread works on the elements as well. Only one array is
+ * decoded in parallel at a time, nested arrays and arrays which are decoded
+ * by other threads at the same time are decoded serially by their caller.
+ */
+class ParallelDecode
+{
+ public:
+
+  /**
+   * Sets the number of threads which decode an array, including the calling
+   * thread. 0 uses the number of hardware threads, 1 decodes serially.
+   */
+  static void SetThreads( const size_t threads );
+
+
+  /**
+   * Sets the minimum size in bytes of an array to be decoded in parallel.
+   * The default is CATBUFFER_PARALLEL_MIN_BYTES.
+   */
+  static void SetMinBytes( const size_t bytes );
+
+
+  /**
+   * Returns true if an array of 'bytes' bytes is decoded in parallel.
+   */
+  static bool Enabled( const size_t bytes );
+
+
+  /**
+   * Calls 'task' for each index in [0, count) on the thread pool, or on the
+   * calling thread if the pool is busy. Stops calling it as soon as a call
+   * returns false or throws. The first exception thrown by 'task' is
+   * rethrown on the calling thread, after all threads stopped working on it.
+   *
+   * @return true if all calls returned true
+   */
+  static bool For( const size_t count, const std::function<bool( size_t )>& task );
+};
+
+
+
+#ifndef CATBUFFER_PARALLEL_MIN_BYTES
+  #define CATBUFFER_PARALLEL_MIN_BYTES (32*1024)
+#endif
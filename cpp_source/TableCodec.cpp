@@ -0,0 +1,500 @@
+#include <cstring>
+
+#include "CatbufferHooks.h"
+#include "ElementArray.h"
+#include "TableCodec.h"
+
+
+namespace
+{
+  /**
+   * Reads an unsigned little endian integer of 'size' bytes (1 to 8).
+   */
+  uint64_t ReadUnsigned( const uint8_t* data, const size_t size )
+  {
+    uint64_t value = 0;
+    memcpy( &value, data, size );
+    return value;
+  }
+
+
+  /**
+   * Copies a scalar of 'size' bytes. The common sizes are copied with a
+   * constant size, which the compiler turns into a single move.
+   */
+  void CopyScalar( uint8_t* dst, const uint8_t* src, const size_t size )
+  {
+    switch( size )
+    {
+      case 1:  *dst = *src;              break;
+      case 2:  memcpy( dst, src, 2 );    break;
+      case 4:  memcpy( dst, src, 4 );    break;
+      case 8:  memcpy( dst, src, 8 );    break;
+      default: memcpy( dst, src, size ); break;
+    }
+  }
+
+
+  /**
+   * Returns the largest value of an unsigned integer of 'size' bytes.
+   */
+  uint64_t MaxUnsigned( const size_t size )
+  {
+    return size >= 8 ? ~uint64_t(0) : ( uint64_t(1) << (size*8) ) - 1;
+  }
+
+
+  /**
+   * Returns true if 'value' fulfills the condition of 'field' on a field of 'size' bytes.
+   */
+  bool Compare( const TableField& field, const uint64_t value, const size_t size )
+  {
+    const bool equal = 0 == ( (value ^ field.value) & MaxUnsigned(size) );
+    return TableField::EQUALS == field.condition ? equal : !equal;
+  }
+
+
+  /**
+   * Returns true if the (optional) field 'field' of 'object' is present.
+   */
+  bool IsPresent( const TableLayout& layout, const TableField& field, const uint8_t* object )
+  {
+    if( TableField::ALWAYS == field.condition )
+    {
+      return true;
+    }
+
+    const TableField& cond = layout.fields[field.ref];
+    return Compare( field, ReadUnsigned( object + cond.offset, cond.size ), cond.size );
+  }
+
+
+  /**
+   * Returns the value of the field 'ref' of 'object', which holds an array count or byte size.
+   */
+  uint64_t ReadRef( const TableLayout& layout, const uint16_t ref, const uint8_t* object )
+  {
+    const TableField& field = layout.fields[ref];
+    return ReadUnsigned( object + field.offset, field.size );
+  }
+
+
+  /**
+   * Returns the number of bytes needed after 'offset' to align it to 'align'.
+   */
+  size_t Padding( const size_t offset, const size_t align )
+  {
+    return align ? ( align - offset % align ) % align : 0;
+  }
+}
+
+
+
+bool TableCodec::Decode( const TableLayout& layout, void* object, RawBuffer& buffer )
+{
+  uint8_t* const base = static_cast<uint8_t*>( object );
+
+  for( uint16_t i=0; i<layout.count; ++i )
+  {
+    const TableField& field  = layout.fields[i];
+    uint8_t* const    member = base + field.offset;
+    bool              succ   = true;
+
+    if( !IsPresent( layout, field, base ) )
+    {
+      continue;
+    }
+
+    switch( field.kind )
+    {
+      case TableField::SCALAR:
+      {
+        const uint8_t* ptr = buffer.GetOffsetPtrAndMove( field.size );
+        if( ptr ){ CopyScalar( member, ptr, field.size ); }
+        succ = nullptr != ptr;
+        break;
+      }
+
+      case TableField::RESERVED:
+      {
+        const uint8_t* ptr = buffer.GetOffsetPtrAndMove( field.size );
+        succ = ptr && field.value == ReadUnsigned( ptr, field.size );
+        break;
+      }
+
+      case TableField::RESERVED_SIZE:
+      {
+        succ = nullptr != buffer.GetOffsetPtrAndMove( field.size );
+        break;
+      }
+
+      case TableField::STRUCT:
+      {
+        succ = Decode( *field.layout, member, buffer );
+        break;
+      }
+
+      case TableField::ARRAY:
+      {
+        size_t count = field.value;
+        if( TableField::NO_REF != field.ref )
+        {
+          count = ReadRef( layout, field.ref, base );
+          if( count == MaxUnsigned( layout.fields[field.ref].size ) )
+          {
+            field.vector->resize( member, 0 );
+            break;
+          }
+        }
+
+        const size_t stride = field.vector->stride;
+        if( !field.layout )
+        {
+          succ = buffer.CanRead( count*stride );
+          if( !succ ){ break; }
+
+          uint8_t*       data = field.vector->resize( member, count );
+          const uint8_t* ptr  = buffer.GetOffsetPtrAndMove( count*stride );
+          if( count ){ memcpy( data, ptr, count*stride ); }
+          break;
+        }
+
+        uint8_t* data = field.vector->resize( member, count );
+        for( size_t j=0; j<count && succ; ++j )
+        {
+          succ = Decode( *field.layout, data + j*stride, buffer );
+        }
+        break;
+      }
+
+      case TableField::ARRAY_FILL:
+      {
+        const size_t stride   = field.vector->stride;
+        size_t       capacity = field.vector->count( member );
+        uint8_t*     data     = field.vector->data( member );
+        size_t       count    = 0;
+
+        for( ; buffer.RemainingSize() && succ; ++count )
+        {
+          if( count == capacity ){ data = field.vector->resize( member, ++capacity ); }
+
+          if( field.layout )
+          {
+            succ = Decode( *field.layout, data + count*stride, buffer );
+          }
+          else
+          {
+            const uint8_t* ptr = buffer.GetOffsetPtrAndMove( stride );
+            if( ptr ){ memcpy( data + count*stride, ptr, stride ); }
+            succ = nullptr != ptr;
+          }
+        }
+
+        if( succ ){ field.vector->resize( member, count ); }
+        break;
+      }
+
+      case TableField::ARRAY_SIZED:
+      {
+        ElementArray& elements = *reinterpret_cast<ElementArray*>( member );
+        const size_t  size     = ReadRef( layout, field.ref, base );
+        size_t        count    = 0;
+
+        for( size_t read_size = 0; read_size < size && succ; ++count )
+        {
+          // Get element type from the header and reuse existing element if it has the same type
+          if( count == elements.size() ){ elements.Append(); }
+          succ = field.layout->recycle( buffer, elements[count] );
+          if( !succ ){ elements.Truncate( count ); break; }
+
+          const size_t rsize = buffer.RemainingSize();
+          succ = elements[count]->Deserialize( buffer );
+
+          const size_t padding = Padding( buffer.GetOffset(), field.align );
+          succ = succ && buffer.MoveOffset( padding );
+          read_size += rsize - buffer.RemainingSize();
+        }
+
+        if( succ ){ elements.Truncate( count ); }
+        break;
+      }
+    }
+
+    if( !succ )
+    {
+      CATBUFFER_HOOK_FAIL( layout.name, layout.field_names[i], buffer );
+      return false;
+    }
+  }
+
+  return true;
+}
+
+
+
+bool TableCodec::Encode( const TableLayout& layout, const void* object, RawBuffer& buffer )
+{
+  const uint8_t* const base = static_cast<const uint8_t*>( object );
+
+  for( uint16_t i=0; i<layout.count; ++i )
+  {
+    const TableField&    field  = layout.fields[i];
+    const uint8_t* const member = base + field.offset;
+    bool                 succ   = true;
+
+    if( !IsPresent( layout, field, base ) )
+    {
+      continue;
+    }
+
+    switch( field.kind )
+    {
+      case TableField::SCALAR:
+      {
+        uint8_t* ptr = buffer.GetOffsetPtrAndMove( field.size );
+        if( ptr ){ CopyScalar( ptr, member, field.size ); }
+        succ = nullptr != ptr;
+        break;
+      }
+
+      case TableField::RESERVED:
+      case TableField::RESERVED_SIZE:
+      {
+        uint64_t value = field.value;
+        if( TableField::RESERVED_SIZE == field.kind )
+        {
+          const TableField& sized = layout.fields[field.ref];
+          value = Size( *sized.layout, base + sized.offset );
+        }
+
+        uint8_t* ptr = buffer.GetOffsetPtrAndMove( field.size );
+        if( ptr ){ memcpy( ptr, &value, field.size ); }
+        succ = nullptr != ptr;
+        break;
+      }
+
+      case TableField::STRUCT:
+      {
+        succ = Encode( *field.layout, member, buffer );
+        break;
+      }
+
+      case TableField::ARRAY:
+      case TableField::ARRAY_FILL:
+      {
+        const size_t   count  = field.vector->count( member );
+        const size_t   stride = field.vector->stride;
+        const uint8_t* data   = field.vector->data( member );
+
+        if( !field.layout )
+        {
+          uint8_t* ptr = buffer.GetOffsetPtrAndMove( count*stride );
+          if( ptr && count ){ memcpy( ptr, data, count*stride ); }
+          succ = nullptr != ptr;
+          break;
+        }
+
+        for( size_t j=0; j<count && succ; ++j )
+        {
+          succ = Encode( *field.layout, data + j*stride, buffer );
+        }
+        break;
+      }
+
+      case TableField::ARRAY_SIZED:
+      {
+        for( const std::unique_ptr<ICatbuffer>& element : *reinterpret_cast<const ElementArray*>( member ) )
+        {
+          succ = element->Serialize( buffer );
+          if( !succ ){ break; }
+
+          const size_t padding = Padding( buffer.GetOffset(), field.align );
+          uint8_t*     ptr     = buffer.GetOffsetPtrAndMove( padding );
+          if( ptr ){ memset( ptr, 0, padding ); }
+
+          succ = nullptr != ptr;
+          if( !succ ){ break; }
+        }
+        break;
+      }
+    }
+
+    if( !succ )
+    {
+      CATBUFFER_HOOK_FAIL( layout.name, layout.field_names[i], buffer );
+      return false;
+    }
+  }
+
+  return true;
+}
+
+
+
+size_t TableCodec::Size( const TableLayout& layout, const void* object )
+{
+  const uint8_t* const base = static_cast<const uint8_t*>( object );
+  size_t               size = 0;
+
+  for( uint16_t i=0; i<layout.count; ++i )
+  {
+    const TableField&    field  = layout.fields[i];
+    const uint8_t* const member = base + field.offset;
+
+    if( !IsPresent( layout, field, base ) )
+    {
+      continue;
+    }
+
+    switch( field.kind )
+    {
+      case TableField::SCALAR:
+      case TableField::RESERVED:
+      case TableField::RESERVED_SIZE:
+        size += field.size;
+        break;
+
+      case TableField::STRUCT:
+        size += Size( *field.layout, member );
+        break;
+
+      case TableField::ARRAY:
+      case TableField::ARRAY_FILL:
+      {
+        const size_t count  = field.vector->count( member );
+        const size_t stride = field.vector->stride;
+
+        if( !field.layout )
+        {
+          size += count*stride;
+          break;
+        }
+
+        // all elements of an array have the size of the first one, as in the generated 'Size()' methods
+        if( count ){ size += count*Size( *field.layout, field.vector->data( member ) ); }
+        break;
+      }
+
+      case TableField::ARRAY_SIZED:
+        size += ReadRef( layout, field.ref, base );
+        break;
+    }
+  }
+
+  return size;
+}
+
+
+
+bool TableCodec::Validate( const TableLayout& layout, RawBuffer& buffer, std::vector<size_t>* offsets )
+{
+  uint64_t values[MAX_SLOTS] = {}; // values of the fields which other fields refer to
+
+  for( uint16_t i=0; i<layout.count; ++i )
+  {
+    const TableField& field = layout.fields[i];
+    bool              succ  = true;
+
+    // conditions on fields after the field (unions) can not be checked, the field is always read
+    if( TableField::ALWAYS != field.condition && field.ref < i )
+    {
+      const TableField& cond = layout.fields[field.ref];
+      if( !Compare( field, values[cond.slot], cond.size ) )
+      {
+        continue;
+      }
+    }
+
+    switch( field.kind )
+    {
+      case TableField::SCALAR:
+      case TableField::RESERVED:
+      case TableField::RESERVED_SIZE:
+      {
+        const uint8_t* ptr = buffer.GetOffsetPtrAndMove( field.size );
+        if( ptr && TableField::NO_SLOT != field.slot ){ values[field.slot] = ReadUnsigned( ptr, field.size ); }
+        succ = nullptr != ptr;
+        break;
+      }
+
+      case TableField::STRUCT:
+      {
+        succ = Validate( *field.layout, buffer, offsets );
+        break;
+      }
+
+      case TableField::ARRAY:
+      {
+        size_t count = field.value;
+        if( TableField::NO_REF != field.ref )
+        {
+          const TableField& sized = layout.fields[field.ref];
+          count = values[sized.slot];
+          if( count == MaxUnsigned( sized.size ) )
+          {
+            break;
+          }
+        }
+
+        if( !field.layout )
+        {
+          succ = buffer.MoveOffset( count*field.vector->stride );
+          break;
+        }
+
+        for( size_t j=0; j<count && succ; ++j )
+        {
+          succ = Validate( *field.layout, buffer );
+        }
+        break;
+      }
+
+      case TableField::ARRAY_FILL:
+      {
+        if( !field.layout )
+        {
+          succ = 0 == buffer.RemainingSize() % field.vector->stride && buffer.MoveOffset( buffer.RemainingSize() );
+          break;
+        }
+
+        while( buffer.RemainingSize() && succ )
+        {
+          succ = Validate( *field.layout, buffer );
+        }
+        break;
+      }
+
+      case TableField::ARRAY_SIZED:
+      {
+        const size_t size = values[ layout.fields[field.ref].slot ];
+
+        if( !offsets )
+        {
+          succ = buffer.MoveOffset( size );
+          break;
+        }
+
+        for( size_t read_size = 0; read_size < size && succ; )
+        {
+          // Save element offset and skip element
+          offsets->push_back( buffer.GetOffset() );
+
+          const size_t rsize = buffer.RemainingSize();
+          succ = field.layout->skip( buffer );
+
+          const size_t padding = Padding( buffer.GetOffset(), field.align );
+          succ = succ && buffer.MoveOffset( padding );
+          read_size += rsize - buffer.RemainingSize();
+        }
+        break;
+      }
+    }
+
+    if( !succ )
+    {
+      return false;
+    }
+  }
+
+  return true;
+}
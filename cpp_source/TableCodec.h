@@ -0,0 +1,166 @@
+#pragma once
+#include <cstdint>
+#include <stddef.h>
+#include <memory>
+#include <vector>
+
+#include "ICatbuffer.h"
+#include "RawBuffer.h"
+
+
+
+struct TableLayout;
+
+
+/**
+ * Type erased operations on a 'std::vector<T>' member, so that arrays of any
+ * element type can be resized and walked by 'TableCodec'. One instance per
+ * element type is shared by all tables ('TableVectorOf<T>::ops').
+ */
+struct TableVector
+{
+  uint8_t* (*resize)( void* vec, const size_t count ); ///< Resizes the vector and returns its data
+  uint8_t* (*data)  ( const void* vec );               ///< Returns the data of the vector
+  size_t   (*count) ( const void* vec );               ///< Returns the number of elements
+  size_t   stride;                                     ///< sizeof(T)
+};
+
+
+template<class T>
+struct TableVectorOf
+{
+  static uint8_t* Resize( void* vec, const size_t count )
+  {
+    std::vector<T>& v = *static_cast<std::vector<T>*>( vec );
+    v.resize( count );
+    return reinterpret_cast<uint8_t*>( v.data() );
+  }
+
+  static uint8_t* Data( const void* vec )
+  {
+    const std::vector<T>& v = *static_cast<const std::vector<T>*>( vec );
+    return reinterpret_cast<uint8_t*>( const_cast<T*>( v.data() ) );
+  }
+
+  static size_t Count( const void* vec ){ return static_cast<const std::vector<T>*>( vec )->size(); }
+
+  static const TableVector ops;
+};
+
+template<class T>
+const TableVector TableVectorOf<T>::ops = { &TableVectorOf<T>::Resize, &TableVectorOf<T>::Data, &TableVectorOf<T>::Count, sizeof(T) };
+
+
+
+/**
+ * Describes how one field of a struct is serialized. 'offset' is the offset
+ * of the member in the C++ class, 'ref' the index of the field in the same
+ * table which holds the element count of an array, the byte size of an
+ * 'array_sized' field, or the value a condition is checked against.
+ */
+struct TableField
+{
+  enum Kind : uint8_t
+  {
+    SCALAR,        ///< integer, enum or alias of 'size' bytes
+    RESERVED,      ///< 'size' bytes which must be equal to 'value'
+    RESERVED_SIZE, ///< 'size' bytes holding the serialized size of the struct field 'ref'
+    STRUCT,        ///< nested struct described by 'layout'
+    ARRAY,         ///< std::vector with 'ref' elements (or 'value' elements if 'ref' is NO_REF)
+    ARRAY_FILL,    ///< std::vector whose elements fill the rest of the buffer
+    ARRAY_SIZED,   ///< ElementArray of 'ref' bytes, with elements created from the header 'layout'
+  };
+
+  enum Condition : uint8_t
+  {
+    ALWAYS,        ///< field is always present
+    EQUALS,        ///< field is present if field 'ref' == 'value'
+    NOT_EQUALS,    ///< field is present if field 'ref' != 'value'
+  };
+
+  static const uint16_t NO_REF  = 0xFFFF;
+  static const uint8_t  NO_SLOT = 0xFF;
+
+  Kind               kind;
+  Condition          condition;
+  uint8_t            align;   ///< alignment of the elements of 'array_sized' fields (0 for none)
+  uint8_t            slot;    ///< index in the values read by 'TableCodec::Validate()', if other fields refer to this field
+  uint32_t           size;    ///< byte size of SCALAR and RESERVED fields
+  uint32_t           offset;  ///< offset of the member in the class
+  uint16_t           ref;     ///< index of the field holding the count, byte size or condition value
+  uint64_t           value;   ///< RESERVED value, condition value, or fixed ARRAY count
+  const TableLayout* layout;  ///< layout of STRUCT fields and of struct elements, header layout of ARRAY_SIZED fields
+  const TableVector* vector;  ///< operations on the vector of ARRAY and ARRAY_FILL fields
+};
+
+
+
+/**
+ * The field table of a struct. For structs which are the header of
+ * 'array_sized' fields, 'recycle' and 'skip' create or skip the element
+ * whose type is given by the header at the offset of the buffer.
+ */
+struct TableLayout
+{
+  const char*              name;
+  const TableField*        fields;
+  const char* const*       field_names;
+  uint16_t                 count;
+  bool (*recycle)( RawBuffer buffer, std::unique_ptr<ICatbuffer>& element );
+  bool (*skip)   ( RawBuffer& buffer );
+};
+
+
+
+/**
+ * Interpreter for the field tables which are generated with '--backend table'.
+ * Instead of generating 'Deserialize()', 'Serialize()', 'Size()' and
+ * 'SkipOver()' for every struct, each struct gets a constant table with one
+ * 'TableField' per field, and its methods call the loops below:
+ *
+ *   bool TransferTransaction::Deserialize( RawBuffer& buffer )
+ *   {
+ *     return TableCodec::Decode( LAYOUT, this, buffer );
+ *   }
+ *
+ * Nested structs are walked with their own tables, without virtual calls.
+ */
+class TableCodec
+{
+ public:
+
+  static const size_t MAX_SLOTS = 16; ///< maximum number of fields per struct which other fields refer to
+
+
+  /**
+   * Deserializes 'buffer' into 'object', an instance of the class of 'layout'.
+   *
+   * @return  True if buffer contained enough data to deserialize all fields
+   */
+  static bool Decode( const TableLayout& layout, void* object, RawBuffer& buffer );
+
+
+  /**
+   * Serializes 'object', an instance of the class of 'layout', into 'buffer'.
+   *
+   * @return  True if buffer was large enough for all fields
+   */
+  static bool Encode( const TableLayout& layout, const void* object, RawBuffer& buffer );
+
+
+  /**
+   * Returns the serialized size of 'object' in bytes.
+   */
+  static size_t Size( const TableLayout& layout, const void* object );
+
+
+  /**
+   * Moves 'buffer' past one serialized instance of the struct of 'layout'
+   * without deserializing it, and checks that it is complete. If 'offsets'
+   * is given, the buffer offset of each element in 'array_sized' fields is
+   * added to it.
+   *
+   * @return  True if buffer contained a complete instance
+   */
+  static bool Validate( const TableLayout& layout, RawBuffer& buffer, std::vector<size_t>* offsets = nullptr );
+};
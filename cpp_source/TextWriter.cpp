@@ -0,0 +1,187 @@
+#include <cstring>
+
+#include "TextWriter.h"
+#include "Codec.h"
+
+
+namespace
+{
+  const char kDecimalPairs[] = "00010203040506070809"
+                               "10111213141516171819"
+                               "20212223242526272829"
+                               "30313233343536373839"
+                               "40414243444546474849"
+                               "50515253545556575859"
+                               "60616263646566676869"
+                               "70717273747576777879"
+                               "80818283848586878889"
+                               "90919293949596979899";
+}
+
+
+TextWriter::TextWriter( std::string& output )
+  : mOutput( output )
+{
+
+}
+
+
+TextWriter& TextWriter::Text( const char* text )
+{
+  mOutput.append( text, strlen( text ) );
+  return *this;
+}
+
+
+TextWriter& TextWriter::Indent( const size_t level )
+{
+  mOutput.append( level, '\t' );
+  return *this;
+}
+
+
+TextWriter& TextWriter::UInt( uint64_t value )
+{
+  char  digits[20];
+  char* pos = digits + sizeof(digits);
+
+  // two digits at a time
+  while( value >= 100 )
+  {
+    const size_t pair = (value % 100) * 2;
+    value /= 100;
+
+    *--pos = kDecimalPairs[pair + 1];
+    *--pos = kDecimalPairs[pair];
+  }
+
+  if( value >= 10 )
+  {
+    *--pos = kDecimalPairs[value*2 + 1];
+    *--pos = kDecimalPairs[value*2];
+  }
+  else
+  {
+    *--pos = (char) ('0' + value);
+  }
+
+  mOutput.append( pos, digits + sizeof(digits) - pos );
+  return *this;
+}
+
+
+TextWriter& TextWriter::Int( const int64_t value )
+{
+  if( value < 0 )
+  {
+    mOutput.push_back( '-' );
+    return UInt( 0 - (uint64_t) value );
+  }
+
+  return UInt( (uint64_t) value );
+}
+
+
+TextWriter& TextWriter::HexUInt( const uint64_t value, const size_t size )
+{
+  // big endian, so that the most significant digit comes first
+  uint8_t bytes[8];
+  for( size_t i=0; i<size; ++i )
+  {
+    bytes[i] = (uint8_t) (value >> (8*(size - 1 - i)));
+  }
+
+  return Hex( bytes, size );
+}
+
+
+TextWriter& TextWriter::Hex( const uint8_t* data, const size_t size )
+{
+  const size_t start = mOutput.size();
+  mOutput.resize( start + size*2 );
+
+  Codec::HexEncode( data, size, &mOutput[start] );
+  return *this;
+}
+
+
+TextWriter& TextWriter::Base32( const uint8_t* data, const size_t size )
+{
+  const size_t start = mOutput.size();
+  mOutput.resize( start + Codec::Base32EncodedSize( size ) );
+
+  Codec::Base32Encode( data, size, &mOutput[start] );
+  return *this;
+}
+
+
+TextWriter& TextWriter::Ascii( const uint8_t* data, const size_t size )
+{
+  const size_t start = mOutput.size();
+  mOutput.resize( start + size );
+
+  for( size_t i=0; i<size; ++i )
+  {
+    mOutput[start + i] = ( data[i] >= 0x20 && data[i] < 0x7F ) ? (char) data[i] : '.';
+  }
+
+  return *this;
+}
+
+
+TextWriter& TextWriter::JsonString( const uint8_t* data, const size_t size )
+{
+  mOutput.push_back( '"' );
+
+  for( size_t i=0; i<size; ++i )
+  {
+    const uint8_t c = data[i];
+
+    if( '"' == c || '\\' == c )
+    {
+      mOutput.push_back( '\\' );
+      mOutput.push_back( (char) c );
+    }
+    else if( c < 0x20 || c >= 0x7F )
+    {
+      mOutput.append( "\\u00" );
+      HexUInt( c, 1 );
+    }
+    else
+    {
+      mOutput.push_back( (char) c );
+    }
+  }
+
+  mOutput.push_back( '"' );
+  return *this;
+}
+
+
+TextWriter& TextWriter::Key( const char* name )
+{
+  Separator();
+
+  mOutput.push_back( '"' );
+  mOutput.append( name, strlen( name ) );
+  mOutput.append( "\":", 2 );
+
+  return *this;
+}
+
+
+TextWriter& TextWriter::Separator()
+{
+  if( !mOutput.empty() && '{' != mOutput.back() && '[' != mOutput.back() )
+  {
+    mOutput.push_back( ',' );
+  }
+
+  return *this;
+}
+
+
+size_t TextWriter::Size() const
+{
+  return mOutput.size();
+}
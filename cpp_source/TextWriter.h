@@ -0,0 +1,103 @@
+#pragma once
+#include <cstdint>
+#include <stddef.h>
+#include <string>
+
+
+
+/**
+ * A class to append text to a string, which is used by the generated
+ * 'PrintTo()' and 'JsonTo()' methods. Numbers, hex and base32 (see
+ * 'Codec.h') are formatted with lookup tables directly into the string,
+ * so nothing is allocated apart from growing the string. All methods
+ * return the writer, so that calls can be chained:
+ *
+ *   std::string text;
+ *   text.reserve( 1 << 20 );
+ *
+ *   TextWriter out( text );
+ *   out.Indent( 1 ).Text( "mFee: " ).UInt( fee ).Text( "\n" );
+ */
+class TextWriter
+{
+ public:
+  TextWriter( std::string& output );
+
+
+  /**
+   * Appends a null terminated string.
+   */
+  TextWriter& Text( const char* text );
+
+
+  /**
+   * Appends 'level' tabs.
+   */
+  TextWriter& Indent( const size_t level );
+
+
+  /**
+   * Appends an unsigned integer in decimal.
+   */
+  TextWriter& UInt( const uint64_t value );
+
+
+  /**
+   * Appends a signed integer in decimal.
+   */
+  TextWriter& Int( const int64_t value );
+
+
+  /**
+   * Appends an unsigned integer in hex, with two digits per byte of 'size'.
+   */
+  TextWriter& HexUInt( const uint64_t value, const size_t size );
+
+
+  /**
+   * Appends bytes as uppercase hex, e.g. { 0x1A, 0x2B } as "1A2B".
+   */
+  TextWriter& Hex( const uint8_t* data, const size_t size );
+
+
+  /**
+   * Appends bytes as unpadded RFC 4648 base32, e.g. for addresses.
+   */
+  TextWriter& Base32( const uint8_t* data, const size_t size );
+
+
+  /**
+   * Appends bytes as text, with non printable characters replaced by '.'.
+   */
+  TextWriter& Ascii( const uint8_t* data, const size_t size );
+
+
+  /**
+   * Appends bytes as a quoted JSON string, with quotes, backslashes and
+   * control characters escaped.
+   */
+  TextWriter& JsonString( const uint8_t* data, const size_t size );
+
+
+  /**
+   * Appends the key of a JSON object member ("name":), preceded by a
+   * comma, unless it is the first member of the object.
+   */
+  TextWriter& Key( const char* name );
+
+
+  /**
+   * Appends a comma between JSON array elements, unless at the start of the array.
+   */
+  TextWriter& Separator();
+
+
+  /**
+   * The number of characters written to the output.
+   */
+  size_t Size() const;
+
+
+ private:
+  std::string& mOutput; ///< The string which text is appended to
+};
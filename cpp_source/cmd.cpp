@@ -1,36 +1,36 @@
+#include <algorithm>
 #include <fstream>
+#include <map>
 #include <vector>
 #include <string>
 #include <iterator>
 
 #include "../generated_src/converters.h"
+#include "Codec.h"
 
 
-std::vector<uint8_t> HexToBytes( const std::string& hex )
+int main( int argc, char* argv[] )
 {
-  std::vector<uint8_t> bytes;
+  // '--json' and '--footprint' can be given before or after the other arguments
+  std::vector<std::string> args;
+  bool json      = false;
+  bool footprint = false;
 
-  for( unsigned int i = 0; i < hex.length(); i += 2 )
+  for( int i=1; i<argc; ++i )
   {
-    std::string byteString = hex.substr(i, 2);
-    uint8_t byte = (uint8_t) strtol(byteString.c_str(), NULL, 16);
-    bytes.push_back(byte);
+    if(      std::string( argv[i] ) == "--json"      ){ json = true; }
+    else if( std::string( argv[i] ) == "--footprint" ){ footprint = true; }
+    else                                              { args.push_back( argv[i] ); }
   }
 
-  return bytes;
-}
-
-
-int main( int argc, char* argv[] )
-{
-  if( argc == 1 )
+  if( args.empty() )
   {
     printf("Too few arguments!\n");
 
     return 0;
   }
 
-  std::string cmd( argv[1] );
+  std::string cmd( args[0] );
 
   if( cmd == "--help" )
   {
@@ -46,59 +46,124 @@ int main( int argc, char* argv[] )
     printf( "  --raw-auto {buffer type}    Deserialize a hex string representing a catbuffer belonging to {group type}\n");
     printf( "                              by automatically detecting the buffer type.\n\n");
 
+    printf( "  --json                      Print the deserialized catbuffer as JSON.\n");
+    printf( "  --footprint                 Print the distribution of the memory footprints of the deserialized\n");
+    printf( "                              catbuffers per type, instead of the catbuffers.\n\n");
+    printf( "Several hex strings or files can be given, which are deserialized one after the other.\n\n");
+
     return 0;
   }
   else if( cmd == "--hex-auto" || cmd == "--hex" || cmd == "--raw-auto" || cmd == "--raw" )
   {
-    if( argc < 4 )
+    if( args.size() < 3 )
     {
       printf("Error: Too few arguments\n");
       return 1;
     }
 
-    std::string bufferType( argv[2] );
-    std::string arg( argv[3] ); // file name or hex string
+    std::string bufferType( args[1] );
 
-    std::vector<uint8_t> buffer;
+    // footprints in bytes of each type, with '--footprint'
+    std::map<std::string, std::vector<size_t>> footprints;
+    std::map<std::string, size_t>              heapBytes;
 
-    if( cmd == "--hex-auto" || cmd == "--hex" )
-    {
-      buffer = HexToBytes( arg );
-    }
-    else
+    for( size_t i=2; i<args.size(); ++i )
     {
-      std::ifstream infile(arg, std::ios_base::binary);
-      buffer = std::vector<uint8_t> { std::istreambuf_iterator<char>(infile), std::istreambuf_iterator<char>() };
-    }
+      const std::string& arg = args[i]; // file name or hex string
 
-    RawBuffer rawbuf( buffer.data(), buffer.size() );
-    std::unique_ptr<ICatbuffer> cat;
+      std::vector<uint8_t> buffer;
 
-    if( cmd == "--hex-auto" || cmd == "--raw-auto" )
-    {
-      cat = create_type( rawbuf, bufferType );
-    }
-    else if( cmd == "--hex" || cmd == "--raw" )
-    {
-      cat = create_type( bufferType );
-      if( nullptr == cat )
+      if( cmd == "--hex-auto" || cmd == "--hex" )
+      {
+        if( !Codec::HexDecode( arg, buffer ) )
+        {
+          printf( "Error: '%s' is not a valid hex string!\n", arg.c_str() );
+          return 1;
+        }
+      }
+      else
       {
-        printf( "\nError: Unknown buffer name '%s\n", bufferType.c_str() );
+        std::ifstream infile(arg, std::ios_base::binary);
+        buffer = std::vector<uint8_t> { std::istreambuf_iterator<char>(infile), std::istreambuf_iterator<char>() };
+      }
+
+      RawBuffer rawbuf( buffer.data(), buffer.size() );
+      std::unique_ptr<ICatbuffer> cat;
+
+      if( cmd == "--hex-auto" || cmd == "--raw-auto" )
+      {
+        cat = create_type( rawbuf, bufferType );
+      }
+      else if( cmd == "--hex" || cmd == "--raw" )
+      {
+        cat = create_type( bufferType );
+        if( nullptr == cat )
+        {
+          printf( "\nError: Unknown buffer name '%s\n", bufferType.c_str() );
+          return 1;
+        }
+
+        if( !cat->Deserialize(rawbuf) )
+        {
+          cat = nullptr;
+        }
+      }
+
+      if( !cat )
+      {
+        printf( "Error: Was not able to deserialize data! Error occured at around byte: %lu\n", rawbuf.GetOffset() );
         return 1;
       }
-      cat->Deserialize(rawbuf);
-    }
 
-    cat->Print();
+      if( footprint )
+      {
+        footprints[ cat->TypeName() ].push_back( cat->TotalFootprint() );
+        heapBytes [ cat->TypeName() ] += cat->HeapBytes();
+        continue;
+      }
 
-    if( !cat )
-    {
-      printf( "Error: Was not able to deserialize data! Error occured at around byte: %lu\n", rawbuf.GetOffset() );
-      return 1;
+      // format the whole output before writing it at once
+      std::string text;
+      text.reserve( 2*buffer.size() + 4096 );
+      TextWriter out( text );
+
+      if( json )
+      {
+        cat->JsonTo( out );
+        out.Text( "\n" );
+      }
+      else
+      {
+        cat->PrintTo( out );
+        out.Text( "\nData deserialized successfully!\n\n" );
+      }
+
+      fwrite( text.data(), 1, text.size(), stdout );
     }
 
+    if( footprint )
+    {
+      size_t count = 0;
+      size_t total = 0;
+
+      printf( "%-48s %8s %10s %10s %10s %10s %10s\n", "type", "count", "min", "median", "mean", "max", "heap mean" );
+      for( std::pair<const std::string, std::vector<size_t>>& type : footprints )
+      {
+        std::vector<size_t>& bytes = type.second;
+        std::sort( bytes.begin(), bytes.end() );
+
+        size_t sum = 0;
+        for( size_t b : bytes ){ sum += b; }
+
+        printf( "%-48s %8lu %10lu %10lu %10lu %10lu %10lu\n", type.first.c_str(), bytes.size(), bytes.front(), bytes[bytes.size()/2],
+                sum/bytes.size(), bytes.back(), heapBytes[type.first]/bytes.size() );
+
+        count += bytes.size();
+        total += sum;
+      }
+      printf( "\n%lu catbuffers, %lu bytes in total\n", count, total );
+    }
   }
 
-  printf("\nData deserialized successfully!\n\n");
   return 0;
 }
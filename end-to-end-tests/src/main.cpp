@@ -3,19 +3,31 @@
 
 #include "converters.h"
 #include "Transaction.h"
+#include "AggregateBondedTransaction.h"
+#include "Codec.h"
+#include "GatherWriter.h"
 
-std::vector<uint8_t> HexToBytes(const std::string& hex) {
-  std::vector<uint8_t> bytes;
+#ifdef CATBUFFER_ENABLE_HOOKS
+#include "CatbufferStats.h"
+#endif
 
-  for (unsigned int i = 0; i < hex.length(); i += 2)
-  {
-    std::string byteString = hex.substr(i, 2);
-    uint8_t byte = (uint8_t) strtol(byteString.c_str(), NULL, 16);
-    bytes.push_back(byte);
-  }
+#ifdef CATBUFFER_GENERATED_COLUMNS
+#include "columns.h"
+#endif
 
-  return bytes;
-}
+#ifdef CATBUFFER_GENERATED_JSON
+#include <cstring>
+#include "json.h"
+#endif
+
+#ifdef CATBUFFER_GENERATED_PARALLEL
+#include <atomic>
+#include <cstring>
+#include <stdexcept>
+#include <thread>
+#include "AggregateTransactionBody.h"
+#include "ParallelDecode.h"
+#endif
 
  
 int main( int argc, char* argv[] )
@@ -23,16 +35,47 @@ int main( int argc, char* argv[] )
   std::string data;
   std::vector<uint8_t> input;
   std::vector<uint8_t> output;
+  std::unique_ptr<ICatbuffer> reused;
+
+  std::vector<uint8_t> batch;
+  std::vector<uint8_t> expected;
+  BufferWriter writer( batch );
+
+#ifdef CATBUFFER_GENERATED_COLUMNS
+  TransferTransactionColumns          transfers;
+  AggregateBondedTransactionColumns   aggregates;
+  size_t                              messageBytes = 0;
+#endif
 
   #include "payloads.h"
   
   for( size_t i=0; i<sizeof(payloads)/sizeof(std::string); ++i )
   {
     // create buffer
-    input = HexToBytes( payloads[i] );
+    if( !Codec::HexDecode( payloads[i], input ) )
+    {
+      printf("Error: Payload %lu is not a valid hex string!\n", i);
+      return 1;
+    }
+
     RawBuffer inputBuf( input.data(), input.size() );
 
 
+    // Hex and base32 round trips
+    std::string hex( 2*input.size(), ' ' );
+    Codec::HexEncode( input.data(), input.size(), &hex[0] );
+
+    std::string base32( Codec::Base32EncodedSize( input.size() ), ' ' );
+    Codec::Base32Encode( input.data(), input.size(), &base32[0] );
+
+    std::vector<uint8_t> decoded( Codec::Base32DecodedSize( base32.size() ) );
+    if( hex != payloads[i] || !Codec::Base32Decode( base32.data(), base32.size(), decoded.data() ) || decoded != input )
+    {
+      printf("Error: Hex or base32 round trip failed!\n");
+      return 1;
+    }
+
+
     // Get header
     RawBuffer header = inputBuf;
     Transaction transaction;
@@ -62,10 +105,139 @@ int main( int argc, char* argv[] )
     }
 
 
+    // Memory footprint includes the footprints of embedded transactions
+    size_t embeddedFootprint = 0;
+    if( TransactionType::AGGREGATE_BONDED == transaction.mType )
+    {
+      for( std::unique_ptr<ICatbuffer>& embedded : ( (AggregateBondedTransaction*) cat.get() )->mAggregateTransactionBody.mTransactions )
+      {
+        embeddedFootprint += embedded->TotalFootprint();
+      }
+    }
+
+    if( cat->TotalFootprint() <= cat->HeapBytes() || cat->HeapBytes() < embeddedFootprint )
+    {
+      printf("Error: Memory footprint does not include all fields!\n");
+      return 1;
+    }
+
+
+    // Deserialize twice into a reused instance, which must serialize to the same payload
+    for( size_t j=0; j<2; ++j )
+    {
+      RawBuffer reuseBuf( input.data(), input.size() );
+      succ = recycle_type_TransactionType( transaction.mType, transaction.mEntityBody.mVersion, reused ) && reused->Deserialize( reuseBuf );
+
+      output.assign( input.size(), 0 );
+      RawBuffer reuseOut( output.data(), output.size() );
+      succ = succ && reused->Serialize( reuseOut );
+
+      if( !succ || output != input )
+      {
+        printf("Error: Was not able to deserialize data into reused instance!\n");
+        return 1;
+      }
+    }
+
+    // The embedded transactions of a cleared aggregate are kept, and recycled by the next deserialization
+    if( TransactionType::AGGREGATE_BONDED == transaction.mType )
+    {
+      ElementArray& embedded = ( (AggregateBondedTransaction*) reused.get() )->mAggregateTransactionBody.mTransactions;
+
+      std::vector<ICatbuffer*> elements;
+      for( std::unique_ptr<ICatbuffer>& element : embedded ){ elements.push_back( element.get() ); }
+
+      reused->Clear();
+      RawBuffer reuseBuf( input.data(), input.size() );
+      succ = !embedded.size() && reused->Deserialize( reuseBuf ) && embedded.size() == elements.size();
+      for( size_t j=0; succ && j<elements.size(); ++j ){ succ = embedded[j].get() == elements[j]; }
+
+      if( !succ )
+      {
+        printf("Error: Was not able to recycle the elements of a cleared instance!\n");
+        return 1;
+      }
+    }
+
+    reused->Clear();
+
+
+    // Truncated payload must fail
+    RawBuffer truncatedBuf( input.data(), input.size()-1 );
+    if( reused->Deserialize( truncatedBuf ) )
+    {
+      printf("Error: Was able to deserialize truncated data!\n");
+      return 1;
+    }
+
+#ifdef CATBUFFER_ENABLE_HOOKS
+    const std::vector<CatbufferStats::Failure> failure = CatbufferStats::LastFailure();
+    if( failure.empty() || failure[0].offset > input.size() )
+    {
+      printf("Error: Failure of truncated data was not recorded!\n");
+      return 1;
+    }
+#endif
+
+
+    // Read header fields directly from raw payload
+    if( Transaction::ReadType( input.data() )     != transaction.mType ||
+        Transaction::ReadFee( input.data() )      != transaction.mFee  ||
+        Transaction::ReadDeadline( input.data() ) != transaction.mDeadline )
+    {
+      printf("Error: Raw field accessors do not match deserialized header!\n");
+      return 1;
+    }
+
+
+    // Deserialize selected fields only, the others must be skipped
+    const uint64_t narrowMask = Transaction::FIELD_FEE | Transaction::FIELD_DEADLINE;
+    Transaction narrowHeader;
+    RawBuffer narrowHeaderBuf( input.data(), input.size() );
+    succ = narrowHeader.DeserializeSelected( narrowHeaderBuf, narrowMask ) && narrowHeaderBuf.GetOffset() == Transaction::FIXED_PREFIX_SIZE &&
+           narrowHeader.mFee == transaction.mFee && narrowHeader.mDeadline == transaction.mDeadline;
+
+    std::unique_ptr<ICatbuffer> narrow = create_type_TransactionType( transaction.mType, transaction.mEntityBody.mVersion );
+    RawBuffer narrowBuf( input.data(), input.size() );
+    RawBuffer narrowTruncatedBuf( input.data(), input.size()-1 );
+    succ = succ && narrow->DeserializeSelected( narrowBuf, narrowMask ) && !narrowBuf.RemainingSize() &&
+           !narrow->DeserializeSelected( narrowTruncatedBuf, narrowMask );
+
+    std::vector<uint8_t> selectedOut;
+    RawBuffer selectedBuf( input.data(), input.size() );
+    succ = succ && narrow->DeserializeSelected( selectedBuf, ~uint64_t(0) ) && !selectedBuf.RemainingSize() && narrow->SerializeTo( selectedOut );
+
+    if( !succ || selectedOut != input )
+    {
+      printf("Error: Was not able to deserialize selected fields!\n");
+      return 1;
+    }
+
+
+    // Skip over payload without deserializing it
+    std::vector<size_t> offsets;
+    RawBuffer skipBuf( input.data(), input.size() );
+    succ = skip_type_TransactionType( transaction.mType, transaction.mEntityBody.mVersion, skipBuf, &offsets );
+
+    if( !succ || skipBuf.RemainingSize() != 0 )
+    {
+      printf("Error: Was not able to skip over data! (%lu bytes remaining)\n", skipBuf.RemainingSize());
+      return 1;
+    }
+
+    for( size_t j=1; j<offsets.size(); ++j )
+    {
+      if( offsets[j] <= offsets[j-1] || offsets[j] >= input.size() )
+      {
+        printf("Error: Invalid element offset %lu\n", offsets[j]);
+        return 1;
+      }
+    }
+
+
     // Serialize
-   	output.resize( input.size() );
-    RawBuffer outputBuf( output.data(), output.size() );
-    succ = cat->Serialize( outputBuf );
+    succ = cat->SerializeTo( output ) && cat->AppendTo( writer );
+    expected.insert( expected.end(), input.begin(), input.end() );
 
     if(!succ)
     {
@@ -74,6 +246,111 @@ int main( int argc, char* argv[] )
     }
 
 
+    // Serialize into iovecs, which reference large arrays in place
+    GatherWriter gather( 32 );
+    std::vector<uint8_t> gathered;
+    succ = cat->AppendTo( gather );
+
+    for( const iovec& vec : gather.Resolve() )
+    {
+      gathered.insert( gathered.end(), (uint8_t*) vec.iov_base, (uint8_t*) vec.iov_base + vec.iov_len );
+    }
+
+    if( !succ || gathered != input )
+    {
+      printf("Error: Gather serialization does not match payload!\n");
+      return 1;
+    }
+
+
+#ifdef CATBUFFER_GENERATED_COLUMNS
+    // Decode transfers and aggregates into columns
+    RawBuffer columnBuf( input.data(), input.size() );
+    succ = true;
+
+    if( TransactionType::TRANSFER == transaction.mType )
+    {
+      succ = transfers.Append( columnBuf ) && transfers.mFee.back() == transaction.mFee;
+      messageBytes += ( (TransferTransaction*) cat.get() )->mTransferTransactionBody.mMessage.size();
+    }
+    else if( TransactionType::AGGREGATE_BONDED == transaction.mType )
+    {
+      succ = aggregates.Append( columnBuf ) && aggregates.mTransactions_offsets.size() == aggregates.mRows+1;
+    }
+
+    if( !succ )
+    {
+      printf("Error: Was not able to decode data into columns!\n");
+      return 1;
+    }
+#endif
+
+
+#ifdef CATBUFFER_GENERATED_JSON
+    // Transcode to JSON and back
+    std::string json;
+    TextWriter jsonOut( json );
+    RawBuffer jsonBuf( input.data(), input.size() );
+    succ = to_json_TransactionType( jsonBuf, jsonOut ) && !jsonBuf.RemainingSize();
+
+    std::vector<uint8_t> transcoded( input.size() );
+    JsonReader jsonIn( json.data(), json.size() );
+    RawBuffer transcodedBuf( transcoded.data(), transcoded.size() );
+    succ = succ && from_json_TransactionType( jsonIn, transcodedBuf ) && jsonIn.AtEnd() && !transcodedBuf.RemainingSize();
+
+    if( !succ || transcoded != input )
+    {
+      printf("Error: JSON round trip failed at offset %lu (%s) of:\n%s\n", jsonIn.GetOffset(), jsonIn.GetError().c_str(), json.c_str());
+      return 1;
+    }
+#endif
+
+
+#ifdef CATBUFFER_GENERATED_PARALLEL
+    // Decode an aggregate with 100 copies of its embedded transactions in parallel
+    if( TransactionType::AGGREGATE_BONDED == transaction.mType || TransactionType::AGGREGATE_COMPLETE == transaction.mType )
+    {
+      const uint8_t* begin       = input.data();
+      const uint8_t* body        = begin + Transaction::FIXED_PREFIX_SIZE;
+      const uint32_t payloadSize = AggregateTransactionBody::ReadPayload_size( body );
+      const uint8_t* embedded    = body + AggregateTransactionBody::FIXED_PREFIX_SIZE;
+
+      std::vector<uint8_t> large( begin, embedded );
+      for( size_t j=0; j<100; ++j )
+      {
+        large.insert( large.end(), embedded, embedded + payloadSize );
+      }
+      large.insert( large.end(), embedded + payloadSize, begin + input.size() );
+
+      const uint32_t largeSize        = large.size();
+      const uint32_t largePayloadSize = 100*payloadSize;
+      memcpy( &large[Transaction::OFFSET_SIZE], &largeSize, sizeof(uint32_t) );
+      memcpy( &large[Transaction::FIXED_PREFIX_SIZE + AggregateTransactionBody::OFFSET_PAYLOAD_SIZE], &largePayloadSize, sizeof(uint32_t) );
+
+      ParallelDecode::SetThreads( 4 );
+      ParallelDecode::SetMinBytes( 0 );
+      std::vector<uint8_t> largeOut;
+      RawBuffer largeBuf( large.data(), large.size() );
+      succ = cat->Deserialize( largeBuf ) && !largeBuf.RemainingSize() && cat->SerializeTo( largeOut );
+
+      // A truncated element must fail
+      RawBuffer truncatedLargeBuf( large.data(), large.size() - input.size() + (embedded - begin) + payloadSize/2 );
+      if( !succ || largeOut != large || ( payloadSize && cat->Deserialize( truncatedLargeBuf ) ) )
+      {
+        printf("Error: Parallel decoding of large aggregate failed!\n");
+        return 1;
+      }
+
+      RawBuffer restoreBuf( input.data(), input.size() );
+      if( !cat->Deserialize( restoreBuf ) )
+      {
+        printf("Error: Was not able to deserialize data after parallel decoding!\n");
+        return 1;
+      }
+    }
+#endif
+
+
     // compare results
     const bool testPassed = (output == input);
     printf("passed = %d\n", testPassed );
@@ -94,6 +371,112 @@ int main( int argc, char* argv[] )
 
   }
 
+  // all payloads serialized back to back
+  if( batch != expected )
+  {
+    printf("Error: Batch serialization does not match payloads!\n");
+    return 1;
+  }
+
+#ifdef CATBUFFER_GENERATED_JSON
+  // JSON which 'FromJson()' rejects, with an error message
+  const char* invalidJson[][2] =
+  {
+    { "{\"amount\":\"1\",\"mosaic_id\":\"2\"}",             "schema order" },
+    { "{\"mosaic_id\":\"2\",\"amount\":\"1\",\"extra\":0}", "not in the schema" },
+    { "{\"mosaic_\\u0069d\":\"2\",\"amount\":\"1\"}",       "escape sequences" },
+    { "{\"mosaic\\\"_id\":\"2\",\"amount\":\"1\"}",         "escape sequences" },
+    { "{\"mosaic_id\":\"2\"}",                              "missing member \"amount\"" },
+  };
+
+  for( const auto& invalid : invalidJson )
+  {
+    uint8_t mosaic[16];
+    JsonReader invalidIn( invalid[0], strlen( invalid[0] ) );
+    RawBuffer mosaicBuf( mosaic, sizeof(mosaic) );
+
+    if( MosaicJson::FromJson( invalidIn, mosaicBuf ) || std::string::npos == invalidIn.GetError().find( invalid[1] ) )
+    {
+      printf("Error: Invalid JSON %s was not rejected with \"%s\" (%s)\n", invalid[0], invalid[1], invalidIn.GetError().c_str());
+      return 1;
+    }
+  }
+
+  // Arrays which do not fit into their size field and invalid hex strings are rejected with an error, too
+  std::string manyMosaics = "[";
+  for( size_t i=0; i<255; ++i ){ manyMosaics += std::string( i ? "," : "" ) + "{\"mosaic_id\":\"1\",\"amount\":\"1\"}"; }
+  manyMosaics += "]";
+
+  const std::string recipient = "{\"recipient_address\":\"" + std::string( 48, '0' ) + "\"";
+  const std::string invalidBodies[][2] =
+  {
+    { recipient + ",\"mosaics\":[],\"message\":\"123\"}",                  "message: odd number of hex digits" },
+    { recipient + ",\"mosaics\":[],\"message\":\"XY\"}",                   "message: invalid hex string" },
+    { recipient + ",\"mosaics\":" + manyMosaics + ",\"message\":\"\"}",    "mosaics: 255 elements, too many for 'mosaics_count'" },
+  };
+
+  for( const auto& invalid : invalidBodies )
+  {
+    std::vector<uint8_t> body( 8192 );
+    JsonReader invalidIn( invalid[0].data(), invalid[0].size() );
+    RawBuffer bodyBuf( body.data(), body.size() );
+
+    if( TransferTransactionBodyJson::FromJson( invalidIn, bodyBuf ) || invalid[1] != invalidIn.GetError() )
+    {
+      printf("Error: Invalid JSON %.40s... was not rejected with \"%s\" (%s)\n", invalid[0].c_str(), invalid[1].c_str(), invalidIn.GetError().c_str());
+      return 1;
+    }
+  }
+#endif
+
+#ifdef CATBUFFER_GENERATED_PARALLEL
+  // An exception thrown on a worker thread is rethrown on the calling thread
+  const std::thread::id caller = std::this_thread::get_id();
+  std::atomic<bool>     thrown( false );
+  bool                  rethrown = false;
+
+  ParallelDecode::SetThreads( 4 );
+  try
+  {
+    ParallelDecode::For( 1000, [&]( size_t )
+    {
+      if( std::this_thread::get_id() != caller )
+      {
+        thrown = true;
+        throw std::runtime_error( "worker failed" );
+      }
+
+      // keep the calling thread busy until a worker threw
+      for( size_t j=0; j<1000 && !thrown; ++j ){ std::this_thread::sleep_for( std::chrono::milliseconds( 1 ) ); }
+      return true;
+    } );
+  }
+  catch( const std::runtime_error& error )
+  {
+    rethrown = 0 == strcmp( error.what(), "worker failed" );
+  }
+
+  if( !rethrown || !ParallelDecode::For( 1000, []( size_t ){ return true; } ) )
+  {
+    printf("Error: Exception of a parallel decoding worker was not rethrown!\n");
+    return 1;
+  }
+#endif
+
+#ifdef CATBUFFER_GENERATED_COLUMNS
+  if( 0 == transfers.mRows || transfers.mMessage.size() != messageBytes || transfers.mMessage_offsets.back() != messageBytes )
+  {
+    printf("Error: Columns do not match payloads!\n");
+    return 1;
+  }
+
+  printf("\nDecoded %lu transfers and %lu aggregates into columns\n", transfers.mRows, aggregates.mRows);
+#endif
+
+#ifdef CATBUFFER_ENABLE_HOOKS
+  CatbufferStats::Print();
+#endif
+
   printf("\nAll tests passed!\n\n");
   return 0;
 }
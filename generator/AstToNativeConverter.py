@@ -1,267 +1,335 @@
 import lark
-import sys
+import typing
 
 from catparser import ast
 
 
 
+class AstToNativeError( Exception ):
+    """
+    Raised by 'ast_to_native()' with all errors found in the type descriptors.
+    """
+
+    def __init__( self, errors: typing.List[str] ) -> None:
+        super().__init__( "\n".join( errors ) )
+        self.errors = errors
+
+
+
 def ast_to_native( type_descriptors ):
     """
-    Takes type descriptors directly from the catbuffer schema and converts 
+    Takes type descriptors directly from the catbuffer schema and converts
     it to input for the C++ generator. The output of this function
-    can be passed directly to 'convert()' in '__main__.py' to 
+    can be passed directly to 'convert()' in '__main__.py' to
     generate C++ code.
+
+    Raises AstToNativeError with all errors found, after converting all
+    type descriptors.
+    """
+
+    return AstToNativeConverter( type_descriptors ).convert()
+
+
+
+class AstToNativeConverter():
+    """
+    Converts catparser type descriptors to generator input. The descriptors
+    are sorted into enums, aliases and structs in a single pass, and every
+    descriptor is then converted once, with dicts and sets for all lookups
+    (enum values, struct fields, factory enum values), so the conversion
+    time grows linearly with the size of the schema.
+
+    Structs are converted in schema order, since a field with the type of
+    an abstract struct is only converted to an 'array_sized' field if the
+    abstract struct was declared before.
     """
 
-    print("\n\nConvert from AST to native generator format ----------------")
+    def __init__( self, type_descriptors ) -> None:
+        self.__enum_models   = []
+        self.__alias_models  = []
+        self.__struct_models = []
+        self.__errors        = []
+
+        for idx, model in enumerate( type_descriptors ):
+            if isinstance( model, ast.Enum ):
+                self.__enum_models.append( (idx, model) )
+            elif isinstance( model, ast.Alias ):
+                self.__alias_models.append( (idx, model) )
+            elif isinstance( model, ast.Struct ):
+                self.__struct_models.append( (idx, model) )
+            else:
+                self.__errors.append( f"Error: Unknown type '{type(model).__name__}' at index {idx}!" )
+
+        self.__aliases       = []
+        self.__structs       = []
+        self.__abstracts     = set()
+        self.__enums         = {}
+        self.__enum_to_type  = {}  # stores the types of enums (uint16, unit32, etc)
+        self.__enum_values   = {}  # enum name -> value name -> value
+        self.__factory_enums = {}
+        self.__factory_names = {}  # factory enum name -> set of its value names
 
-    aliases       = list()
-    structs       = list()
-    abstracts     = set()
-    enums         = dict()  
-    factory_enums = dict()  
-    enum_to_type  = dict()  # stores the types of enums (uint16, unit32, etc)
 
 
-    # Enum conversion -----------------------------------------------
-    print("\n  - Convert enums types:")
-    for idx, model in enumerate( type_descriptors ):
+    def convert( self ) -> list:
 
-        if isinstance( model, ast.Enum ):
+        print("\n\nConvert from AST to native generator format ----------------")
+
+        print("\n  - Convert enums types:")
+        for idx, model in self.__enum_models:
             print( "\t"+str(idx)+": "+str(type(model))+" -> "+model.name )
+            self.__convert_enum( model )
 
-            # enum header
-            enum         = dict()
-            enum["name"] = model.name
-            enum["type"] = "enum " + model.base.short_name.value
-            values       = list()
+        print("\n  - Convert alias types:")
+        for idx, model in self.__alias_models:
+            print( "\t"+str(idx)+": "+str(type(model))+" -> "+model.name )
+            self.__convert_alias( model )
 
-            if model.comment:
-                enum["comment"] = model.comment.parsed
+        print("\n  - Convert struct types:")
+        for idx, model in self.__struct_models:
+            print( "\t"+str(idx) + ": " + str(type(model)) + " -> " + model.name )
+            self.__convert_struct( model )
 
-            # store type for later use
-            enum_to_type[model.name] = model.base.short_name.value
+        if self.__errors:
+            raise AstToNativeError( self.__errors )
 
-            # save enum values
-            for value in model.values:
-                tmp = dict()
-                tmp["name"]  = value.name
-                tmp["value"] = value.value
-                if value.comment:
-                    tmp["comment"] = value.comment.parsed
+        for key, value in self.__factory_enums.items():
+            self.__enums[key] = value
 
-                values.append(tmp)
+        print("\n\tConversion done!\n\n")
 
-            enum["values"] = values
+        return self.__aliases + list(self.__enums.values()) + self.__structs
 
-            enums[model.name] = enum
 
 
-    # Alias conversion -----------------------------------------------
-    print("\n  - Convert alias types:")
-    for idx, model in enumerate(type_descriptors):
+    def __convert_enum( self, model ) -> None:
 
-        if isinstance(model, ast.Alias ):
-            print( "\t"+str(idx)+": "+str(type(model))+" -> "+model.name )
+        # enum header
+        enum         = dict()
+        enum["name"] = model.name
+        enum["type"] = "enum " + model.base.short_name.value
+        values       = list()
 
-            if( isinstance(model.linked_type, ast.FixedSizeBuffer) ):
-                alias = { "name": model.name, 
-                          "size": model.linked_type.size, 
-                          "type": "alias " + "array uint8" }
+        if model.comment:
+            enum["comment"] = model.comment.parsed
 
-            elif( isinstance(model.linked_type, ast.FixedSizeInteger) ):
-                alias = { "name": model.name, 
-                          "type": f"alias {model.linked_type.short_name}" }
+        # store type and values for later use
+        self.__enum_to_type[model.name] = model.base.short_name.value
+        self.__enum_values[model.name]  = {}
 
-            else:
-                print( "Error: Unknown alias linked_type in AST model!" )
-                exit(1)
+        # save enum values
+        for value in model.values:
+            tmp = dict()
+            tmp["name"]  = value.name
+            tmp["value"] = value.value
+            if value.comment:
+                tmp["comment"] = value.comment.parsed
 
-            aliases.append(alias)
+            values.append(tmp)
+            self.__enum_values[model.name].setdefault( value.name, value.value ) # first value wins, as in a linear search
 
+        enum["values"] = values
 
-    # Struct conversion -----------------------------------------------
-    print("\n  - Convert struct types:")
-    for idx, model in enumerate(type_descriptors):
+        self.__enums[model.name] = enum
 
-        if isinstance(model, ast.Struct):
-            print( "\t"+str(idx) + ": " + str(type(model)) + " -> " + model.name )
 
-            layout = []
-            sizeof = dict()
 
-            for idx, field in enumerate(model.fields):
+    def __convert_alias( self, model ) -> None:
 
-                if( field.name == "TRANSACTION_VERSION" or field.name == "TRANSACTION_TYPE" ):
-                    continue
+        if( isinstance(model.linked_type, ast.FixedSizeBuffer) ):
+            alias = { "name": model.name,
+                      "size": model.linked_type.size,
+                      "type": "alias " + "array uint8" }
 
-                tmp = dict()
-                tmp["name"] = field.name
-                if field.comment:
-                    tmp["comment"] = field.comment.parsed
+        elif( isinstance(model.linked_type, ast.FixedSizeInteger) ):
+            alias = { "name": model.name,
+                      "type": f"alias {model.linked_type.short_name}" }
 
-                # builtin field type ---------------------------------------------------------
-                if isinstance(field.field_type, ast.FixedSizeInteger):
-                   
-                    if field.disposition == None:
-                        disposition = ""
-                    elif field.disposition in ["const", "reserved"]:
-                        disposition  = field.disposition
-                        tmp["value"] = field.value
-                    elif field.disposition == "sizeof":
-                        disposition  = ""
-                        sizeof[field.value] = field.name
-                    else:
-                        print(f"Error: Disposition '{field.disposition}' unknown for field '{field.name}' in AST model!")
-                        exit(1)
+        else:
+            self.__errors.append( f"Error: Unknown alias linked_type in AST model for alias '{model.name}'!" )
+            return
 
-                    tmp["type"] = f'{disposition} {field.field_type.short_name.value}'
+        self.__aliases.append(alias)
 
 
-                # user defined field type ----------------------------------------------------
-                elif isinstance(field.field_type, lark.Token):
 
-                    if field.field_type.type == "USER_TYPE_NAME":
+    def __convert_struct( self, model ) -> None:
 
-                        if field.field_type.value in abstracts:
-                            tmp["size"]                 = sizeof[field.name]
-                            tmp["type"]                 = f"array_sized {field.field_type.value}"
-                            tmp["header_type_field"]    = "type"      #TODO: hard coded
-                            tmp["header_version_field"] = "version"
-                        else:
-                            tmp["type"] = field.field_type.value
+        layout = []
+        sizeof = dict()
 
-                    else:
-                        print(f'Error: Unknown field type {field.field_type.type} in AST model for field {field.name}')
-                        exit(1)
+        for idx, field in enumerate(model.fields):
 
+            if( field.name == "TRANSACTION_VERSION" or field.name == "TRANSACTION_TYPE" ):
+                continue
 
-                # array field type ----------------------------------------------------
-                elif isinstance(field.field_type, ast.Array):
+            tmp = self.__convert_field( model, idx, field, sizeof )
+            if tmp is not None:
+                layout.append(tmp)
 
-                        if(field.field_type.disposition == "array fill"):
-                            tmp["type"] = f'array_fill {field.field_type.element_type}'
 
-                        elif(field.field_type.disposition == "array"):
-                            tmp["type"] = f'array {field.field_type.element_type}'
-                            tmp["size"] = field.field_type.size
+        # if struct is not abstract, set its type and version
+        if model.disposition != "abstract" and model.discriminator:
+            discriminator = self.__convert_discriminator( model )
+            if discriminator is not None:
+                layout.append(discriminator)
 
-                        elif(field.field_type.disposition == "array sized"):
-                            tmp["type"]                 = f'array_sized {field.field_type.element_type}'
-                            tmp["size"]                 = field.field_type.size
-                            tmp["header_type_field"]    = "type"    # model.discriminator[0]
-                            tmp["header_version_field"] = "version"
 
-                            if field.field_type.alignment:
-                                tmp["align"] = field.field_type.alignment
+        if model.disposition == "abstract":
+            self.__abstracts.add(model.name)
+            for field in layout:
+                if field["name"] == "type":
+                    field["type"] = model.name+"Group"
 
-                        else:
-                            print( f'Error: Unknown array field {field.field_type.disposition} for field {field.name}' )
-                            exit(1)
 
-                else:
-                    print( f'Error: Unknown struct field:\n{idx}: {field}' )
-                    exit(1)
+        # create struct and save
+        struct = dict()
+        struct["name"]   = model.name
+        struct["type"]   = "struct"
+        struct["layout"] = layout
 
+        if model.comment:
+            struct["comment"] = model.comment.parsed
 
-                # add conditional
-                if isinstance(field.value, ast.Conditional) and field.value.operation != "in":
-                    tmp["condition"]           = field.value.linked_field_name
-                    tmp["condition_operation"] = field.value.operation
-                    tmp["condition_value"]     = field.value.value
+        self.__structs.append(struct)
 
 
-                layout.append(tmp)
 
+    def __convert_field( self, model, idx: int, field, sizeof: dict ) -> typing.Optional[dict]:
 
-            # if struct is not abstract, set its type and version
-            if model.disposition != "abstract" and model.discriminator:
-
-                discriminator = dict()
-
-                for init in model.initializers:
-                    if init.target_property_name == "type":                        
-                        for field in model.fields: # find variable in fields which gives struct its type
-                            if field.name == init.value:
-                                discriminator_enum          = field.field_type.value
-                                discriminator["type"]       = f'struct_type {model.factory_type+"Group"}'
-                                discriminator["value"]      = field.value
-                                discriminator["type_field"] = "type"
-                                discriminator["header"]     = model.factory_type
-                                
-                    elif init.target_property_name == "version": # find variable in fields which gives struct its version
-                        for field in model.fields:
-                            if field.name == init.value:
-                                struct_version = field.value
-                                discriminator["version_field"] = "version"
-
-                if "value" in discriminator:
-                    discriminator["value"] = discriminator["value"] + f' @{struct_version}'
-
-                    # create a new internal enum (if not created yet)
-                    if model.factory_type+"Group" not in factory_enums:
-                        fac_enum = {}
-                        fac_enum["name"]   = model.factory_type+"Group"
-                        fac_enum["type"]   = "enum " + enum_to_type[discriminator_enum]
-                        fac_enum["values"] = []
-                        factory_enums[ model.factory_type+"Group" ] = fac_enum
-
-                    tmp_enum = dict()
-                    tmp_enum["name"] = discriminator["value"].split()[0]
-
-                    for enum in enums[discriminator_enum]["values"]:
-                        if enum["name"] == tmp_enum["name"]:
-                            tmp_enum["value"] = enum["value"]
-
-
-                    # check that enum was not added before (this can happen if there are more than one version of a struct)
-                    unique = True
-                    for enum in factory_enums[ model.factory_type+"Group" ]["values"]:
-                        if enum["name"] == tmp_enum["name"]:
-                            unique = False
-                            break
-
-                    # add enum if unique
-                    if unique:
-                        factory_enums[ model.factory_type+"Group" ]["values"].append(tmp_enum)
-
-                else:
-                    print(f'ERROR: Did not find type or version field for struct "{model.name}"!')
-                    exit(1)
+        tmp = dict()
+        tmp["name"] = field.name
+        if field.comment:
+            tmp["comment"] = field.comment.parsed
 
-                layout.append(discriminator)
+        # builtin field type ---------------------------------------------------------
+        if isinstance(field.field_type, ast.FixedSizeInteger):
 
-            
-            if model.disposition == "abstract":
-                abstracts.add(model.name)
-                for field in layout:
-                    if field["name"] == "type":
-                        field["type"] = model.name+"Group"
+            if field.disposition == None:
+                disposition = ""
+            elif field.disposition in ["const", "reserved"]:
+                disposition  = field.disposition
+                tmp["value"] = field.value
+            elif field.disposition == "sizeof":
+                disposition  = ""
+                sizeof[field.value] = field.name
+            else:
+                self.__errors.append( f"Error: Disposition '{field.disposition}' unknown for field '{field.name}' in struct '{model.name}'!" )
+                return None
+
+            tmp["type"] = f'{disposition} {field.field_type.short_name.value}'
+
+
+        # user defined field type ----------------------------------------------------
+        elif isinstance(field.field_type, lark.Token):
 
+            if field.field_type.type != "USER_TYPE_NAME":
+                self.__errors.append( f"Error: Unknown field type {field.field_type.type} in AST model for field '{field.name}' in struct '{model.name}'!" )
+                return None
+
+            if field.field_type.value in self.__abstracts:
+                if field.name not in sizeof:
+                    self.__errors.append( f"Error: No sizeof field for field '{field.name}' in struct '{model.name}'!" )
+                    return None
+
+                tmp["size"]                 = sizeof[field.name]
+                tmp["type"]                 = f"array_sized {field.field_type.value}"
+                tmp["header_type_field"]    = "type"      #TODO: hard coded
+                tmp["header_version_field"] = "version"
+            else:
+                tmp["type"] = field.field_type.value
 
-            # create struct and save
-            struct = dict()
-            struct["name"]   = model.name
-            struct["type"]   = "struct"
-            struct["layout"] = layout
-            
-            if model.comment:
-                struct["comment"] = model.comment.parsed
 
-            structs.append(struct)
+        # array field type ----------------------------------------------------
+        elif isinstance(field.field_type, ast.Array):
 
+            if(field.field_type.disposition == "array fill"):
+                tmp["type"] = f'array_fill {field.field_type.element_type}'
+
+            elif(field.field_type.disposition == "array"):
+                tmp["type"] = f'array {field.field_type.element_type}'
+                tmp["size"] = field.field_type.size
+
+            elif(field.field_type.disposition == "array sized"):
+                tmp["type"]                 = f'array_sized {field.field_type.element_type}'
+                tmp["size"]                 = field.field_type.size
+                tmp["header_type_field"]    = "type"    # model.discriminator[0]
+                tmp["header_version_field"] = "version"
+
+                if field.field_type.alignment:
+                    tmp["align"] = field.field_type.alignment
+
+            else:
+                self.__errors.append( f"Error: Unknown array field {field.field_type.disposition} for field '{field.name}' in struct '{model.name}'!" )
+                return None
 
-        elif isinstance( model, ast.Enum ) or isinstance(model, ast.Alias ):
-            continue
         else:
-            print( "Error: Unknown type" )
-            exit(1)
+            self.__errors.append( f"Error: Unknown struct field in struct '{model.name}':\n{idx}: {field}" )
+            return None
+
+
+        # add conditional
+        if isinstance(field.value, ast.Conditional) and field.value.operation != "in":
+            tmp["condition"]           = field.value.linked_field_name
+            tmp["condition_operation"] = field.value.operation
+            tmp["condition_value"]     = field.value.value
+
+        return tmp
+
+
+
+    def __convert_discriminator( self, model ) -> typing.Optional[dict]:
+        """
+        Returns the 'struct_type' field of a struct, which gives the struct
+        its type and version in the factory enum '{factory_type}Group'.
+        """
+
+        discriminator      = dict()
+        discriminator_enum = None
+        struct_version     = None
+        fields             = { field.name: field for field in model.fields } # last field wins, as in a linear search
+
+        for init in model.initializers:
+            field = fields.get( init.value )
+            if field is None:
+                continue
+
+            if init.target_property_name == "type": # find variable in fields which gives struct its type
+                discriminator_enum          = field.field_type.value
+                discriminator["type"]       = f'struct_type {model.factory_type+"Group"}'
+                discriminator["value"]      = field.value
+                discriminator["type_field"] = "type"
+                discriminator["header"]     = model.factory_type
+
+            elif init.target_property_name == "version": # find variable in fields which gives struct its version
+                struct_version                 = field.value
+                discriminator["version_field"] = "version"
+
+        if "value" not in discriminator or struct_version is None:
+            self.__errors.append( f'Error: Did not find type or version field for struct "{model.name}"!' )
+            return None
+
+        if discriminator_enum not in self.__enum_to_type:
+            self.__errors.append( f'Error: Type enum "{discriminator_enum}" of struct "{model.name}" not declared!' )
+            return None
+
+        discriminator["value"] = discriminator["value"] + f' @{struct_version}'
+
+        # create a new internal enum (if not created yet)
+        factory_name = model.factory_type+"Group"
+        if factory_name not in self.__factory_enums:
+            self.__factory_enums[factory_name] = { "name": factory_name, "type": "enum " + self.__enum_to_type[discriminator_enum], "values": [] }
+            self.__factory_names[factory_name] = set()
 
-    for key, value in factory_enums.items():
-        enums[key] = value
+        value_name = discriminator["value"].split()[0]
 
+        # add enum value, unless it was added before (this can happen if there are more than one version of a struct)
+        if value_name not in self.__factory_names[factory_name]:
+            tmp_enum = { "name": value_name }
+            if value_name in self.__enum_values[discriminator_enum]:
+                tmp_enum["value"] = self.__enum_values[discriminator_enum][value_name]
 
-    print("\n\tConversion done!\n\n")
+            self.__factory_enums[factory_name]["values"].append(tmp_enum)
+            self.__factory_names[factory_name].add(value_name)
 
-    return (aliases + list(enums.values()) + structs)
-    
+        return discriminator
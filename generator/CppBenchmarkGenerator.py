@@ -0,0 +1,377 @@
+import typing
+
+from .CppClassDeclarationGenerator import CppClassDeclarationGenerator
+from .CppFieldGenerator import CppFieldGenerator
+
+
+
+class CppBenchmarkGenerator():
+    """
+    Generates a self-contained C++ benchmark executable ('benchmark.cpp'),
+    which reads payloads from a file and measures the time per operation
+    and throughput of 'create_type_{group}()', 'Deserialize()',
+    'Serialize()' and 'Size()' for each struct and group found in the file.
+    With 'generate_json', the JSON transcoders ('to_json_{group}()' and
+    'from_json_{group}()', see 'CppJsonGenerator') are measured as well,
+    after checking that each payload is transcoded to JSON and back to the
+    same bytes.
+
+    The payload file can either be a YAML test vector file (lines containing
+    'payload: <hex>') or a file with a single hex encoded payload per line.
+    The class group of each payload is detected by deserializing the group
+    header, in the same way as the 'create_type_{group}( RawBuffer& )'
+    converters do. The results are printed in JSON format:
+
+        ----------------------------------------------------------------------------------------
+        ./benchmark ../test_vectors/symbol_transactions.yml > results.json
+        ----------------------------------------------------------------------------------------
+    """
+
+    def __init__( self,
+                  class_decls:                         typing.Dict[str, CppClassDeclarationGenerator],
+                  type_to_versions_to_enum_to_classes: typing.Dict[str, typing.Dict[str, typing.Dict[str, str]]],
+                  generate_json:                       bool = False ) -> None:
+
+        self.__includes      = [ '#include "converters.h"' ]
+        self.__code_output   = ""
+        self.__groups        = []
+        self.__generate_json = generate_json
+
+        if generate_json:
+            self.__includes.append( '#include "json.h"' )
+
+        for group_name, versions_to_enum_to_classes in type_to_versions_to_enum_to_classes.items():
+            if not versions_to_enum_to_classes:
+                continue
+
+            self.__groups.append( group_name )
+            self.__generate_group( group_name, versions_to_enum_to_classes, class_decls )
+
+
+
+    def write_file( self, file_path: str ) -> None:
+        f = open( file_path, "w" )
+        if self.__generate_json:
+            f.write( "#define CATBUFFER_BENCHMARK_JSON\n" )
+        f.write( "\n".join( sorted(set(self.__includes)) ) + "\n" )
+        f.write( benchmark_code_header )
+        f.write( self.__code_output )
+        f.write( self.__generate_detect() )
+        f.write( benchmark_code_main )
+        f.close()
+
+
+
+    def __generate_group( self, group_name: str, versions_to_enum_to_classes: dict, class_decls: dict ) -> None:
+        """
+        Generates a function which returns the class name of a group member,
+        and a function which detects if a payload belongs to the group.
+        """
+
+        first_class   = list( list(versions_to_enum_to_classes.values())[0].values() )[0]
+        decl          = class_decls[first_class]
+        header_class  = decl.group_header
+        type_field    = "header." + CppFieldGenerator.convert_to_field_name( decl.header_type_field )
+        version_field = "header." + CppFieldGenerator.convert_to_field_name( decl.header_version_field ) if decl.header_version_field else "1"
+
+        self.__includes.append( f'#include "{header_class}.h"' )
+
+        self.__code_output += f'static const char* name_{group_name}( {group_name} type, size_t version )\n{{\n'
+        for version, enum_to_classes in versions_to_enum_to_classes.items():
+            for enum_type, class_name in enum_to_classes.items():
+                self.__code_output += f'\tif( {version} == version && {group_name}::{enum_type} == type ){{ return "{class_name}"; }}\n'
+        self.__code_output += '\treturn "unknown";\n}\n\n\n'
+
+        self.__code_output += f'static bool detect_{group_name}( Sample& sample )\n{{\n'
+        self.__code_output += f'\t// Get header\n'
+        self.__code_output += f'\tRawBuffer headerBuf( sample.data.data(), sample.data.size() );\n'
+        self.__code_output += f'\t{header_class} header;\n'
+        self.__code_output += f'\tif( !header.Deserialize( headerBuf ) ){{ return false; }}\n\n'
+        self.__code_output += f'\tconst {group_name} type = {type_field};\n'
+        self.__code_output += f'\tconst size_t version = {version_field};\n\n'
+        self.__code_output += f'\t// Payload belongs to group if all of it can be deserialized\n'
+        self.__code_output += f'\tstd::unique_ptr<ICatbuffer> cat = create_type_{group_name}( type, version );\n'
+        self.__code_output += f'\tif( nullptr == cat ){{ return false; }}\n\n'
+        self.__code_output += f'\tRawBuffer buffer( sample.data.data(), sample.data.size() );\n'
+        self.__code_output += f'\tif( !cat->Deserialize( buffer ) || buffer.RemainingSize() ){{ return false; }}\n\n'
+        self.__code_output += f'\tsample.group  = "{group_name}";\n'
+        self.__code_output += f'\tsample.name   = name_{group_name}( type, version );\n'
+        self.__code_output += f'\tsample.create = [type, version](){{ return create_type_{group_name}( type, version ); }};\n'
+        if self.__generate_json:
+            self.__code_output += f'\tsample.to_json   = &to_json_{group_name};\n'
+            self.__code_output += f'\tsample.from_json = &from_json_{group_name};\n'
+        self.__code_output += f'\treturn true;\n}}\n\n\n'
+
+
+
+    def __generate_detect( self ) -> str:
+        output  = 'static bool detect( Sample& sample )\n{\n'
+        if not self.__groups:
+            output += '\t(void) sample; // no struct groups, e.g. when generating with \'--roots\'\n'
+
+        for group_name in self.__groups:
+            output += f'\tif( detect_{group_name}( sample ) ){{ return true; }}\n'
+        output += '\treturn false;\n}\n\n\n'
+        return output
+
+
+
+benchmark_code_header = """
+#include <cctype>
+#include <chrono>
+#include <cstdio>
+#include <cstdlib>
+#include <fstream>
+#include <functional>
+#include <map>
+#include <memory>
+#include <string>
+#include <vector>
+
+
+
+struct Sample
+{
+  std::string                                  group;  ///< Name of class group of payload
+  std::string                                  name;   ///< Name of class of payload
+  std::vector<uint8_t>                         data;   ///< Payload
+  std::function<std::unique_ptr<ICatbuffer>()> create; ///< Creates an instance of the payload class
+#ifdef CATBUFFER_BENCHMARK_JSON
+  bool (*to_json)( RawBuffer&, TextWriter& );          ///< Transcodes the payload to JSON
+  bool (*from_json)( JsonReader&, RawBuffer& );        ///< Transcodes JSON to the payload
+#endif
+};
+
+
+#ifdef CATBUFFER_BENCHMARK_JSON
+static const char*   OPERATIONS[]   = { "create_type", "Deserialize", "Serialize", "Size", "ToJson", "FromJson" };
+#else
+static const char*   OPERATIONS[]   = { "create_type", "Deserialize", "Serialize", "Size" };
+#endif
+static const size_t  NUM_OPERATIONS = sizeof(OPERATIONS)/sizeof(OPERATIONS[0]);
+static volatile size_t sink;  ///< Results of benchmarked calls, to prevent them from being optimized away
+
+
+struct Stats
+{
+  Stats() : samples(0), bytes(0) { for( size_t i=0; i<NUM_OPERATIONS; ++i ){ ns[i] = 0; } }
+
+  size_t samples;             ///< Number of payloads
+  size_t bytes;               ///< Total bytes of payloads
+  double ns[NUM_OPERATIONS];  ///< Total nanoseconds per operation of payloads
+};
+
+
+
+/**
+ * Calls 'func' in batches of increasing size, until a batch takes at least
+ * 'min_time_ns' nanoseconds, and returns the time per call.
+ */
+template<typename Func>
+static double measure_ns( Func func, const double min_time_ns )
+{
+  for( size_t iterations = 1; ; iterations *= 2 )
+  {
+    const std::chrono::steady_clock::time_point start = std::chrono::steady_clock::now();
+
+    for( size_t i=0; i<iterations; ++i )
+    {
+      func();
+    }
+
+    const double elapsed = std::chrono::duration<double, std::nano>( std::chrono::steady_clock::now() - start ).count();
+    if( elapsed >= min_time_ns )
+    {
+      return elapsed / iterations;
+    }
+  }
+}
+
+
+static bool is_hex( const std::string& str )
+{
+  if( str.empty() || str.size() % 2 )
+  {
+    return false;
+  }
+
+  for( const char c : str )
+  {
+    if( !isxdigit( (unsigned char) c ) ){ return false; }
+  }
+
+  return true;
+}
+
+
+static std::string trim( const std::string& str )
+{
+  const size_t start = str.find_first_not_of( " \\t\\r\\n\\"'-" );
+  const size_t end   = str.find_last_not_of( " \\t\\r\\n\\"'" );
+  return ( std::string::npos == start ) ? "" : str.substr( start, end-start+1 );
+}
+
+
+/**
+ * Reads hex encoded payloads from a file, either from YAML 'payload:' keys or
+ * from lines only containing hex characters.
+ */
+static std::vector<std::vector<uint8_t>> read_payloads( const char* file_name )
+{
+  std::vector<std::vector<uint8_t>> payloads;
+  std::ifstream file( file_name );
+  std::string line;
+
+  while( std::getline( file, line ) )
+  {
+    line = trim( line );
+
+    const size_t key = line.find( "payload:" );
+    if( std::string::npos != key )
+    {
+      line = trim( line.substr( key + 8 ) );
+    }
+
+    if( !is_hex( line ) )
+    {
+      continue;
+    }
+
+    std::vector<uint8_t> payload;
+    for( size_t i=0; i<line.size(); i+=2 )
+    {
+      payload.push_back( (uint8_t) strtol( line.substr(i, 2).c_str(), NULL, 16 ) );
+    }
+
+    payloads.push_back( payload );
+  }
+
+  return payloads;
+}
+
+
+static void print_stats( const std::map<std::string, Stats>& stats, const char* kind, bool& first )
+{
+  for( const std::pair<const std::string, Stats>& elem : stats )
+  {
+    const Stats& s = elem.second;
+
+    for( size_t i=0; i<NUM_OPERATIONS; ++i )
+    {
+      const double ns_per_op     = s.ns[i] / s.samples;
+      const double bytes_per_sec = s.bytes / s.ns[i] * 1e9;
+
+      printf( "%s\\n    { \\"name\\": \\"%s\\", \\"kind\\": \\"%s\\", \\"operation\\": \\"%s\\", \\"payloads\\": %lu, \\"avg_bytes\\": %.1f, \\"ns_per_op\\": %.2f, \\"bytes_per_sec\\": %.0f }",
+              first ? "" : ",", elem.first.c_str(), kind, OPERATIONS[i], s.samples, (double) s.bytes / s.samples, ns_per_op, bytes_per_sec );
+
+      first = false;
+    }
+  }
+}
+
+
+
+"""
+
+
+
+benchmark_code_main = """int main( int argc, char* argv[] )
+{
+  if( argc < 2 )
+  {
+    fprintf( stderr, "Usage: %s <payload file> [min time per measurement in ms]\\n", argv[0] );
+    return 1;
+  }
+
+  const double min_time_ns = ( argc > 2 ? atof( argv[2] ) : 50.0 ) * 1e6;
+
+
+  // Read and detect payloads
+  std::vector<Sample> samples;
+  for( std::vector<uint8_t>& payload : read_payloads( argv[1] ) )
+  {
+    Sample sample;
+    sample.data = payload;
+
+    if( !detect( sample ) )
+    {
+      fprintf( stderr, "Warning: Skipping payload of %lu bytes, which does not belong to any group\\n", payload.size() );
+      continue;
+    }
+
+    samples.push_back( sample );
+  }
+
+  if( samples.empty() )
+  {
+    fprintf( stderr, "Error: No payloads found in '%s'!\\n", argv[1] );
+    return 1;
+  }
+
+
+  // Measure each operation for each payload
+  std::map<std::string, Stats> struct_stats;
+  std::map<std::string, Stats> group_stats;
+
+  for( size_t idx=0; idx<samples.size(); ++idx )
+  {
+    Sample& sample = samples[idx];
+    fprintf( stderr, "Benchmarking payload %lu/%lu (%s)\\n", idx+1, samples.size(), sample.name.c_str() );
+
+    std::unique_ptr<ICatbuffer> cat = sample.create();
+    std::vector<uint8_t> output( sample.data.size() );
+    double ns[NUM_OPERATIONS];
+
+    ns[0] = measure_ns( [&](){ sink += ( nullptr != sample.create() ); }, min_time_ns );
+    ns[1] = measure_ns( [&](){ RawBuffer buf( sample.data.data(), sample.data.size() ); sink += cat->Deserialize( buf ); }, min_time_ns );
+    ns[2] = measure_ns( [&](){ RawBuffer buf( output.data(), output.size() ); sink += cat->Serialize( buf ); }, min_time_ns );
+    ns[3] = measure_ns( [&](){ sink += cat->Size(); }, min_time_ns );
+
+#ifdef CATBUFFER_BENCHMARK_JSON
+    // Transcode the payload to JSON and back, which must give the payload again
+    std::string json;
+    {
+      RawBuffer  buf( sample.data.data(), sample.data.size() );
+      TextWriter out( json );
+      if( !sample.to_json( buf, out ) )
+      {
+        fprintf( stderr, "Error: Payload %lu (%s) can not be transcoded to JSON!\\n", idx+1, sample.name.c_str() );
+        return 1;
+      }
+
+      JsonReader in( json.data(), json.size() );
+      RawBuffer  back( output.data(), output.size() );
+      if( !sample.from_json( in, back ) || !in.AtEnd() || back.RemainingSize() || output != sample.data )
+      {
+        fprintf( stderr, "Error: JSON of payload %lu (%s) is not transcoded back to the payload at offset %lu!\\n", idx+1, sample.name.c_str(), in.GetOffset() );
+        return 1;
+      }
+    }
+
+    std::string text;
+    text.reserve( json.size() );
+
+    ns[4] = measure_ns( [&](){ text.clear(); TextWriter out( text ); RawBuffer buf( sample.data.data(), sample.data.size() ); sink += sample.to_json( buf, out ); }, min_time_ns );
+    ns[5] = measure_ns( [&](){ JsonReader in( json.data(), json.size() ); RawBuffer buf( output.data(), output.size() ); sink += sample.from_json( in, buf ); }, min_time_ns );
+#endif
+
+    Stats* stats[] = { &struct_stats[sample.name], &group_stats[sample.group] };
+    for( Stats* s : stats )
+    {
+      s->samples += 1;
+      s->bytes   += sample.data.size();
+      for( size_t i=0; i<NUM_OPERATIONS; ++i ){ s->ns[i] += ns[i]; }
+    }
+  }
+
+
+  // Print results
+  bool first = true;
+  printf( "{\\n  \\"payload_file\\": \\"%s\\",\\n  \\"min_time_ms\\": %.1f,\\n  \\"results\\": [", argv[1], min_time_ns / 1e6 );
+  print_stats( struct_stats, "struct", first );
+  print_stats( group_stats,  "group",  first );
+  printf( "\\n  ]\\n}\\n" );
+
+  return 0;
+}
+"""
@@ -0,0 +1,793 @@
+import typing
+
+from .CppClassDeclarationGenerator import CppClassDeclarationGenerator
+from .CppFieldGenerator import CppFieldGenerator
+from .CppFieldOffsetGenerator import CppFieldOffsetGenerator
+from .CppTypesGenerator import CppTypesGenerator
+from .TypeLayoutAnalyzer import TypeLayoutAnalyzer
+
+
+
+class CppCApiGenerator():
+    """
+    Generates an 'extern "C"' API for the generated library in
+    'capi/catbuffer_c.h' and 'capi/catbuffer_c.cpp', which is built into
+    the shared library 'libcatbuffer_c', and a Python module which loads it
+    with 'ctypes' ('python/catbuffer_ffi.py').
+
+    All functions work on memory owned by the caller and return a
+    'catbuffer_status'. For each struct group (e.g. 'TransactionType'),
+    functions are generated which validate or decode serialized buffers,
+    one at a time or a batch of buffers in one call, reading the type and
+    version from the group header. A batch is one contiguous buffer with the
+    serialized structs back to back, and the size of each struct:
+
+        ----------------------------------------------------------------------------------------
+        int catbuffer_TransactionType_create        ( catbuffer_object* object, uint32_t type, uint32_t version );
+        int catbuffer_TransactionType_decode        ( catbuffer_object* object, const uint8_t* data, size_t size, size_t* consumed );
+        int catbuffer_TransactionType_validate      ( const uint8_t* data, size_t size, size_t* consumed );
+        int catbuffer_TransactionType_validate_batch( const uint8_t* data, const size_t* sizes, size_t count, uint32_t* types, uint32_t* versions, size_t* done );
+        int catbuffer_TransactionType_decode_batch  ( const uint8_t* data, const size_t* sizes, size_t count, catbuffer_object* const* objects, size_t* done );
+        ----------------------------------------------------------------------------------------
+
+    A 'catbuffer_object' holds a decoded instance, which can be serialized
+    into a buffer of the caller. For the fields in the fixed size prefix of
+    each struct (see 'CppFieldOffsetGenerator'), a table with their offsets,
+    sizes and kinds is generated, so that callers can read fields directly
+    from serialized buffers ('catbuffer_find_struct()', 'catbuffer_get_uint()').
+
+    The Python module passes 'bytes', 'bytearray', 'memoryview' and other
+    contiguous buffers to the library with the buffer protocol, so they are
+    not copied.
+    """
+
+    def __init__( self,
+                  input_data:                          list,
+                  class_decls:                         typing.Dict[str, CppClassDeclarationGenerator],
+                  types:                               CppTypesGenerator,
+                  layouts:                             TypeLayoutAnalyzer,
+                  type_to_versions_to_enum_to_classes: typing.Dict[str, typing.Dict[str, typing.Dict[str, str]]] ) -> None:
+
+        self.__class_decls   = class_decls
+        self.__name_to_enum  = types.name_to_enum
+        self.__name_to_alias = types.name_to_alias
+        self.__groups        = { group: versions for group, versions in type_to_versions_to_enum_to_classes.items() if versions }
+        self.__enum_values   = { elem["name"]: elem["values"] for elem in input_data if "enum" == elem["type"].split()[0] }
+
+        self.__includes      : typing.Set[str] = { '#include "../converters.h"' }
+        self.__declaration_code_output = ""
+        self.__definition_code_output  = ""
+        self.__python_code_output      = ""
+
+        for group_name, versions_to_enum_to_classes in self.__groups.items():
+            self.__generate_group( group_name, versions_to_enum_to_classes )
+
+        self.__generate_struct_tables( CppFieldOffsetGenerator( layouts, class_decls ) )
+
+
+
+    def write_files( self, folder: str ) -> None:
+        """
+        Writes 'catbuffer_c.h' and 'catbuffer_c.cpp' to 'folder'.
+        """
+
+        f = open( folder+"/catbuffer_c.h", "w" )
+        f.write( c_api_header_start )
+        f.write( self.__declaration_code_output )
+        f.write( c_api_header_end )
+        f.close()
+
+        f = open( folder+"/catbuffer_c.cpp", "w" )
+        f.write( "\n".join( [ "#include <cstring>", "#include <new>" ] + sorted( self.__includes ) + [ '#include "catbuffer_c.h"' ] ) + "\n" )
+        f.write( c_api_source_start )
+        f.write( self.__definition_code_output )
+        f.close()
+
+
+
+    def write_loader_file( self, file_path: str ) -> None:
+        """
+        Writes the Python module which loads the shared library with 'ctypes'.
+        """
+
+        f = open( file_path, "w" )
+        f.write( python_loader_start )
+        f.write( self.__python_code_output )
+        f.write( f'\n\nGROUPS = [ {", ".join( self.__groups )} ]\n' )
+        f.close()
+
+
+
+    def __generate_group( self, group_name: str, versions_to_enum_to_classes: dict ) -> None:
+        first_class   = list( list(versions_to_enum_to_classes.values())[0].values() )[0]
+        decl          = self.__class_decls[first_class]
+        header_class  = decl.group_header
+        type_field    = "header." + CppFieldGenerator.convert_to_field_name( decl.header_type_field )
+        version_field = "header." + CppFieldGenerator.convert_to_field_name( decl.header_version_field ) if decl.header_version_field else "1"
+        prefix        = f'catbuffer_{group_name}'
+
+        self.__includes.add( f'#include "../{header_class}.h"' )
+
+        # Declarations
+        output  = f'\n\n/*\n * Struct group \'{group_name}\', whose type and version are given by the \'{header_class}\' header\n */\n\n'
+        output += f'/* Replaces the instance held by \'object\' with a new instance of the given type and version */\n'
+        output += f'int {prefix}_create( catbuffer_object* object, uint32_t type, uint32_t version );\n\n'
+        output += f'/* Decodes a buffer into \'object\', keeping its instance if it has the type and version of the buffer */\n'
+        output += f'int {prefix}_decode( catbuffer_object* object, const uint8_t* data, size_t size, size_t* consumed );\n\n'
+        output += f'/* Checks that a buffer can be decoded, without decoding it */\n'
+        output += f'int {prefix}_validate( const uint8_t* data, size_t size, size_t* consumed );\n\n'
+        output += f'/* Checks that each of the \'count\' buffers of \'sizes\' bytes, back to back in \'data\', is exactly one struct, and gets their types and versions. \'done\' is the number of valid buffers */\n'
+        output += f'int {prefix}_validate_batch( const uint8_t* data, const size_t* sizes, size_t count, uint32_t* types, uint32_t* versions, size_t* done );\n\n'
+        output += f'/* Decodes each of the \'count\' buffers of \'sizes\' bytes, back to back in \'data\', which must be exactly one struct, into the object with the same index. \'done\' is the number of decoded buffers */\n'
+        output += f'int {prefix}_decode_batch( const uint8_t* data, const size_t* sizes, size_t count, catbuffer_object* const* objects, size_t* done );\n'
+        self.__declaration_code_output += output
+
+        # Definitions
+        output  = f'\n\n/////////////////////////////////////////////////////////////////\n'
+        output += f'// {group_name}\n'
+        output += f'/////////////////////////////////////////////////////////////////\n\n'
+
+        output += f'static bool has_type_{group_name}( const uint32_t type, const uint32_t version )\n{{\n'
+        output += f'\tswitch( version )\n\t{{\n'
+        for version, enum_to_classes in versions_to_enum_to_classes.items():
+            output += f'\t\tcase {version}:\n\t\t\tswitch( static_cast<{group_name}>( type ) )\n\t\t\t{{\n'
+            for enum_type in enum_to_classes:
+                output += f'\t\t\t\tcase {group_name}::{enum_type}:\n'
+            output += f'\t\t\t\t\treturn true;\n\n\t\t\t\tdefault:\n\t\t\t\t\treturn false;\n\t\t\t}}\n'
+        output += f'\n\t\tdefault:\n\t\t\treturn false;\n\t}}\n}}\n\n\n'
+
+        output += f'static int read_header_{group_name}( const uint8_t* data, const size_t size, uint32_t& type, uint32_t& version )\n{{\n'
+        output += f'\tRawBuffer buffer( const_cast<uint8_t*>( data ), size );\n'
+        output += f'\t{header_class} header;\n'
+        output += f'\tif( !header.Deserialize( buffer ) ){{ return CATBUFFER_INVALID; }}\n\n'
+        output += f'\ttype    = static_cast<uint32_t>( {type_field} );\n'
+        output += f'\tversion = static_cast<uint32_t>( {version_field} );\n'
+        output += f'\treturn has_type_{group_name}( type, version ) ? CATBUFFER_OK : CATBUFFER_UNKNOWN_TYPE;\n}}\n\n\n'
+
+        output += f'int {prefix}_create( catbuffer_object* object, uint32_t type, uint32_t version )\n{{\n'
+        output += f'\tif( !has_type_{group_name}( type, version ) ){{ return CATBUFFER_UNKNOWN_TYPE; }}\n\n'
+        output += f'\ttry\n\t{{\n'
+        output += f'\t\tobject->instance = create_type_{group_name}( static_cast<{group_name}>( type ), version );\n'
+        output += f'\t}}\n\tcatch( const std::bad_alloc& )\n\t{{\n\t\treturn CATBUFFER_OUT_OF_MEMORY;\n\t}}\n\n'
+        output += f'\tobject->type    = type;\n'
+        output += f'\tobject->version = version;\n'
+        output += f'\treturn CATBUFFER_OK;\n}}\n\n\n'
+
+        output += f'int {prefix}_decode( catbuffer_object* object, const uint8_t* data, size_t size, size_t* consumed )\n{{\n'
+        output += f'\tuint32_t type, version;\n'
+        output += f'\tconst int status = read_header_{group_name}( data, size, type, version );\n'
+        output += f'\tif( CATBUFFER_OK != status ){{ return status; }}\n\n'
+        output += f'\ttry\n\t{{\n'
+        output += f'\t\trecycle_type_{group_name}( static_cast<{group_name}>( type ), version, object->instance );\n'
+        output += f'\t}}\n\tcatch( const std::bad_alloc& )\n\t{{\n\t\treturn CATBUFFER_OUT_OF_MEMORY;\n\t}}\n\n'
+        output += f'\tobject->type    = type;\n'
+        output += f'\tobject->version = version;\n'
+        output += f'\treturn catbuffer_decode( object, data, size, consumed );\n}}\n\n\n'
+
+        output += f'int {prefix}_validate( const uint8_t* data, size_t size, size_t* consumed )\n{{\n'
+        output += f'\tuint32_t type, version;\n'
+        output += f'\tconst int status = read_header_{group_name}( data, size, type, version );\n'
+        output += f'\tif( CATBUFFER_OK != status ){{ return status; }}\n\n'
+        output += f'\tRawBuffer buffer( const_cast<uint8_t*>( data ), size );\n'
+        output += f'\tif( !skip_type_{group_name}( static_cast<{group_name}>( type ), version, buffer ) ){{ return CATBUFFER_INVALID; }}\n\n'
+        output += f'\t*consumed = buffer.GetOffset();\n'
+        output += f'\treturn CATBUFFER_OK;\n}}\n\n\n'
+
+        output += f'int {prefix}_validate_batch( const uint8_t* data, const size_t* sizes, size_t count, uint32_t* types, uint32_t* versions, size_t* done )\n{{\n'
+        output += f'\tfor( *done = 0; *done < count; data += sizes[(*done)++] )\n\t{{\n'
+        output += f'\t\tconst int status = read_header_{group_name}( data, sizes[*done], types[*done], versions[*done] );\n'
+        output += f'\t\tif( CATBUFFER_OK != status ){{ return status; }}\n\n'
+        output += f'\t\tRawBuffer buffer( const_cast<uint8_t*>( data ), sizes[*done] );\n'
+        output += f'\t\tif( !skip_type_{group_name}( static_cast<{group_name}>( types[*done] ), versions[*done], buffer ) || buffer.RemainingSize() ){{ return CATBUFFER_INVALID; }}\n'
+        output += f'\t}}\n\n'
+        output += f'\treturn CATBUFFER_OK;\n}}\n\n\n'
+
+        output += f'int {prefix}_decode_batch( const uint8_t* data, const size_t* sizes, size_t count, catbuffer_object* const* objects, size_t* done )\n{{\n'
+        output += f'\tfor( *done = 0; *done < count; data += sizes[(*done)++] )\n\t{{\n'
+        output += f'\t\tsize_t consumed;\n'
+        output += f'\t\tconst int status = {prefix}_decode( objects[*done], data, sizes[*done], &consumed );\n'
+        output += f'\t\tif( CATBUFFER_OK != status ){{ return status; }}\n'
+        output += f'\t\tif( consumed != sizes[*done] ){{ return CATBUFFER_INVALID; }}\n'
+        output += f'\t}}\n\n'
+        output += f'\treturn CATBUFFER_OK;\n}}\n'
+        self.__definition_code_output += output
+
+        # Python
+        names = { value["name"]: int( str(value["value"]), 0 ) for value in self.__enum_values[group_name] }
+        types = [ f'{names[enum_type]}: "{class_name}"' for enum_to_classes in versions_to_enum_to_classes.values() for enum_type, class_name in enum_to_classes.items() ]
+
+        output  = f'\n\n{group_name} = Group( "{group_name}", {{ {", ".join( types )} }} )\n'
+        self.__python_code_output += output
+
+
+
+    def __generate_struct_tables( self, offsets: CppFieldOffsetGenerator ) -> None:
+        """
+        Generates the tables of the fields in the fixed size prefix of each
+        struct, and the table of all structs sorted by name.
+        """
+
+        output = '\n\n/////////////////////////////////////////////////////////////////\n// Struct field tables\n/////////////////////////////////////////////////////////////////\n'
+        structs = []
+
+        for class_name in sorted( self.__class_decls ):
+            self.__includes.add( f'#include "../{class_name}.h"' )
+            fields = offsets.scalar_fields( self.__class_decls[class_name] )
+
+            if fields:
+                output += f'\nstatic const catbuffer_field {class_name}_fields[] =\n{{\n'
+                for name, var_type in fields:
+                    output += f'\t{{ "{name}", {class_name}::OFFSET_{name.upper()}, sizeof({var_type}), {self.__field_kind( var_type )} }},\n'
+                output += '};\n'
+                structs.append( f'\t{{ "{class_name}", {class_name}_fields, sizeof({class_name}_fields)/sizeof(catbuffer_field), {class_name}::FIXED_PREFIX_SIZE }},\n' )
+            else:
+                structs.append( f'\t{{ "{class_name}", nullptr, 0, {class_name}::FIXED_PREFIX_SIZE }},\n' )
+
+        output += '\n\n// All structs, sorted by name for \'catbuffer_find_struct()\'\n'
+        output += 'static const catbuffer_struct STRUCTS[] =\n{\n' + "".join( structs ) + '};\n\n\n'
+        output += c_api_find_struct
+        self.__definition_code_output += output
+
+
+
+    def __field_kind( self, var_type: str ) -> str:
+        if var_type in self.__name_to_alias and self.__name_to_alias[var_type].size > 1:
+            return "CATBUFFER_BYTES"
+
+        if var_type in self.__name_to_enum:
+            var_type = self.__name_to_enum[var_type].type
+
+        elif var_type in self.__name_to_alias:
+            var_type = self.__name_to_alias[var_type].type
+
+        return "CATBUFFER_UNSIGNED" if var_type.startswith( "u" ) else "CATBUFFER_SIGNED"
+
+
+
+c_api_header_start = """#pragma once
+#include <stddef.h>
+#include <stdint.h>
+
+#ifdef __cplusplus
+extern "C" {
+#endif
+
+
+
+/*
+ * Return values of the functions, which return an 'int'
+ */
+enum catbuffer_status
+{
+  CATBUFFER_OK            = 0,  /* Success */
+  CATBUFFER_INVALID       = 1,  /* The buffer is too small or contains invalid data */
+  CATBUFFER_UNKNOWN_TYPE  = 2,  /* The type and version do not belong to a struct of the group */
+  CATBUFFER_TOO_SMALL     = 3,  /* The output buffer or array has not enough capacity */
+  CATBUFFER_OUT_OF_MEMORY = 4,  /* Allocating an instance or array failed */
+  CATBUFFER_EMPTY         = 5   /* The object does not hold an instance */
+};
+
+
+/*
+ * Kinds of the fields in 'catbuffer_field'
+ */
+enum catbuffer_field_kind
+{
+  CATBUFFER_UNSIGNED = 0,  /* Little endian unsigned integer (also enums and aliases) */
+  CATBUFFER_SIGNED   = 1,  /* Little endian signed integer */
+  CATBUFFER_BYTES    = 2   /* Byte array, e.g. keys and hashes */
+};
+
+
+/*
+ * A decoded struct instance, created with 'catbuffer_object_new()'
+ */
+typedef struct catbuffer_object catbuffer_object;
+
+
+/*
+ * A field in the fixed size prefix of a serialized struct
+ */
+typedef struct
+{
+  const char* name;    /* Name as in the schema */
+  size_t      offset;  /* Byte offset in a serialized buffer */
+  size_t      size;    /* Size in bytes */
+  int         kind;    /* A 'catbuffer_field_kind' */
+} catbuffer_field;
+
+
+/*
+ * The fields in the fixed size prefix of a struct
+ */
+typedef struct
+{
+  const char*            name;               /* Struct name */
+  const catbuffer_field* fields;             /* Builtin, enum and alias fields in the fixed size prefix */
+  size_t                 field_count;        /* Number of 'fields' */
+  size_t                 fixed_prefix_size;  /* Size of the fixed size prefix */
+} catbuffer_struct;
+
+
+
+/* Creates an empty object, returns NULL if out of memory */
+catbuffer_object* catbuffer_object_new( void );
+
+/* Destroys an object */
+void catbuffer_object_free( catbuffer_object* object );
+
+/* Gets the type and version of the instance held by an object */
+int catbuffer_object_type( const catbuffer_object* object, uint32_t* type, uint32_t* version );
+
+/* Decodes a buffer into the instance held by an object */
+int catbuffer_decode( catbuffer_object* object, const uint8_t* data, size_t size, size_t* consumed );
+
+/* Gets the serialized size of the instance held by an object */
+int catbuffer_size( catbuffer_object* object, size_t* size );
+
+/* Serializes the instance held by an object, 'written' is the serialized size (also if 'capacity' is too small) */
+int catbuffer_serialize( catbuffer_object* object, uint8_t* output, size_t capacity, size_t* written );
+
+/* Returns the fields of a struct, or NULL if there is no struct with the name */
+const catbuffer_struct* catbuffer_find_struct( const char* name );
+
+/* Reads an unsigned little endian integer of 'width' (1, 2, 4 or 8) bytes at 'offset' */
+int catbuffer_get_uint( const uint8_t* data, size_t size, size_t offset, size_t width, uint64_t* value );
+
+/* Reads a signed little endian integer of 'width' (1, 2, 4 or 8) bytes at 'offset' */
+int catbuffer_get_int( const uint8_t* data, size_t size, size_t offset, size_t width, int64_t* value );
+"""
+
+
+
+c_api_header_end = """
+
+
+#ifdef __cplusplus
+}
+#endif
+"""
+
+
+
+c_api_source_start = """
+
+
+struct catbuffer_object
+{
+  std::unique_ptr<ICatbuffer> instance;  ///< Decoded instance, nullptr if none was created
+  uint32_t                    type;      ///< Type of 'instance'
+  uint32_t                    version;   ///< Version of 'instance'
+};
+
+
+
+catbuffer_object* catbuffer_object_new( void )
+{
+  catbuffer_object* object = new (std::nothrow) catbuffer_object;
+  if( object )
+  {
+    object->type    = 0;
+    object->version = 0;
+  }
+
+  return object;
+}
+
+
+void catbuffer_object_free( catbuffer_object* object )
+{
+  delete object;
+}
+
+
+int catbuffer_object_type( const catbuffer_object* object, uint32_t* type, uint32_t* version )
+{
+  if( !object->instance ){ return CATBUFFER_EMPTY; }
+
+  *type    = object->type;
+  *version = object->version;
+  return CATBUFFER_OK;
+}
+
+
+int catbuffer_decode( catbuffer_object* object, const uint8_t* data, size_t size, size_t* consumed )
+{
+  if( !object->instance ){ return CATBUFFER_EMPTY; }
+
+  // Deserialize() does not write to the buffer
+  RawBuffer buffer( const_cast<uint8_t*>( data ), size );
+
+  try
+  {
+    if( !object->instance->Deserialize( buffer ) ){ return CATBUFFER_INVALID; }
+  }
+  catch( const std::bad_alloc& )
+  {
+    return CATBUFFER_OUT_OF_MEMORY;
+  }
+
+  *consumed = buffer.GetOffset();
+  return CATBUFFER_OK;
+}
+
+
+int catbuffer_size( catbuffer_object* object, size_t* size )
+{
+  if( !object->instance ){ return CATBUFFER_EMPTY; }
+
+  *size = object->instance->Size();
+  return CATBUFFER_OK;
+}
+
+
+int catbuffer_serialize( catbuffer_object* object, uint8_t* output, size_t capacity, size_t* written )
+{
+  if( !object->instance ){ return CATBUFFER_EMPTY; }
+
+  *written = object->instance->Size();
+  if( *written > capacity ){ return CATBUFFER_TOO_SMALL; }
+
+  RawBuffer buffer( output, *written );
+  return object->instance->Serialize( buffer ) ? CATBUFFER_OK : CATBUFFER_INVALID;
+}
+
+
+int catbuffer_get_uint( const uint8_t* data, size_t size, size_t offset, size_t width, uint64_t* value )
+{
+  if( ( 1 != width && 2 != width && 4 != width && 8 != width ) || offset > size || width > size - offset ){ return CATBUFFER_INVALID; }
+
+  *value = 0;
+  memcpy( value, data + offset, width );
+  return CATBUFFER_OK;
+}
+
+
+int catbuffer_get_int( const uint8_t* data, size_t size, size_t offset, size_t width, int64_t* value )
+{
+  uint64_t bits;
+  const int status = catbuffer_get_uint( data, size, offset, width, &bits );
+  if( CATBUFFER_OK != status ){ return status; }
+
+  // sign extend
+  const uint64_t sign = uint64_t(1) << (8*width - 1);
+  *value = static_cast<int64_t>( ( bits ^ sign ) - sign );
+  return CATBUFFER_OK;
+}
+"""
+
+
+
+c_api_find_struct = """const catbuffer_struct* catbuffer_find_struct( const char* name )
+{
+  size_t first = 0;
+  size_t last  = sizeof(STRUCTS)/sizeof(catbuffer_struct);
+
+  while( first < last )
+  {
+    const size_t mid = first + (last - first) / 2;
+    const int    cmp = strcmp( STRUCTS[mid].name, name );
+
+    if( 0 == cmp ){ return &STRUCTS[mid]; }
+    if( cmp < 0 ) { first = mid + 1; }
+    else          { last  = mid;     }
+  }
+
+  return nullptr;
+}
+"""
+
+
+
+python_loader_start = '''"""
+Generated by the catbuffer generator. Do not edit.
+
+Loads the C API of the generated library ('libcatbuffer_c') with ctypes.
+Buffers are passed to the library with the buffer protocol, so 'bytes',
+'bytearray', 'memoryview' and other contiguous buffers are not copied.
+
+    lib = catbuffer_ffi.load()
+    txs = lib.TransactionType.decode_batch( data, sizes )   # one call for all payloads in 'data'
+    fee = lib.read_field( "Transaction", "fee", data )
+"""
+
+import ctypes
+import os
+import struct
+import sys
+
+
+OK, INVALID, UNKNOWN_TYPE, TOO_SMALL, OUT_OF_MEMORY, EMPTY = range( 6 )
+UNSIGNED, SIGNED, BYTES = range( 3 )
+
+_STATUS_NAMES = [ "OK", "INVALID", "UNKNOWN_TYPE", "TOO_SMALL", "OUT_OF_MEMORY", "EMPTY" ]
+_FORMATS      = { ( UNSIGNED, 1 ): "B", ( UNSIGNED, 2 ): "H", ( UNSIGNED, 4 ): "I", ( UNSIGNED, 8 ): "Q",
+                  ( SIGNED,   1 ): "b", ( SIGNED,   2 ): "h", ( SIGNED,   4 ): "i", ( SIGNED,   8 ): "q" }
+
+
+class CatbufferError( ValueError ):
+    """ Raised when a function of the library does not return OK. """
+
+    def __init__( self, status, function ):
+        super().__init__( f"{function} failed with {_STATUS_NAMES[status] if status < len(_STATUS_NAMES) else status}" )
+        self.status = status
+
+
+class _Field( ctypes.Structure ):
+    _fields_ = [ ( "name", ctypes.c_char_p ), ( "offset", ctypes.c_size_t ), ( "size", ctypes.c_size_t ), ( "kind", ctypes.c_int ) ]
+
+
+class _Struct( ctypes.Structure ):
+    _fields_ = [ ( "name", ctypes.c_char_p ), ( "fields", ctypes.POINTER( _Field ) ), ( "field_count", ctypes.c_size_t ), ( "fixed_prefix_size", ctypes.c_size_t ) ]
+
+
+class _PyBuffer( ctypes.Structure ):
+    """ Py_buffer of the CPython buffer protocol. """
+    _fields_ = [ ( "buf", ctypes.c_void_p ), ( "obj", ctypes.c_void_p ), ( "len", ctypes.c_ssize_t ), ( "itemsize", ctypes.c_ssize_t ),
+                 ( "readonly", ctypes.c_int ), ( "ndim", ctypes.c_int ), ( "format", ctypes.c_char_p ), ( "shape", ctypes.c_void_p ),
+                 ( "strides", ctypes.c_void_p ), ( "suboffsets", ctypes.c_void_p ), ( "internal", ctypes.c_void_p ) ]
+
+
+_PyObject_GetBuffer = ctypes.pythonapi.PyObject_GetBuffer
+_PyObject_GetBuffer.argtypes = [ ctypes.py_object, ctypes.POINTER( _PyBuffer ), ctypes.c_int ]
+_PyBuffer_Release = ctypes.pythonapi.PyBuffer_Release
+_PyBuffer_Release.argtypes = [ ctypes.POINTER( _PyBuffer ) ]
+_PyBUF_WRITABLE = 0x0001
+
+
+class _Buffer():
+    """
+    Gets the address and length of a contiguous buffer without copying it,
+    and keeps the buffer locked until the end of the 'with' block. 'bytes'
+    are passed as they are, since ctypes passes a pointer to their data.
+    """
+
+    def __init__( self, data, writable = False ):
+        self.view = None
+        if bytes is type( data ) and not writable:
+            self.ptr, self.len = data, len( data )
+            return
+
+        self.view = _PyBuffer()
+        _PyObject_GetBuffer( data, ctypes.byref( self.view ), _PyBUF_WRITABLE if writable else 0 )
+        self.ptr, self.len = self.view.buf, self.view.len
+
+    def __enter__( self ):
+        return self.ptr, self.len
+
+    def __exit__( self, *args ):
+        if self.view is not None:
+            _PyBuffer_Release( ctypes.byref( self.view ) )
+
+
+def _batch( data, sizes ):
+    """
+    Returns a batch as one buffer and the array of the sizes. If 'sizes' is
+    None, 'data' is a list of buffers, which are joined (this copies them).
+    """
+    if sizes is None:
+        sizes = [ len( buffer ) for buffer in data ]
+        data  = b"".join( data )
+
+    if sum( sizes ) > memoryview( data ).nbytes:
+        raise CatbufferError( INVALID, "batch" )
+
+    return data, ( ctypes.c_size_t * len( sizes ) )( *sizes )
+
+
+def _check( status, function ):
+    if OK != status:
+        raise CatbufferError( status, function )
+
+
+class Object():
+    """ A decoded struct instance (catbuffer_object), which is kept in the library. """
+
+    def __init__( self, lib ):
+        self._lib    = lib
+        self._handle = lib.catbuffer_object_new()
+        if not self._handle:
+            raise MemoryError()
+
+    def __del__( self ):
+        if getattr( self, "_handle", None ):
+            self._lib.catbuffer_object_free( self._handle )
+
+    @property
+    def type( self ):
+        type, version = ctypes.c_uint32(), ctypes.c_uint32()
+        _check( self._lib.catbuffer_object_type( self._handle, ctypes.byref( type ), ctypes.byref( version ) ), "catbuffer_object_type" )
+        return type.value, version.value
+
+    def decode( self, data ):
+        """ Decodes a buffer into the current instance, returns the number of bytes read. """
+        consumed = ctypes.c_size_t()
+        with _Buffer( data ) as ( ptr, size ):
+            _check( self._lib.catbuffer_decode( self._handle, ptr, size, ctypes.byref( consumed ) ), "catbuffer_decode" )
+        return consumed.value
+
+    def size( self ):
+        size = ctypes.c_size_t()
+        _check( self._lib.catbuffer_size( self._handle, ctypes.byref( size ) ), "catbuffer_size" )
+        return size.value
+
+    def serialize_into( self, output ):
+        """ Serializes the instance into a writable buffer, returns the number of bytes written. """
+        written = ctypes.c_size_t()
+        with _Buffer( output, writable=True ) as ( ptr, size ):
+            _check( self._lib.catbuffer_serialize( self._handle, ptr, size, ctypes.byref( written ) ), "catbuffer_serialize" )
+        return written.value
+
+    def serialize( self ):
+        """ Serializes the instance into a new bytearray. """
+        output = bytearray( self.size() )
+        self.serialize_into( output )
+        return output
+
+
+class Group():
+    """ The functions of a struct group, bound to a library by 'Library'. """
+
+    def __init__( self, name, classes ):
+        self.name    = name
+        self.classes = classes  # type -> struct name
+
+    def _bind( self, lib ):
+        group = Group( self.name, self.classes )
+        group._lib = lib
+        prefix = f"catbuffer_{self.name}_"
+        for function in [ "create", "decode", "validate", "validate_batch", "decode_batch" ]:
+            setattr( group, "_" + function, getattr( lib, prefix + function ) )
+        return group
+
+    def create( self, type, version = 1 ):
+        """ Creates an instance of the given type and version. """
+        obj = Object( self._lib )
+        _check( self._create( obj._handle, type, version ), f"catbuffer_{self.name}_create" )
+        return obj
+
+    def decode( self, data, obj = None ):
+        """ Decodes a buffer, whose type is read from its header, into a new object or into 'obj'. """
+        obj = Object( self._lib ) if obj is None else obj
+        consumed = ctypes.c_size_t()
+        with _Buffer( data ) as ( ptr, size ):
+            _check( self._decode( obj._handle, ptr, size, ctypes.byref( consumed ) ), f"catbuffer_{self.name}_decode" )
+        return obj
+
+    def validate( self, data ):
+        """ Checks that a buffer can be decoded and returns its size. """
+        consumed = ctypes.c_size_t()
+        with _Buffer( data ) as ( ptr, size ):
+            _check( self._validate( ptr, size, ctypes.byref( consumed ) ), f"catbuffer_{self.name}_validate" )
+        return consumed.value
+
+    def validate_batch( self, data, sizes = None ):
+        """
+        Checks in one call that each of the buffers of 'sizes' bytes, back to
+        back in 'data', is exactly one struct of the group, and returns the
+        (type, version) of each buffer.
+        """
+        data, sizes = _batch( data, sizes )
+        count    = len( sizes )
+        types    = ( ctypes.c_uint32 * count )()
+        versions = ( ctypes.c_uint32 * count )()
+        done     = ctypes.c_size_t()
+        with _Buffer( data ) as ( ptr, _ ):
+            _check( self._validate_batch( ptr, sizes, count, types, versions, ctypes.byref( done ) ), f"catbuffer_{self.name}_validate_batch" )
+        return list( zip( types, versions ) )
+
+    def decode_batch( self, data, sizes = None, objects = None ):
+        """
+        Decodes each of the buffers of 'sizes' bytes, back to back in 'data',
+        in one call, into 'objects' (which are reused and must be at least as
+        many as the buffers), or into new objects.
+        """
+        data, sizes = _batch( data, sizes )
+        count = len( sizes )
+        if objects is None:
+            objects = [ Object( self._lib ) for _ in range( count ) ]
+        elif len( objects ) < count:
+            raise CatbufferError( TOO_SMALL, f"catbuffer_{self.name}_decode_batch" )
+
+        handles = ( ctypes.c_void_p * count )( *[ obj._handle for obj in objects[:count] ] )
+        done    = ctypes.c_size_t()
+        with _Buffer( data ) as ( ptr, _ ):
+            _check( self._decode_batch( ptr, sizes, count, handles, ctypes.byref( done ) ), f"catbuffer_{self.name}_decode_batch" )
+
+        return objects[:count]
+
+
+class Library():
+    """ The loaded shared library, with an attribute for each struct group. """
+
+    def __init__( self, path ):
+        self._lib     = ctypes.CDLL( path )
+        self._structs = {}
+
+        lib     = self._lib
+        handle  = ctypes.c_void_p
+        data    = ctypes.c_void_p  # takes an address, or points to the data of a 'bytes' object
+        size    = ctypes.c_size_t
+        size_p  = ctypes.POINTER( ctypes.c_size_t )
+        u32_p   = ctypes.POINTER( ctypes.c_uint32 )
+
+        self._signatures = {
+            "catbuffer_object_new":   ( handle, [] ),
+            "catbuffer_object_free":  ( None,   [ handle ] ),
+            "catbuffer_object_type":  ( ctypes.c_int, [ handle, u32_p, u32_p ] ),
+            "catbuffer_decode":       ( ctypes.c_int, [ handle, data, size, size_p ] ),
+            "catbuffer_size":         ( ctypes.c_int, [ handle, size_p ] ),
+            "catbuffer_serialize":    ( ctypes.c_int, [ handle, data, size, size_p ] ),
+            "catbuffer_find_struct":  ( ctypes.POINTER( _Struct ), [ ctypes.c_char_p ] ),
+        }
+
+        for group in GROUPS:
+            prefix = f"catbuffer_{group.name}_"
+            self._signatures.update( {
+                prefix + "create":         ( ctypes.c_int, [ handle, ctypes.c_uint32, ctypes.c_uint32 ] ),
+                prefix + "decode":         ( ctypes.c_int, [ handle, data, size, size_p ] ),
+                prefix + "validate":       ( ctypes.c_int, [ data, size, size_p ] ),
+                prefix + "validate_batch": ( ctypes.c_int, [ data, size_p, size, u32_p, u32_p, size_p ] ),
+                prefix + "decode_batch":   ( ctypes.c_int, [ data, size_p, size, ctypes.POINTER( handle ), size_p ] ),
+            } )
+
+        for name, ( restype, argtypes ) in self._signatures.items():
+            function = getattr( lib, name )
+            function.restype, function.argtypes = restype, argtypes
+
+        for group in GROUPS:
+            setattr( self, group.name, group._bind( lib ) )
+
+    def __getattr__( self, name ):
+        if name.startswith( "catbuffer_" ):
+            return getattr( self._lib, name )
+        raise AttributeError( name )
+
+    def fields( self, struct_name ):
+        """
+        Returns the fields in the fixed size prefix of a struct, as a dict
+        from field name to (offset, size, kind), and the size of the prefix.
+        """
+        if struct_name not in self._structs:
+            info = self._lib.catbuffer_find_struct( struct_name.encode() )
+            if not info:
+                raise KeyError( struct_name )
+
+            info   = info.contents
+            fields = { info.fields[i].name.decode(): ( info.fields[i].offset, info.fields[i].size, info.fields[i].kind ) for i in range( info.field_count ) }
+            self._structs[struct_name] = ( fields, info.fixed_prefix_size )
+
+        return self._structs[struct_name]
+
+    def read_field( self, struct_name, field_name, data, offset = 0 ):
+        """
+        Reads a field from a serialized struct at 'offset' of 'data', without
+        decoding it. Integers are returned as int, byte arrays as memoryview.
+        """
+        fields, _ = self.fields( struct_name )
+        field_offset, size, kind = fields[field_name]
+        start = offset + field_offset
+
+        if BYTES == kind:
+            if start + size > len( data ):
+                raise CatbufferError( INVALID, "read_field" )
+            return memoryview( data )[start:start+size]
+
+        return struct.unpack_from( "<" + _FORMATS[ ( kind, size ) ], data, start )[0]
+
+
+def load( path = None ):
+    """
+    Loads the library from 'path', from the environment variable
+    'CATBUFFER_C_LIBRARY', or from the build folder '_build' next to the
+    'python' folder.
+    """
+    if path is None:
+        path = os.environ.get( "CATBUFFER_C_LIBRARY" )
+
+    if path is None:
+        extension = { "darwin": ".dylib", "win32": ".dll" }.get( sys.platform, ".so" )
+        path = os.path.join( os.path.dirname( os.path.abspath( __file__ ) ), "..", "_build", "libcatbuffer_c" + extension )
+
+    return Library( path )
+'''
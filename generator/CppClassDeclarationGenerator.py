@@ -4,6 +4,9 @@ from .YamlFieldChecker      import YamlFieldChecker, YamlFieldCheckResult
 from .YamlDependencyChecker import YamlDependencyChecker, YamlDependencyCheckerResult
 from .CppFieldGenerator     import CppFieldGenerator, TypeConverter
 from .CppTypesGenerator     import CppTypesGenerator
+from .CppFieldOffsetGenerator import CppFieldOffsetGenerator
+from .CppSelectGenerator import CppSelectGenerator
+from .TypeLayoutAnalyzer import TypeLayoutAnalyzer
 
 
 
@@ -22,7 +25,9 @@ class CppClassDeclarationGenerator():
               user_types:      CppTypesGenerator,
               class_decls:     typing.Dict[str, "CppClassDeclarationGenerator"],
               comment:         str = "",
-              prettyprinter:   bool = False
+              prettyprinter:   bool = False,
+              final:           bool = False,
+              table_layout:    bool = False
               ) -> typing.Tuple[YamlFieldCheckResult, str]:
         """
         Parameters
@@ -44,6 +49,14 @@ class CppClassDeclarationGenerator():
         prettyprinter: bool, optional
             Set to true for pretty printing functionality
 
+        final: bool, optional
+            Set to true to declare the class 'final', so that calls to
+            its virtual methods can be devirtualized
+
+        table_layout: bool, optional
+            Set to true for the table driven backend, which declares the
+            field table 'LAYOUT' used by 'TableCodec'
+
         returns : bool
             True if class correctly initialized using input parameters
         """
@@ -77,6 +90,8 @@ class CppClassDeclarationGenerator():
         self.__dependency_checks : typing.List[dict]                = list()
 
         self.__prettyprinter                                        = prettyprinter
+        self.__final                                                = final
+        self.__table_layout                                         = table_layout
 
         result, result_str = self.__find_condition_fields()
         if result != YamlFieldCheckResult.OK:
@@ -90,12 +105,23 @@ class CppClassDeclarationGenerator():
 
 
 
-    def write_file( self, file_path: str ) -> None:
+    def write_file( self, file_path: str, layouts: TypeLayoutAnalyzer ) -> None:
+        """
+        Writes the generated class declaration to 'file_path'. Should be
+        called when all structs/classes have been processed, since the field
+        offset table depends on the sizes of the other classes ('layouts').
+        """
+
         self.__generate_includes()
 
+        offset_generator = CppFieldOffsetGenerator( layouts, self.__name_to_class )
+
         f = open( file_path, "w" )
         f.write(self.__include_code_output)
         f.write(self.__header_code_output)
+        f.write(offset_generator.generate( self ))
+        f.write(CppSelectGenerator.generate_mask_enum( self, self.__name_to_class ))
+        f.write("\n};")
 
 
     # should be called when all structs/classes have been processed.
@@ -138,11 +164,6 @@ class CppClassDeclarationGenerator():
            
             self.conditions[ cond_name ].append( field )
 
-            # add include if type is a class
-            type = field[ "type" ]
-            if type in self.__name_to_class:               
-                self.__include_code_output += f'#include "{type}.h"\n'
-
         return YamlFieldCheckResult.OK, ""
 
 
@@ -188,13 +209,21 @@ class CppClassDeclarationGenerator():
 
         conditions = self.conditions.copy()
 
-        self.__header_code_output  = f'\n\nclass {self.class_name} : public ICatbuffer\n{{\npublic:\n' # class definition
+        final_specifier            = " final" if self.__final else ""
+        self.__header_code_output  = f'\n\nclass {self.class_name}{final_specifier} : public ICatbuffer\n{{\npublic:\n' # class definition
         self.__header_code_output += f'\t{self.class_name}(){{ }};\n'      # constructor
         self.__header_code_output += f'\t~{self.class_name}(){{ }};\n\n\n' # destructor
         self.__header_code_output += inherited_methods
+        self.__header_code_output += skip_methods
+
+        if self.__table_layout:
+            self.__header_code_output += table_layout_member
+        self.__lib_includes.add("#include <vector>")
 
         if self.__prettyprinter:
-            self.__header_code_output += "\tvoid   Print      ( const size_t level ) override;\n"
+            self.__header_code_output += "\tvoid   PrintTo    ( TextWriter& out, const size_t level ) override;\n"
+            self.__header_code_output += "\tvoid   JsonTo     ( TextWriter& out ) override;\n"
+            self.__header_code_output += f'\tconst char* TypeName( ) override {{ return "{self.class_name}"; }}\n'
 
         self.__header_code_output += '\n\npublic:\n'
 
@@ -284,8 +313,7 @@ class CppClassDeclarationGenerator():
 
                     # generate
                     self.__header_code_output += CppFieldGenerator.gen_array_sized_field( field["name"], comments )
-                    self.__lib_includes.add("#include <vector>")
-                    self.__lib_includes.add("#include <memory>")
+                    self.__includes.add('#include "ElementArray.h"')
 
                 elif( "array_fill" == disposition ):
                     # check fields
@@ -340,12 +368,10 @@ class CppClassDeclarationGenerator():
                 self.member_vars[field["name"]] = (idx, field_type)
 
 
-            # Add include
-            if field_type in self.__name_to_class:
+            # Add include, except for array sized fields, which only hold 'ICatbuffer' pointers (the header type is included by the .cpp file)
+            if field_type in self.__name_to_class and "array_sized" != field.get("disposition"):
                 self.__includes.add(f'#include "{field_type}.h"')
 
-        self.__header_code_output += "\n};"
-    
         return YamlFieldCheckResult.OK, ""
 
 
@@ -354,18 +380,23 @@ class CppClassDeclarationGenerator():
 
         self.__include_code_output = f'#pragma once\n'
 
-        for include in self.__lib_includes:
+        for include in sorted(self.__lib_includes):
             self.__include_code_output += (include + "\n")
 
         self.__include_code_output += '\n'
         self.__include_code_output += '#include "types.h"\n'
-        self.__include_code_output += '#include "ICatbuffer.h"\n\n'
+        self.__include_code_output += '#include "ICatbuffer.h"\n'
+
+        if self.__table_layout:
+            self.__include_code_output += '#include "TableCodec.h"\n'
+
+        self.__include_code_output += '\n'
 
         if self.__prettyprinter:
             self.__include_code_output += '#include "IPrettyPrinter.h"\n\n'
 
 
-        for include in self.__includes:
+        for include in sorted(self.__includes):
             self.__include_code_output += (include + "\n")
 
         self.__include_code_output += '\n'
@@ -375,5 +406,22 @@ class CppClassDeclarationGenerator():
 inherited_methods = """\t
 \t// ICatbuffer inherited methods
 \tbool   Deserialize( RawBuffer& buffer  ) override;
+\tbool   DeserializeSelected( RawBuffer& buffer, const uint64_t mask ) override;
 \tbool   Serialize  ( RawBuffer& buffer  ) override;
-\tsize_t Size       (                    ) override;\n"""
+\tbool   SerializeGather( GatherWriter& writer ) override;
+\tsize_t Size       (                    ) override;
+\tvoid   Clear      (                    ) override;
+\tsize_t HeapBytes  (                    ) override;
+\tsize_t TotalFootprint(                 ) override { return sizeof( *this ) + HeapBytes(); }\n"""
+
+
+skip_methods = """\n\t
+\t// Moves 'buffer' past one serialized instance without deserializing it. If 'offsets'
+\t// is given, the buffer offset of each element in 'array_sized' fields is added to it.
+\tstatic bool SkipOver      ( RawBuffer& buffer, std::vector<size_t>* offsets = nullptr );
+\tstatic bool ElementOffsets( RawBuffer& buffer, std::vector<size_t>& offsets ){ return SkipOver( buffer, &offsets ); }\n"""
+
+
+table_layout_member = """\n\t
+\t// Field table of the serialized layout, which is interpreted by 'TableCodec'
+\tstatic const TableLayout LAYOUT;\n"""
\ No newline at end of file
@@ -7,6 +7,13 @@ from .CppPrintOutputGenerator import CppPrintOutputGenerator
 from .CppSerializationGenerator import CppSerializationGenerator
 from .CppDeserializationGenerator import CppDeserializationGenerator
 from .CppSizeGenerator import CppSizeGenerator
+from .CppSkipGenerator import CppSkipGenerator
+from .CppSelectGenerator import CppSelectGenerator
+from .CppClearGenerator import CppClearGenerator
+from .CppFootprintGenerator import CppFootprintGenerator
+from .CppGatherGenerator import CppGatherGenerator
+from .CppTableGenerator import CppTableGenerator
+from .TypeLayoutAnalyzer import TypeLayoutAnalyzer
 
 
 
@@ -27,7 +34,10 @@ class CppClassDefinitionGenerator():
               class_decl:               CppClassDeclarationGenerator, 
               class_name_to_class_decl: typing.Dict[str, CppClassDeclarationGenerator],
               types:                    CppTypesGenerator,
-              prettyprinter:            bool = False ) -> None:
+              layouts:                  TypeLayoutAnalyzer,
+              prettyprinter:            bool = False,
+              table_headers:            typing.Optional[typing.Dict[str, typing.Tuple[str, str, str]]] = None,
+              parallel_decode:          bool = False ) -> None:
         """
         Parameters
         ----------
@@ -41,8 +51,22 @@ class CppClassDefinitionGenerator():
         types : CppTypesGenerator
             A list of all user defined types, used for type checking
 
+        layouts : TypeLayoutAnalyzer
+            The layouts of all types, used for telling scalars (builtins,
+            enums and aliases) apart from structs
+
         prettyprinter: bool, optional
             Set to true for pretty printing functionality
+
+        table_headers: typing.Dict[str, typing.Tuple[str, str, str]], optional
+            Set for the table driven backend, to the headers of all
+            'array_sized' fields (see 'CppTableGenerator.array_sized_headers()').
+            'Deserialize()', 'Serialize()', 'Size()' and 'SkipOver()' are
+            then generated as calls to 'TableCodec' with a field table.
+
+        parallel_decode: bool, optional
+            Set to true for deserializing the elements of large 'array_sized'
+            fields in parallel (see 'ParallelDecode.h').
         """
 
         self.__class_decl                  = class_decl
@@ -53,27 +77,59 @@ class CppClassDefinitionGenerator():
         self.__include_code_output         = ""
 
         self.__prettyprinter               = prettyprinter
-
-        self.__deserializer                = CppDeserializationGenerator( types, class_decl.class_name, class_decl.size_to_arrays )
-        self.__serializer                  = CppSerializationGenerator( types, class_decl.class_name, class_decl.size_to_arrays )
-        self.__size_generator              = CppSizeGenerator( types, class_decl.class_name )
-        self.__print_generator             = CppPrintOutputGenerator( types, class_decl.class_name, class_decl.size_to_arrays )
+        self.__table_backend               = table_headers is not None
+        self.__parallel_decode             = parallel_decode
+
+        self.__deserializer                = CppDeserializationGenerator( layouts, class_decl.class_name, class_decl.size_to_arrays, parallel_decode )
+        self.__serializer                  = CppSerializationGenerator( layouts, class_decl.class_name, class_decl.size_to_arrays )
+        self.__size_generator              = CppSizeGenerator( layouts, class_decl.class_name )
+        self.__print_generator             = CppPrintOutputGenerator( types, layouts, class_decl.class_name, class_decl.size_to_arrays )
+        self.__skip_generator              = CppSkipGenerator( layouts, class_decl.class_name, self.__find_read_vars() )
+        self.__clear_generator             = CppClearGenerator( layouts, class_decl.class_name )
+        self.__footprint_generator         = CppFootprintGenerator( layouts, class_decl.class_name )
+        self.__gather_generator            = CppGatherGenerator( layouts, class_decl.class_name, class_decl.size_to_arrays )
+        self.__table_generator             = CppTableGenerator( types, layouts, class_decl.class_name, (table_headers or {}).get( class_decl.class_name ) )
+        self.__select_generator            = CppSelectGenerator( layouts, class_decl, class_name_to_class_decl, self.__find_read_vars(), parallel_decode )
 
         self.__generate_implementation()
 
 
 
-    def write_file( self, file_path: str ):
-        self.__generate_includes()
+    def write_file( self, file_path: str, header_only: bool = False ):
+        """
+        Writes the generated class definition to 'file_path'. With
+        'header_only', the methods are declared 'inline' and appended to
+        the class declaration header 'file_path', so that calls into
+        nested structs can be inlined by the compiler.
+        """
 
-        f = open( file_path, "w" )
-        f.write( self.__include_code_output )
-        f.write( self.__deserializer.generate() )
-        f.write( self.__serializer.generate() )
-        f.write( self.__size_generator.generate() )
+        if self.__table_backend:
+            code  = self.__table_generator.generate()
+            code += self.__select_generator.generate()
+            code += self.__gather_generator.generate()
+        else:
+            code  = self.__deserializer.generate( header_only )
+            code += self.__select_generator.generate( header_only )
+            code += self.__serializer.generate( header_only )
+            code += self.__gather_generator.generate( header_only )
+            code += self.__size_generator.generate( header_only )
+            code += self.__skip_generator.generate( header_only )
+
+        code += self.__clear_generator.generate( header_only )
+        code += self.__footprint_generator.generate( header_only )
 
         if self.__prettyprinter:
-            f.write( self.__print_generator.generate() )
+            code += self.__print_generator.generate( header_only )
+
+        if header_only:
+            self.__includes.discard( f'#include "{self.__class_decl.class_name}.h"' )
+
+        self.__generate_includes( code )
+
+        f = open( file_path, "a" if header_only else "w" )
+        f.write( "\n\n\n" if header_only else "" )
+        f.write( self.__include_code_output )
+        f.write( code )
 
 
 
@@ -90,6 +146,15 @@ class CppClassDefinitionGenerator():
         conditions   = self.__class_decl.conditions.copy()
 
         self.__includes.add( f'#include "{class_name}.h"' )
+        self.__includes.add( '#include "CatbufferHooks.h"' )
+        self.__includes.add( '#include "GatherWriter.h"' )
+
+        if self.__table_backend:
+            self.__includes.add( '#include <cstddef>' )
+            self.__includes.add( '#include "TableCodec.h"' )
+
+            if self.__table_generator.is_header:
+                self.__includes.add( '#include "converters.h"' )
 
         for field in fields:
             var_type   = field["type"]
@@ -115,21 +180,37 @@ class CppClassDefinitionGenerator():
 
                     self.__deserializer.array_field( var_type, name, size, size_var_type)
                     self.__serializer.array_field( var_type, name )
+                    self.__gather_generator.array_field( var_type, name )
                     self.__size_generator.array_field( var_type, name )
                     self.__print_generator.array_field( var_type, name, print_hint )
+                    self.__skip_generator.array_field( var_type, name, size, size_var_type )
+                    self.__select_generator.array_field( var_type, name, size, size_var_type )
+                    self.__table_generator.array_field( var_type, name, size )
+                    self.__clear_generator.array_field( name )
+                    self.__footprint_generator.array_field( var_type, name )
 
                 elif "inline" == disposition:
                     self.__deserializer.inline_field( name )
                     self.__serializer.inline_field( name )
+                    self.__gather_generator.inline_field( name )
                     self.__size_generator.inline_field( name )
                     self.__print_generator.inline_field( name )
+                    self.__skip_generator.inline_field( name )
+                    self.__select_generator.inline_field( name )
+                    self.__table_generator.inline_field( name )
+                    self.__clear_generator.inline_field( name )
+                    self.__footprint_generator.inline_field( name )
 
                 elif "reserved" == disposition:
                     reserved_value = field["value"]
                     self.__deserializer.reserved_field( var_type, name, reserved_value )
                     self.__serializer.reserved_field( var_type, name, reserved_value )
+                    self.__gather_generator.reserved_field( var_type, name, reserved_value )
                     self.__size_generator.reserved_field( var_type, name )
                     self.__print_generator.reserved_field( var_type, name, reserved_value)
+                    self.__skip_generator.reserved_field( var_type, name )
+                    self.__select_generator.reserved_field( var_type, name, reserved_value )
+                    self.__table_generator.reserved_field( var_type, name, reserved_value )
 
                 elif "array_sized" == disposition:
                     header_type          = field["type"]
@@ -140,16 +221,32 @@ class CppClassDefinitionGenerator():
 
                     self.__deserializer.array_sized_field( name, size, header_type, header_type_field, header_version_field, enum_type, align )
                     self.__serializer.array_sized_field( name, align )
+                    self.__gather_generator.array_sized_field( name, align )
                     self.__size_generator.array_sized_field( name, size )
                     self.__print_generator.array_sized_field( header_type, name, size )
+                    self.__skip_generator.array_sized_field( name, size, header_type, header_type_field, header_version_field, enum_type, align )
+                    self.__select_generator.array_sized_field( name, size, header_type, header_type_field, header_version_field, enum_type, align )
+                    self.__table_generator.array_sized_field( name, size, header_type, align )
+                    self.__clear_generator.array_sized_field( name )
+                    self.__footprint_generator.array_sized_field( name )
 
                     self.__includes.add(f'#include "converters.h"')
+                    self.__includes.add(f'#include "{header_type}.h"')
+
+                    if self.__parallel_decode:
+                        self.__includes.add( '#include "ParallelDecode.h"' )
 
                 elif "array_fill" == disposition: #TODO: check that only added once and at the end!!
                     self.__deserializer.array_fill_field( var_type, name )
                     self.__serializer.array_fill_field( var_type, name )
+                    self.__gather_generator.array_fill_field( var_type, name )
                     self.__size_generator.array_fill_field( var_type, name )
                     self.__print_generator.array_fill_field( var_type, name )
+                    self.__skip_generator.array_fill_field( var_type, name )
+                    self.__select_generator.array_fill_field( var_type, name )
+                    self.__table_generator.array_fill_field( var_type, name )
+                    self.__clear_generator.array_fill_field( name )
+                    self.__footprint_generator.array_fill_field( var_type, name )
                 else:
                     print_hint(f'Unknown disposition: { disposition }\n')
                     exit(1)
@@ -171,16 +268,56 @@ class CppClassDefinitionGenerator():
     
                         self.__deserializer.condition_field( name, var_type, condition, union_name )
                         self.__serializer.condition_field( name, var_type, condition, union_name )
+                        self.__gather_generator.condition_field( name, var_type, condition, union_name )
                         self.__size_generator.condition( name, var_type, condition, union_name )
                         self.__print_generator.condition( name, var_type, condition, union_name )
 
+                        skip_condition = self.__gen_condition_from_field( conditions[condition_name][0], "tmp" )
+                        self.__skip_generator.condition_field( name, var_type, skip_condition, condition_name, union_name )
+                        self.__select_generator.condition_field( name, var_type, condition, union_name )
+
+                        _, condition_type = self.__class_decl.member_vars[condition_name]
+                        self.__table_generator.condition_field( name, var_type, conditions[condition_name][0], condition_type, union_name )
+                        self.__clear_generator.condition( name, var_type, union_name )
+                        self.__footprint_generator.condition( name, var_type, union_name )
+
                         del conditions[condition_name]
 
                 else:
                     self.__deserializer.normal_field( var_type, name )
                     self.__serializer.normal_field( var_type, name )
+                    self.__gather_generator.normal_field( var_type, name )
                     self.__size_generator.normal_field( var_type, name )
                     self.__print_generator.normal_field( var_type, name, print_hint )
+                    self.__skip_generator.normal_field( var_type, name )
+                    self.__select_generator.normal_field( var_type, name )
+                    self.__table_generator.normal_field( var_type, name )
+                    self.__clear_generator.normal_field( var_type, name )
+                    self.__footprint_generator.normal_field( var_type, name )
+
+
+
+    def __find_read_vars( self ) -> typing.Set[str]:
+        """
+        Returns the names of the fields which other fields depend on, i.e.
+        fields used as array sizes or as conditions. These are the only
+        fields that need to be read when skipping over a buffer.
+        """
+
+        read_vars   = set()
+        member_vars = self.__class_decl.member_vars
+
+        for idx, field in enumerate(self.__class_decl.fields):
+            if "size" in field and not str(field["size"]).isdigit():
+                read_vars.add( field["size"] )
+
+            # condition variables defined after the condition field are unions, which are always read
+            if "condition" in field and field["condition"] in member_vars:
+                idx_cond, _ = member_vars[ field["condition"] ]
+                if idx_cond < idx:
+                    read_vars.add( field["condition"] )
+
+        return read_vars
 
 
 
@@ -195,28 +332,38 @@ class CppClassDefinitionGenerator():
             print(f'Error: {class_name} not found in classes\n')
             exit(1)
 
-        for elem in self.__class_name_to_class_decl[class_name].fields:
-            if "name" not in elem:
-                continue
+        member_vars = self.__class_name_to_class_decl[class_name].member_vars
+        if var_name not in member_vars:
+            print(f'Error: Variable "{var_name}" not found in class "{class_name}"\n')
+            exit(1)
+
+        _, var_type = member_vars[var_name]
+        return var_type
 
-            if elem["name"] == var_name:
-                return elem["type"]
 
-        print(f'Error: Variable "{var_name}" not found in class "{class_name}"\n')
-        exit(1)
+    def __generate_includes( self, code: str ) -> str:
+        """
+        Generates the includes of the .cpp file. Only headers which are
+        needed by the generated code are included, everything else comes
+        from the class declaration.
+        """
 
+        if "std::numeric_limits" in code:
+            self.__includes.add( "#include <limits>" )
 
-    def __generate_includes( self ) -> str:
-        self.__includes.add( "#include <iostream>" )
-        self.__includes.add( "#include <iomanip>"  )
-        self.__includes.add( "#include <limits>"   )
-        for include in self.__includes:
+        for include in sorted(self.__includes):
             self.__include_code_output += (include + "\n")
 
         self.__include_code_output += '\n'
 
 
-    def __gen_condition_from_field( self, field: dict) -> str:
+    def __gen_condition_from_field( self, field: dict, prefix: str = "m" ) -> str:
+        """
+        Generates the C++ condition expression of a condition field. The
+        condition variable is prefixed with 'prefix', so that the condition
+        can also be used on local variables (eg. 'tmpType' instead of 'mType').
+        """
+
         op = ""
 
         if( "not equals" == field["condition_operation"] ):
@@ -234,7 +381,8 @@ class CppClassDefinitionGenerator():
         if cond_type in self.__types.name_to_enum:
             condition_value = f'{cond_type}::{condition_value}'
 
-        return f'{CppFieldGenerator.convert_to_field_name(field["condition"])} {op} {condition_value}'
+        cond_var = prefix + CppFieldGenerator.convert_to_field_name(field["condition"])[1:]
+        return f'{cond_var} {op} {condition_value}'
 
 
 
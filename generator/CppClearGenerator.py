@@ -0,0 +1,75 @@
+from .CppFieldGenerator import CppFieldGenerator
+from .TypeLayoutAnalyzer import TypeLayoutAnalyzer
+
+
+
+class CppClearGenerator():
+    """
+    Generates a 'Clear()' C++ method, which resets all class members to
+    their default values. Vectors are cleared, but keep their capacity, so
+    that an object can be reused for deserializing many buffers without
+    reallocating memory. The polymorphic elements of 'array_sized' fields
+    are cleared and kept by their 'ElementArray', so that the next
+    'Deserialize()' recycles them, e.g.:
+
+        ----------------------------------------------------------------------------------------
+        void AggregateTransactionBody::Clear( )
+        {
+            ...
+            mTransactions.Truncate( 0 );
+            mCosignatures.clear();
+        }
+        ----------------------------------------------------------------------------------------
+    """
+
+    def __init__( self, layouts: TypeLayoutAnalyzer, class_name: str ) -> None:
+        self.__layouts       = layouts
+
+        self.__code_output   = f'void {class_name}::Clear( )\n{{\n'
+
+
+    def normal_field( self, var_type: str, var_name: str ) -> None:
+        var_name = CppFieldGenerator.convert_to_field_name(var_name)
+
+        if self.__layouts.is_scalar( var_type ):
+            self.__code_output += f'\t{var_name} = {{}};\n'
+        else:
+            self.__code_output += f'\t{var_name}.Clear();\n'
+
+
+
+    def array_field( self, arr_name: str ) -> None:
+        arr_name = CppFieldGenerator.convert_to_field_name(arr_name)
+        self.__code_output += f'\t{arr_name}.clear();\n'
+
+
+
+    def inline_field( self, var_name: str ) -> None:
+        var_name = CppFieldGenerator.convert_to_field_name(var_name)
+        self.__code_output += f'\t{var_name}.Clear();\n'
+
+
+
+    def array_sized_field( self, array_name: str ) -> None:
+        array_name = CppFieldGenerator.convert_to_field_name(array_name)
+        self.__code_output += f'\t{array_name}.Truncate( 0 );\n'
+
+
+
+    def array_fill_field( self, array_name: str ) -> None:
+        self.array_field( array_name )
+
+
+
+    def condition( self, var_name: str, var_type: str, union_name: str = "" ) -> None:
+        if union_name:
+            union_name = CppFieldGenerator.convert_to_field_name(union_name)
+            self.__code_output += f'\t{union_name} = {{}};\n'
+        else:
+            self.normal_field( var_type, var_name )
+
+
+
+    def generate( self, inline: bool = False ) -> str:
+        self.__code_output += "}\n\n\n"
+        return ( "inline " if inline else "" ) + self.__code_output
@@ -0,0 +1,202 @@
+import typing
+
+from .CppClassDeclarationGenerator import CppClassDeclarationGenerator
+from .CppTypesGenerator import CppTypesGenerator
+from .CppFieldGenerator import CppFieldGenerator
+
+
+
+class CppColumnsGenerator():
+    """
+    Generates a columnar (struct of arrays) decoder for each struct, which
+    deserializes many buffers of the same struct into one contiguous vector
+    per field. Fields of inline members are columns of the struct itself.
+    For array fields, the elements of all rows are stored in one vector, and
+    an offsets vector with one entry more than rows gives the elements of
+    each row. For example, for the struct 'TransferTransaction' the class
+    below is generated:
+
+        ----------------------------------------------------------------------------------------
+        class TransferTransactionColumns
+        {
+        public:
+            bool Append ( RawBuffer& buffer );
+            void Reserve( size_t rows );
+            void Clear  ( );
+
+            size_t                        mRows;             // number of rows
+            std::vector<uint32_t>         mSize;
+            ...
+            std::vector<Amount>           mFee;
+            std::vector<uint8_t>          mMessage;          // elements of row i are [ mMessage_offsets[i], mMessage_offsets[i+1] )
+            std::vector<size_t>           mMessage_offsets;
+            ...
+        };
+        ----------------------------------------------------------------------------------------
+
+    Each row is deserialized into a reused instance of the struct and then
+    moved into the columns, so a row is only appended if it is valid. All
+    columns classes are declared in 'columns.h' and implemented in 'columns.cpp'.
+    """
+
+    def __init__( self,
+                  class_decls: typing.Dict[str, CppClassDeclarationGenerator],
+                  types:       CppTypesGenerator ) -> None:
+
+        self.__class_decls   = class_decls
+        self.__name_to_enum  = types.name_to_enum
+        self.__name_to_alias = types.name_to_alias
+
+        self.__declaration_code_output = ""
+        self.__definition_code_output  = ""
+
+        for class_name, decl in class_decls.items():
+            self.__generate_class( class_name, decl )
+
+
+
+    def write_file( self, folder: str ) -> None:
+        f = open( folder+"/columns.h", "w" )
+        f.write( '#pragma once\n\n#include <memory>\n#include <vector>\n#include "RawBuffer.h"\n#include "types.h"\n' )
+        for class_name in self.__class_decls:
+            f.write( f'#include "{class_name}.h"\n' )
+        f.write( self.__declaration_code_output )
+        f.close()
+
+        f = open( folder+"/columns.cpp", "w" )
+        f.write( '#include "columns.h"\n' )
+        f.write( self.__definition_code_output )
+        f.close()
+
+
+
+    def __collect_columns( self, decl: CppClassDeclarationGenerator, access: str, columns: list, names: set ) -> None:
+        """
+        Goes through the fields of a class declaration and adds a column for
+        each field to 'columns'. 'access' is the path to the class instance
+        (eg. 'mRow.mTransaction.'), fields of inline members are added recursively.
+        """
+
+        for idx, field in enumerate( decl.fields ):
+            var_type    = field["type"]
+            name        = field["name"] if "name" in field else ""
+            disposition = field["disposition"] if "disposition" in field else ""
+            member      = access + CppFieldGenerator.convert_to_field_name( name )
+
+            if disposition in ["const", "struct_type", "reserved"]:
+                continue
+
+            elif "inline" == disposition:
+                self.__collect_columns( self.__class_decls[var_type], access + f'm{var_type}.', columns, names )
+                continue
+
+            elif disposition in ["array", "array_fill"]:
+                kind = "array_move" if var_type in self.__class_decls else "array"
+
+            elif "array_sized" == disposition:
+                kind, var_type = "array_move", "std::unique_ptr<ICatbuffer>"
+
+            elif "condition" in field:
+                # condition variables defined after more than one condition field are unions
+                cond_name   = field["condition"]
+                idx_cond, _ = decl.member_vars[cond_name]
+                if idx_cond > idx and len( decl.conditions[cond_name] ) > 1:
+                    member = access + CppFieldGenerator.convert_to_field_name( cond_name ) + "_union." + CppFieldGenerator.convert_to_field_name( name )
+
+                kind = "move" if var_type in self.__class_decls else "value"
+
+            else:
+                kind = "move" if var_type in self.__class_decls else "value"
+
+            # fields of inline members can have the same name as other fields
+            column_name = name if name not in names else f'{decl.class_name}_{name}'
+            names.add( column_name )
+
+            columns.append( { "kind": kind, "name": CppFieldGenerator.convert_to_field_name( column_name ), "type": var_type, "member": member,
+                              "comments": field["comments"] if "comments" in field else "" } )
+
+
+
+    def __generate_class( self, class_name: str, decl: CppClassDeclarationGenerator ) -> None:
+        columns = []
+        self.__collect_columns( decl, "mRow.", columns, set() )
+
+        columns_name = f'{class_name}Columns'
+
+        # Declaration
+        output  = f'\n\n/**\n * Columnar decoder for \'{class_name}\', with one vector per field.\n'
+        output += f' * Elements of row \'i\' in array columns are [ m<Name>_offsets[i], m<Name>_offsets[i+1] ).\n */\n'
+        output += f'class {columns_name}\n{{\npublic:\n'
+        output += f'\t{columns_name}( ){{ Clear(); }};\n\n'
+        output += f'\t// Deserializes \'buffer\' and appends it as a row. Returns false (and appends nothing) if invalid.\n'
+        output += f'\tbool Append ( RawBuffer& buffer );\n\n'
+        output += f'\t// Reserves memory in the columns with one value per row.\n'
+        output += f'\tvoid Reserve( const size_t rows );\n\n'
+        output += f'\t// Removes all rows.\n'
+        output += f'\tvoid Clear  ( );\n\n\n'
+        output += f'\tsize_t mRows; // number of rows\n'
+
+        for column in columns:
+            comment = f' // {column["comments"]}' if column["comments"] else ''
+            output += f'\tstd::vector<{column["type"]}> {column["name"]};{comment}\n'
+
+            if column["kind"] in ["array", "array_move"]:
+                output += f'\tstd::vector<size_t> {column["name"]}_offsets;\n'
+
+        output += f'\nprivate:\n\t{class_name} mRow; // reused for deserializing each row\n}};\n'
+        self.__declaration_code_output += output
+
+
+        # Append
+        output  = f'\n\n/////////////////////////////////////////////////////////////////\n'
+        output += f'bool {columns_name}::Append( RawBuffer& buffer )\n{{\n'
+        output += f'\tmRow.Clear();\n\n'
+        output += f'\tif( !mRow.Deserialize( buffer ) )\n\t{{\n\t\treturn false;\n\t}}\n\n'
+
+        for column in columns:
+            name, member = column["name"], column["member"]
+
+            if "value" == column["kind"]:
+                output += f'\t{name}.push_back( {member} );\n'
+            elif "move" == column["kind"]:
+                output += f'\t{name}.push_back( std::move( {member} ) );\n'
+            elif "array" == column["kind"]:
+                output += f'\t{name}.insert( {name}.end(), {member}.begin(), {member}.end() );\n'
+                output += f'\t{name}_offsets.push_back( {name}.size() );\n'
+            elif "array_move" == column["kind"]:
+                output += f'\tfor( {column["type"]}& elem : {member} ){{ {name}.push_back( std::move( elem ) ); }}\n'
+                output += f'\t{name}_offsets.push_back( {name}.size() );\n'
+
+        output += f'\n\t++mRows;\n\treturn true;\n}}\n'
+
+
+        # Reserve
+        output += f'\n\n/////////////////////////////////////////////////////////////////\n'
+        output += f'void {columns_name}::Reserve( const size_t rows )\n{{\n'
+
+        for column in columns:
+            if column["kind"] in ["array", "array_move"]:
+                output += f'\t{column["name"]}_offsets.reserve( rows + 1 );\n'
+            else:
+                output += f'\t{column["name"]}.reserve( rows );\n'
+
+        if not columns:
+            output += '\t(void) rows;\n'
+
+        output += '}\n'
+
+
+        # Clear
+        output += f'\n\n/////////////////////////////////////////////////////////////////\n'
+        output += f'void {columns_name}::Clear( )\n{{\n'
+        output += f'\tmRows = 0;\n'
+
+        for column in columns:
+            output += f'\t{column["name"]}.clear();\n'
+
+            if column["kind"] in ["array", "array_move"]:
+                output += f'\t{column["name"]}_offsets.assign( 1, 0 );\n'
+
+        output += '}\n'
+
+        self.__definition_code_output += output
@@ -1,5 +1,4 @@
 import typing
-import string
 
 from .CppClassDeclarationGenerator import CppClassDeclarationGenerator
 from .CppTypesGenerator import CppTypesGenerator
@@ -67,13 +66,6 @@ class CppConvertersGenerator():
         # Go through class declarations and build 'type_to_versions_to_enum_to_classes' dict
         for class_name, decl in class_declarations.items():
 
-            #TODO: this is just temporary, both group_type and group_version should always be defined 
-            if decl.group_version and not decl.group_type:
-                lookup_str      = class_name.rstrip(string.digits) # remove version number from end of class name
-                ref_decl        = class_declarations[lookup_str]   # get class declaration
-                decl.group_type = ref_decl.group_type              # copy its type
-                decl.group_id   = ref_decl.group_id                # copy its id
-
             if not decl.group_type: # not all classes belong to an enum group
                 continue
             
@@ -96,6 +88,8 @@ class CppConvertersGenerator():
         # generate code output
         self.__generate_declarations()
         self.__generate_enum_type_to_class_methods()
+        self.__generate_enum_type_to_skip_methods()
+        self.__generate_enum_type_to_recycle_methods()
 
         if generate_print_methods:
             self.__generate_string_to_class_method( class_declarations )
@@ -130,6 +124,56 @@ class CppConvertersGenerator():
             self.__definition_code_output += version_to_function_code
 
 
+    def __generate_enum_type_to_skip_methods( self ):
+
+        for enum_class, versions_to_enum_to_classes in self.type_to_versions_to_enum_to_classes.items():
+            if not versions_to_enum_to_classes:
+                continue
+
+            version_to_function_code  = f'bool skip_type_{enum_class}( {enum_class} type, size_t version, RawBuffer& buffer, std::vector<size_t>* offsets )\n{{\n\t'
+            version_to_function_code += f'switch( version )\n\t{{\n'
+
+            for version, enum_to_classes in versions_to_enum_to_classes.items():
+
+                version_to_function_code      += f'\t\tcase {version} : {{ return skip_type_{enum_class}_v{version}( type, buffer, offsets ); }}\n'
+                self.__definition_code_output += f'bool skip_type_{enum_class}_v{version}( {enum_class} type, RawBuffer& buffer, std::vector<size_t>* offsets )\n{{\n\t'
+                self.__definition_code_output += f'switch( type )\n\t{{\n'
+
+                for enum_type, class_name in enum_to_classes.items():
+                    self.__includes.add(f'#include "{class_name}.h"')
+                    self.__definition_code_output += f'\t\tcase {enum_class}::{enum_type} : {{ return {class_name}::SkipOver( buffer, offsets ); }}\n'
+
+                self.__definition_code_output += f'\n\t\tdefault: {{ return false; }}\n\t}}\n}}\n\n'
+
+            version_to_function_code += f'\n\t\tdefault: {{ return false; }}\n\t}}\n}}\n\n'
+            self.__definition_code_output += version_to_function_code
+
+
+    def __generate_enum_type_to_recycle_methods( self ):
+
+        for enum_class, versions_to_enum_to_classes in self.type_to_versions_to_enum_to_classes.items():
+            if not versions_to_enum_to_classes:
+                continue
+
+            version_to_function_code  = f'bool recycle_type_{enum_class}( {enum_class} type, size_t version, std::unique_ptr<ICatbuffer>& catbuf )\n{{\n\t'
+            version_to_function_code += f'switch( version )\n\t{{\n'
+
+            for version, enum_to_classes in versions_to_enum_to_classes.items():
+
+                version_to_function_code      += f'\t\tcase {version} : {{ return recycle_type_{enum_class}_v{version}( type, catbuf ); }}\n'
+                self.__definition_code_output += f'bool recycle_type_{enum_class}_v{version}( {enum_class} type, std::unique_ptr<ICatbuffer>& catbuf )\n{{\n\t'
+                self.__definition_code_output += f'switch( type )\n\t{{\n'
+
+                for enum_type, class_name in enum_to_classes.items():
+                    self.__includes.add(f'#include "{class_name}.h"')
+                    self.__definition_code_output += f'\t\tcase {enum_class}::{enum_type} : {{ if( nullptr == dynamic_cast<{class_name}*>( catbuf.get() ) ){{ catbuf.reset( new {class_name}() ); }} return true; }}\n'
+
+                self.__definition_code_output += f'\n\t\tdefault: {{ return false; }}\n\t}}\n}}\n\n'
+
+            version_to_function_code += f'\n\t\tdefault: {{ return false; }}\n\t}}\n}}\n\n'
+            self.__definition_code_output += version_to_function_code
+
+
     def __generate_declarations( self ):
 
         for enum_class, version_to_types in self.type_to_versions_to_enum_to_classes.items():
@@ -146,6 +190,29 @@ class CppConvertersGenerator():
             self.__declaration_code_output += f' */\n'
             self.__declaration_code_output += f'std::unique_ptr<ICatbuffer> create_type_{enum_class}( {enum_class} type, size_t version );\n\n\n'
 
+            self.__declaration_code_output += f'/**\n'
+            self.__declaration_code_output += f" * Function to move a buffer past a serialized class belonging to the class group '{enum_class}', without deserializing it.\n"
+            self.__declaration_code_output += f' * \n'
+            self.__declaration_code_output += f" * @param[in] type     The enum-type of the serialized class.\n"
+            self.__declaration_code_output += f" * @param[in] version  The version of the serialized class.\n"
+            self.__declaration_code_output += f" * @param[in] buffer   The buffer which will be moved past the serialized class.\n"
+            self.__declaration_code_output += f" * @param[in] offsets  Optional, the buffer offsets of the elements in 'array_sized' fields are added to it.\n"
+            self.__declaration_code_output += f" * @return             false if 'type' and 'version' does not correspond to a class or buffer is too small, otherwise true.\n"
+            self.__declaration_code_output += f' */\n'
+            self.__declaration_code_output += f'bool skip_type_{enum_class}( {enum_class} type, size_t version, RawBuffer& buffer, std::vector<size_t>* offsets = nullptr );\n\n\n'
+
+            self.__declaration_code_output += f'/**\n'
+            self.__declaration_code_output += f" * Function to reuse an instance of a class belonging to the class group '{enum_class}'. If 'catbuf'\n"
+            self.__declaration_code_output += f" * already holds an instance of the class given by 'type' and 'version' it is kept, otherwise it is replaced\n"
+            self.__declaration_code_output += f" * by a new instance. This avoids reallocating memory when deserializing many buffers of the same type.\n"
+            self.__declaration_code_output += f' * \n'
+            self.__declaration_code_output += f" * @param[in] type     The class with enum-type 'type', which should be instantiated.\n"
+            self.__declaration_code_output += f" * @param[in] version  The the version of the class which should be instantiated.\n"
+            self.__declaration_code_output += f" * @param[in] catbuf   The instance to reuse, can be nullptr.\n"
+            self.__declaration_code_output += f" * @return             false if 'type' and 'version' does not correspond to a class, otherwise true.\n"
+            self.__declaration_code_output += f' */\n'
+            self.__declaration_code_output += f'bool recycle_type_{enum_class}( {enum_class} type, size_t version, std::unique_ptr<ICatbuffer>& catbuf );\n\n\n'
+
         if self.__generate_print_methods:
             self.__declaration_code_output += f'/**\n'
             self.__declaration_code_output += f" * Function to convert a RawBuffer to an instance of a class belonging to the class group 'group_name'.\n"
@@ -168,7 +235,7 @@ class CppConvertersGenerator():
 
     def __generate_includes( self ):
 
-        for include in self.__includes:
+        for include in sorted(self.__includes):
             self.__include_code_output += (include + "\n")
 
         self.__include_code_output += '\n'
@@ -212,12 +279,12 @@ class CppConvertersGenerator():
                 self.__definition_code_output += f'\telse if( "{group_name}" == group_name ){{ return create_type_{group_name}( inputBuf ); }}\n'
 
             self.__definition_code_output += f'\telse\n\t{{\n'
-            self.__definition_code_output += f'\t\tprintf( "Error: %s is not a valid buffer type!\\n", group_name.c_str() );\n'
-            self.__definition_code_output += f'\t\texit(1);\n\t}}\n}}\n\n'
+            self.__definition_code_output += f'\t\tfprintf( stderr, "Error: %s is not a valid buffer type!\\n", group_name.c_str() );\n'
+            self.__definition_code_output += f'\t\treturn nullptr;\n\t}}\n}}\n\n'
         else:
             self.__definition_code_output += f'\t(void) inputBuf;\n'
-            self.__definition_code_output += f'\tprintf( "Error: Buffer type %s was not defined in the schemas!\\n", group_name.c_str() );\n'
-            self.__definition_code_output += f'\texit(1);\n\n}}\n\n'
+            self.__definition_code_output += f'\tfprintf( stderr, "Error: Buffer type %s was not defined in the schemas!\\n", group_name.c_str() );\n'
+            self.__definition_code_output += f'\treturn nullptr;\n}}\n\n'
 
 
     def __generate_rawbuffer_to_class_methods( self, class_decls ):
@@ -246,16 +313,16 @@ class CppConvertersGenerator():
             self.__definition_code_output += f'  if( !succ )\n'
             self.__definition_code_output += f'  {{\n'
             self.__definition_code_output += f'    header.Print(0);\n'
-            self.__definition_code_output += f'    printf( "Error: Was not able to deserialize header! Error occurred at byte: %lu\\n", headerBuf.GetOffset() );\n'
+            self.__definition_code_output += f'    fprintf( stderr, "Error: Was not able to deserialize header! Error occurred at byte: %lu\\n", headerBuf.GetOffset() );\n'
             self.__definition_code_output += f'    return nullptr;\n'
             self.__definition_code_output += f'  }}\n'
             self.__definition_code_output += f'\n'
             self.__definition_code_output += f'  // Deserialize all of payload\n'
-            self.__definition_code_output += f'  printf( "\\nDetected buffer of type 0x%X (%d) \\n\\n", (uint32_t) header.mType, (uint32_t) header.mType );\n'
+            self.__definition_code_output += f'  fprintf( stderr, "\\nDetected buffer of type 0x%X (%d) \\n\\n", (uint32_t) header.mType, (uint32_t) header.mType );\n'
             self.__definition_code_output += f'  std::unique_ptr<ICatbuffer> cat = create_type_{group_name}( header.mType, {version_field} );\n'
             self.__definition_code_output += f'  if( nullptr == cat )\n'
             self.__definition_code_output += f'  {{\n'
-            self.__definition_code_output += f'    printf( "Error: Combination of type=%u and version=%u do not correspond to any buffer!\\n", (uint32_t) header.mType, {version_field} );\n'
+            self.__definition_code_output += f'    fprintf( stderr, "Error: Combination of type=%u and version=%u do not correspond to any buffer!\\n", (uint32_t) header.mType, {version_field} );\n'
             self.__definition_code_output += f'    return nullptr;\n'
             self.__definition_code_output += f'  }}\n'
             self.__definition_code_output += f'  succ = cat->Deserialize( inputBuf );\n'
@@ -263,7 +330,7 @@ class CppConvertersGenerator():
             self.__definition_code_output += f'  if( !succ )\n'
             self.__definition_code_output += f'  {{\n'
             self.__definition_code_output += f'    header.Print(0);\n'
-            self.__definition_code_output += f'    printf( "Error: Was not able to deserialize header! Error occurred at byte: %lu\\n", headerBuf.GetOffset() );\n'
+            self.__definition_code_output += f'    fprintf( stderr, "Error: Was not able to deserialize header! Error occurred at byte: %lu\\n", headerBuf.GetOffset() );\n'
             self.__definition_code_output += f'    return nullptr;\n'
             self.__definition_code_output += f'  }}\n'
             self.__definition_code_output += f'\n'
@@ -288,6 +355,8 @@ class CppConvertersGenerator():
         f = open(file_path+f'/converters.h', "w")
         f.write("#pragma once\n\n")
         f.write("#include <memory>\n")
+        f.write("#include <string>\n")
+        f.write("#include <vector>\n")
         f.write('#include "ICatbuffer.h"\n')
         f.write('#include "types.h"\n\n')
         f.write(self.__declaration_code_output)
@@ -1,7 +1,7 @@
 import typing
 
 from .CppFieldGenerator import CppFieldGenerator
-from .CppTypesGenerator import CppTypesGenerator
+from .TypeLayoutAnalyzer import TypeLayoutAnalyzer
 
 
 class CppDeserializationGenerator():
@@ -13,9 +13,14 @@ class CppDeserializationGenerator():
 
 
 
-    def __init__( self, types: CppTypesGenerator, class_name: str, size_to_arrays : typing.Dict[str, typing.List[str]] ) -> None:
-        self.__name_to_enum   = types.name_to_enum
-        self.__name_to_alias  = types.name_to_alias
+    def __init__( self, layouts: TypeLayoutAnalyzer, class_name: str, size_to_arrays : typing.Dict[str, typing.List[str]], parallel: bool = False ) -> None:
+        """
+        With 'parallel', the elements of 'array_sized' fields are deserialized
+        on the thread pool of 'ParallelDecode', if the array is large enough.
+        """
+
+        self.__parallel       = parallel
+        self.__layouts        = layouts
         self.__size_to_arrays = size_to_arrays
         self.__class_name     = class_name
 
@@ -29,9 +34,9 @@ class CppDeserializationGenerator():
     def normal_field( self, var_type: str, var_name: str, reserved: bool = False ) -> str:
         member_name = CppFieldGenerator.convert_to_field_name(var_name)
 
-        if var_type in self.__name_to_alias or var_type in self.__name_to_enum or var_type in CppFieldGenerator.builtin_types:
+        if self.__layouts.is_scalar( var_type ):
             self.__add_ptr_var = True
-            self.__code_output += f'\tptr = buffer.GetOffsetPtrAndMove( sizeof({var_type}) ); if(!ptr){{ return false; }}\n'
+            self.__code_output += f'\tptr = buffer.GetOffsetPtrAndMove( sizeof({var_type}) ); if(!ptr){{ {self.__fail(var_name)} return false; }}\n'
 
             if var_name in self.__size_to_arrays or reserved:
                 self.__code_output += f'\t{var_type} tmp{member_name[1:]} = *( ({var_type}*) ptr );\n\n'
@@ -39,7 +44,7 @@ class CppDeserializationGenerator():
                 self.__code_output += f'\t{member_name} = *( ({var_type}*) ptr );\n\n'
         else:
             self.__add_succ_var = True
-            self.__code_output += f'\tsucc = {member_name}.Deserialize( buffer ); if(!succ){{ return false; }}\n'
+            self.__code_output += f'\tsucc = {member_name}.Deserialize( buffer ); if(!succ){{ {self.__fail(var_name)} return false; }}\n'
 
 
 
@@ -55,7 +60,6 @@ class CppDeserializationGenerator():
 
             self.__code_output += f'\n\tif( {size_var} != std::numeric_limits<{size_type}>::max() )\n\t{{'
         self.__code_output += f'\n\t\t{name}.resize({size_var});'
-        self.__code_output += f'\n\t\t{name}.shrink_to_fit();'
         self.__code_output += f'\n\t\tfor( size_t i=0; i<{size_var}; ++i )\n'
         self.__code_output += f'\t\t{{\n'
 
@@ -67,6 +71,7 @@ class CppDeserializationGenerator():
 
         if not str(size_var).isdigit():
             self.__code_output += f'\t}}\n'
+            self.__code_output += f'\telse\n\t{{\n\t\t{name}.clear();\n\t}}\n\n'
 
 
     def inline_field( self, var_name: str ):
@@ -86,7 +91,7 @@ class CppDeserializationGenerator():
             self.__code_output += f'(void) tmp{member_name[1:]};'
 
         if len(tmp) == 1:
-            self.__code_output += f'\tif( {value} != tmp{member_name[1:]} ){{ return false; }}\n'
+            self.__code_output += f'\tif( {value} != tmp{member_name[1:]} ){{ {self.__fail(name)} return false; }}\n'
 
 
 
@@ -94,46 +99,104 @@ class CppDeserializationGenerator():
                                  header_type: str, header_type_field: str, header_version_field: str,
                                  enum_type:   str, align:             str = "" ):
 
+        fail                 = self.__fail( array_name )
         array_name           = CppFieldGenerator.convert_to_field_name( array_name )
         array_size           = CppFieldGenerator.convert_to_field_name( array_size )
         header_type_field    = CppFieldGenerator.convert_to_field_name( header_type_field )
         header_version_field = CppFieldGenerator.convert_to_field_name( header_version_field )
 
-        self.__code_output += f'\tfor( size_t read_size = 0; read_size < {array_size}; )\n\t{{\n'
-        self.__code_output += "\t\t// Deserialize header\n"
-        self.__code_output += f'\t\t{ header_type } header;\n'
-        self.__code_output += f'\t\tRawBuffer tmp = buffer;\n'
-        self.__code_output += f'\t\tsucc = header.Deserialize(tmp); if(!succ){{ return false; }}\n\n'
-
-        self.__code_output += "\t\t// Get element type and create type\n"
-        self.__code_output += f'\t\t{ enum_type } type = header.{ header_type_field };\n'
-        self.__code_output += f'\t\tstd::unique_ptr<ICatbuffer> catbuf = create_type_{ enum_type }( type, header.{header_version_field} );\n'
-        self.__code_output += f'\t\tif( nullptr == catbuf ){{ return false; }}\n\n'
-
-        self.__code_output += "\t\t// Deserialize element and save it\n"
-        self.__code_output += f'\t\tconst size_t rsize = buffer.RemainingSize();\n'
-        self.__code_output += f'\t\tsucc = catbuf->Deserialize( buffer ); if(!succ){{ return false; }}\n'
-        self.__code_output += f'\t\tread_size += (rsize-buffer.RemainingSize());\n'
-        self.__code_output += f'\t\t{ array_name }.push_back( std::move(catbuf) );\n\n'
-
-        if align:
-            self.__code_output += "\t\t// Read optional padding\n"
-            self.__code_output += f'\t\tconst size_t padding = ({align} - uintptr_t(buffer.GetOffsetPtr())%{align}) % {align};\n'
-            self.__code_output += f'\t\tsucc = buffer.MoveOffset(padding); if(!succ){{ return false; }}\n'
-            self.__code_output += f'\t\tread_size += padding;\n'
-        self.__code_output += f'\t}}\n\n'
+        count    = "count" + array_name[1:]
+        elements = "elements" + array_name[1:]
+
+        # Serial loop, which deserializes each element after reading its header
+        loop  = f'\tfor( size_t read_size = 0; read_size < {array_size}; ++{count} )\n\t{{\n'
+        loop += self.__array_sized_element( array_name, count, header_type, header_type_field, header_version_field, enum_type, fail )
+
+        loop += "\t\t// Deserialize element\n"
+        loop += f'\t\tconst size_t rsize = buffer.RemainingSize();\n'
+        loop += f'\t\tsucc = { array_name }[{count}]->Deserialize( buffer ); if(!succ){{ {fail} return false; }}\n'
+        loop += f'\t\tread_size += (rsize-buffer.RemainingSize());\n\n'
+        loop += self.__array_sized_padding( align, fail )
+        loop += f'\t}}\n'
+
+        self.__code_output += f'\tsize_t {count} = 0;\n'
+
+        if not self.__parallel:
+            self.__code_output += loop
+        else:
+            # Scan for the element boundaries and create the elements, then deserialize them on the thread pool
+            self.__code_output += f'\tif( !ParallelDecode::Enabled( {array_size} ) )\n\t{{\n'
+            self.__code_output += "".join( "\t" + line if line.strip() else line for line in loop.splitlines( True ) )
+            self.__code_output += f'\t}}\n\telse\n\t{{\n'
+            self.__code_output += f'\t\tstd::vector<RawBuffer> {elements};\n'
+            self.__code_output += f'\t\tfor( size_t read_size = 0; read_size < {array_size}; ++{count} )\n\t\t{{\n'
+            self.__code_output += "".join( "\t" + line if line.strip() else line for line in
+                                           self.__array_sized_element( array_name, count, header_type, header_type_field, header_version_field, enum_type, fail ).splitlines( True ) )
+
+            self.__code_output += "\t\t\t// Save element buffer and skip element\n"
+            self.__code_output += f'\t\t\t{elements}.push_back( buffer );\n'
+            self.__code_output += f'\t\t\tconst size_t rsize = buffer.RemainingSize();\n'
+            self.__code_output += f'\t\t\tsucc = skip_type_{ enum_type }( type, header.{header_version_field}, buffer ); if(!succ){{ {fail} return false; }}\n'
+            self.__code_output += f'\t\t\tread_size += (rsize-buffer.RemainingSize());\n\n'
+            self.__code_output += "".join( "\t" + line for line in self.__array_sized_padding( align, fail ).splitlines( True ) )
+            self.__code_output += f'\t\t}}\n\n'
+
+            self.__code_output += "\t\t// Deserialize elements in parallel\n"
+            self.__code_output += f'\t\tsucc = ParallelDecode::For( {count}, [&]( size_t i ){{ return { array_name }[i]->Deserialize( {elements}[i] ); }} );\n'
+            self.__code_output += f'\t\tif(!succ){{ {fail} return false; }}\n'
+            self.__code_output += f'\t}}\n'
+
+        self.__code_output += f'\t{ array_name }.Truncate( {count} );\n\n'
 
         self.__add_succ_var = True
 
 
 
+    def __array_sized_element( self, array_name: str, count: str, header_type: str, header_type_field: str,
+                               header_version_field: str, enum_type: str, fail: str ) -> str:
+        """
+        Returns the code which reads the header of an 'array_sized' element,
+        and creates the element or reuses the existing one.
+        """
+
+        output  = "\t\t// Deserialize header\n"
+        output += f'\t\t{ header_type } header;\n'
+        output += f'\t\tRawBuffer tmp = buffer;\n'
+        output += f'\t\tsucc = header.Deserialize(tmp); if(!succ){{ {fail} return false; }}\n\n'
+
+        output += "\t\t// Get element type and reuse existing element if it has the same type\n"
+        output += f'\t\t{ enum_type } type = header.{ header_type_field };\n'
+        output += f'\t\tif( {count} == { array_name }.size() ){{ { array_name }.Append(); }}\n'
+        output += f'\t\tsucc = recycle_type_{ enum_type }( type, header.{header_version_field}, { array_name }[{count}] );\n'
+        output += f'\t\tif( !succ ){{ { array_name }.Truncate( {count} ); {fail} return false; }}\n\n'
+        return output
+
+
+
+    def __array_sized_padding( self, align: str, fail: str ) -> str:
+        if not align:
+            return ""
+
+        output  = "\t\t// Read optional padding\n"
+        output += f'\t\tconst size_t padding = ({align} - buffer.GetOffset()%{align}) % {align};\n'
+        output += f'\t\tsucc = buffer.MoveOffset(padding); if(!succ){{ {fail} return false; }}\n'
+        output += f'\t\tread_size += padding;\n'
+        return output
+
+
+
     def array_fill_field( self, array_type: str, array_name: str ):
+        fail       = self.__fail( array_name )
         array_name = CppFieldGenerator.convert_to_field_name( array_name )
 
+        count      = "count" + array_name[1:]
+
+        self.__code_output += f'\tsize_t {count} = 0;\n'
         self.__code_output += f'\twhile( buffer.RemainingSize() )\n\t{{\n\t\t'
-        self.__code_output += f'{ array_type } fill;\n\t\t'
-        self.__code_output += f'succ = fill.Deserialize( buffer ); if(!succ){{ return false; }}\n\t\t'
-        self.__code_output += f'{ array_name }.push_back( fill );\n\t}}\n\n'
+        self.__code_output += f'if( {count} == { array_name }.size() ){{ { array_name }.emplace_back(); }}\n\t\t'
+        self.__code_output += f'succ = { array_name }[{count}].Deserialize( buffer ); if(!succ){{ {fail} return false; }}\n\t\t'
+        self.__code_output += f'++{count};\n\t}}\n'
+        self.__code_output += f'\t{ array_name }.resize( {count} );\n\n'
 
         self.__add_succ_var = True
 
@@ -154,8 +217,9 @@ class CppDeserializationGenerator():
 
 
 
-    def generate( self ) -> str:
-        output = f'bool {self.__class_name}::Deserialize( RawBuffer& buffer )\n{{\n'
+    def generate( self, inline: bool = False ) -> str:
+        output  = f'{"inline " if inline else ""}bool {self.__class_name}::Deserialize( RawBuffer& buffer )\n{{\n'
+        output += f'\tCATBUFFER_HOOK_DESERIALIZE( "{self.__class_name}", buffer );\n'
 
         if self.__add_ptr_var:
             output += "\tvoid* ptr;\n"
@@ -167,3 +231,26 @@ class CppDeserializationGenerator():
         output += "\treturn true;\n"
         output += "}\n\n\n"
         return output
+
+
+
+    def take_code( self ) -> str:
+        """
+        Returns the code which has been generated since the last call and
+        removes it from the output, so that other generators can embed the
+        deserialization of single fields.
+        """
+
+        code, self.__code_output = self.__code_output, ""
+        return code
+
+
+
+    def __fail( self, field_name: str ) -> str:
+        """
+        Returns the hook which is called before returning false because
+        field 'field_name' could not be deserialized.
+        """
+
+        field_name = field_name.replace( "[i]", "" )
+        return f'CATBUFFER_HOOK_FAIL( "{self.__class_name}", "{field_name}", buffer );'
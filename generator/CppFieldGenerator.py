@@ -180,12 +180,18 @@ class CppFieldGenerator():
 
         and converts it to:
 
-            -------------------------------------------------------------------------------
-            std::vector<std::unique_ptr<ICatbuffer>> mTransactions; // sub-transaction data
-            -------------------------------------------------------------------------------
+            ---------------------------------------------------
+            ElementArray mTransactions; // sub-transaction data
+            ---------------------------------------------------
+
+        'ElementArray' (see ElementArray.h) is a vector of the polymorphic
+        elements, which keeps the elements of a cleared array for reuse.
         """
 
-        return CppFieldGenerator.gen_array_field("std::unique_ptr<ICatbuffer>", name, comment)
+        name    = CppFieldGenerator.convert_to_field_name( name )
+        output  = f'\tElementArray {name};'
+        output += f' // {comment}\n' if comment else "\n"
+        return output
 
 
     @staticmethod
@@ -0,0 +1,155 @@
+import typing
+
+from .CppFieldGenerator import CppFieldGenerator
+from .TypeLayoutAnalyzer import TypeLayoutAnalyzer
+
+
+class CppFieldOffsetGenerator():
+    """
+    Generates a table of constant byte offsets for the fields in the fixed
+    size prefix of a serialized struct, i.e. all fields before the first
+    field with a variable size. Fields of inline members are included as
+    if they were fields of the struct itself.
+
+    For each builtin, enum and alias field in the prefix, a static 'Read'
+    method is also generated, which reads the field directly from a raw
+    byte pointer. For example, given the struct 'Transaction', the code
+    below is generated:
+
+        ----------------------------------------------------------------------------------------
+        enum FieldOffset : size_t
+        {
+            OFFSET_SIZE = 0,
+            ...
+            OFFSET_FEE = 112,
+            OFFSET_DEADLINE = 120,
+            FIXED_PREFIX_SIZE = 128,
+        };
+
+        static Amount ReadFee( const uint8_t* data ){ return *( (const Amount*) (data + OFFSET_FEE) ); }
+        ----------------------------------------------------------------------------------------
+
+    This allows sorting and filtering raw buffers without deserializing them.
+    """
+
+    def __init__( self,
+                  layouts:     TypeLayoutAnalyzer,
+                  class_decls: typing.Dict[str, "CppClassDeclarationGenerator"] ) -> None:
+
+        self.__layouts     = layouts
+        self.__class_decls = class_decls
+
+
+
+    def generate( self, class_decl: "CppClassDeclarationGenerator" ) -> str:
+        offsets : typing.List[typing.Tuple[str, str, int]] = []  # list of (field name, field type, offset)
+        prefix_size, _ = self.__collect_offsets( class_decl, 0, offsets )
+
+        output  = '\n\n\t// Byte offsets of the fields in the fixed size prefix of a serialized buffer\n'
+        output += '\tenum FieldOffset : size_t\n\t{\n'
+
+        names = set()
+        for name, _, offset in offsets:
+            if name in names:
+                continue
+
+            names.add(name)
+            output += f'\t\tOFFSET_{name.upper()} = {offset},\n'
+
+        output += f'\t\tFIXED_PREFIX_SIZE = {prefix_size},\n'
+        output += '\t};\n\n'
+
+        for name, var_type in self.scalar_fields( class_decl, offsets ):
+            method_name = "Read" + CppFieldGenerator.convert_to_field_name( name )[1:]
+            output += f'\tstatic {var_type} {method_name}( const uint8_t* data ){{ return *( (const {var_type}*) (data + OFFSET_{name.upper()}) ); }}\n'
+
+        return output
+
+
+
+    def scalar_fields( self, class_decl: "CppClassDeclarationGenerator", offsets: typing.Optional[list] = None ) -> typing.List[typing.Tuple[str, str]]:
+        """
+        Returns the name and type of each builtin, enum and alias field in
+        the fixed size prefix, i.e. the fields which have a 'Read' method
+        and an 'OFFSET_{NAME}' constant.
+        """
+
+        if offsets is None:
+            offsets = []
+            self.__collect_offsets( class_decl, 0, offsets )
+
+        fields = []
+        names  = set()
+        for name, var_type, _ in offsets:
+            if name in names or not self.__layouts.is_scalar( var_type ):
+                continue
+
+            names.add(name)
+            fields.append( (name, var_type) )
+
+        return fields
+
+
+
+    def __collect_offsets( self, class_decl, base_offset: int, offsets: list ) -> typing.Tuple[int, bool]:
+        """
+        Goes through the fields of a class declaration and adds the offsets
+        of all fields in the fixed size prefix to 'offsets'. Returns the end
+        offset of the prefix and True if all fields have a fixed size.
+        """
+
+        offset = base_offset
+
+        for idx, field in enumerate(class_decl.fields):
+            var_type    = field["type"]
+            name        = field["name"] if "name" in field else ""
+            disposition = field["disposition"] if "disposition" in field else ""
+
+            if disposition in ["const", "struct_type"]:
+                continue
+
+            elif "reserved" == disposition:
+                offset += self.__layouts.type_size( var_type )
+
+            elif "inline" == disposition:
+                offset, fixed = self.__collect_offsets( self.__class_decls[var_type], offset, offsets )
+                if not fixed:
+                    return offset, False
+
+            elif "array" == disposition:
+                elem_size = self.__layouts.type_size( var_type )
+                if not str(field["size"]).isdigit() or elem_size is None:
+                    return offset, False
+
+                offsets.append( (name, "", offset) )
+                offset += elem_size * int(field["size"])
+
+            elif disposition in ["array_sized", "array_fill"]:
+                return offset, False
+
+            else:
+                if "condition" in field:
+                    # condition variables defined after the condition field are unions (always serialized)
+                    idx_cond, _ = class_decl.member_vars[ field["condition"] ]
+                    if idx_cond < idx:
+                        return offset, False
+
+                    offsets.append( (name, var_type, offset) )
+
+                    # union members share the same offset
+                    next_field = class_decl.fields[idx+1] if idx+1 < len(class_decl.fields) else {}
+                    if "condition" in next_field and next_field["condition"] == field["condition"]:
+                        continue
+
+                    offset += self.__layouts.type_size( var_type )
+                    continue
+
+                size = self.__layouts.type_size( var_type )
+                offsets.append( (name, var_type, offset) )
+
+                if size is None:
+                    return offset, False
+
+                offset += size
+
+        return offset, True
@@ -0,0 +1,89 @@
+from .CppFieldGenerator import CppFieldGenerator
+from .TypeLayoutAnalyzer import TypeLayoutAnalyzer
+
+
+
+class CppFootprintGenerator():
+    """
+    Generates a 'HeapBytes()' C++ method, which returns the number of bytes
+    that an object has allocated on the heap. Vectors count with their
+    capacity, not their size, and the elements of 'array_sized' fields
+    (including the spare ones kept by 'Clear()') with the 'TotalFootprint()'
+    of their actual class, e.g.:
+
+        ----------------------------------------------------------------------------------------
+        size_t AggregateTransactionBody::HeapBytes( )
+        {
+            size_t bytes = 0;
+            bytes += mTransactions.capacity()*sizeof(std::unique_ptr<ICatbuffer>);
+            for( std::unique_ptr<ICatbuffer>& element : mTransactions ){ if( element ){ bytes += element->TotalFootprint(); } }
+            bytes += mTransactions.SpareBytes();
+            bytes += mCosignatures.capacity()*sizeof(Cosignature);
+            for( Cosignature& element : mCosignatures ){ bytes += element.HeapBytes(); }
+            return bytes;
+        }
+        ----------------------------------------------------------------------------------------
+
+    Heap allocations of the standard library itself (e.g. allocator
+    bookkeeping) are not counted.
+    """
+
+    def __init__( self, layouts: TypeLayoutAnalyzer, class_name: str ) -> None:
+        self.__layouts       = layouts
+        self.__class_name    = class_name
+
+        self.__code_output   = ""
+
+
+    def normal_field( self, var_type: str, var_name: str ) -> None:
+        if not self.__layouts.is_scalar( var_type ):
+            self.__code_output += f'\tbytes += {CppFieldGenerator.convert_to_field_name( var_name )}.HeapBytes();\n'
+
+
+
+    def array_field( self, var_type: str, arr_name: str ) -> None:
+        arr_name = CppFieldGenerator.convert_to_field_name(arr_name)
+        self.__code_output += f'\tbytes += {arr_name}.capacity()*sizeof({var_type});\n'
+
+        if not self.__layouts.is_scalar( var_type ):
+            self.__code_output += f'\tfor( {var_type}& element : {arr_name} ){{ bytes += element.HeapBytes(); }}\n'
+
+
+
+    def inline_field( self, var_name: str ) -> None:
+        self.__code_output += f'\tbytes += {CppFieldGenerator.convert_to_field_name( var_name )}.HeapBytes();\n'
+
+
+
+    def array_sized_field( self, array_name: str ) -> None:
+        array_name = CppFieldGenerator.convert_to_field_name(array_name)
+        self.__code_output += f'\tbytes += {array_name}.capacity()*sizeof(std::unique_ptr<ICatbuffer>);\n'
+        self.__code_output += f'\tfor( std::unique_ptr<ICatbuffer>& element : {array_name} ){{ if( element ){{ bytes += element->TotalFootprint(); }} }}\n'
+        self.__code_output += f'\tbytes += {array_name}.SpareBytes();\n'
+
+
+
+    def array_fill_field( self, var_type: str, array_name: str ) -> None:
+        self.array_field( var_type, array_name )
+
+
+
+    def condition( self, var_name: str, var_type: str, union_name: str = "" ) -> None:
+        # union members are fixed sized
+        if not union_name:
+            self.normal_field( var_type, var_name )
+
+
+
+    def generate( self, inline: bool = False ) -> str:
+        output = f'{"inline " if inline else ""}size_t {self.__class_name}::HeapBytes( )\n{{\n'
+
+        if self.__code_output:
+            output += "\tsize_t bytes = 0;\n"
+            output += self.__code_output
+            output += "\treturn bytes;\n"
+        else:
+            output += "\treturn 0;\n"
+
+        output += "}\n\n\n"
+        return output
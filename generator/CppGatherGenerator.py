@@ -0,0 +1,141 @@
+import typing
+
+from .CppFieldGenerator import CppFieldGenerator
+from .TypeLayoutAnalyzer import TypeLayoutAnalyzer
+
+
+class CppGatherGenerator():
+    """
+    Generates a 'SerializeGather()' C++ method, which serializes the class
+    fields into a GatherWriter instead of a RawBuffer. Builtin, enum and
+    alias members and arrays are passed to the writer by address, so that
+    large byte arrays are referenced in place instead of being copied.
+    Values which are computed while serializing (array sizes and reserved
+    fields) are always copied into the scratch area of the writer.
+    """
+
+
+
+    def __init__( self, layouts: TypeLayoutAnalyzer, class_name: str, size_to_arrays : typing.Dict[str, typing.List[str]] ) -> None:
+        self.__layouts        = layouts
+        self.__size_to_arrays = size_to_arrays
+        self.__class_name     = class_name
+
+        self.__add_succ_var   = False
+        self.__add_ptr_var    = False
+
+        self.__code_output    = ""
+
+
+
+    def normal_field( self, var_type: str, var_name: str ) -> None:
+        member_name = CppFieldGenerator.convert_to_field_name(var_name)
+
+        if self.__layouts.is_scalar( var_type ):
+            if var_name in self.__size_to_arrays:
+                array_name = self.__size_to_arrays[var_name][0]
+                array_name = CppFieldGenerator.convert_to_field_name(array_name)
+
+                self.__add_ptr_var  = True
+                self.__code_output += f'\tptr = writer.Append( sizeof({var_type}) );\n'
+                self.__code_output += f'\t*( ({var_type}*) ptr ) = {array_name}.size();\n\n'
+            else:
+                self.__code_output += f'\twriter.Write( &{member_name}, sizeof({var_type}) );\n'
+        else:
+            self.__add_succ_var = True
+            self.__code_output += f'\tsucc = {member_name}.SerializeGather( writer ); if( !succ ){{ return false; }}\n'
+
+
+
+    def array_field( self, var_type: str, var_name: str ) -> None:
+        member_var = CppFieldGenerator.convert_to_field_name(var_name)
+
+        if self.__layouts.is_scalar( var_type ):
+            self.__code_output += f'\twriter.Write( {member_var}.data(), sizeof({var_type})*{member_var}.size() );\n'
+            return
+
+        self.__code_output += f'\n\tfor( size_t i=0; i<{member_var}.size(); ++i )\n'
+        self.__code_output += f'\t{{\n'
+        self.__code_output += "\t"
+        self.normal_field( var_type, var_name+"[i]" )
+        self.__code_output += f'\t}}\n\n'
+
+
+
+    def inline_field( self, var_name: str ) -> None:
+        self.normal_field( var_name, var_name )
+
+
+
+    def reserved_field( self, var_type: str, var_name: str, value: str ) -> None:
+        member_var = CppFieldGenerator.convert_to_field_name(var_name)
+        self.__code_output += f'\tptr = writer.Append( sizeof({var_type}) );\n'
+
+        tmp = str(value).split()
+
+        if len(tmp) > 1:
+            var_field = CppFieldGenerator.convert_to_field_name(tmp[1])
+            value = f'{var_field}.Size()'
+
+        self.__code_output += f'\t*( ({var_type}*) ptr ) = {value}; // {var_type} {member_var}\n\n'
+        self.__add_ptr_var  = True
+
+
+
+    def array_sized_field( self, array_name: str, align: str = "" ) -> None:
+        array_name = CppFieldGenerator.convert_to_field_name(array_name)
+
+        self.__code_output += f'\n\tfor( const std::unique_ptr<ICatbuffer>& catbuf : {array_name} )\n\t{{\n'
+        self.__code_output += f'\t\tsucc = catbuf->SerializeGather( writer ); if(!succ){{ return false; }}\n'
+
+        if align:
+            self.__code_output += f'\t\twriter.Pad( {align} );\n'
+
+        self.__code_output += f'\t}}\n\n'
+
+        self.__add_succ_var = True
+
+
+
+    def array_fill_field( self, array_type: str, array_name: str ) -> None:
+        array_name = CppFieldGenerator.convert_to_field_name(array_name)
+
+        if self.__layouts.is_scalar( array_type ):
+            self.__code_output += f'\twriter.Write( {array_name}.data(), sizeof({array_type})*{array_name}.size() );\n'
+            return
+
+        self.__code_output += f'\tfor( {array_type}& fill : {array_name} )\n\t{{\n\t\t'
+        self.__code_output += f'succ = fill.SerializeGather( writer ); if(!succ){{ return false; }}\n\t}}\n\n'
+
+        self.__add_succ_var = True
+
+
+
+    def condition_field( self, var_name: str, var_type: str, condition: str, union_name: str ) -> None:
+        name = var_name
+        if union_name:
+            var_name = CppFieldGenerator.convert_to_field_name(var_name)
+            name = f'{union_name}.{var_name}'
+        else:
+            self.__code_output += f'\n\tif( {condition} )\n\t{{\n\t'
+
+        self.normal_field( var_type, name )
+
+        if not union_name:
+           self.__code_output += "\t}\n\n"
+
+
+
+    def generate( self, inline: bool = False ) -> str:
+        output = f'{"inline " if inline else ""}bool {self.__class_name}::SerializeGather( GatherWriter& writer )\n{{\n'
+
+        if self.__add_ptr_var:
+            output += "\tuint8_t* ptr;\n"
+
+        if self.__add_succ_var:
+            output += "\tbool succ;\n"
+
+        output += self.__code_output
+        output += "\treturn true;\n"
+        output += "}\n\n\n"
+        return output
@@ -0,0 +1,608 @@
+import re
+import typing
+
+from .CppClassDeclarationGenerator import CppClassDeclarationGenerator
+from .CppTypesGenerator import CppTypesGenerator
+from .CppFieldGenerator import CppFieldGenerator
+
+
+
+class CppJsonGenerator():
+    """
+    Generates streaming JSON transcoders for each struct, which convert a
+    serialized struct in a 'RawBuffer' to JSON and back, without creating
+    an instance of the struct or a JSON document. For example, for the
+    struct 'TransferTransaction' the class below is generated:
+
+        ----------------------------------------------------------------------------------------
+        class TransferTransactionJson
+        {
+        public:
+            static bool ToJson  ( RawBuffer& buffer, TextWriter& out );
+            static bool FromJson( JsonReader& in, RawBuffer& buffer );
+        };
+        ----------------------------------------------------------------------------------------
+
+    'ToJson()' reads the fields from the buffer and appends them to 'out'
+    as a JSON object, and 'FromJson()' parses the members of a JSON object
+    with a 'JsonReader' and writes each field directly into the buffer:
+
+        ----------------------------------------------------------------------------------------
+        {"Transaction":{...,"type":"TRANSFER","fee":"100",...},"TransferTransactionBody":{"recipient_address":"98E5...","mosaics":[...],"message":"00313233"}}
+        ----------------------------------------------------------------------------------------
+
+    The JSON objects have the same members as the ones written by
+    'JsonTo()', except that:
+
+        * enums are written as the names of their enumerators (parsed with
+          the generated name tables, numbers are also accepted)
+        * alias byte arrays and byte arrays are written as hex strings
+        * fields which hold the element count or byte size of arrays are
+          not written, 'FromJson()' fills them in after the array
+        * the members must be in schema order when parsed, other members
+          and escape sequences in strings are rejected
+
+    For each struct group (e.g. 'TransactionType'), 'to_json_{group}()' and
+    'from_json_{group}()' dispatch on the type and version of the group
+    header. All transcoders are declared in 'json.h' and implemented in
+    'json.cpp'.
+    """
+
+    def __init__( self,
+                  input_data:                          list,
+                  class_decls:                         typing.Dict[str, CppClassDeclarationGenerator],
+                  types:                               CppTypesGenerator,
+                  type_to_versions_to_enum_to_classes: typing.Dict[str, typing.Dict[str, typing.Dict[str, str]]] ) -> None:
+
+        self.__class_decls   = class_decls
+        self.__name_to_enum  = types.name_to_enum
+        self.__name_to_alias = types.name_to_alias
+        self.__groups        = { group: versions for group, versions in type_to_versions_to_enum_to_classes.items() if versions }
+
+        self.__enum_values   = { elem["name"]: elem["values"] for elem in input_data if "enum" == elem["type"].split()[0] }
+        self.__used_enums    : typing.Set[str] = set()
+        self.__includes      : typing.Set[str] = set()
+
+        self.__declaration_code_output = ""
+        self.__definition_code_output  = ""
+
+        for class_name, decl in class_decls.items():
+            self.__generate_class( class_name, decl )
+
+        for group_name, versions_to_enum_to_classes in self.__groups.items():
+            self.__generate_group( group_name, versions_to_enum_to_classes )
+
+
+
+    def write_file( self, folder: str ) -> None:
+        f = open( folder+"/json.h", "w" )
+        f.write( '#pragma once\n\n#include "JsonReader.h"\n#include "RawBuffer.h"\n#include "TextWriter.h"\n#include "types.h"\n' )
+        f.write( self.__declaration_code_output )
+        f.close()
+
+        f = open( folder+"/json.cpp", "w" )
+        f.write( "\n".join( [ "#include <cstring>", "#include <limits>", '#include "Codec.h"', '#include "json.h"' ] + sorted( self.__includes ) ) + "\n" )
+        for enum_name in sorted( self.__used_enums ):
+            f.write( self.__generate_enum( enum_name ) )
+        f.write( self.__definition_code_output )
+        f.close()
+
+
+
+    def __generate_enum( self, enum_name: str ) -> str:
+        """
+        Generates the table of the enumerator names of an enum, sorted by
+        name for 'JsonReader::Enum()', and a function which appends the name
+        of a value (or the value, if it has no name) to a 'TextWriter'.
+        """
+
+        names  = {}
+        values = {}
+        for value in self.__enum_values[enum_name]:
+            number = int( str(value["value"]), 0 )
+            names.setdefault( value["name"], number )
+            values.setdefault( number, value["name"] ) # first enumerator wins, if values are used more than once
+
+        output  = f'\n\n// Names of the enumerators of \'{enum_name}\', sorted by name\n'
+        output += f'static const JsonName {enum_name}_names[] =\n{{\n'
+        for name in sorted( names ):
+            output += f'\t{{ "{name}", {names[name]} }},\n'
+        output += '};\n\n'
+
+        output += f'static void {enum_name}_ToJson( TextWriter& out, const uint64_t value )\n{{\n'
+        output += '\tswitch( value )\n\t{\n'
+        for number, name in values.items():
+            output += f'\t\tcase {number}: out.Text( "\\"{name}\\"" ); break;\n'
+        output += '\t\tdefault: out.UInt( value ); break;\n\t}\n}\n'
+
+        return output
+
+
+
+    def __generate_class( self, class_name: str, decl: CppClassDeclarationGenerator ) -> None:
+        json_name = f'{class_name}Json'
+
+        # Declaration
+        output  = f'\n\n/**\n * Streaming JSON transcoder for serialized \'{class_name}\' structs.\n */\n'
+        output += f'class {json_name}\n{{\npublic:\n'
+        output += f'\t// Reads a serialized \'{class_name}\' from \'buffer\' and appends it to \'out\' as a JSON object.\n'
+        output += f'\tstatic bool ToJson  ( RawBuffer& buffer, TextWriter& out );\n\n'
+        output += f'\t// Reads a \'{class_name}\' JSON object from \'in\' and writes it serialized to \'buffer\'.\n'
+        output += f'\tstatic bool FromJson( JsonReader& in, RawBuffer& buffer );\n}};\n'
+        self.__declaration_code_output += output
+
+        fields     = self.__collect_fields( decl )
+        size_vars  = { field["size"] for field in fields if field["size"] and not field["size"].isdigit() }
+        read_vars  = size_vars | { field["condition"]["condition"] for field in fields if field["condition"] }
+        sized_vars = { field["value"].split()[1] for field in fields if "reserved" == field["kind"] and len( field["value"].split() ) > 1 }
+
+
+        # ToJson
+        to_json  = f'\n\n/////////////////////////////////////////////////////////////////\n'
+        to_json += f'bool {json_name}::ToJson( RawBuffer& buffer, TextWriter& out )\n{{\n'
+        to_json += '\tout.Text( "{" );\n\n'
+
+        for field in fields:
+            name, var_type, indent = field["name"], field["type"], "\t"
+            local = self.__local_name( name )
+
+            if field["condition"]:
+                to_json += f'\tif( {self.__condition( decl, field["condition"] )} )\n\t{{\n'
+                indent = "\t\t"
+
+            if "reserved" == field["kind"]:
+                to_json += f'{indent}ptr = buffer.GetOffsetPtrAndMove( sizeof({var_type}) ); if(!ptr){{ return false; }} //< {name}\n'
+                if len( field["value"].split() ) == 1:
+                    to_json += f'{indent}if( {field["value"]} != *( ({var_type}*) ptr ) ){{ return false; }}\n'
+
+            elif "inline" == field["kind"]:
+                to_json += f'{indent}out.Key( "{var_type}" );\n'
+                to_json += f'{indent}if( !{var_type}Json::ToJson( buffer, out ) ){{ return false; }}\n'
+
+            elif "value" == field["kind"]:
+                if name in read_vars:
+                    to_json += f'{indent}ptr = buffer.GetOffsetPtrAndMove( sizeof({var_type}) ); if(!ptr){{ return false; }}\n'
+                    to_json += f'{indent}const {var_type} {local} = *( ({var_type}*) ptr );\n'
+
+                if name not in size_vars:
+                    to_json += f'{indent}out.Key( "{name}" );\n'
+                    to_json += self.__to_json_value( var_type, indent, name in read_vars, local )
+
+            elif "array" == field["kind"]:
+                to_json += self.__to_json_array( decl, field, indent )
+
+            elif "array_fill" == field["kind"]:
+                to_json += f'{indent}out.Key( "{name}" );\n'
+                if self.__is_byte( var_type ):
+                    to_json += f'{indent}const size_t count{local[3:]} = buffer.RemainingSize();\n'
+                    to_json += f'{indent}ptr = buffer.GetOffsetPtrAndMove( count{local[3:]} ); if(!ptr){{ return false; }}\n'
+                    to_json += f'{indent}out.Text( "\\"" ).Hex( ptr, count{local[3:]} ).Text( "\\"" );\n'
+                else:
+                    to_json += f'{indent}out.Text( "[" );\n'
+                    to_json += f'{indent}while( buffer.RemainingSize() )\n{indent}{{\n'
+                    to_json += f'{indent}\tout.Separator();\n'
+                    to_json += self.__to_json_value( var_type, indent+"\t" )
+                    to_json += f'{indent}}}\n'
+                    to_json += f'{indent}out.Text( "]" );\n'
+
+            elif "array_sized" == field["kind"]:
+                to_json += f'{indent}out.Key( "{name}" ).Text( "[" );\n'
+                to_json += f'{indent}for( size_t read_size = 0; read_size < {self.__local_name( field["size"] )}; )\n{indent}{{\n'
+                to_json += f'{indent}\tconst size_t rsize = buffer.RemainingSize();\n'
+                to_json += f'{indent}\tout.Separator();\n'
+                to_json += f'{indent}\tif( !to_json_{field["group"]}( buffer, out ) ){{ return false; }}\n'
+
+                if field["align"]:
+                    align = field["align"]
+                    to_json += f'{indent}\tif( !buffer.MoveOffset( ({align} - buffer.GetOffset()%{align}) % {align} ) ){{ return false; }}\n'
+
+                to_json += f'{indent}\tread_size += rsize - buffer.RemainingSize();\n'
+                to_json += f'{indent}}}\n'
+                to_json += f'{indent}out.Text( "]" );\n'
+
+            if field["condition"]:
+                to_json += '\t}\n'
+
+            to_json += '\n'
+
+        to_json += '\tout.Text( "}" );\n\treturn true;\n}\n'
+        to_json  = self.__declare_ptr( to_json, f'bool {json_name}::ToJson( RawBuffer& buffer, TextWriter& out )\n{{\n' )
+
+
+        # FromJson
+        from_json  = f'\n\n/////////////////////////////////////////////////////////////////\n'
+        from_json += f'bool {json_name}::FromJson( JsonReader& in, RawBuffer& buffer )\n{{\n'
+        from_json += '\tif( !in.BeginObject() ){ return false; }\n\n'
+
+        written_sizes  = set()
+        reserved_types = {}  # struct field name -> type of the reserved field holding its size
+        for field in fields:
+            name, var_type, indent = field["name"], field["type"], "\t"
+            local = self.__local_name( name )
+
+            if field["condition"]:
+                from_json += f'\tif( {self.__condition( decl, field["condition"] )} )\n\t{{\n'
+                indent = "\t\t"
+
+            if name in sized_vars:
+                from_json += f'{indent}const size_t start{local[3:]} = buffer.GetOffset();\n'
+
+            if "reserved" == field["kind"]:
+                value = field["value"].split()
+                if len( value ) > 1:
+                    fill = f'fill{self.__local_name( value[1] )[3:]}'
+                    reserved_types[ value[1] ] = self.__builtin_type( var_type )
+                    from_json += f'{indent}uint8_t* const {fill} = buffer.GetOffsetPtrAndMove( sizeof({var_type}) ); if( !{fill} ){{ return false; }} //< {name}, written after \'{value[1]}\'\n'
+                else:
+                    from_json += f'{indent}ptr = buffer.GetOffsetPtrAndMove( sizeof({var_type}) ); if(!ptr){{ return false; }}\n'
+                    from_json += f'{indent}*( ({var_type}*) ptr ) = {value[0]}; //< {name}\n'
+
+            elif "inline" == field["kind"]:
+                from_json += f'{indent}if( !in.Key( "{var_type}" ) || !{var_type}Json::FromJson( in, buffer ) ){{ return false; }}\n'
+
+            elif "value" == field["kind"]:
+                if name in size_vars:
+                    from_json += f'{indent}uint8_t* const fill{local[3:]} = buffer.GetOffsetPtrAndMove( sizeof({var_type}) ); if( !fill{local[3:]} ){{ return false; }} //< {name}, written after the array\n'
+                else:
+                    from_json += f'{indent}if( !in.Key( "{name}" ) ){{ return false; }}\n'
+                    from_json += self.__from_json_value( var_type, indent )
+
+                    if name in read_vars:
+                        from_json += f'{indent}const {var_type} {local} = *( ({var_type}*) ptr );\n'
+
+            elif field["kind"] in [ "array", "array_fill", "array_sized" ]:
+                from_json += self.__from_json_array( decl, field, indent, field["size"] in written_sizes )
+                written_sizes.add( field["size"] )
+
+            if name in sized_vars:
+                size_type  = reserved_types[name]
+                from_json += f'{indent}const {size_type} size{local[3:]} = static_cast<{size_type}>( buffer.GetOffset() - start{local[3:]} );\n'
+                from_json += f'{indent}memcpy( fill{local[3:]}, &size{local[3:]}, sizeof({size_type}) );\n'
+
+            if field["condition"]:
+                from_json += '\t}\n'
+
+            from_json += '\n'
+
+        from_json += '\treturn in.EndObject();\n}\n'
+        from_json  = self.__declare_ptr( from_json, f'bool {json_name}::FromJson( JsonReader& in, RawBuffer& buffer )\n{{\n' )
+
+        self.__definition_code_output += to_json + from_json
+
+
+
+    def __collect_fields( self, decl: CppClassDeclarationGenerator ) -> typing.List[dict]:
+        """
+        Returns the fields of a struct which are serialized, in the same way
+        as they are added to the (de)serialization generators in
+        'CppClassDefinitionGenerator': only the first field with a
+        condition on a field is serialized, and conditional fields before
+        the field they depend on are union members, which are always
+        serialized.
+        """
+
+        fields     = []
+        conditions = decl.conditions.copy()
+
+        for idx, field in enumerate( decl.fields ):
+            disposition = field["disposition"] if "disposition" in field else ""
+            var_type    = field["type"]
+            entry       = { "kind": "value", "name": field["name"] if "name" in field else var_type, "type": var_type,
+                            "size": str( field["size"] ) if "size" in field else "", "value": str( field.get( "value", "" ) ),
+                            "condition": None, "align": str( field.get( "align", "" ) ), "group": "" }
+
+            if disposition in [ "const", "struct_type" ]:
+                continue
+
+            elif disposition in [ "inline", "reserved", "array", "array_fill", "array_sized" ]:
+                entry["kind"] = disposition
+
+                if "array_sized" == disposition:
+                    _, entry["group"] = self.__class_decls[var_type].member_vars[ field["header_type_field"] ]
+
+            elif "condition" in field:
+                condition_name = field["condition"]
+                if condition_name not in conditions:
+                    continue
+
+                idx_cond, _ = decl.member_vars[condition_name]
+                if idx_cond < idx:
+                    entry["condition"] = conditions[condition_name][0]
+
+                del conditions[condition_name]
+
+            if var_type in self.__name_to_enum:
+                self.__used_enums.add( var_type )
+
+            fields.append( entry )
+
+        return fields
+
+
+
+    def __to_json_value( self, var_type: str, indent: str, read: bool = False, local: str = "" ) -> str:
+        """
+        Generates code which reads a value of 'var_type' from the buffer and
+        appends it to 'out'. If 'read', the value was already read into the
+        local variable 'local'.
+        """
+
+        if var_type in self.__class_decls:
+            return f'{indent}if( !{var_type}Json::ToJson( buffer, out ) ){{ return false; }}\n'
+
+        output = ""
+        if not read:
+            output += f'{indent}ptr = buffer.GetOffsetPtrAndMove( sizeof({var_type}) ); if(!ptr){{ return false; }}\n'
+
+        value = local if read else f'*( ({var_type}*) ptr )'
+
+        if var_type in self.__name_to_alias and self.__name_to_alias[var_type].size > 1:
+            output += f'{indent}out.Text( "\\"" ).Hex( ptr, sizeof({var_type}) ).Text( "\\"" );\n'
+
+        elif var_type in self.__name_to_enum:
+            output += f'{indent}{var_type}_ToJson( out, static_cast<uint64_t>( {value} ) );\n'
+
+        else:
+            builtin_type = self.__builtin_type( var_type )
+            method       = "UInt" if builtin_type.startswith( "u" ) else "Int"
+
+            # 64 bit integers are strings, since JSON numbers are doubles
+            if "64" in builtin_type:
+                output += f'{indent}out.Text( "\\"" ).{method}( {value} ).Text( "\\"" );\n'
+            else:
+                output += f'{indent}out.{method}( {value} );\n'
+
+        return output
+
+
+
+    def __to_json_array( self, decl: CppClassDeclarationGenerator, field: dict, indent: str ) -> str:
+        name, var_type, size = field["name"], field["type"], field["size"]
+        count = size if size.isdigit() else self.__local_name( size )
+
+        output = ""
+        if not size.isdigit():
+            # a count of the largest value of its type clears the array, as in 'Deserialize()'
+            output += f'{indent}const size_t count{self.__local_name( name )[3:]} = ( std::numeric_limits<{self.__var_type( decl, size )}>::max() == {count} ) ? 0 : {count};\n'
+            count   = f'count{self.__local_name( name )[3:]}'
+
+        output += f'{indent}out.Key( "{name}" );\n'
+
+        if self.__is_byte( var_type ):
+            output += f'{indent}ptr = buffer.GetOffsetPtrAndMove( {count} ); if(!ptr){{ return false; }}\n'
+            output += f'{indent}out.Text( "\\"" ).Hex( ptr, {count} ).Text( "\\"" );\n'
+            return output
+
+        output += f'{indent}out.Text( "[" );\n'
+        output += f'{indent}for( size_t i=0; i<{count}; ++i )\n{indent}{{\n'
+        output += f'{indent}\tout.Separator();\n'
+        output += self.__to_json_value( var_type, indent+"\t" )
+        output += f'{indent}}}\n'
+        output += f'{indent}out.Text( "]" );\n'
+        return output
+
+
+
+    def __from_json_value( self, var_type: str, indent: str ) -> str:
+        """
+        Generates code which parses a value of 'var_type' and writes it to the buffer.
+        """
+
+        if var_type in self.__class_decls:
+            return f'{indent}if( !{var_type}Json::FromJson( in, buffer ) ){{ return false; }}\n'
+
+        output = f'{indent}ptr = buffer.GetOffsetPtrAndMove( sizeof({var_type}) );\n'
+
+        if var_type in self.__name_to_alias and self.__name_to_alias[var_type].size > 1:
+            output += f'{indent}if( !ptr || !in.Hex( ptr, sizeof({var_type}) ) ){{ return false; }}\n'
+
+        elif var_type in self.__name_to_enum:
+            output += f'{indent}if( !ptr || !in.Enum( ptr, sizeof({var_type}), {var_type}_names, sizeof({var_type}_names)/sizeof(JsonName) ) ){{ return false; }}\n'
+
+        else:
+            method  = "UInt" if self.__builtin_type( var_type ).startswith( "u" ) else "Int"
+            output += f'{indent}if( !ptr || !in.{method}( ptr, sizeof({var_type}) ) ){{ return false; }}\n'
+
+        return output
+
+
+
+    def __from_json_array( self, decl: CppClassDeclarationGenerator, field: dict, indent: str, size_written: bool ) -> str:
+        """
+        Generates code which parses an array and writes its elements to the
+        buffer, and then writes the element count (or byte size) to the size
+        field. If the size field was already written by another array, the
+        count must be the same.
+        """
+
+        name, var_type, size = field["name"], field["type"], field["size"]
+        local  = self.__local_name( name )
+        output = f'{indent}if( !in.Key( "{name}" ) ){{ return false; }}\n'
+
+        if "array_sized" == field["kind"]:
+            output += f'{indent}const size_t start{local[3:]} = buffer.GetOffset();\n'
+
+        if self.__is_byte( var_type ) and "array_sized" != field["kind"]:
+            output += f'{indent}const char* hex{local[3:]};\n'
+            output += f'{indent}size_t count{local[3:]};\n'
+            output += f'{indent}if( !in.String( hex{local[3:]}, count{local[3:]} ) ){{ return false; }}\n'
+            output += f'{indent}if( count{local[3:]} % 2 ){{ return in.Fail( "{name}: odd number of hex digits" ); }}\n'
+            output += f'{indent}count{local[3:]} /= 2;\n'
+            output += f'{indent}ptr = buffer.GetOffsetPtrAndMove( count{local[3:]} );\n'
+            output += f'{indent}if( !ptr ){{ return false; }}\n'
+            output += f'{indent}if( !Codec::HexDecode( hex{local[3:]}, 2*count{local[3:]}, ptr ) ){{ return in.Fail( "{name}: invalid hex string" ); }}\n'
+        else:
+            output += f'{indent}size_t count{local[3:]} = 0;\n'
+            output += f'{indent}if( !in.BeginArray() ){{ return false; }}\n'
+            output += f'{indent}for( ; !in.EndArray(); ++count{local[3:]} )\n{indent}{{\n'
+            output += f'{indent}\tif( !in.Element() ){{ return false; }}\n'
+
+            if "array_sized" == field["kind"]:
+                output += f'{indent}\tif( !from_json_{field["group"]}( in, buffer ) ){{ return false; }}\n'
+
+                if field["align"]:
+                    align = field["align"]
+                    output += f'{indent}\tconst size_t padding = ({align} - buffer.GetOffset()%{align}) % {align};\n'
+                    output += f'{indent}\tptr = buffer.GetOffsetPtrAndMove( padding ); if(!ptr){{ return false; }}\n'
+                    output += f'{indent}\tmemset( ptr, 0, padding );\n'
+            else:
+                output += self.__from_json_value( var_type, indent+"\t" )
+
+            output += f'{indent}}}\n'
+
+        # the size of 'array_sized' fields is their size in bytes
+        count = f'count{local[3:]}'
+        unit  = "bytes" if self.__is_byte( var_type ) else "elements"
+        if "array_sized" == field["kind"]:
+            output += f'{indent}const size_t bytes{local[3:]} = buffer.GetOffset() - start{local[3:]};\n'
+            count   = f'bytes{local[3:]}'
+            unit    = "bytes"
+
+        # e.g. "mosaics: 3 elements"
+        found = f'"{name}: " + std::to_string( {count} ) + " {unit}'
+
+        if size.isdigit():
+            output += f'{indent}if( {size} != {count} ){{ return in.Fail( {found}, expected {size}" ); }}\n'
+
+        elif size:
+            size_type = self.__var_type( decl, size )
+            size_ptr  = f'fill{self.__local_name( size )[3:]}'
+
+            if size_written:
+                output += f'{indent}{size_type} size{local[3:]};\n'
+                output += f'{indent}memcpy( &size{local[3:]}, {size_ptr}, sizeof({size_type}) );\n'
+                output += f'{indent}if( size{local[3:]} != {count} ){{ return in.Fail( {found}, expected " + std::to_string( size{local[3:]} ) ); }}\n'
+            else:
+                # the largest value of an element count clears the array when deserialized, so it can not be written
+                compare = ">" if "array_sized" == field["kind"] else ">="
+                output += f'{indent}if( {count} {compare} std::numeric_limits<{size_type}>::max() ){{ return in.Fail( {found}, too many for \'{size}\'" ); }}\n'
+                output += f'{indent}const {size_type} size{local[3:]} = static_cast<{size_type}>( {count} );\n'
+                output += f'{indent}memcpy( {size_ptr}, &size{local[3:]}, sizeof({size_type}) );\n'
+
+        return output
+
+
+
+    def __generate_group( self, group_name: str, versions_to_enum_to_classes: dict ) -> None:
+        """
+        Generates the functions which transcode a struct of a group, whose
+        type is given by the type and version of the group header.
+        'from_json_{group}()' gets them by transcoding the header, which is
+        the first member of each struct in the group, into 'buffer' without
+        moving it.
+        """
+
+        first_class   = list( list(versions_to_enum_to_classes.values())[0].values() )[0]
+        decl          = self.__class_decls[first_class]
+        header_class  = decl.group_header
+        type_field    = "header." + CppFieldGenerator.convert_to_field_name( decl.header_type_field )
+        version_field = "header." + CppFieldGenerator.convert_to_field_name( decl.header_version_field ) if decl.header_version_field else "1"
+
+        for enum_to_classes in versions_to_enum_to_classes.values():
+            for class_name in enum_to_classes.values():
+                first_field = next( field for field in self.__class_decls[class_name].fields if "struct_type" != field.get( "disposition" ) )
+                if "inline" != first_field.get( "disposition" ) or header_class != first_field["type"]:
+                    print( f'Error: The first field of struct "{class_name}" must be its group header "{header_class}" for JSON transcoding!\n' )
+                    exit(1)
+
+        self.__includes.add( f'#include "{header_class}.h"' )
+
+        self.__declaration_code_output += f'\n\n/**\n * Transcodes a serialized struct of the group \'{group_name}\', whose type and version\n'
+        self.__declaration_code_output += f' * are given by its \'{header_class}\' header, to JSON and back (see \'{header_class}Json\').\n */\n'
+        self.__declaration_code_output += f'bool to_json_{group_name}( RawBuffer& buffer, TextWriter& out );\n'
+        self.__declaration_code_output += f'bool from_json_{group_name}( JsonReader& in, RawBuffer& buffer );\n'
+
+        dispatch = {}
+        for method, args in [ ( "ToJson", "buffer, out" ), ( "FromJson", "in, buffer" ) ]:
+            output  = f'\tswitch( {version_field} )\n\t{{\n'
+            for version, enum_to_classes in versions_to_enum_to_classes.items():
+                output += f'\t\tcase {version}:\n\t\t\tswitch( {type_field} )\n\t\t\t{{\n'
+                for enum_type, class_name in enum_to_classes.items():
+                    output += f'\t\t\t\tcase {group_name}::{enum_type}: {{ return {class_name}Json::{method}( {args} ); }}\n'
+                output += f'\t\t\t\tdefault: {{ return false; }}\n\t\t\t}}\n'
+            output += f'\n\t\tdefault: {{ return false; }}\n\t}}\n'
+            dispatch[method] = output
+
+        output  = f'\n\n/////////////////////////////////////////////////////////////////\n'
+        output += f'bool to_json_{group_name}( RawBuffer& buffer, TextWriter& out )\n{{\n'
+        output += f'\tRawBuffer headerBuf = buffer;\n'
+        output += f'\t{header_class} header;\n'
+        output += f'\tif( !header.Deserialize( headerBuf ) ){{ return false; }}\n\n'
+        output += dispatch["ToJson"]
+        output += '}\n'
+
+        output += f'\n\n/////////////////////////////////////////////////////////////////\n'
+        output += f'bool from_json_{group_name}( JsonReader& in, RawBuffer& buffer )\n{{\n'
+        output += f'\t// Write the header without moving \'in\' and \'buffer\', and deserialize it\n'
+        output += f'\tJsonReader headerIn  = in;\n'
+        output += f'\tRawBuffer  headerBuf = buffer;\n'
+        output += f'\tif( !headerIn.BeginObject() || !headerIn.Key( "{header_class}" ) || !{header_class}Json::FromJson( headerIn, headerBuf ) ){{ in = headerIn; return false; }} // keep the error\n\n'
+        output += f'\tRawBuffer written( buffer.GetOffsetPtr(), headerBuf.GetOffset() - buffer.GetOffset() );\n'
+        output += f'\t{header_class} header;\n'
+        output += f'\tif( !header.Deserialize( written ) ){{ return false; }}\n\n'
+        output += dispatch["FromJson"]
+        output += '}\n'
+
+        self.__definition_code_output += output
+
+
+
+    def __condition( self, decl: CppClassDeclarationGenerator, condition: dict ) -> str:
+        """
+        Generates the C++ condition expression of a condition field, on the
+        local variable which holds the value of the condition variable.
+        """
+
+        op    = "!=" if "not equals" == condition["condition_operation"] else "=="
+        value = condition["condition_value"]
+
+        _, cond_type = decl.member_vars[ condition["condition"] ]
+        if cond_type in self.__name_to_enum:
+            value = f'{cond_type}::{value}'
+
+        return f'{self.__local_name( condition["condition"] )} {op} {value}'
+
+
+
+    def __var_type( self, decl: CppClassDeclarationGenerator, var_name: str ) -> str:
+        """
+        Returns the builtin type of the member 'var_name' (an array size).
+        """
+
+        _, var_type = decl.member_vars[var_name]
+        return self.__builtin_type( var_type )
+
+
+
+    def __declare_ptr( self, code: str, signature: str ) -> str:
+        """
+        Declares the pointer to the serialized bytes of the current field
+        in the generated method, if the method uses it.
+        """
+
+        if not re.search( r'\bptr\b', code ):
+            return code
+
+        return code.replace( signature, signature + '\tuint8_t* ptr;\n', 1 )
+
+
+
+    def __builtin_type( self, var_type: str ) -> str:
+        if var_type in self.__name_to_enum:
+            return self.__name_to_enum[var_type].type
+
+        if var_type in self.__name_to_alias:
+            return self.__name_to_alias[var_type].type
+
+        return var_type
+
+
+
+    def __is_byte( self, var_type: str ) -> bool:
+        return var_type in [ "uint8_t", "int8_t" ]
+
+
+
+    @staticmethod
+    def __local_name( name: str ) -> str:
+        return "tmp" + CppFieldGenerator.convert_to_field_name( name )[1:]
@@ -2,88 +2,93 @@ import typing
 
 from .CppFieldGenerator import CppFieldGenerator
 from .CppTypesGenerator import CppTypesGenerator
+from .TypeLayoutAnalyzer import TypeLayoutAnalyzer
 
 
 class CppPrintOutputGenerator():
     """
-    Generates a 'Print()' C++ method to pretty print deserialized raw byte buffer inputs.
-    Fields are added for printing by calling 'xyz_field()' methods and when done the C++ 
-    print method is generated by calling the 'generate()' method.
+    Generates the 'PrintTo()' and 'JsonTo()' C++ methods, which append a
+    deserialized raw byte buffer as indented text or as a JSON object to a
+    'TextWriter'. Fields are added for printing by calling 'xyz_field()'
+    methods and when done the C++ methods are generated by calling the
+    'generate()' method.
+
+    Byte arrays are formatted according to their print hint ('hex', 'base32',
+    'ascii' or 'num'). Sizes of fields are computed when generating the code,
+    and 'Size()' is only called for the outermost struct.
     """
 
-    def __init__( self, types: CppTypesGenerator, class_name: str, size_to_arrays : typing.Dict[str, typing.List[str]] ) -> None:
+    def __init__( self, types: CppTypesGenerator, layouts: TypeLayoutAnalyzer, class_name: str, size_to_arrays : typing.Dict[str, typing.List[str]] ) -> None:
         self.__name_to_enum   = types.name_to_enum
         self.__name_to_alias  = types.name_to_alias
+        self.__layouts        = layouts
         self.__size_to_arrays = size_to_arrays
 
-        self.__code_output   = f'void {class_name}::Print( size_t level )\n{{\n'
-        self.__code_output  += f"\tstd::string tabs( level, '\\t' );\n"
-        self.__code_output  += f'\tstd::cout << tabs << "{class_name} (" << Size() <<" bytes)\\n";\n'
-        self.__code_output  += f'\tstd::cout << tabs << "{{\\n";\n\n'
+        self.__code_output   = f'void {class_name}::PrintTo( TextWriter& out, const size_t level )\n{{\n'
+        self.__code_output  += f'\tout.Indent( level ).Text( "{class_name}" );\n'
+        self.__code_output  += f'\tif( 0 == level ){{ out.Text( " (" ).UInt( Size() ).Text( " bytes)" ); }}\n'
+        self.__code_output  += f'\tout.Text( "\\n" ).Indent( level ).Text( "{{\\n" );\n\n'
+
+        self.__json_output   = f'void {class_name}::JsonTo( TextWriter& out )\n{{\n'
+        self.__json_output  += f'\tout.Text( "{{" );\n'
 
 
     def normal_field( self, var_type: str, var_name: str, print_hint: str = "" ):
         member_name = CppFieldGenerator.convert_to_field_name(var_name)
 
-        if var_type in self.__name_to_alias:
-            typedef = self.__name_to_alias[var_type]
-
-            if typedef.size == 1:
-                self.__code_output += f'\tstd::cout << tabs << "\\t{var_type} {member_name}: " << +(static_cast<{typedef.type}>({member_name})) << " (" << sizeof({member_name}) <<" bytes)\\n";\n'
-            else:
-                print_mod, separator = get_print_mod(typedef.hint)
-
-                self.__code_output += f'\n\t{{'
-                self.__code_output += f'\tstd::ios_base::fmtflags flags( std::cout.flags() );\n'
-                self.__code_output += f'\tstd::cout << tabs << "\\t{typedef.type} " << "{member_name}[ " << {typedef.size} << " ] = ";\n'
-                self.__code_output += f'\tfor( size_t j=0; j<{typedef.size}; ++j )\n'
-                self.__code_output += f'\t{{\n'
-                self.__code_output += f'\t\tstd::cout <<  {print_mod}{member_name}.data[j] {separator};\n'
-                self.__code_output += f'\t}}\n'
-                self.__code_output += f'\tstd::cout.flags( flags );\n\t}}\n'
-                self.__code_output += f'\tstd::cout <<  " (" << sizeof({member_name}) <<" bytes)\\n";\n'
-
-        elif var_type in self.__name_to_enum:
-            enum_type = self.__name_to_enum[var_type].type
-            self.__code_output += f'\tstd::cout << tabs << "\\t{var_type} {member_name}: " << +static_cast<{enum_type}>({member_name}) << " (" << sizeof({member_name}) <<" bytes)\\n";\n'
-
-        elif var_type in CppFieldGenerator.builtin_types:
-
-            if var_name in self.__size_to_arrays:
-                array_name = self.__size_to_arrays[var_name][0]
-                array_name = CppFieldGenerator.convert_to_field_name(array_name)
-                self.__code_output += f'\tstd::cout << tabs << "\\t{var_type} {member_name}: " << {array_name}.size() << " (" << sizeof({var_type}) <<" bytes)\\n";\n'
-            else:
-                print_mod, _ = get_print_mod(print_hint)
-                self.__code_output += f'\n\t{{'
-                self.__code_output += f'\tstd::ios_base::fmtflags flags( std::cout.flags() );\n'
-                self.__code_output += f'\tstd::cout << tabs << "\\t{var_type} {member_name}: " << {print_mod}{member_name} << " (" << sizeof({member_name}) <<" bytes)\\n";\n'
-                self.__code_output += f'\tstd::cout.flags( flags );\n\t}}\n'
+        if var_type in CppFieldGenerator.builtin_types and var_name in self.__size_to_arrays:
+            array_name = CppFieldGenerator.convert_to_field_name( self.__size_to_arrays[var_name][0] )
+            self.__code_output += f'\tout.Indent( level+1 ).Text( "{var_type} {member_name}: " ).UInt( {array_name}.size() ).Text( " ({self.__layouts.type_size(var_type)} bytes)\\n" );\n'
+            self.__json_output += f'\tout.Key( "{var_name}" ).UInt( {array_name}.size() );\n'
+            return
 
-        else:
-            self.__code_output += f'\t{member_name}.Print( level+1 );\n'
+        self.__field( var_type, member_name, member_name, print_hint, "\t" )
+        self.__json_output += f'\tout.Key( "{var_name}" );\n'
+        self.__json_value( var_type, member_name, print_hint, "\t" )
 
 
 
     def array_field( self, array_type: str, array_name: str, print_hint: str = "" ):
-        arr_member_name = CppFieldGenerator.convert_to_field_name( array_name )
+        member_name = CppFieldGenerator.convert_to_field_name( array_name )
+
+        # byte arrays with a print hint are printed on one line
+        if array_type in ["uint8_t", "int8_t"] and print_hint in ["hex", "base32", "ascii"]:
+            method = self.__bytes_method( print_hint )
+            self.__code_output += f'\tout.Indent( level+1 ).Text( "{array_type} {member_name}[ " ).UInt( {member_name}.size() ).Text( " ] = " )'
+            self.__code_output += f'.{method}( (const uint8_t*) {member_name}.data(), {member_name}.size() ).Text( " (" ).UInt( {member_name}.size() ).Text( " bytes)\\n" );\n'
+
+            self.__json_output += f'\tout.Key( "{array_name}" );\n'
+            self.__json_output += self.__json_bytes( print_hint, f'(const uint8_t*) {member_name}.data()', f'{member_name}.size()', "\t" )
+            return
 
         self.__code_output += f'\n'
-        self.__code_output += f'\tstd::cout << tabs << "\\t{array_type} " << "{arr_member_name}[ " << {arr_member_name}.size() << " ] =\\n";\n' 
-        self.__code_output += f'\tstd::cout << tabs << "\\t[\\n";\n'
-        self.__code_output += f'\tfor( size_t i=0; i<{arr_member_name}.size(); ++i )\n'
+        self.__code_output += f'\tout.Indent( level+1 ).Text( "{array_type} {member_name}[ " ).UInt( {member_name}.size() ).Text( " ] =\\n" );\n'
+        self.__code_output += f'\tout.Indent( level+1 ).Text( "[\\n" );\n'
+        self.__code_output += f'\tfor( size_t i=0; i<{member_name}.size(); ++i )\n'
         self.__code_output += f'\t{{\n'
+        self.__field( array_type, f'{member_name}[i]', f'{member_name}[i]', print_hint, "\t\t" )
+        self.__code_output += f'\t}}\n'
 
-        self.normal_field(array_type, array_name+'[i]', print_hint)
+        if self.__layouts.is_scalar( array_type ):
+            self.__code_output += f'\tout.Indent( level+1 ).Text( "] (" ).UInt( {self.__layouts.type_size( array_type )} * {member_name}.size() ).Text( " bytes)\\n" );\n'
+        else:
+            self.__code_output += f'\tout.Indent( level+1 ).Text( "]\\n" );\n'
 
-        self.__code_output += f'\t}}\n'
-        self.__code_output += f'\tstd::cout << tabs <<"\\t] (" << sizeof({array_type}) * {arr_member_name}.size() <<" bytes)\\n";\n'
+        self.__json_output += f'\tout.Key( "{array_name}" ).Text( "[" );\n'
+        self.__json_output += f'\tfor( size_t i=0; i<{member_name}.size(); ++i )\n'
+        self.__json_output += f'\t{{\n'
+        self.__json_output += f'\t\tout.Separator();\n'
+        self.__json_value( array_type, f'{member_name}[i]', print_hint, "\t\t" )
+        self.__json_output += f'\t}}\n'
+        self.__json_output += f'\tout.Text( "]" );\n'
 
 
 
     def inline_field( self, var_name: str ):
-        var_name = CppFieldGenerator.convert_to_field_name(var_name)
-        self.__code_output += f'\t{var_name}.Print( level+1 );\n'
+        member_name = CppFieldGenerator.convert_to_field_name(var_name)
+        self.__code_output += f'\t{member_name}.PrintTo( out, level+1 );\n'
+        self.__json_output += f'\tout.Key( "{var_name}" );\n'
+        self.__json_output += f'\t{member_name}.JsonTo( out );\n'
 
 
 
@@ -94,20 +99,28 @@ class CppPrintOutputGenerator():
             var_field = CppFieldGenerator.convert_to_field_name(tmp[1])
             var_value = f'{var_field}.Size()'
 
-        self.__code_output += f'\tstd::cout << tabs << "\\t{var_type} {var_name}: " << {var_value} << " (" << sizeof({var_type}) <<" bytes)\\n";\n'
+        self.__code_output += f'\tout.Indent( level+1 ).Text( "{var_type} {var_name}: " ).UInt( {var_value} ).Text( " ({self.__layouts.type_size(var_type)} bytes)\\n" );\n'
 
 
 
     def array_sized_field( self, array_type: str, array_name: str, array_size: str ):
-        array_name = CppFieldGenerator.convert_to_field_name(array_name)
-        array_size = CppFieldGenerator.convert_to_field_name(array_size)
+        member_name = CppFieldGenerator.convert_to_field_name(array_name)
 
-        self.__code_output += f'\tstd::cout << tabs << "\\t{array_type} " << "{array_name}[ " << {array_name}.size() << " ] =\\n";\n' 
-        self.__code_output += f'\tstd::cout << tabs << "\\t[\\n";\n'
-        self.__code_output += f'\tfor( size_t i=0; i<{array_name}.size(); ++i )\n'
+        self.__code_output += f'\tout.Indent( level+1 ).Text( "{array_type} {member_name}[ " ).UInt( {member_name}.size() ).Text( " ] =\\n" );\n'
+        self.__code_output += f'\tout.Indent( level+1 ).Text( "[\\n" );\n'
+        self.__code_output += f'\tfor( size_t i=0; i<{member_name}.size(); ++i )\n'
         self.__code_output += f'\t{{\n'
-        self.__code_output += f'\t\t{array_name}[i]->Print( level+1 );'
+        self.__code_output += f'\t\t{member_name}[i]->PrintTo( out, level+2 );\n'
         self.__code_output += f'\t}}\n'
+        self.__code_output += f'\tout.Indent( level+1 ).Text( "]\\n" );\n'
+
+        self.__json_output += f'\tout.Key( "{array_name}" ).Text( "[" );\n'
+        self.__json_output += f'\tfor( size_t i=0; i<{member_name}.size(); ++i )\n'
+        self.__json_output += f'\t{{\n'
+        self.__json_output += f'\t\tout.Separator();\n'
+        self.__json_output += f'\t\t{member_name}[i]->JsonTo( out );\n'
+        self.__json_output += f'\t}}\n'
+        self.__json_output += f'\tout.Text( "]" );\n'
 
 
 
@@ -116,31 +129,138 @@ class CppPrintOutputGenerator():
 
 
 
-    def condition( self, var_type: str, var_name: str, condition: str, union_name: str = "" ):
-        self.__code_output += f'\tstd::cout << tabs << "\\tTODO: to be implemented when unions implemented in schemas!!!: if( {condition} ) {var_type} {var_name}\\n";\n'
-        #TODO: implement this when unions and 
+    def condition( self, var_name: str, var_type: str, condition: str, union_name: str = "" ):
+        member_name = CppFieldGenerator.convert_to_field_name(var_name)
+
+        # union members are always serialized, conditional fields only if the condition is true
+        if union_name:
+            member_name = CppFieldGenerator.convert_to_field_name(union_name) + "." + member_name
+            indent      = "\t"
+        else:
+            self.__code_output += f'\tif( {condition} )\n\t{{\n'
+            self.__json_output += f'\tif( {condition} )\n\t{{\n'
+            indent      = "\t\t"
+
+        self.__field( var_type, member_name, member_name, "", indent )
+        self.__json_output += f'{indent}out.Key( "{var_name}" );\n'
+        self.__json_value( var_type, member_name, "", indent )
+
+        if not union_name:
+            self.__code_output += '\t}\n'
+            self.__json_output += '\t}\n'
+
+
+
+    def generate( self, inline: bool = False ) -> str:
+        self.__code_output  += '\n\tout.Indent( level ).Text( "}\\n" );\n'
+        self.__code_output  += "}\n\n\n"
+
+        self.__json_output  += '\tout.Text( "}" );\n'
+        self.__json_output  += "}\n"
+
+        specifier = "inline " if inline else ""
+        return specifier + self.__code_output + specifier + self.__json_output
 
 
 
-    def generate( self ) -> str:
-        self.__code_output  += '\n\tstd::cout << tabs << "}\\n";\n'
-        self.__code_output  += "}\n"
-        return self.__code_output
+    def __field( self, var_type: str, label: str, member: str, print_hint: str, indent: str ):
+        """
+        Generates code which prints a single field (or array element) 'member'
+        of type 'var_type' on one line, or a nested struct.
+        """
 
+        if var_type in self.__name_to_alias and self.__name_to_alias[var_type].size > 1:
+            typedef = self.__name_to_alias[var_type]
+            size    = self.__layouts.type_size( var_type )
+            hint    = typedef.hint if typedef.hint else "num"
+
+            self.__code_output += f'{indent}out.Indent( level+1 ).Text( "{typedef.type} {label}[ {typedef.size} ] = " );\n'
+
+            if "num" == hint:
+                self.__code_output += f'{indent}for( size_t j=0; j<{typedef.size}; ++j ){{ out{self.__number( typedef.type, f"{member}.data[j]" )}.Text( "|" ); }}\n'
+            else:
+                self.__code_output += f'{indent}out.{self.__bytes_method( hint )}( (const uint8_t*) {member}.data, {size} );\n'
 
+            self.__code_output += f'{indent}out.Text( " ({size} bytes)\\n" );\n'
 
-def get_print_mod( print_hint: str ):
-    if print_hint == "hex":
-        print_mod = "std::setfill(\'0\') << std::setw(2) << std::hex << +"
-        separator = ''
-    elif print_hint == "ascii":
-        print_mod = ""
-        separator = ''
-    elif print_hint == "num" or print_hint == "": 
-        print_mod = "+"
-        separator = '<< "|"'
-    else:
-        print(f"Error: Unknown hint '{print_hint}' !")
-        exit(1)
+        elif self.__layouts.is_scalar( var_type ):
+            if "hex" == print_hint:
+                value = f'.Text( "0x" ).HexUInt( (uint64_t) {member}, {self.__layouts.type_size(var_type)} )'
+            else:
+                value = self.__number( var_type, member )
+
+            self.__code_output += f'{indent}out.Indent( level+1 ).Text( "{var_type} {label}: " ){value}.Text( " ({self.__layouts.type_size(var_type)} bytes)\\n" );\n'
+
+        else:
+            self.__code_output += f'{indent}{member}.PrintTo( out, level+1 );\n'
+
+
+
+    def __json_value( self, var_type: str, member: str, print_hint: str, indent: str ):
+        """
+        Generates code which appends the JSON value of 'member'.
+        """
+
+        if var_type in self.__name_to_alias and self.__name_to_alias[var_type].size > 1:
+            typedef = self.__name_to_alias[var_type]
+
+            if "num" == typedef.hint:
+                self.__json_output += f'{indent}out.Text( "[" );\n'
+                self.__json_output += f'{indent}for( size_t j=0; j<{typedef.size}; ++j ){{ out.Separator(){self.__number( typedef.type, f"{member}.data[j]" )}; }}\n'
+                self.__json_output += f'{indent}out.Text( "]" );\n'
+            else:
+                self.__json_output += self.__json_bytes( typedef.hint, f'(const uint8_t*) {member}.data', str(self.__layouts.type_size( var_type )), indent )
+
+        elif self.__layouts.is_scalar( var_type ):
+            # 64 bit integers are strings, since JSON numbers are doubles
+            if 8 == self.__layouts.type_size( var_type ):
+                self.__json_output += f'{indent}out.Text( "\\"" ){self.__number( var_type, member )}.Text( "\\"" );\n'
+            else:
+                self.__json_output += f'{indent}out{self.__number( var_type, member )};\n'
+
+        else:
+            self.__json_output += f'{indent}{member}.JsonTo( out );\n'
+
+
+
+    def __json_bytes( self, print_hint: str, data: str, size: str, indent: str ) -> str:
+        if "ascii" == print_hint:
+            return f'{indent}out.JsonString( {data}, {size} );\n'
+
+        return f'{indent}out.Text( "\\"" ).{self.__bytes_method( print_hint if print_hint else "hex" )}( {data}, {size} ).Text( "\\"" );\n'
+
+
+
+    def __bytes_method( self, print_hint: str ) -> str:
+        methods = { "hex": "Hex", "base32": "Base32", "ascii": "Ascii" }
+
+        if print_hint not in methods:
+            print(f"Error: Unknown hint '{print_hint}' !")
+            exit(1)
+
+        return methods[print_hint]
+
+
+
+    def __number( self, var_type: str, member: str ) -> str:
+        """
+        Returns the 'TextWriter' call which appends 'member' as a decimal number.
+        """
+
+        builtin_type = self.__builtin_type( var_type )
+
+        if builtin_type.startswith("u"):
+            return f'.UInt( static_cast<{builtin_type}>( {member} ) )'
+
+        return f'.Int( static_cast<{builtin_type}>( {member} ) )'
+
+
+
+    def __builtin_type( self, var_type: str ) -> str:
+        if var_type in self.__name_to_enum:
+            return self.__name_to_enum[var_type].type
+
+        if var_type in self.__name_to_alias:
+            return self.__name_to_alias[var_type].type
 
-    return print_mod, separator
+        return var_type
@@ -0,0 +1,338 @@
+import typing
+
+from .CppFieldGenerator import CppFieldGenerator
+from .TypeLayoutAnalyzer import TypeLayoutAnalyzer
+from .CppDeserializationGenerator import CppDeserializationGenerator
+
+
+
+class CppSelectGenerator():
+    """
+    Generates a 'DeserializeSelected()' C++ method, which only deserializes
+    the fields whose bits are set in a mask. Each named field of a struct,
+    including the fields of its inline members, has a bit in the 'FieldMask'
+    enum of the struct, e.g. for 'TransferTransaction':
+
+        ----------------------------------------------------------------------------------------
+        enum FieldMask : uint64_t
+        {
+            FIELD_SIZE = uint64_t(1) << 0,
+            ...
+            FIELD_FEE = uint64_t(1) << 6,
+            FIELD_DEADLINE = uint64_t(1) << 7,
+            FIELD_RECIPIENT_ADDRESS = uint64_t(1) << 8,
+            ...
+            FIELD_ALL = ...,
+        };
+
+        tx.DeserializeSelected( buffer, TransferTransaction::FIELD_FEE | TransferTransaction::FIELD_RECIPIENT_ADDRESS );
+        ----------------------------------------------------------------------------------------
+
+    The bits of an inline member follow each other in the order of its
+    fields, so the mask is passed on to it shifted by the bit of its first
+    field. Consecutive fixed sized fields are read with a single bounds
+    check, and unselected ones are skipped by their offsets. Unselected
+    variable sized fields are skipped with their size fields, like in
+    'SkipOver()', and keep their previous values. Fields which other fields
+    depend on (array sizes and conditions), unions and reserved fields are
+    always read and checked.
+    """
+
+    def __init__( self,
+                  layouts:        TypeLayoutAnalyzer,
+                  class_decl:     "CppClassDeclarationGenerator",
+                  class_decls:    typing.Dict[str, "CppClassDeclarationGenerator"],
+                  read_vars:      typing.Set[str],
+                  parallel:       bool = False ) -> None:
+
+        self.__layouts        = layouts
+        self.__class_name     = class_decl.class_name
+        self.__read_vars      = read_vars
+        self.__size_to_arrays = class_decl.size_to_arrays
+
+        names, self.__inline_bits = CppSelectGenerator.mask_layout( class_decl, class_decls )
+        self.__bits = { name: bit for bit, name in reversed( list( enumerate( names ) ) ) }
+
+        # Generates the code of selected variable sized fields, which is the same as in 'Deserialize()'
+        self.__deserializer   = CppDeserializationGenerator( layouts, class_decl.class_name, class_decl.size_to_arrays, parallel )
+
+        self.__add_succ_var   = False
+        self.__add_ptr_var    = False
+        self.__use_mask       = False
+
+        self.__pending : typing.List[typing.Tuple[str, str, str]] = []  # (type, name, kind) of fixed sized fields which have not been read yet
+        self.__code_output    = ""
+
+
+
+    @staticmethod
+    def mask_layout( class_decl:  "CppClassDeclarationGenerator",
+                     class_decls: typing.Dict[str, "CppClassDeclarationGenerator"] ) -> typing.Tuple[typing.List[str], typing.Dict[str, int]]:
+        """
+        Returns the names of the fields which have a bit in the field mask,
+        in the order of their bits, and the first bit of each inline member.
+        """
+
+        names       : typing.List[str]     = []
+        inline_bits : typing.Dict[str, int] = {}
+        conditions  : typing.Set[str]      = set()
+
+        for idx, field in enumerate( class_decl.fields ):
+            disposition = field["disposition"] if "disposition" in field else ""
+
+            if disposition in ["const", "struct_type", "reserved"]:
+                continue
+
+            if "inline" == disposition:
+                inline_bits[field["type"]] = len( names )
+                names += CppSelectGenerator.mask_layout( class_decls[field["type"]], class_decls )[0]
+                continue
+
+            # condition variables defined after the condition fields are unions (always read)
+            if "condition" in field:
+                condition = field["condition"]
+                if condition in conditions:
+                    continue  # only the first field of a condition is deserialized
+
+                conditions.add( condition )
+                if class_decl.member_vars[condition][0] > idx and len( class_decl.conditions[condition] ) > 1:
+                    continue
+
+            if "name" in field:
+                names.append( field["name"] )
+
+        return names, inline_bits
+
+
+
+    @staticmethod
+    def generate_mask_enum( class_decl:  "CppClassDeclarationGenerator",
+                            class_decls: typing.Dict[str, "CppClassDeclarationGenerator"] ) -> str:
+        """
+        Generates the 'FieldMask' enum of a class declaration.
+        """
+
+        names, _ = CppSelectGenerator.mask_layout( class_decl, class_decls )
+        if len( names ) > 64:
+            print( f'Error: Struct "{class_decl.class_name}" has more than 64 fields for \'DeserializeSelected()\'!\n' )
+            exit(1)
+
+        output  = '\n\t// Bits of the fields for \'DeserializeSelected()\', including the fields of inline members\n'
+        output += '\tenum FieldMask : uint64_t\n\t{\n'
+
+        declared = set()
+        for bit, name in enumerate( names ):
+            if name in declared:
+                continue
+
+            declared.add( name )
+            output += f'\t\tFIELD_{name.upper()} = uint64_t(1) << {bit},\n'
+
+        output += f'\t\tFIELD_ALL = {"~uint64_t(0)" if 64 == len( names ) else f"( uint64_t(1) << {len( names )} ) - 1"},\n'
+        output += '\t};\n'
+        return output
+
+
+
+    def normal_field( self, var_type: str, var_name: str ) -> None:
+        if self.__layouts.is_scalar( var_type ):
+            self.__pending.append( (var_type, var_name, "read" if var_name in self.__read_vars else "select") )
+            return
+
+        self.__flush()
+        self.__add_succ_var = True
+        member_name = CppFieldGenerator.convert_to_field_name( var_name )
+        fail        = self.__fail( var_name )
+
+        self.__code_output += f'\tif( {self.__mask_bit( var_name )} ){{ succ = {member_name}.Deserialize( buffer ); }}\n'
+        self.__code_output += f'\telse{" " * len( self.__mask_bit( var_name ) )} {{ succ = {var_type}::SkipOver( buffer ); }}\n'
+        self.__code_output += f'\tif(!succ){{ {fail} return false; }}\n\n'
+
+
+
+    def inline_field( self, var_name: str ) -> None:
+        self.__flush()
+        self.__add_succ_var = True
+        self.__use_mask     = True
+
+        bit  = self.__inline_bits[var_name]
+        mask = f'mask >> {bit}' if bit else 'mask'
+        self.__code_output += f'\tsucc = {CppFieldGenerator.convert_to_field_name( var_name )}.DeserializeSelected( buffer, {mask} ); if(!succ){{ {self.__fail( var_name )} return false; }}\n'
+
+
+
+    def reserved_field( self, var_type: str, var_name: str, value: str ) -> None:
+        if len( str(value).split() ) > 1:
+            self.__pending.append( (var_type, var_name, "skip") )
+        else:
+            self.__pending.append( (var_type, var_name, f'reserved {value}') )
+
+
+
+    def array_field( self, var_type: str, var_name: str, size_var: str, size_type: str ) -> None:
+        self.__flush()
+        self.__deserializer.array_field( var_type, var_name, size_var, size_type )
+
+        count = str(size_var)
+        if count.isdigit():
+            skip = self.__skip_elements( var_type, var_name, count, "\t\t" )
+        else:
+            count = CppFieldGenerator.convert_to_field_name( size_var )
+            skip  = f'\t\tif( {count} != std::numeric_limits<{size_type}>::max() )\n\t\t{{\n'
+            skip += self.__skip_elements( var_type, var_name, count, "\t\t\t" )
+            skip += f'\t\t}}\n'
+
+        self.__select( var_name, skip )
+
+
+
+    def array_sized_field( self, array_name:  str, array_size:        str,
+                                 header_type: str, header_type_field: str, header_version_field: str,
+                                 enum_type:   str, align:             str = "" ) -> None:
+        self.__flush()
+        self.__deserializer.array_sized_field( array_name, array_size, header_type, header_type_field, header_version_field, enum_type, align )
+
+        skip = f'\t\tsucc = buffer.MoveOffset( {CppFieldGenerator.convert_to_field_name( array_size )} ); if(!succ){{ {self.__fail( array_name )} return false; }}\n'
+        self.__select( array_name, skip )
+
+
+
+    def array_fill_field( self, array_type: str, array_name: str ) -> None:
+        self.__flush()
+        self.__deserializer.array_fill_field( array_type, array_name )
+
+        fail = self.__fail( array_name )
+        if self.__layouts.is_scalar( array_type ):
+            skip  = f'\t\tif( buffer.RemainingSize() % sizeof({array_type}) ){{ {fail} return false; }}\n'
+            skip += f'\t\tsucc = buffer.MoveOffset( buffer.RemainingSize() ); if(!succ){{ {fail} return false; }}\n'
+        else:
+            skip  = f'\t\twhile( buffer.RemainingSize() )\n\t\t{{\n'
+            skip += f'\t\t\tsucc = {array_type}::SkipOver( buffer ); if(!succ){{ {fail} return false; }}\n\t\t}}\n'
+
+        self.__select( array_name, skip )
+
+
+
+    def condition_field( self, var_name: str, var_type: str, condition: str, union_name: str = "" ) -> None:
+        self.__flush()
+
+        # unions are always read
+        if union_name:
+            self.__deserializer.condition_field( var_name, var_type, condition, union_name )
+            self.__add_code( self.__deserializer.take_code(), "" )
+            return
+
+        self.__code_output += f'\n\tif( {condition} )\n\t{{\n'
+        self.normal_field( var_type, var_name )
+        self.__flush( "\t" )
+        self.__code_output += "\t}\n\n"
+
+
+
+    def generate( self, inline: bool = False ) -> str:
+        self.__flush()
+
+        output  = f'{"inline " if inline else ""}bool {self.__class_name}::DeserializeSelected( RawBuffer& buffer, const uint64_t mask )\n{{\n'
+        output += f'\tCATBUFFER_HOOK_DESERIALIZE( "{self.__class_name}", buffer );\n'
+
+        if self.__add_ptr_var:
+            output += "\tvoid* ptr;\n"
+
+        if self.__add_succ_var:
+            output += "\tbool succ;\n"
+
+        if not self.__use_mask:
+            output += "\t(void) mask;\n"
+
+        output += self.__code_output
+        output += "\treturn true;\n"
+        output += "}\n\n\n"
+        return output
+
+
+
+    def __flush( self, indent: str = "" ) -> None:
+        """
+        Reads all fixed sized fields which have been added since the last
+        flush with one bounds check, and copies the selected ones from
+        their offsets.
+        """
+
+        if not self.__pending:
+            return
+
+        self.__add_ptr_var = True
+        sizes = [ f'sizeof({var_type})' for var_type, _, _ in self.__pending ]
+        self.__code_output += f'{indent}\tptr = buffer.GetOffsetPtrAndMove( {" + ".join( sizes )} ); if(!ptr){{ {self.__fail( self.__pending[0][1] )} return false; }}\n'
+
+        for idx, (var_type, var_name, kind) in enumerate( self.__pending ):
+            value       = f'*( ({var_type}*) ptr )' if 0 == idx else f'*( ({var_type}*) ( (uint8_t*) ptr + {" + ".join( sizes[:idx] )} ) )'
+            member_name = CppFieldGenerator.convert_to_field_name( var_name )
+
+            if "skip" == kind:
+                continue
+
+            elif kind.startswith( "reserved" ):
+                self.__code_output += f'{indent}\tif( {kind.split()[1]} != {value} ){{ {self.__fail( var_name )} return false; }}\n'
+
+            elif var_name in self.__size_to_arrays:
+                self.__code_output += f'{indent}\tconst {var_type} tmp{member_name[1:]} = {value};\n'
+
+            elif "read" == kind:
+                self.__code_output += f'{indent}\t{member_name} = {value};\n'
+
+            else:
+                self.__code_output += f'{indent}\tif( {self.__mask_bit( var_name )} ){{ {member_name} = {value}; }}\n'
+
+        self.__code_output += "\n"
+        self.__pending = []
+
+
+
+    def __select( self, var_name: str, skip: str ) -> None:
+        """
+        Adds the code of a variable sized field, which is deserialized if
+        its bit is set and otherwise skipped with 'skip'.
+        """
+
+        self.__add_succ_var = True
+        self.__code_output += f'\tif( {self.__mask_bit( var_name )} )\n\t{{\n'
+        self.__add_code( self.__deserializer.take_code(), "\t" )
+        self.__code_output += f'\t}}\n\telse\n\t{{\n'
+        self.__code_output += skip
+        self.__code_output += f'\t}}\n\n'
+
+
+
+    def __add_code( self, code: str, indent: str ) -> None:
+        if "ptr" in code:
+            self.__add_ptr_var = True
+
+        if "succ" in code:
+            self.__add_succ_var = True
+
+        self.__code_output += "".join( indent + line if line.strip() else line for line in code.strip( "\n" ).splitlines( True ) ) + "\n"
+
+
+
+    def __skip_elements( self, var_type: str, var_name: str, count: str, indent: str ) -> str:
+        fail = self.__fail( var_name )
+
+        if self.__layouts.is_scalar( var_type ):
+            return f'{indent}succ = buffer.MoveOffset( sizeof({var_type})*{count} ); if(!succ){{ {fail} return false; }}\n'
+
+        output  = f'{indent}for( size_t i=0; i<{count}; ++i )\n{indent}{{\n'
+        output += f'{indent}\tsucc = {var_type}::SkipOver( buffer ); if(!succ){{ {fail} return false; }}\n'
+        output += f'{indent}}}\n'
+        return output
+
+
+
+    def __mask_bit( self, var_name: str ) -> str:
+        self.__use_mask = True
+        return f'mask & FIELD_{var_name.upper()}'
+
+
+
+    def __fail( self, field_name: str ) -> str:
+        return f'CATBUFFER_HOOK_FAIL( "{self.__class_name}", "{field_name}", buffer );'
@@ -1,7 +1,7 @@
 import typing
 
 from .CppFieldGenerator import CppFieldGenerator
-from .CppTypesGenerator import CppTypesGenerator
+from .TypeLayoutAnalyzer import TypeLayoutAnalyzer
 
 
 class CppSerializationGenerator():
@@ -13,9 +13,8 @@ class CppSerializationGenerator():
 
 
 
-    def __init__( self, types: CppTypesGenerator, class_name: str, size_to_arrays : typing.Dict[str, typing.List[str]] ) -> None:
-        self.__name_to_enum   = types.name_to_enum
-        self.__name_to_alias  = types.name_to_alias
+    def __init__( self, layouts: TypeLayoutAnalyzer, class_name: str, size_to_arrays : typing.Dict[str, typing.List[str]] ) -> None:
+        self.__layouts        = layouts
         self.__size_to_arrays = size_to_arrays
         self.__class_name     = class_name
 
@@ -29,9 +28,9 @@ class CppSerializationGenerator():
     def normal_field( self, var_type: str, var_name: str ) -> str:
         member_name = CppFieldGenerator.convert_to_field_name(var_name)
 
-        if var_type in self.__name_to_alias or var_type in self.__name_to_enum or var_type in CppFieldGenerator.builtin_types:
+        if self.__layouts.is_scalar( var_type ):
             self.__add_ptr_var = True
-            self.__code_output += f'\tptr = buffer.GetOffsetPtrAndMove( sizeof({var_type}) ); if(!ptr){{ return false; }}\n'
+            self.__code_output += f'\tptr = buffer.GetOffsetPtrAndMove( sizeof({var_type}) ); if(!ptr){{ {self.__fail(var_name)} return false; }}\n'
 
             if var_name in self.__size_to_arrays:
                 array_name = self.__size_to_arrays[var_name][0]
@@ -41,7 +40,7 @@ class CppSerializationGenerator():
                 self.__code_output += f'\t*( ({var_type}*) ptr ) = {member_name};\n\n'
         else:
             self.__add_succ_var = True
-            self.__code_output += f'\tsucc = {member_name}.Serialize( buffer ); if( !succ ){{ return false; }}\n'
+            self.__code_output += f'\tsucc = {member_name}.Serialize( buffer ); if( !succ ){{ {self.__fail(var_name)} return false; }}\n'
 
 
 
@@ -66,7 +65,7 @@ class CppSerializationGenerator():
 
     def reserved_field( self, var_type: str, var_name: str, value: str ):
         member_var = CppFieldGenerator.convert_to_field_name(var_name)
-        self.__code_output += f'\tptr = buffer.GetOffsetPtrAndMove( sizeof({var_type}) ); if(!ptr){{ return false; }}\n'
+        self.__code_output += f'\tptr = buffer.GetOffsetPtrAndMove( sizeof({var_type}) ); if(!ptr){{ {self.__fail(var_name)} return false; }}\n'
 
         tmp = str(value).split()
 
@@ -81,27 +80,29 @@ class CppSerializationGenerator():
 
 
     def array_sized_field( self, array_name: str, align: str = "" ):
+        fail       = self.__fail( array_name )
         array_name = CppFieldGenerator.convert_to_field_name(array_name)
 
         self.__code_output += f'\n\tfor( const std::unique_ptr<ICatbuffer>& catbuf : {array_name} )\n\t{{\n'
-        self.__code_output += f'  succ = catbuf->Serialize( buffer ); if(!succ){{ return false; }}\n'
+        self.__code_output += f'  succ = catbuf->Serialize( buffer ); if(!succ){{ {fail} return false; }}\n'
 
         if align:
-            self.__code_output += f'  size_t padding = ( {align} - uintptr_t(buffer.GetOffsetPtr())%{align} ) % {align};\n'
+            self.__code_output += f'  size_t padding = ( {align} - buffer.GetOffset()%{align} ) % {align};\n'
             self.__code_output += f'  for( size_t i=0; i<padding; ++i )\n'
             self.__code_output += f'  {{\n'
-            self.__code_output += f'    ptr = buffer.GetOffsetPtrAndMove(1); if(!ptr){{ return false; }}\n'
+            self.__code_output += f'    ptr = buffer.GetOffsetPtrAndMove(1); if(!ptr){{ {fail} return false; }}\n'
             self.__code_output += f'    *( (uint8_t*) ptr ) = 0;\n'
             self.__code_output += f'  }}\n'
             
         self.__code_output += f' }}\n\n'
 
-        self.__add_ptr_var = True
+        self.__add_ptr_var  = True
+        self.__add_succ_var = True
 
 
     def array_fill_field( self, array_type: str, array_name: str ) -> str:
          self.__code_output += f'\tfor( {array_type}& fill : {CppFieldGenerator.convert_to_field_name(array_name)} )\n\t{{\n\t\t'
-         self.__code_output += f'succ = fill.Serialize( buffer ); if(!succ){{ return false; }}\n\t}}\n\n'
+         self.__code_output += f'succ = fill.Serialize( buffer ); if(!succ){{ {self.__fail(array_name)} return false; }}\n\t}}\n\n'
 
          self.__add_succ_var = True
 
@@ -121,8 +122,9 @@ class CppSerializationGenerator():
            self.__code_output += "\t}\n\n"
 
 
-    def generate( self ) -> str:
-        output = f'bool {self.__class_name}::Serialize( RawBuffer& buffer )\n{{\n'
+    def generate( self, inline: bool = False ) -> str:
+        output  = f'{"inline " if inline else ""}bool {self.__class_name}::Serialize( RawBuffer& buffer )\n{{\n'
+        output += f'\tCATBUFFER_HOOK_SERIALIZE( "{self.__class_name}", buffer );\n'
 
         if self.__add_ptr_var:
             output += "\tvoid* ptr;\n"
@@ -134,3 +136,14 @@ class CppSerializationGenerator():
         output += "\treturn true;\n"
         output += "}\n\n\n"
         return output
+
+
+
+    def __fail( self, field_name: str ) -> str:
+        """
+        Returns the hook which is called before returning false because
+        field 'field_name' could not be serialized.
+        """
+
+        field_name = field_name.replace( "[i]", "" )
+        return f'CATBUFFER_HOOK_FAIL( "{self.__class_name}", "{field_name}", buffer );'
@@ -1,14 +1,13 @@
 from .CppFieldGenerator import CppFieldGenerator
-from .CppTypesGenerator import CppTypesGenerator
+from .TypeLayoutAnalyzer import TypeLayoutAnalyzer
 
 
 
 class CppSizeGenerator():
 
 
-    def __init__( self, types: CppTypesGenerator, class_name: str ) -> None:
-        self.__name_to_enum  = types.name_to_enum
-        self.__name_to_alias = types.name_to_alias
+    def __init__( self, layouts: TypeLayoutAnalyzer, class_name: str ) -> None:
+        self.__layouts      = layouts
 
         self.__code_output  = f'size_t {class_name}::Size( )\n{{\n\tsize_t size=0;\n'
 
@@ -16,7 +15,7 @@ class CppSizeGenerator():
     def normal_field( self, var_type: str, var_name: str ) -> str:
         var_name = CppFieldGenerator.convert_to_field_name(var_name)
 
-        if var_type in self.__name_to_alias or var_type in self.__name_to_enum or var_type in CppFieldGenerator.builtin_types:
+        if self.__layouts.is_scalar( var_type ):
             self.__code_output += f'\tsize += sizeof({var_type}); //< {var_name}\n'
         else:
             self.__code_output += f'\tsize += {var_name}.Size();\n'
@@ -28,7 +27,7 @@ class CppSizeGenerator():
 
         arr_name = CppFieldGenerator.convert_to_field_name( arr_name )
 
-        if arr_type in self.__name_to_enum or arr_type in self.__name_to_alias or arr_type in CppFieldGenerator.builtin_types:
+        if self.__layouts.is_scalar( arr_type ):
             self.__code_output += f'\tsize += sizeof({arr_type})*{arr_name}.size(); //< {arr_name}\n'
         else:            
             self.__code_output += f'\tif( {arr_name}.size() ){{ size += {arr_name}.size()*{arr_name}[0].Size(); }}\n' #TODO: this is assuming that element sizes are all the same. Maybe do a for loop instead.
@@ -57,7 +56,11 @@ class CppSizeGenerator():
 
     def array_fill_field( self, array_type: str, array_name: str ):
         array_name = CppFieldGenerator.convert_to_field_name( array_name )
-        self.__code_output += f'\tsize += {array_name}.size() * sizeof({array_type});\n'
+
+        if self.__layouts.is_scalar( array_type ):
+            self.__code_output += f'\tsize += {array_name}.size() * sizeof({array_type});\n'
+        else:
+            self.__code_output += f'\tfor( {array_type}& fill : {array_name} ){{ size += fill.Size(); }}\n'
 
 
 
@@ -75,8 +78,8 @@ class CppSizeGenerator():
 
 
 
-    def generate( self ) -> str:
+    def generate( self, inline: bool = False ) -> str:
         self.__code_output += "\treturn size;\n"
         self.__code_output += "}\n\n\n"
 
-        return self.__code_output
+        return ( "inline " if inline else "" ) + self.__code_output
@@ -0,0 +1,196 @@
+import typing
+
+from .CppFieldGenerator import CppFieldGenerator
+from .TypeLayoutAnalyzer import TypeLayoutAnalyzer
+
+
+class CppSkipGenerator():
+    """
+    Generates a static 'SkipOver()' C++ method, which moves a RawBuffer past
+    one serialized instance of a struct without deserializing it. Only the
+    fields which other fields depend on (array sizes and conditions) are read,
+    all other fields are skipped by using the fixed size of their types.
+    Consecutive fixed sized fields are skipped with a single offset move.
+
+    If an 'offsets' vector is passed to 'SkipOver()', the start offset of each
+    element in 'array_sized' fields is pushed to it. This makes it possible to
+    index the elements of large aggregates without deserializing them.
+    """
+
+    def __init__( self, layouts: TypeLayoutAnalyzer, class_name: str, read_vars: typing.Set[str] ) -> None:
+        self.__layouts        = layouts
+        self.__read_vars      = read_vars  # fields which are used as array size or condition by other fields
+        self.__class_name     = class_name
+
+        self.__add_succ_var   = False
+        self.__add_ptr_var    = False
+        self.__use_offsets    = False
+
+        self.__pending_sizes : typing.List[str] = []  # sizes of fields which have not been skipped yet
+        self.__declared_vars : typing.Set[str]  = set()
+
+        self.__code_output    = ""
+
+
+
+    def normal_field( self, var_type: str, var_name: str ) -> None:
+        if self.__layouts.is_scalar( var_type ):
+
+            if var_name not in self.__read_vars:
+                self.__pending_sizes.append( f'sizeof({var_type})' )
+                return
+
+            self.__flush()
+            self.__add_ptr_var = True
+            self.__code_output += f'\tptr = buffer.GetOffsetPtrAndMove( sizeof({var_type}) ); if(!ptr){{ return false; }}\n'
+            self.__code_output += f'\tconst {var_type} {self.__tmp_name(var_name)} = *( ({var_type}*) ptr );\n\n'
+            self.__declared_vars.add( var_name )
+        else:
+            self.__flush()
+            self.__add_succ_var = True
+            self.__use_offsets  = True
+            self.__code_output += f'\tsucc = {var_type}::SkipOver( buffer, offsets ); if(!succ){{ return false; }}\n'
+
+
+
+    def array_field( self, var_type: str, var_name: str, size_var: str, size_type: str ) -> None:
+        self.__flush()
+
+        indent = "\t"
+        count  = str(size_var)
+
+        if not count.isdigit():
+            count = self.__tmp_name( size_var )
+            self.__code_output += f'\n\tif( {count} != std::numeric_limits<{size_type}>::max() )\n\t{{\n'
+            indent = "\t\t"
+
+        self.__add_succ_var = True
+        if self.__layouts.is_scalar( var_type ):
+            self.__code_output += f'{indent}succ = buffer.MoveOffset( sizeof({var_type})*{count} ); if(!succ){{ return false; }} //< {CppFieldGenerator.convert_to_field_name(var_name)}\n'
+        else:
+            self.__code_output += f'{indent}for( size_t i=0; i<{count}; ++i )\n'
+            self.__code_output += f'{indent}{{\n'
+            self.__code_output += f'{indent}\tsucc = {var_type}::SkipOver( buffer ); if(!succ){{ return false; }}\n'
+            self.__code_output += f'{indent}}}\n'
+
+        if not str(size_var).isdigit():
+            self.__code_output += f'\t}}\n\n'
+
+
+
+    def inline_field( self, var_name: str ) -> None:
+        self.normal_field( var_name, var_name )
+
+
+
+    def reserved_field( self, var_type: str, var_name: str ) -> None:
+        self.__pending_sizes.append( f'sizeof({var_type})' )
+
+
+
+    def array_sized_field( self, array_name:  str, array_size:        str,
+                                 header_type: str, header_type_field: str, header_version_field: str,
+                                 enum_type:   str, align:             str = "" ) -> None:
+        self.__flush()
+
+        array_size           = self.__tmp_name( array_size )
+        header_type_field    = CppFieldGenerator.convert_to_field_name( header_type_field )
+        header_version_field = CppFieldGenerator.convert_to_field_name( header_version_field )
+
+        self.__code_output += f'\tif( offsets )\n\t{{\n'
+        self.__code_output += f'\t\tfor( size_t read_size = 0; read_size < {array_size}; )\n\t\t{{\n'
+        self.__code_output += "\t\t\t// Deserialize header to get element type\n"
+        self.__code_output += f'\t\t\t{header_type} header;\n'
+        self.__code_output += f'\t\t\tRawBuffer tmp = buffer;\n'
+        self.__code_output += f'\t\t\tsucc = header.Deserialize(tmp); if(!succ){{ return false; }}\n\n'
+
+        self.__code_output += "\t\t\t// Save element offset and skip element\n"
+        self.__code_output += f'\t\t\toffsets->push_back( buffer.GetOffset() );\n'
+        self.__code_output += f'\t\t\tconst size_t rsize = buffer.RemainingSize();\n'
+        self.__code_output += f'\t\t\tsucc = skip_type_{enum_type}( header.{header_type_field}, header.{header_version_field}, buffer ); if(!succ){{ return false; }}\n'
+        self.__code_output += f'\t\t\tread_size += (rsize-buffer.RemainingSize());\n'
+
+        if align:
+            self.__code_output += "\n\t\t\t// Skip optional padding\n"
+            self.__code_output += f'\t\t\tconst size_t padding = ({align} - buffer.GetOffset()%{align}) % {align};\n'
+            self.__code_output += f'\t\t\tsucc = buffer.MoveOffset(padding); if(!succ){{ return false; }}\n'
+            self.__code_output += f'\t\t\tread_size += padding;\n'
+
+        self.__code_output += f'\t\t}}\n\t}}\n'
+        self.__code_output += f'\telse\n\t{{\n'
+        self.__code_output += f'\t\tsucc = buffer.MoveOffset( {array_size} ); if(!succ){{ return false; }} //< {CppFieldGenerator.convert_to_field_name(array_name)}\n'
+        self.__code_output += f'\t}}\n\n'
+
+        self.__add_succ_var = True
+        self.__use_offsets  = True
+
+
+
+    def array_fill_field( self, array_type: str, array_name: str ) -> None:
+        self.__flush()
+
+        if self.__layouts.is_scalar( array_type ):
+            self.__code_output += f'\tif( buffer.RemainingSize() % sizeof({array_type}) ){{ return false; }}\n'
+            self.__code_output += f'\tsucc = buffer.MoveOffset( buffer.RemainingSize() ); if(!succ){{ return false; }}\n\n'
+        else:
+            self.__code_output += f'\twhile( buffer.RemainingSize() )\n\t{{\n'
+            self.__code_output += f'\t\tsucc = {array_type}::SkipOver( buffer ); if(!succ){{ return false; }}\n\t}}\n\n'
+
+        self.__add_succ_var = True
+
+
+
+    def condition_field( self, var_name: str, var_type: str, condition: str, condition_var: str, union_name: str = "" ) -> None:
+
+        # unions are always read (the size of the first union member is used)
+        if union_name or condition_var not in self.__declared_vars:
+            self.normal_field( var_type, var_name )
+            return
+
+        self.__flush()
+        self.__code_output += f'\n\tif( {condition} )\n\t{{\n'
+        self.normal_field( var_type, var_name )
+        self.__flush( "\t" )
+        self.__code_output += "\t}\n\n"
+
+
+
+    def generate( self, inline: bool = False ) -> str:
+        self.__flush()
+
+        output = f'{"inline " if inline else ""}bool {self.__class_name}::SkipOver( RawBuffer& buffer, std::vector<size_t>* offsets )\n{{\n'
+
+        if self.__add_ptr_var:
+            output += "\tvoid* ptr;\n"
+
+        if self.__add_succ_var:
+            output += "\tbool succ;\n"
+
+        if not self.__use_offsets:
+            output += "\t(void) offsets;\n"
+
+        output += self.__code_output
+        output += "\treturn true;\n"
+        output += "}\n\n\n"
+        return output
+
+
+
+    def __flush( self, indent: str = "" ) -> None:
+        """
+        Moves the buffer offset past all fixed sized fields which have
+        been added since the last flush.
+        """
+
+        if not self.__pending_sizes:
+            return
+
+        self.__add_succ_var = True
+        self.__code_output += f'{indent}\tsucc = buffer.MoveOffset( {" + ".join(self.__pending_sizes)} ); if(!succ){{ return false; }}\n'
+        self.__pending_sizes = []
+
+
+
+    @staticmethod
+    def __tmp_name( var_name: str ) -> str:
+        return "tmp" + CppFieldGenerator.convert_to_field_name( var_name )[1:]
@@ -0,0 +1,268 @@
+import typing
+
+from .CppFieldGenerator import CppFieldGenerator
+from .CppTypesGenerator import CppTypesGenerator
+from .TypeLayoutAnalyzer import TypeLayoutAnalyzer
+
+
+
+class CppTableGenerator():
+    """
+    Generates the field table of a struct for the table driven backend
+    ('--backend table'), and 'Deserialize()', 'Serialize()', 'Size()' and
+    'SkipOver()' methods which pass the table to the interpreter loops in
+    'TableCodec'. For the struct 'TransferTransactionBody' the code below
+    is generated:
+
+        ----------------------------------------------------------------------------------------
+        static const TableField TransferTransactionBody_fields[] =
+        {
+        	{ TableField::SCALAR, TableField::ALWAYS, 0, TableField::NO_SLOT, sizeof(UnresolvedAddress), offsetof(TransferTransactionBody, mRecipient_address), TableField::NO_REF, 0, nullptr, nullptr },
+        	{ TableField::SCALAR, TableField::ALWAYS, 0, 1, sizeof(uint16_t), offsetof(TransferTransactionBody, mMessage_size), TableField::NO_REF, 0, nullptr, nullptr },
+        	...
+        	{ TableField::ARRAY, TableField::ALWAYS, 0, TableField::NO_SLOT, 0, offsetof(TransferTransactionBody, mMessage), 1, 0, nullptr, &TableVectorOf<uint8_t>::ops },
+        };
+        ...
+        const TableLayout TransferTransactionBody::LAYOUT = { "TransferTransactionBody", TransferTransactionBody_fields, TransferTransactionBody_field_names, 7, nullptr, nullptr };
+
+        bool TransferTransactionBody::Deserialize( RawBuffer& buffer )
+        {
+        	CATBUFFER_HOOK_DESERIALIZE( "TransferTransactionBody", buffer );
+        	return TableCodec::Decode( LAYOUT, this, buffer );
+        }
+        ----------------------------------------------------------------------------------------
+
+    Fields refer to other fields (array counts, 'array_sized' byte sizes and
+    conditions) by their index in the table. The fields which are referred
+    to get a 'slot', where 'TableCodec::Validate()' keeps their values.
+
+    Structs which are the header of 'array_sized' fields (see
+    'array_sized_headers()') also get the functions which create or skip
+    the element following a header, using the converters of its enum group.
+
+    The offsets in the table are taken with 'offsetof', although the
+    classes are not standard layout (they have virtual methods). This is
+    only conditionally supported by C++11, so the generated tables are
+    limited to GCC and Clang, which support it for classes without virtual
+    bases.
+    """
+
+    max_slots = 16  # TableCodec::MAX_SLOTS
+
+    def __init__( self, types: CppTypesGenerator, layouts: TypeLayoutAnalyzer, class_name: str, header: typing.Optional[typing.Tuple[str, str, str]] = None ) -> None:
+        """
+        'header' is the type field, version field and enum type of the
+        struct, if it is the header of 'array_sized' fields.
+        """
+
+        self.__name_to_enum  = types.name_to_enum
+        self.__layouts       = layouts
+        self.__class_name    = class_name
+        self.__header        = header
+
+        self.__fields : typing.List[dict] = []
+
+
+
+    @property
+    def is_header( self ) -> bool:
+        """
+        True if the struct is the header of 'array_sized' fields.
+        """
+
+        return self.__header is not None
+
+
+
+    @staticmethod
+    def array_sized_headers( class_decls: dict ) -> typing.Dict[str, typing.Tuple[str, str, str]]:
+        """
+        Returns the header type field, version field and enum type of the
+        header structs of all 'array_sized' fields, by header struct name.
+        """
+
+        headers = {}
+        for decl in class_decls.values():
+            for field in decl.fields:
+                if "array_sized" != field.get( "disposition" ) or field["type"] in headers:
+                    continue
+
+                header_decl = class_decls[ field["type"] ]
+                _, enum_type = header_decl.member_vars[ field["header_type_field"] ]
+                headers[ field["type"] ] = ( field["header_type_field"], field["header_version_field"], enum_type )
+
+        return headers
+
+
+
+    def normal_field( self, var_type: str, var_name: str, member: str = "" ) -> None:
+        member = member or CppFieldGenerator.convert_to_field_name( var_name )
+
+        if self.__layouts.is_scalar( var_type ):
+            self.__add( "SCALAR", var_name, member, size=f'sizeof({var_type})' )
+        else:
+            self.__add( "STRUCT", var_name, member, layout=f'&{var_type}::LAYOUT' )
+
+
+
+    def array_field( self, var_type: str, var_name: str, size_var: str ) -> None:
+        member = CppFieldGenerator.convert_to_field_name( var_name )
+        layout = "nullptr" if self.__layouts.is_scalar( var_type ) else f'&{var_type}::LAYOUT'
+
+        if str(size_var).isdigit():
+            self.__add( "ARRAY", var_name, member, value=str(size_var), layout=layout, vector=f'&TableVectorOf<{var_type}>::ops' )
+        else:
+            self.__add( "ARRAY", var_name, member, ref=size_var, layout=layout, vector=f'&TableVectorOf<{var_type}>::ops' )
+
+
+
+    def inline_field( self, var_name: str ) -> None:
+        self.normal_field( var_name, var_name )
+
+
+
+    def reserved_field( self, var_type: str, var_name: str, value: str ) -> None:
+        tmp = str(value).split()
+
+        # 'size <field>' reserves the serialized size of a struct field
+        if len(tmp) > 1:
+            self.__add( "RESERVED_SIZE", var_name, "", size=f'sizeof({var_type})', ref=tmp[1] )
+        else:
+            self.__add( "RESERVED", var_name, "", size=f'sizeof({var_type})', value=str(value) )
+
+
+
+    def array_sized_field( self, array_name: str, array_size: str, header_type: str, align: str = "" ) -> None:
+        self.__add( "ARRAY_SIZED", array_name, CppFieldGenerator.convert_to_field_name( array_name ),
+                    ref=array_size, align=str(align or 0), layout=f'&{header_type}::LAYOUT' )
+
+
+
+    def array_fill_field( self, array_type: str, array_name: str ) -> None:
+        layout = "nullptr" if self.__layouts.is_scalar( array_type ) else f'&{array_type}::LAYOUT'
+        self.__add( "ARRAY_FILL", array_name, CppFieldGenerator.convert_to_field_name( array_name ),
+                    layout=layout, vector=f'&TableVectorOf<{array_type}>::ops' )
+
+
+
+    def condition_field( self, var_name: str, var_type: str, condition_field: dict, condition_type: str, union_name: str = "" ) -> None:
+        """
+        Adds a field which is only present if 'condition_field' is fulfilled.
+        Union members are always present (the first union member is used).
+        """
+
+        if union_name:
+            member = CppFieldGenerator.convert_to_field_name( union_name ) + "." + CppFieldGenerator.convert_to_field_name( var_name )
+            self.normal_field( var_type, var_name, member )
+            return
+
+        value = condition_field["condition_value"]
+        if condition_type in self.__name_to_enum:
+            value = f'{condition_type}::{value}'
+
+        self.normal_field( var_type, var_name )
+        self.__fields[-1]["condition"] = "EQUALS" if "equals" == condition_field["condition_operation"] else "NOT_EQUALS"
+        self.__fields[-1]["ref"]       = condition_field["condition"]
+        self.__fields[-1]["value"]     = f'static_cast<uint64_t>( {value} )'
+
+
+
+    def generate( self ) -> str:
+        name  = self.__class_name
+        index = { field["name"]: idx for idx, field in enumerate( self.__fields ) }
+        slots = {}
+
+        for idx, field in enumerate( self.__fields ):
+            ref = field["ref"]
+            if not ref:
+                continue
+
+            if ref not in index:
+                print( f'Error: Field "{ref}" referred to by field "{field["name"]}" not found in struct "{name}"!\n' )
+                exit(1)
+
+            # Validate() keeps the values of array sizes and of conditions on preceding fields
+            if "RESERVED_SIZE" != field["kind"] and index[ref] < idx and ref not in slots:
+                slots[ref] = len(slots)
+
+        if len(slots) > self.max_slots:
+            print( f'Error: More than {self.max_slots} fields of struct "{name}" are used as array sizes or conditions!\n' )
+            exit(1)
+
+        output = ""
+        if self.__header:
+            output += self.__generate_header_functions()
+
+        if self.__fields:
+            # the classes are not standard layout (they have virtual methods), but offsetof() works with GCC and Clang since they have no virtual bases
+            output += '#if defined(__GNUC__)\n#pragma GCC diagnostic push\n#pragma GCC diagnostic ignored "-Winvalid-offsetof"\n#endif\n\n'
+            output += f'// Field table of \'{name}\', interpreted by \'TableCodec\'\n'
+            output += f'static const TableField {name}_fields[] =\n{{\n'
+            output += f'\t// kind, condition, align, slot, size, offset, ref, value, layout, vector\n'
+
+            for field in self.__fields:
+                slot   = str( slots[field["name"]] ) if field["name"] in slots else "TableField::NO_SLOT"
+                ref    = str( index[field["ref"]] ) if field["ref"] else "TableField::NO_REF"
+                offset = f'offsetof({name}, {field["member"]})' if field["member"] else "0"
+
+                output += f'\t{{ TableField::{field["kind"]}, TableField::{field["condition"]}, {field["align"]}, {slot}, {field["size"]}, {offset}, {ref}, '
+                output += f'{field["value"]}, {field["layout"]}, {field["vector"]} }}, // {field["name"]}\n'
+
+            output += '};\n\n'
+            output += '#if defined(__GNUC__)\n#pragma GCC diagnostic pop\n#endif\n\n'
+            output += f'static const char* const {name}_field_names[] = {{ {", ".join( [ chr(34) + field["name"] + chr(34) for field in self.__fields ] )} }};\n\n'
+            fields, field_names = f'{name}_fields', f'{name}_field_names'
+        else:
+            fields, field_names = "nullptr", "nullptr"
+
+        functions = f'&{name}_RecycleElement, &{name}_SkipElement' if self.__header else "nullptr, nullptr"
+        output += f'const TableLayout {name}::LAYOUT = {{ "{name}", {fields}, {field_names}, {len(self.__fields)}, {functions} }};\n\n\n'
+
+        output += f'bool {name}::Deserialize( RawBuffer& buffer )\n{{\n'
+        output += f'\tCATBUFFER_HOOK_DESERIALIZE( "{name}", buffer );\n'
+        output += f'\treturn TableCodec::Decode( LAYOUT, this, buffer );\n}}\n\n\n'
+
+        output += f'bool {name}::Serialize( RawBuffer& buffer )\n{{\n'
+        output += f'\tCATBUFFER_HOOK_SERIALIZE( "{name}", buffer );\n'
+        output += f'\treturn TableCodec::Encode( LAYOUT, this, buffer );\n}}\n\n\n'
+
+        output += f'size_t {name}::Size( )\n{{\n'
+        output += f'\treturn TableCodec::Size( LAYOUT, this );\n}}\n\n\n'
+
+        output += f'bool {name}::SkipOver( RawBuffer& buffer, std::vector<size_t>* offsets )\n{{\n'
+        output += f'\treturn TableCodec::Validate( LAYOUT, buffer, offsets );\n}}\n\n\n'
+
+        return output
+
+
+
+    def __generate_header_functions( self ) -> str:
+        """
+        Generates the functions which read the header of an 'array_sized'
+        element and create (or reuse) or skip the element of its type.
+        """
+
+        name                 = self.__class_name
+        type_field, version_field, enum_type = self.__header
+        header_type_field    = CppFieldGenerator.convert_to_field_name( type_field )
+        header_version_field = CppFieldGenerator.convert_to_field_name( version_field )
+
+        output  = f'// Creates (or reuses) the element whose type is given by the \'{name}\' header at the offset of \'buffer\'\n'
+        output += f'static bool {name}_RecycleElement( RawBuffer buffer, std::unique_ptr<ICatbuffer>& element )\n{{\n'
+        output += f'\t{name} header;\n'
+        output += f'\treturn header.Deserialize( buffer ) && recycle_type_{enum_type}( header.{header_type_field}, header.{header_version_field}, element );\n}}\n\n'
+
+        output += f'// Moves \'buffer\' past the element whose type is given by the \'{name}\' header at the offset of \'buffer\'\n'
+        output += f'static bool {name}_SkipElement( RawBuffer& buffer )\n{{\n'
+        output += f'\t{name} header;\n'
+        output += f'\tRawBuffer tmp = buffer;\n'
+        output += f'\treturn header.Deserialize( tmp ) && skip_type_{enum_type}( header.{header_type_field}, header.{header_version_field}, buffer );\n}}\n\n\n'
+
+        return output
+
+
+
+    def __add( self, kind: str, name: str, member: str, size: str = "0", ref: str = "", value: str = "0",
+               align: str = "0", layout: str = "nullptr", vector: str = "nullptr" ) -> None:
+        self.__fields.append( { "kind": kind, "condition": "ALWAYS", "name": name, "member": member, "size": size, "ref": ref,
+                                "value": value, "align": align, "layout": layout, "vector": vector } )
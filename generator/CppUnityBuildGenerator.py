@@ -0,0 +1,86 @@
+import typing
+from pathlib import Path
+
+
+
+class CppUnityBuildGenerator():
+    """
+    Amalgamates the generated '*.cpp' files into a given number of unity
+    build shards ('generated_src/unity/unity_<n>.cpp'), which '#include' the
+    generated files. Every shard is compiled as one translation unit, so the
+    shared headers ('types.h', 'ICatbuffer.h', the standard library headers)
+    are parsed once per shard instead of once per struct.
+
+    The files are distributed by size, so that the shards take about the
+    same time to compile and can be built in parallel. The 'CMakeLists.txt'
+    is rewritten to build the shards instead of the generated files:
+
+        ----------------------------------------------------------------------------------------
+        unity/unity_0.cpp:
+
+        #include "../AccountAddressRestrictionTransaction.cpp"
+        #include "../AccountKeyLinkTransaction.cpp"
+        ...
+        ----------------------------------------------------------------------------------------
+
+    The only internal symbols of the generated files are the 'static' tables
+    and functions of 'json.cpp' (and of 'capi/catbuffer_c.cpp', which is not
+    sharded). Their names contain the name of their type or group, e.g.
+    'AliasAction_names' or 'has_type_TransactionType', and each of them is
+    defined in one file only. So no two files define the same internal
+    name, and the files can be combined in any order.
+    """
+
+    unity_folder_name = "unity"
+    cmake_glob_line   = "file(GLOB GEN_SRC_FILES ${PROJECT_SOURCE_DIR}/generated_src/*.cpp)"
+
+    def __init__( self, gen_output_folder: str, shard_count: int ) -> None:
+
+        self.__gen_output_folder = gen_output_folder
+        self.__shards : typing.List[typing.List[str]] = []
+
+        source_files = sorted( Path( gen_output_folder ).glob( "*.cpp" ) )
+        shard_count  = max( 1, min( shard_count, len(source_files) ) )
+        shard_sizes  = [ 0 ] * shard_count
+        self.__shards = [ [] for _ in range( shard_count ) ]
+
+        # Largest files first, each into the currently smallest shard
+        for source_file in sorted( source_files, key=lambda file: (-file.stat().st_size, file.name) ):
+            shard = shard_sizes.index( min( shard_sizes ) )
+            shard_sizes[shard] += source_file.stat().st_size
+            self.__shards[shard].append( source_file.name )
+
+
+
+    def write_files( self, cmake_file_path: str ) -> None:
+        """
+        Writes the shards and replaces the generated sources in 'cmake_file_path' by the shards.
+        """
+
+        unity_folder = Path( self.__gen_output_folder ) / self.unity_folder_name
+        unity_folder.mkdir( parents=True, exist_ok=True )
+
+        shard_files = []
+        for index, file_names in enumerate( self.__shards ):
+            shard_file = f'unity_{index}.cpp'
+            shard_files.append( shard_file )
+
+            f = open( unity_folder / shard_file, "w" )
+            f.write( f'// Unity build shard {index+1} of {len(self.__shards)}\n' )
+            for file_name in sorted( file_names ):
+                f.write( f'#include "../{file_name}"\n' )
+            f.close()
+
+        cmake_sources  = "set(GEN_SRC_FILES\n"
+        cmake_sources += "".join( f'  ${{PROJECT_SOURCE_DIR}}/generated_src/{self.unity_folder_name}/{shard_file}\n' for shard_file in shard_files )
+        cmake_sources += ")"
+
+        with open( cmake_file_path, "r" ) as f:
+            cmake = f.read()
+
+        if self.cmake_glob_line not in cmake:
+            print( f"Error: '{cmake_file_path}' does not contain the generated sources line '{self.cmake_glob_line}'!\n" )
+            exit(1)
+
+        with open( cmake_file_path, "w" ) as f:
+            f.write( cmake.replace( self.cmake_glob_line, cmake_sources ) )
@@ -0,0 +1,734 @@
+import keyword
+import re
+import struct
+import typing
+
+from .CppClassDeclarationGenerator import CppClassDeclarationGenerator
+from .CppFieldGenerator import CppFieldGenerator
+from .CppTypesGenerator import CppTypesGenerator
+from .TypeLayoutAnalyzer import TypeLayoutAnalyzer
+
+
+
+class PythonCodecGenerator():
+    """
+    Generates a pure Python module which can deserialize and serialize the
+    structs defined in the YAML input file, in the same binary format as the
+    generated C++ code.
+
+    Enums are generated as 'IntEnum' classes and structs as classes with
+    '__slots__'. Fields of inline members are flattened into the struct
+    itself, e.g. 'Transaction' has the attributes 'size', 'signature', ...,
+    'type', 'fee' and 'deadline'. Consecutive fixed size fields are read and
+    written with a single precompiled 'struct.Struct'. 'uint8' arrays and
+    byte array aliases (e.g. 'signature') are skipped by the struct and
+    returned as 'memoryview' slices of the input, so no bytes are copied.
+
+    For each class group, a dict from (version, type) to class is generated,
+    which is used when deserializing 'array_sized' fields and by the
+    'deserialize_{group}()' functions:
+
+        ----------------------------------------------------------------------------------------
+        import catbuffer
+
+        tx = catbuffer.deserialize_TransactionType( payload )
+        tx.fee = 100
+        payload = tx.serialize()
+        ----------------------------------------------------------------------------------------
+    """
+
+    formats       = { 'int8_t': 'b', 'uint8_t': 'B', 'int16_t': 'h', 'uint16_t': 'H', 'int32_t': 'i', 'uint32_t': 'I', 'int64_t': 'q', 'uint64_t': 'Q' }
+    dtype_formats = { 'b': 'i1', 'B': 'u1', 'h': '<i2', 'H': '<u2', 'i': '<i4', 'I': '<u4', 'q': '<i8', 'Q': '<u8' }
+    max_values    = { 'int8_t': 0x7F, 'uint8_t': 0xFF, 'int16_t': 0x7FFF, 'uint16_t': 0xFFFF, 'int32_t': 0x7FFFFFFF, 'uint32_t': 0xFFFFFFFF, 'int64_t': 0x7FFFFFFFFFFFFFFF, 'uint64_t': 0xFFFFFFFFFFFFFFFF }
+
+
+    def __init__( self,
+                  input_data:                          list,
+                  class_decls:                         typing.Dict[str, CppClassDeclarationGenerator],
+                  types:                               CppTypesGenerator,
+                  layouts:                             TypeLayoutAnalyzer,
+                  type_to_versions_to_enum_to_classes: typing.Dict[str, typing.Dict[str, typing.Dict[str, str]]] ) -> None:
+
+        self.__class_decls   = class_decls
+        self.__name_to_enum  = types.name_to_enum
+        self.__name_to_alias = types.name_to_alias
+        self.__layouts       = layouts
+        self.__groups        = { group: versions for group, versions in type_to_versions_to_enum_to_classes.items() if versions }
+
+        self.__structs       : typing.Dict[str, str] = {}  # struct format to name of precompiled 'struct.Struct'
+        self.__steps         : typing.Dict[str, list] = {}  # memoized flattened fields of each class
+
+        self.__code_output   = ""
+
+        for elem in input_data:
+            if 'enum' == elem['type'].split()[0]:
+                self.__generate_enum( elem )
+
+        for elem in input_data:
+            if 'alias' == elem['type'].split()[0]:
+                self.__code_output += f'{elem["name"]} = {"int" if self.__name_to_alias[elem["name"]].size == 1 else "bytes"}\n'
+
+        self.__code_output += '\n\n'
+
+        for elem in input_data:
+            if 'struct' == elem['type']:
+                self.__generate_class( elem['name'], elem.get('comments', '') )
+
+        for group_name in self.__groups:
+            self.__generate_group( group_name )
+
+
+
+    def write_file( self, file_path: str ) -> None:
+        f = open( file_path, "w" )
+        f.write( python_code_header )
+
+        for fmt, name in self.__structs.items():
+            f.write( f"{name} = struct.Struct( '<{fmt}' )\n" )
+
+        f.write( '\n\n' )
+        f.write( self.__code_output )
+        f.close()
+
+
+
+    def write_dtypes_file( self, file_path: str ) -> None:
+        """
+        Writes a module with a NumPy structured dtype for each struct which
+        has a fixed size, so that a buffer of records can be decoded with a
+        single call:
+
+            ----------------------------------------------------------------------------------------
+            mosaics = numpy.frombuffer( data, dtype=catbuffer_dtypes.Mosaic )
+            ----------------------------------------------------------------------------------------
+
+        Fields have the same names as in the Python codec, alias arrays are
+        sub-arrays of bytes ('u1') and reserved fields are left out, but kept
+        in the offsets and item size.
+        """
+
+        self.__dtypes      : typing.Dict[str, typing.Optional[int]] = {}  # item size of each dtype, None if not fixed size
+        self.__dtype_output = ""
+
+        for class_name in self.__class_decls:
+            self.__generate_dtype( class_name )
+
+        f = open( file_path, "w" )
+        f.write( dtypes_code_header )
+        f.write( self.__dtype_output )
+        f.write( '\nDTYPES = {\n' )
+        for class_name, itemsize in self.__dtypes.items():
+            if itemsize:
+                f.write( f'    "{class_name}": {class_name},\n' )
+        f.write( '}\n' )
+        f.close()
+
+
+
+    def __dtype_format( self, elem: dict ) -> typing.Optional[str]:
+        """
+        Returns the dtype format of a single value, or None if it is not of fixed size.
+        """
+
+        if elem['cls']:
+            return elem['cls'] if self.__generate_dtype( elem['cls'] ) else None
+
+        if elem['fmt'].endswith('s'):
+            return f"( 'u1', {elem['fmt'][:-1]} )"
+
+        return repr( self.dtype_formats[ elem['fmt'] ] )
+
+
+
+    def __generate_dtype( self, class_name: str ) -> typing.Optional[int]:
+        """
+        Generates the dtype of a class (and of the classes it contains), if
+        it has a fixed size. Returns its item size, or None if not fixed size.
+        """
+
+        if class_name in self.__dtypes:
+            return self.__dtypes[class_name]
+
+        self.__dtypes[class_name] = None
+        names, formats, offsets = [], [], []
+        offset = 0
+
+        for step in self.__flatten( class_name ):
+            kind = step['kind']
+            size = step.get('size', 1)
+
+            if kind not in [ 'fixed', 'struct', 'array' ] or not str(size).isdigit():
+                return None
+
+            fmt = self.__dtype_format( step['elem'] )
+            if fmt is None:
+                return None
+
+            elem_size = self.__dtypes[ step['elem']['cls'] ] if step['elem']['cls'] else self.__struct_size( step['elem']['fmt'] )
+
+            if 'fixed' != kind or step['reserved'] is None:
+                names.append( repr(step['name']) )
+                formats.append( fmt if 'array' != kind else f'( {fmt}, {size} )' )
+                offsets.append( str(offset) )
+
+            offset += elem_size * int(size)
+
+        if 0 == offset:
+            return None
+
+        self.__dtype_output += f"{class_name} = numpy.dtype( {{ 'names'   : [ {', '.join(names)} ],\n"
+        self.__dtype_output += f"{' '*len(class_name)}                  'formats' : [ {', '.join(formats)} ],\n"
+        self.__dtype_output += f"{' '*len(class_name)}                  'offsets' : [ {', '.join(offsets)} ],\n"
+        self.__dtype_output += f"{' '*len(class_name)}                  'itemsize': {offset} }} )\n\n"
+
+        self.__dtypes[class_name] = offset
+        return offset
+
+
+
+    @staticmethod
+    def __struct_size( fmt: str ) -> int:
+        return struct.calcsize( '<' + fmt )
+
+
+
+    @staticmethod
+    def snake_case( name: str ) -> str:
+        """
+        Converts a CamelCase name to snake_case, eg. 'EntityBody' to 'entity_body'.
+        """
+
+        name = re.sub( r'([a-z0-9])([A-Z])', r'\1_\2', name ).lower()
+        return name + "_" if keyword.iskeyword( name ) else name
+
+
+
+    def __generate_enum( self, enum: dict ) -> None:
+        name = enum['name']
+
+        self.__code_output += f'class {name}( enum.IntEnum ):\n'
+        if 'comments' in enum:
+            self.__code_output += f'    """ {enum["comments"]} """\n\n'
+
+        for value in enum['values']:
+            self.__code_output += f'    {value["name"]} = {value["value"]}\n'
+
+        # lookup table which keeps unknown values (eg. combined flags) as ints
+        self.__code_output += f'\n_{name}_VALUES = {{ member.value: member for member in {name} }}\n\n\n'
+
+
+
+    def __elem( self, var_type: str ) -> dict:
+        """
+        Returns how a single value of type 'var_type' is encoded: either
+        with a struct format ('fmt'), optionally converted to an enum, or
+        by a generated class ('cls').
+        """
+
+        if var_type in CppFieldGenerator.builtin_types:
+            return { 'fmt': self.formats[var_type], 'enum': None, 'cls': None }
+
+        if var_type in self.__name_to_enum:
+            return { 'fmt': self.formats[ self.__name_to_enum[var_type].type ], 'enum': var_type, 'cls': None }
+
+        if var_type in self.__name_to_alias:
+            alias = self.__name_to_alias[var_type]
+            if 1 == alias.size:
+                return { 'fmt': self.formats[alias.type], 'enum': None, 'cls': None }
+
+            return { 'fmt': f'{self.__layouts.type_size( var_type )}s', 'enum': None, 'cls': None }
+
+        return { 'fmt': None, 'enum': None, 'cls': var_type }
+
+
+
+    def __struct( self, fmt: str ) -> str:
+        """
+        Returns the name of a precompiled 'struct.Struct' for format 'fmt'.
+        """
+
+        if fmt not in self.__structs:
+            self.__structs[fmt] = f'_STRUCT_{len(self.__structs)}'
+
+        return self.__structs[fmt]
+
+
+
+    def __flatten( self, class_name: str ) -> list:
+        """
+        Returns the fields of a class as a list of steps, with the fields of
+        inline members included as if they were fields of the class itself.
+        """
+
+        if class_name in self.__steps:
+            return self.__steps[class_name]
+
+        decl   = self.__class_decls[class_name]
+        steps  = []
+        unions = {}
+
+        for idx, field in enumerate( decl.fields ):
+            var_type    = field['type']
+            name        = field.get( 'name', '' )
+            disposition = field.get( 'disposition', '' )
+
+            if disposition in [ 'const', 'struct_type' ]:
+                continue
+
+            elif 'inline' == disposition:
+                steps += self.__flatten( var_type )
+
+            elif 'reserved' == disposition:
+                value = field['value']
+                steps.append( { 'kind': 'fixed', 'name': name, 'elem': self.__elem(var_type), 'reserved': value if isinstance(value, int) else None } )
+
+            elif 'array' == disposition:
+                size = field['size']
+                size_type = decl.member_vars[size][1] if size in decl.member_vars else ''
+                steps.append( { 'kind': 'array', 'name': name, 'elem': self.__elem(var_type), 'size': size, 'size_type': size_type } )
+
+            elif 'array_sized' == disposition:
+                steps.append( { 'kind': 'array_sized', 'name': name, 'header': var_type, 'size': field['size'], 'align': field.get('align', ''),
+                                'type_field': field['header_type_field'], 'version_field': field['header_version_field'] } )
+
+            elif 'array_fill' == disposition:
+                steps.append( { 'kind': 'array_fill', 'name': name, 'elem': self.__elem(var_type) } )
+
+            elif 'condition' in field:
+                cond_name  = field['condition']
+                cond_type  = decl.member_vars[cond_name][1]
+                cond_value = field['condition_value']
+                cond_value = f'{cond_type}.{cond_value}' if cond_type in self.__name_to_enum else cond_value
+                op         = '!=' if 'not equals' == field['condition_operation'] else '=='
+                member     = { 'name': name, 'elem': self.__elem(var_type), 'condition': f'self.{cond_name} {op} {cond_value}' }
+
+                # condition variables defined after the condition field are unions (always serialized)
+                idx_cond, _ = decl.member_vars[cond_name]
+                if idx_cond < idx:
+                    steps.append( dict( member, kind='condition' ) )
+                elif cond_name in unions:
+                    unions[cond_name]['members'].append( member )
+                else:
+                    unions[cond_name] = { 'kind': 'union', 'members': [member] }
+                    steps.append( unions[cond_name] )
+
+            else:
+                steps.append( { 'kind': 'fixed' if self.__elem(var_type)['fmt'] else 'struct', 'name': name, 'elem': self.__elem(var_type),
+                                'reserved': None, 'size_of': decl.size_to_arrays[name][0] if name in decl.size_to_arrays else '' } )
+
+        self.__steps[class_name] = steps
+        return steps
+
+
+
+    def __generate_class( self, class_name: str, comments: str ) -> None:
+        decl  = self.__class_decls[class_name]
+        steps = self.__flatten( class_name )
+        names = [ member['name'] for step in steps for member in step.get('members', [step]) if member['name'] and step.get('reserved') is None ]
+
+        self.__code_output += f'class {class_name}:\n'
+        if comments:
+            self.__code_output += f'    """ {comments} """\n\n'
+
+        self.__code_output += f'    __slots__ = ( {"".join( repr(name) + ", " for name in names )})\n\n'
+
+        for field in decl.fields:
+            if 'struct_type' == field.get('disposition'):
+                self.__code_output += f'    TRANSACTION_TYPE    = {field["type"]}.{decl.group_id}\n'
+                self.__code_output += f'    TRANSACTION_VERSION = {decl.group_version}\n\n'
+            elif 'const' == field.get('disposition'):
+                value = f'{field["type"]}.{field["value"]}' if field['type'] in self.__name_to_enum else field['value']
+                self.__code_output += f'    {field["name"]} = {value}\n\n'
+
+        self.__code_output += self.__generate_init( steps )
+        self.__code_output += self.__generate_decode( steps )
+        self.__code_output += self.__generate_encode( steps )
+        self.__code_output += python_class_methods
+
+
+
+    def __default( self, elem: dict ) -> str:
+        if elem['cls']:
+            return f'{elem["cls"]}()'
+
+        if elem['fmt'].endswith('s'):
+            return f'bytes( {elem["fmt"][:-1]} )'
+
+        return '0'
+
+
+
+    def __generate_init( self, steps: list ) -> str:
+        output = '    def __init__( self ):\n'
+
+        for step in steps:
+            kind = step['kind']
+
+            if 'fixed' == kind and step['reserved'] is not None:
+                continue
+            elif kind in [ 'fixed', 'struct' ]:
+                output += f'        self.{step["name"]} = {self.__default(step["elem"])}\n'
+            elif 'array' == kind and 'B' == step['elem']['fmt']:
+                output += f'        self.{step["name"]} = b""\n'
+            elif kind in [ 'array', 'array_sized', 'array_fill' ]:
+                output += f'        self.{step["name"]} = []\n'
+            elif 'condition' == kind:
+                output += f'        self.{step["name"]} = None\n'
+            elif 'union' == kind:
+                for member in step['members']:
+                    output += f'        self.{member["name"]} = {self.__default(member["elem"])}\n'
+
+        if not steps:
+            output += '        pass\n'
+
+        return output + '\n'
+
+
+
+    def __generate_decode( self, steps: list ) -> str:
+        output  = '    @classmethod\n'
+        output += '    def _decode( cls, view, offset ):\n'
+        output += '        self = cls.__new__( cls )\n'
+
+        idx = 0
+        while idx < len(steps):
+            step = steps[idx]
+            kind = step['kind']
+
+            if 'fixed' == kind:
+                # read all consecutive fixed fields at once
+                run = []
+                while idx < len(steps) and 'fixed' == steps[idx]['kind']:
+                    run.append( steps[idx] )
+                    idx += 1
+
+                targets = [ f'self.{s["name"]}' if s['reserved'] is None else f'_{s["name"]}' for s in run ]
+                fmt     = "".join( s['elem']['fmt'] for s in run )
+                struct  = self.__struct( fmt.replace( 's', 'x' ) )  # byte fields are skipped, and sliced from the view
+                values  = [ target for s, target in zip( run, targets ) if not s['elem']['fmt'].endswith('s') ]
+
+                output += f'        {", ".join(values)}, = ' if values else '        '
+                output += f'{struct}.unpack_from( view, offset )\n'
+
+                start = 0
+                for s, target in zip( run, targets ):
+                    size = self.__struct_size( s['elem']['fmt'] )
+                    if s['elem']['fmt'].endswith('s'):
+                        output += f'        {target} = view[offset+{start}:offset+{start + size}]\n'
+                    start += size
+
+                output += f'        offset += {struct}.size\n'
+
+                for s, target in zip( run, targets ):
+                    if s['reserved'] is not None:
+                        output += f'        if {s["reserved"]} != {target}: raise DecodeError( "{s["name"]}" )\n'
+                    elif s['elem']['enum']:
+                        output += f'        {target} = _{s["elem"]["enum"]}_VALUES.get( {target}, {target} )\n'
+                continue
+
+            elif 'struct' == kind:
+                output += f'        self.{step["name"]}, offset = {step["elem"]["cls"]}._decode( view, offset )\n'
+
+            elif 'array' == kind:
+                output += self.__decode_array( step )
+
+            elif 'array_sized' == kind:
+                output += self.__decode_array_sized( step )
+
+            elif 'array_fill' == kind:
+                output += f'        self.{step["name"]} = []\n'
+                output += f'        while offset < len( view ):\n'
+                output += f'            elem, offset = {step["elem"]["cls"]}._decode( view, offset )\n'
+                output += f'            self.{step["name"]}.append( elem )\n'
+
+            elif 'condition' == kind:
+                output += f'        self.{step["name"]} = None\n'
+                output += f'        if {step["condition"]}:\n'
+                output += self.__decode_value( step['elem'], f'self.{step["name"]}', '            ' )
+
+            elif 'union' == kind:
+                # all union members start at the same offset, which is moved by the size of the first member
+                for member in step['members']:
+                    output += self.__decode_value( dict( member['elem'], enum=None ), f'self.{member["name"]}', '        ', False )
+                output += f'        offset += {self.__struct( step["members"][0]["elem"]["fmt"] )}.size\n'
+
+            idx += 1
+
+        return output + '        return self, offset\n\n'
+
+
+
+    def __decode_value( self, elem: dict, target: str, indent: str, move: bool = True ) -> str:
+        if elem['cls']:
+            return f'{indent}{target}, offset = {elem["cls"]}._decode( view, offset )\n'
+
+        struct  = self.__struct( elem['fmt'] )
+
+        if elem['fmt'].endswith('s'):
+            output  = f'{indent}{self.__struct( elem["fmt"].replace( "s", "x" ) )}.unpack_from( view, offset )\n'
+            output += f'{indent}{target} = view[offset:offset+{self.__struct_size( elem["fmt"] )}]\n'
+        else:
+            output  = f'{indent}{target}, = {struct}.unpack_from( view, offset )\n'
+
+        if move:
+            output += f'{indent}offset += {struct}.size\n'
+
+        if elem['enum']:
+            output += f'{indent}{target} = _{elem["enum"]}_VALUES.get( {target}, {target} )\n'
+
+        return output
+
+
+
+    def __decode_array( self, step: dict ) -> str:
+        name   = step['name']
+        elem   = step['elem']
+        size   = step['size'] if str(step['size']).isdigit() else f'self.{step["size"]}'
+        empty  = 'b""' if 'B' == elem['fmt'] else '[]'
+        output = f'        self.{name} = {empty}\n'
+        indent = '        '
+
+        # arrays with a size of max value are not serialized
+        if not str(step['size']).isdigit() and step['size_type'] in self.max_values:
+            output += f'        if {size} != {self.max_values[ step["size_type"] ]}:\n'
+            indent += '    '
+
+        if elem['cls']:
+            output += f'{indent}for _ in range( {size} ):\n'
+            output += f'{indent}    elem, offset = {elem["cls"]}._decode( view, offset )\n'
+            output += f'{indent}    self.{name}.append( elem )\n'
+
+        elif 'B' == elem['fmt']:
+            output += f'{indent}if offset + {size} > len( view ): raise DecodeError( "{name}" )\n'
+            output += f'{indent}self.{name} = view[offset:offset+{size}]\n'
+            output += f'{indent}offset += {size}\n'
+
+        else:
+            output += f'{indent}array = _array_struct( "{elem["fmt"]}", {size} )\n'
+            output += f'{indent}self.{name} = list( array.unpack_from( view, offset ) )\n'
+            output += f'{indent}offset += array.size\n'
+
+            if elem['enum']:
+                output += f'{indent}self.{name} = [ _{elem["enum"]}_VALUES.get( value, value ) for value in self.{name} ]\n'
+
+        return output
+
+
+
+    def __decode_array_sized( self, step: dict ) -> str:
+        name          = step['name']
+        type_attr     = self.__header_attr( step['type_field'] )
+        version_attr  = self.__header_attr( step['version_field'] )
+        enum_type     = self.__header_enum( step['header'], type_attr )
+
+        output  = f'        self.{name} = []\n'
+        output += f'        end = offset + self.{step["size"]}\n'
+        output += f'        if end > len( view ): raise DecodeError( "{name}" )\n'
+        output += f'        while offset < end:\n'
+        output += f'            header, _ = {step["header"]}._decode( view, offset )\n'
+        output += f'            elem_cls  = _{enum_type}_CLASSES.get( ( header.{version_attr}, header.{type_attr} ) )\n'
+        output += f'            if elem_cls is None: raise DecodeError( "{name}" )\n\n'
+        output += f'            elem, offset = elem_cls._decode( view, offset )\n'
+        output += f'            self.{name}.append( elem )\n'
+
+        if step['align']:
+            output += f'            offset += -offset % {step["align"]}\n'
+
+        output += f'        if offset != end: raise DecodeError( "{name}" )\n'
+        return output
+
+
+
+    def __generate_encode( self, steps: list ) -> str:
+        output = '    def _encode( self, out ):\n'
+
+        idx = 0
+        while idx < len(steps):
+            step = steps[idx]
+            kind = step['kind']
+
+            if 'fixed' == kind:
+                run = []
+                while idx < len(steps) and 'fixed' == steps[idx]['kind']:
+                    run.append( steps[idx] )
+                    idx += 1
+
+                values = []
+                for s in run:
+                    if s['reserved'] is not None:
+                        values.append( str(s['reserved']) )
+                    elif s.get('size_of'):
+                        values.append( f'len( self.{s["size_of"]} )' )
+                    else:
+                        values.append( self.__encode_value( s['elem'], f'self.{s["name"]}' ) )
+
+                struct  = self.__struct( "".join( s['elem']['fmt'] for s in run ) )
+                output += f'        out += {struct}.pack( {", ".join(values)} )\n'
+                continue
+
+            elif 'struct' == kind:
+                output += f'        self.{step["name"]}._encode( out )\n'
+
+            elif 'array' == kind:
+                elem = step['elem']
+                if elem['cls']:
+                    output += f'        for elem in self.{step["name"]}: elem._encode( out )\n'
+                elif 'B' == elem['fmt']:
+                    output += f'        out += self.{step["name"]}\n'
+                else:
+                    output += f'        out += _array_struct( "{elem["fmt"]}", len( self.{step["name"]} ) ).pack( *self.{step["name"]} )\n'
+
+            elif 'array_sized' == kind:
+                output += f'        for elem in self.{step["name"]}:\n'
+                output += f'            elem._encode( out )\n'
+                if step['align']:
+                    output += f'            out += bytes( -len( out ) % {step["align"]} )\n'
+
+            elif 'array_fill' == kind:
+                output += f'        for elem in self.{step["name"]}: elem._encode( out )\n'
+
+            elif 'condition' == kind:
+                output += f'        if {step["condition"]}:\n'
+                if step['elem']['cls']:
+                    output += f'            self.{step["name"]}._encode( out )\n'
+                else:
+                    output += f'            out += {self.__struct( step["elem"]["fmt"] )}.pack( {self.__encode_value( step["elem"], "self." + step["name"] )} )\n'
+
+            elif 'union' == kind:
+                # serialize the member whose condition is true, or the first member
+                members = step['members']
+                for i, member in enumerate( members[1:] ):
+                    output += f'        {"if" if 0 == i else "elif"} {member["condition"]}:\n'
+                    output += f'            out += {self.__struct( member["elem"]["fmt"] )}.pack( {self.__encode_value( member["elem"], "self." + member["name"] )} )\n'
+                indent = '            ' if len(members) > 1 else '        '
+                if len(members) > 1:
+                    output += '        else:\n'
+                output += f'{indent}out += {self.__struct( members[0]["elem"]["fmt"] )}.pack( {self.__encode_value( members[0]["elem"], "self." + members[0]["name"] )} )\n'
+
+            idx += 1
+
+        if not steps:
+            output += '        pass\n'
+
+        return output + '\n'
+
+
+
+    @staticmethod
+    def __encode_value( elem: dict, value: str ) -> str:
+        # byte fields may be memoryviews, which 'struct' only packs as bytes
+        return f'bytes( {value} )' if elem['fmt'].endswith('s') else value
+
+
+
+    def __header_attr( self, field_path: str ) -> str:
+        """
+        Converts a C++ header field path (eg. 'EntityBody.mVersion') to
+        the name of the flattened attribute (eg. 'version').
+        """
+
+        name = field_path.split('.')[-1]
+        if name.startswith('m') and name[1:2].isupper():
+            name = name[1:2].lower() + name[2:]
+
+        return name
+
+
+
+    def __header_enum( self, header_class: str, type_attr: str ) -> str:
+        for step in self.__flatten( header_class ):
+            if step.get('name') == type_attr:
+                return step['elem']['enum']
+
+        print(f'Error: Type field "{type_attr}" not found in header "{header_class}"\n')
+        exit(1)
+
+
+
+    def __generate_group( self, group_name: str ) -> None:
+        versions_to_enum_to_classes = self.__groups[group_name]
+
+        self.__code_output += f'_{group_name}_CLASSES = {{\n'
+        for version, enum_to_classes in versions_to_enum_to_classes.items():
+            for enum_type, class_name in enum_to_classes.items():
+                self.__code_output += f'    ( {version}, {group_name}.{enum_type} ): {class_name},\n'
+        self.__code_output += '}\n\n\n'
+
+        first_class   = list( list(versions_to_enum_to_classes.values())[0].values() )[0]
+        decl          = self.__class_decls[first_class]
+        type_attr     = self.__header_attr( decl.header_type_field )
+        version_attr  = self.__header_attr( decl.header_version_field ) if decl.header_version_field else ''
+        version       = f'header.{version_attr}' if version_attr else '1'
+
+        self.__code_output += f'def create_type_{group_name}( type, version ):\n'
+        self.__code_output += f'    """ Returns a new instance of the class with enum-type \'type\' and version \'version\', or None. """\n'
+        self.__code_output += f'    cls = _{group_name}_CLASSES.get( ( version, type ) )\n'
+        self.__code_output += f'    return cls() if cls else None\n\n\n'
+
+        self.__code_output += f'def deserialize_{group_name}( data ):\n'
+        self.__code_output += f'    """ Deserializes a buffer belonging to the class group \'{group_name}\', detecting its class from the header. """\n'
+        self.__code_output += f'    header = {decl.group_header}.deserialize( data )\n'
+        self.__code_output += f'    cls    = _{group_name}_CLASSES.get( ( {version}, header.{type_attr} ) )\n'
+        self.__code_output += f'    if cls is None: raise DecodeError( "unknown type" )\n'
+        self.__code_output += f'    return cls.deserialize( data )\n\n\n'
+
+
+
+python_code_header = '''"""
+Generated by the catbuffer generator. Do not edit.
+
+Deserializes and serializes catbuffer structs in pure Python. Byte arrays
+of deserialized structs are memoryviews of the input buffer.
+"""
+
+import enum
+import struct
+
+
+class DecodeError( ValueError ):
+    """ Raised when a buffer can not be deserialized. """
+
+
+_array_structs = {}
+
+def _array_struct( fmt, count ):
+    """ Returns a precompiled 'struct.Struct' for an array of 'count' values of format 'fmt'. """
+    key = ( fmt, count )
+    if key not in _array_structs:
+        _array_structs[key] = struct.Struct( '<' + fmt * count )
+    return _array_structs[key]
+
+
+'''
+
+
+
+dtypes_code_header = '''"""
+Generated by the catbuffer generator. Do not edit.
+
+NumPy structured dtypes of all fixed size catbuffer structs.
+"""
+
+import numpy
+
+
+'''
+
+
+
+python_class_methods = '''    @classmethod
+    def deserialize( cls, data ):
+        """ Deserializes an instance from a bytes-like object. """
+        try:
+            return cls._decode( memoryview( data ), 0 )[0]
+        except struct.error as e:
+            raise DecodeError( str(e) ) from e
+
+    def serialize( self ):
+        """ Serializes the instance to bytes. """
+        out = bytearray()
+        self._encode( out )
+        return bytes( out )
+
+
+'''
@@ -0,0 +1,189 @@
+import hashlib
+import importlib.metadata
+import pickle
+import typing
+import zlib
+from pathlib import Path
+
+from catparser.ast import AstException, Statement
+from catparser.AstPostProcessor import AstPostProcessor
+from catparser.AstValidator import AstValidator
+from catparser.CatsLarkParser import create_cats_lark_parser
+from lark import Tree
+
+from .AstToNativeConverter import ast_to_native
+
+
+
+class SchemaCache():
+    """
+    Loads catbuffer schemas (.cats files) as input for the generator, and
+    caches the result between runs in a single compressed pickle file:
+
+        ----------------------------------------------------------------------------------------
+        cache = SchemaCache( "output/.schema_cache" )
+        input_data = cache.load( "schemas/all.cats", "schemas" )
+        cache.save()
+        ----------------------------------------------------------------------------------------
+
+    The converted types of a schema set are keyed by the SHA-256 hashes of
+    all its files (the schema and its imports), so an unchanged set is
+    returned without parsing or converting anything. The parsed statements
+    of every file are also cached by the hash of the file, so if a file
+    changes, only that file is parsed again. The inline expansion and the
+    conversion still run over the whole set, since they resolve types
+    across files, but they take a fraction of the time of parsing.
+    """
+
+    version = 1  # increase when the cache format or the conversion changes
+
+    def __init__( self, cache_path: str = "" ) -> None:
+        """
+        Reads the cache from 'cache_path', if it exists. Without a path,
+        nothing is read or saved.
+        """
+
+        self.__cache_path = Path( cache_path ) if cache_path else None
+        self.__files : typing.Dict[str, typing.Tuple[str, typing.List[str], bytes]] = {}  # path -> (hash, imports, pickled statements)
+        self.__sets  : typing.Dict[str, bytes] = {}                                      # set key -> compressed pickled types
+        self.__parser = None
+
+        self.parsed_files : typing.List[str] = []  # files parsed by the last 'load()'
+        self.hit          = False                  # True if the last 'load()' returned cached types
+
+        if self.__cache_path and self.__cache_path.is_file():
+            try:
+                version, self.__files, self.__sets = pickle.loads( zlib.decompress( self.__cache_path.read_bytes() ) )
+                if version != self.__key_prefix():
+                    self.__files, self.__sets = {}, {}
+            except Exception: # an unreadable cache is rebuilt
+                self.__files, self.__sets = {}, {}
+
+
+
+    def load( self, schema_file: str, include_path: str ) -> list:
+        """
+        Returns the converted types of 'schema_file' and its imports, which
+        are searched for in 'include_path'. Raises AstException if the
+        schema does not validate, and AstToNativeError if it can not be
+        converted.
+        """
+
+        self.parsed_files = []
+
+        order = []  # files in import order (imports before the files importing them)
+        self.__collect( Path( schema_file ), Path( include_path ), set(), order )
+
+        key = hashlib.sha256( "\n".join( [ self.__key_prefix() ] + [ f'{path} {self.__files[path][0]}' for path in order ] ).encode() ).hexdigest()
+
+        self.hit = key in self.__sets
+        if not self.hit:
+            descriptors = []
+            for path in order:
+                descriptors += pickle.loads( self.__files[path][2] )
+
+            self.__sets[key] = zlib.compress( pickle.dumps( self.__convert( descriptors ), pickle.HIGHEST_PROTOCOL ) )
+
+        # most recently used last, so that only the recent sets are kept
+        self.__sets[key] = self.__sets.pop( key )
+        while len(self.__sets) > 8:
+            del self.__sets[ next(iter(self.__sets)) ]
+
+        return pickle.loads( zlib.decompress( self.__sets[key] ) )
+
+
+
+    def save( self ) -> None:
+        if not self.__cache_path:
+            return
+
+        data = zlib.compress( pickle.dumps( (self.__key_prefix(), self.__files, self.__sets), pickle.HIGHEST_PROTOCOL ) )
+
+        tmp_path = self.__cache_path.with_suffix( ".tmp" )
+        tmp_path.write_bytes( data )
+        tmp_path.replace( self.__cache_path )
+
+
+
+    def __collect( self, path: Path, include_path: Path, visited: set, order: list ) -> None:
+        """
+        Adds the imports of 'path' and then 'path' itself to 'order', parsing the files which are not cached.
+        """
+
+        if str(path) in visited:
+            return
+
+        visited.add( str(path) )
+        contents = path.read_bytes()
+        digest   = hashlib.sha256( contents ).hexdigest()
+
+        if str(path) not in self.__files or self.__files[str(path)][0] != digest:
+            imports, statements = self.__parse( contents.decode( "utf8" ) )
+            self.__files[str(path)] = ( digest, imports, pickle.dumps( statements, pickle.HIGHEST_PROTOCOL ) )
+            self.parsed_files.append( str(path) )
+
+        for imported in self.__files[str(path)][1]:
+            self.__collect( include_path / imported, include_path, visited, order )
+
+        order.append( str(path) )
+
+
+
+    def __parse( self, contents: str ) -> typing.Tuple[typing.List[str], list]:
+        """
+        Parses a single file, returning its imports and statements.
+        """
+
+        if not self.__parser:
+            self.__parser = create_cats_lark_parser()
+
+        parse_result = self.__parser.parse( contents )
+        if isinstance( parse_result, Statement ):
+            return [], [ parse_result ]
+
+        imports = []
+        for child in parse_result.children:
+            if not isinstance( child, Tree ):
+                continue
+
+            if 'import' != child.data:
+                raise AstException( f'found unexpected unprocessed tree "{child.data}"' )
+
+            imports.append( str(child.children[0]) )
+
+        return imports, [ child for child in parse_result.children if isinstance( child, Statement ) ]
+
+
+
+    @staticmethod
+    def __convert( descriptors: list ) -> list:
+        """
+        Expands the inline structs of the parsed statements and converts them to generator input.
+        """
+
+        processor = AstPostProcessor( descriptors )
+
+        SchemaCache.__validate( descriptors, AstValidator.Mode.PRE_EXPANSION )
+        processor.apply_attributes()
+        processor.expand_named_inlines()
+        processor.expand_unnamed_inlines()
+        SchemaCache.__validate( descriptors, AstValidator.Mode.POST_EXPANSION )
+
+        return ast_to_native( processor.type_descriptors )
+
+
+
+    @staticmethod
+    def __validate( descriptors: list, mode: AstValidator.Mode ) -> None:
+        validator = AstValidator( descriptors )
+        validator.set_validation_mode( mode )
+        validator.validate()
+
+        if validator.errors:
+            raise AstException( "\n".join( [ f"schema validation failed ({mode.name}):" ] + [ f" + {error}" for error in validator.errors ] ) )
+
+
+
+    @staticmethod
+    def __key_prefix() -> str:
+        return f'{SchemaCache.version} catparser {importlib.metadata.version( "catparser" )}'
@@ -0,0 +1,233 @@
+import typing
+from dataclasses import dataclass
+
+from .CppFieldGenerator import CppFieldGenerator
+from .CppTypesGenerator import CppTypesGenerator
+
+
+@dataclass
+class TypeLayout:
+    min_size          : int                  # smallest serialized size in bytes
+    max_size          : typing.Optional[int] # largest serialized size in bytes (None if unbounded)
+    alignment         : int                  # largest alignment of a field, or of the padding of an array sized field
+    trivially_copyable: bool                 # the serialized bytes have a fixed size and layout (no arrays, conditions or polymorphic fields)
+    depth             : int = 0              # nesting depth of struct members (0 for builtins, enums, aliases and flat structs)
+    fan_out           : int = 0              # number of struct types which the array sized fields of the struct can hold
+
+    @property
+    def fixed( self ) -> bool:
+        return self.max_size == self.min_size
+
+
+class TypeLayoutAnalyzer():
+    """
+    Computes the serialized layout of every type in a schema, i.e. its
+    minimum and maximum size, alignment, nesting depth, etc. The layouts
+    are computed on demand and memoized, so all generators can share one
+    instance instead of deriving sizes from the types themselves:
+
+        ----------------------------------------------------------------------------------------
+        layouts = TypeLayoutAnalyzer( types_generator, class_decls )
+
+        layouts.type_size( "Transaction" )          # 128
+        layouts.type_size( "TransferTransaction" )  # None, variable size
+        layouts.layout( "Mosaic" ).alignment        # 8
+        ----------------------------------------------------------------------------------------
+
+    The maximum size of an array is derived from the largest value of its
+    size field, and arrays which fill the rest of a buffer are unbounded.
+    'report()' formats the layouts of all structs as a schema statistics
+    table.
+    """
+
+    def __init__( self,
+                  types:       CppTypesGenerator,
+                  class_decls: typing.Dict[str, "CppClassDeclarationGenerator"] ) -> None:
+
+        self.__name_to_enum  = types.name_to_enum
+        self.__name_to_alias = types.name_to_alias
+        self.__class_decls   = class_decls
+
+        self.__layouts : typing.Dict[str, TypeLayout] = {}  # memoized layouts
+
+        # group header -> structs of the group, i.e. the types an array sized field can hold
+        self.__header_to_structs : typing.Dict[str, typing.List[str]] = {}
+        for class_name, decl in class_decls.items():
+            if decl.group_header:
+                self.__header_to_structs.setdefault( decl.group_header, [] ).append( class_name )
+
+
+
+    def layout( self, var_type: str ) -> TypeLayout:
+        """
+        Returns the layout of a builtin, enum, alias or struct type.
+        """
+
+        if var_type not in self.__layouts:
+            self.__layouts[var_type] = self.__analyze( var_type )
+
+        return self.__layouts[var_type]
+
+
+
+    def type_size( self, var_type: str ) -> typing.Optional[int]:
+        """
+        Returns the serialized size of a type in bytes, or None if the
+        type does not have a fixed size.
+        """
+
+        layout = self.layout( var_type )
+        return layout.min_size if layout.fixed else None
+
+
+
+    def is_scalar( self, var_type: str ) -> bool:
+        """
+        Returns True for builtin, enum and alias types, which are stored as
+        plain values in the generated classes.
+        """
+
+        return var_type in CppFieldGenerator.builtin_types or var_type in self.__name_to_enum or var_type in self.__name_to_alias
+
+
+
+    def report( self ) -> str:
+        """
+        Returns a table with the layouts of all structs, followed by a summary.
+        """
+
+        output  = f'{"struct":<48} {"min":>6} {"max":>10} {"align":>5} {"trivial":>7} {"depth":>5} {"fan-out":>7}\n'
+        output += '-' * 94 + '\n'
+
+        for class_name in sorted( self.__class_decls ):
+            layout   = self.layout( class_name )
+            max_size = "unbounded" if layout.max_size is None else layout.max_size
+            trivial  = "yes" if layout.trivially_copyable else "no"
+            output  += f'{class_name:<48} {layout.min_size:>6} {max_size:>10} {layout.alignment:>5} {trivial:>7} {layout.depth:>5} {layout.fan_out:>7}\n'
+
+        layouts  = [ self.layout( class_name ) for class_name in self.__class_decls ]
+        output  += '-' * 94 + '\n'
+        output  += f'{len(layouts)} structs: {sum(layout.fixed for layout in layouts)} fixed size, '
+        output  += f'{sum(layout.trivially_copyable for layout in layouts)} trivially copyable, '
+        output  += f'{sum(layout.fan_out > 0 for layout in layouts)} polymorphic, '
+        output  += f'max depth {max( [ layout.depth for layout in layouts ], default=0 )}\n'
+
+        return output
+
+
+
+    def __analyze( self, var_type: str ) -> TypeLayout:
+
+        if var_type in CppFieldGenerator.builtin_types:
+            size = int( "".join( c for c in var_type if c.isdigit() ) ) // 8
+            return TypeLayout( size, size, size, True )
+
+        if var_type in self.__name_to_enum:
+            return self.layout( self.__name_to_enum[var_type].type )
+
+        if var_type in self.__name_to_alias:
+            alias = self.__name_to_alias[var_type]
+            base  = self.layout( alias.type )
+            return TypeLayout( base.min_size * alias.size, base.max_size * alias.size, base.alignment, True )
+
+        if var_type in self.__class_decls:
+            return self.__analyze_struct( self.__class_decls[var_type] )
+
+        raise KeyError( f"Type '{var_type}' not declared" )
+
+
+
+    def __analyze_struct( self, class_decl ) -> TypeLayout:
+        """
+        Adds up the layouts of the serialized fields of a struct. 'const'
+        and 'struct_type' fields are not serialized.
+        """
+
+        result      = TypeLayout( 0, 0, 1, True )
+        unions_done = set()
+
+        for idx, field in enumerate(class_decl.fields):
+            var_type    = field["type"]
+            disposition = field["disposition"] if "disposition" in field else ""
+
+            if disposition in ["const", "struct_type"]:
+                continue
+
+            if disposition in ["inline", "reserved", ""] and "condition" not in field:
+                self.__add( result, var_type, 1, 1 )
+
+            elif "condition" in field:
+                cond_var = field["condition"]
+                idx_cond = class_decl.member_vars[cond_var][0] if cond_var in class_decl.member_vars else -1
+
+                # condition variables defined after the condition field are unions (always serialized, as large as the largest member)
+                if idx_cond > idx:
+                    if cond_var in unions_done:
+                        continue
+
+                    unions_done.add( cond_var )
+                    members = [ member["type"] for member in class_decl.conditions[cond_var] ]
+                    self.__add( result, max( members, key=lambda member: self.layout( member ).min_size ), 1, 1 )
+                else:
+                    self.__add( result, var_type, 0, 1 )
+                    result.trivially_copyable = False
+
+            elif "array" == disposition:
+                if str(field["size"]).isdigit():
+                    self.__add( result, var_type, int(field["size"]), int(field["size"]) )
+                else:
+                    self.__add( result, var_type, 0, self.__max_count( class_decl, field["size"] ) )
+                    result.trivially_copyable = False
+
+            elif "array_sized" == disposition:
+                structs   = self.__header_to_structs.get( var_type, [] )
+                max_bytes = self.__max_count( class_decl, field["size"] )
+
+                result.max_size           = None if result.max_size is None or max_bytes is None else result.max_size + max_bytes
+                result.alignment          = max( [ result.alignment, int(field.get("align", 1)) ] + [ self.layout( struct ).alignment for struct in structs ] )
+                result.depth              = max( [ result.depth ] + [ self.layout( struct ).depth + 1 for struct in structs ] )
+                result.fan_out           += len( structs )
+                result.trivially_copyable = False
+
+            elif "array_fill" == disposition:
+                self.__add( result, var_type, 0, None )
+                result.trivially_copyable = False
+
+        return result
+
+
+
+    def __add( self, result: TypeLayout, var_type: str, min_count: int, max_count: typing.Optional[int] ) -> None:
+        """
+        Adds between 'min_count' and 'max_count' (None for unbounded) fields of type 'var_type' to 'result'.
+        """
+
+        layout = self.layout( var_type )
+
+        result.min_size += layout.min_size * min_count
+
+        if 0 != max_count:
+            if result.max_size is None or layout.max_size is None or max_count is None:
+                result.max_size = None
+            else:
+                result.max_size += layout.max_size * max_count
+
+        result.alignment           = max( result.alignment, layout.alignment )
+        result.trivially_copyable &= layout.trivially_copyable
+        result.fan_out            += layout.fan_out
+
+        if var_type in self.__class_decls:
+            result.depth = max( result.depth, layout.depth + 1 )
+
+
+
+    def __max_count( self, class_decl, size_var: str ) -> typing.Optional[int]:
+        """
+        Returns the largest value of a size field, or None if the field is not a builtin or enum of the struct.
+        """
+
+        for field in class_decl.fields:
+            if field.get("name") == size_var and self.is_scalar( field["type"] ) and field["type"] not in self.__name_to_alias:
+                return ( 1 << ( 8 * self.layout( field["type"] ).min_size ) ) - 1
+
+        return None
@@ -6,6 +6,7 @@ class YamlDependencyCheckerResult(Enum):
     OK                                  = auto()  # Everything went well
     ARRAY_SIZED_HEADER_NOT_DECLARED     = auto()
     ARRAY_SIZED_TYPE_FIELD_NOT_DECLARED = auto()
+    ROOT_TYPE_NOT_DECLARED              = auto()
 
 
 class YamlDependencyChecker():
@@ -27,6 +28,96 @@ class YamlDependencyChecker():
 
 
 
+    @staticmethod
+    def type_dependencies( input_data: list ) -> typing.Dict[ str, typing.Set[str] ]:
+        """
+        Builds the type dependency graph of a YAML input, i.e. for each
+        enum, alias and struct, the set of types it directly depends on.
+        Builtin types are not part of the graph.
+
+        A struct depends on the types of its fields and on the header of
+        its 'struct_type' group. An 'array_sized' field can hold any
+        struct of the group with the given header, so the struct also
+        depends on all structs of that group.
+        """
+
+        names             = { elem["name"] for elem in input_data }
+        header_to_structs = {}  # group header -> structs of the group
+        dependencies      = {}
+
+        for elem in input_data:
+            if "struct" != elem["type"]:
+                continue
+
+            for field in elem["layout"]:
+                if "struct_type" == field["type"].split()[0]:
+                    header_to_structs.setdefault( field["header"], set() ).add( elem["name"] )
+
+        for elem in input_data:
+            dependencies[ elem["name"] ] = set()
+
+            if "struct" != elem["type"]:
+                continue
+
+            for field in elem["layout"]:
+                types = field["type"].split()
+                dependencies[ elem["name"] ].add( types[-1] )
+
+                if "struct_type" == types[0]:
+                    dependencies[ elem["name"] ].add( field["header"] )
+
+                elif "array_sized" == types[0]:
+                    dependencies[ elem["name"] ].update( header_to_structs.get( types[-1], set() ) )
+
+            dependencies[ elem["name"] ] &= names
+            dependencies[ elem["name"] ].discard( elem["name"] )
+
+        return dependencies
+
+
+
+    @staticmethod
+    def reachable_types( input_data: list, roots: typing.List[str] ) -> typing.Tuple[ YamlDependencyCheckerResult, str, typing.Set[str] ]:
+        """
+        Returns the transitive closure of 'roots' in the type dependency
+        graph, i.e. all types needed to generate the root types. A root
+        can also be the enum of a 'struct_type' group, which stands for
+        all structs of that group.
+        """
+
+        dependencies     = YamlDependencyChecker.type_dependencies( input_data )
+        group_to_structs = {}  # group enum -> structs of the group
+
+        for elem in input_data:
+            if "struct" != elem["type"]:
+                continue
+
+            for field in elem["layout"]:
+                types = field["type"].split()
+                if "struct_type" == types[0]:
+                    group_to_structs.setdefault( types[-1], set() ).add( elem["name"] )
+
+        pending = []
+        for root in roots:
+            if root not in dependencies:
+                return YamlDependencyCheckerResult.ROOT_TYPE_NOT_DECLARED, f"\n\nError: The root type '{root}' is not declared!\n\n", set()
+
+            pending.append( root )
+            pending.extend( group_to_structs.get( root, set() ) )
+
+        reachable = set()
+        while pending:
+            name = pending.pop()
+            if name in reachable:
+                continue
+
+            reachable.add( name )
+            pending.extend( dependencies[name] - reachable )
+
+        return YamlDependencyCheckerResult.OK, "", reachable
+
+
+
 
 
 
@@ -1,18 +1,33 @@
 import typing
 import yaml
 import shutil
+import argparse
 from pathlib import Path
-import sys
 from distutils.dir_util import copy_tree
 
 from .CppClassDefinitionGenerator import CppClassDefinitionGenerator
 from .CppClassDeclarationGenerator import CppClassDeclarationGenerator 
 from .YamlFieldChecker import YamlFieldCheckResult
+from .YamlDependencyChecker import YamlDependencyChecker, YamlDependencyCheckerResult
 from .CppTypesGenerator import CppTypesGenerator
 from .CppConvertersGenerator import CppConvertersGenerator
+from .CppBenchmarkGenerator import CppBenchmarkGenerator
+from .CppCApiGenerator import CppCApiGenerator
+from .CppColumnsGenerator import CppColumnsGenerator
+from .CppJsonGenerator import CppJsonGenerator
+from .PythonCodecGenerator import PythonCodecGenerator
+from .CppUnityBuildGenerator import CppUnityBuildGenerator
+from .TypeLayoutAnalyzer import TypeLayoutAnalyzer
+from .CppTableGenerator import CppTableGenerator
 
 
-def generate( input_data: list, gen_output_folder: str, generate_print_methods: bool = False):
+def declare_schema( input_data: list, generate_print_methods: bool = False, header_only: bool = False, backend: str = "code" ) -> typing.Tuple[CppTypesGenerator, typing.Dict[str, CppClassDeclarationGenerator], TypeLayoutAnalyzer]:
+    """
+    Declares the enum, alias and struct types of the generator input, and
+    exits if the fields of a struct are invalid. Returns the types, the
+    class declarations by name and the TypeLayoutAnalyzer which all
+    generators share.
+    """
 
     # Generate enum types
     print("Generating enum types:")
@@ -34,8 +49,6 @@ def generate( input_data: list, gen_output_folder: str, generate_print_methods:
             types_generator.add_alias_type( elem )
             print("\t"+elem["name"])
 
-    types_generator.write_file(gen_output_folder+"/types.h")
-
 
     # Generate class declarations (*.h)
     print("\nGenerating class declarations:")
@@ -46,38 +59,96 @@ def generate( input_data: list, gen_output_folder: str, generate_print_methods:
             comments           = elem['comments'] if "comments" in elem else ""
             class_name         = elem['name']
             class_dec_gen      = class_decls[class_name]
-            result, result_str = class_dec_gen.init(class_name, elem['layout'], types_generator, class_decls, comments, generate_print_methods)
+            result, result_str = class_dec_gen.init(class_name, elem['layout'], types_generator, class_decls, comments, generate_print_methods, header_only, "table" == backend)
 
             if result != YamlFieldCheckResult.OK:
                 print(result_str)
                 exit(1)
 
-            class_dec_gen.write_file( gen_output_folder+f'/{class_name}.h' )
-
             class_decls[elem['name']] = class_dec_gen
             print("\t"+elem["name"])
 
+    for decl in class_decls.values():
+        decl.check_dependency()
+
+    return types_generator, class_decls, TypeLayoutAnalyzer( types_generator, class_decls )
+
 
+
+def generate( input_data: list, gen_output_folder: str, generate_print_methods: bool = False, benchmark_folder: str = "", python_folder: str = "", generate_numpy: bool = False, generate_columns: bool = False, header_only: bool = False, print_stats: bool = False, backend: str = "code", generate_json: bool = False, capi_folder: str = "", ffi_folder: str = "", parallel_decode: bool = False ):
+
+    types_generator, class_decls, layouts = declare_schema( input_data, generate_print_methods, header_only, backend )
+
+    types_generator.write_file(gen_output_folder+"/types.h")
     for class_name, decl in class_decls.items():
-        decl.check_dependency()
+        decl.write_file( gen_output_folder+f'/{class_name}.h', layouts )
 
     # Generate class definitions (*.cpp)
     print("\nGenerating class definitions:")
+    table_headers = CppTableGenerator.array_sized_headers( class_decls ) if "table" == backend else None
+
     for elem in input_data:
         if 'struct' == elem['type']:
             print("\t"+elem["name"])
 
             class_decl         = class_decls[elem['name']]
             class_def_gen      = CppClassDefinitionGenerator()
-            class_def_gen.init( class_decl, class_decls, types_generator, generate_print_methods )
+            class_def_gen.init( class_decl, class_decls, types_generator, layouts, generate_print_methods, table_headers, parallel_decode )
 
-            class_def_gen.write_file( gen_output_folder+f'/{class_decl.class_name}.cpp' )
+            if header_only:
+                class_def_gen.write_file( gen_output_folder+f'/{class_decl.class_name}.h', header_only=True )
+            else:
+                class_def_gen.write_file( gen_output_folder+f'/{class_decl.class_name}.cpp' )
 
 
     # Generate enum to class converters
     converter = CppConvertersGenerator( class_decls, types_generator, generate_print_methods )
     converter.write_file( gen_output_folder )
 
+
+    # Generate columnar decoders
+    if generate_columns:
+        print("\nGenerating columnar decoders")
+        columns = CppColumnsGenerator( class_decls, types_generator )
+        columns.write_file( gen_output_folder )
+
+
+    # Generate JSON transcoders
+    if generate_json:
+        print("\nGenerating JSON transcoders")
+        json_transcoders = CppJsonGenerator( input_data, class_decls, types_generator, converter.type_to_versions_to_enum_to_classes )
+        json_transcoders.write_file( gen_output_folder )
+
+
+    # Generate C API and Python loader
+    if capi_folder:
+        print("\nGenerating C API")
+        capi = CppCApiGenerator( input_data, class_decls, types_generator, layouts, converter.type_to_versions_to_enum_to_classes )
+        capi.write_files( capi_folder )
+
+        capi.write_loader_file( ffi_folder+"/catbuffer_ffi.py" )
+
+
+    # Generate benchmark executable
+    if benchmark_folder:
+        print("\nGenerating benchmark")
+        benchmark = CppBenchmarkGenerator( class_decls, converter.type_to_versions_to_enum_to_classes, generate_json )
+        benchmark.write_file( benchmark_folder+"/benchmark.cpp" )
+
+    # Generate Python codec
+    if python_folder:
+        print("\nGenerating Python codec")
+        codec = PythonCodecGenerator( input_data, class_decls, types_generator, layouts, converter.type_to_versions_to_enum_to_classes )
+        codec.write_file( python_folder+"/catbuffer.py" )
+
+        if generate_numpy:
+            codec.write_dtypes_file( python_folder+"/catbuffer_dtypes.py" )
+
+    # Print schema statistics
+    if print_stats:
+        print("\nSchema statistics (serialized sizes in bytes):\n")
+        print( layouts.report() )
+
     print("\nDone!")
 
 
@@ -85,28 +156,98 @@ def generate( input_data: list, gen_output_folder: str, generate_print_methods:
 
 
 
+def load_schema( schema_file: str, include_path: str, cache_path: str ) -> list:
+    """
+    Parses a catbuffer schema and its imports with catparser, and converts
+    it to generator input. The result is cached in 'cache_path' (see
+    'SchemaCache'), unless it is empty.
+    """
+
+    try:
+        from .SchemaCache import SchemaCache
+    except ImportError as ex:
+        print(f"Error: Reading .cats files requires catparser ({ex})!\n")
+        exit(1)
+
+    from catparser.ast import AstException
+    from lark.exceptions import LarkError
+    from .AstToNativeConverter import AstToNativeError
+
+    print(f"Reading schema: {schema_file}\n")
+    cache = SchemaCache( cache_path )
+
+    try:
+        input_data = cache.load( schema_file, include_path )
+    except (AstException, AstToNativeError, LarkError, OSError) as ex:
+        print(f"Error: {ex}\n")
+        exit(1)
+
+    cache.save()
+
+    if cache.hit:
+        print("Using cached schema conversion\n")
+    else:
+        print(f"Parsed {len(cache.parsed_files)} changed schema file(s): {', '.join(cache.parsed_files)}\n")
+
+    return input_data
+
+
+
 def main():
     """
     Takes a .yaml file and generates C++ code in an output folder.
 
-    Command line: 'python3 -m generator myYamlFile.yaml MyOutputFolder'
+    Command line: 'python3 -m generator myYamlFile.yaml MyOutputFolder [options]'
 
     The steps taken are: 
 
         1) Generate enum and aliases in 'types.h'
         2) Generate class declarations (*.h) for struct types
-        3) Generate class definitions (*.cpp) for struct types
+        3) Generate class definitions (*.cpp) for struct types, or inline in the headers with '--header-only',
+           or field tables for 'TableCodec' with '--backend table'. With '--parallel-decode', large 'array_sized'
+           fields are deserialized on a thread pool ('ParallelDecode.h')
         4) Generate 'enum to class' converters in file 'converters.h'
+        5) Optionally generate columnar decoders in 'columns.h'
+        6) Optionally generate streaming JSON transcoders in 'json.h' and 'json.cpp'
+        7) Optionally generate a C API in 'capi/catbuffer_c.h' and its 'ctypes' loader in 'python/catbuffer_ffi.py'
+        8) Optionally generate a benchmark executable in 'benchmark/benchmark.cpp'
+        9) Optionally generate a pure Python codec in 'python/catbuffer.py' and NumPy dtypes in 'python/catbuffer_dtypes.py'
+        10) Optionally amalgamate the class definitions into unity build shards in 'generated_src/unity/'
     """
 
-    # Check if enough arguments
-    if len(sys.argv) < 3:
-        print( "Error: Not enough command line arguments!\n" )
-        exit(1)
+    parser = argparse.ArgumentParser( prog="generator", description="Generates C++ serialization code from a catbuffer YAML file." )
+    parser.add_argument( "input_file",           help="the YAML input file, or a catbuffer schema (.cats) file" )
+    parser.add_argument( "output_folder",        help="the folder where the C++ code will be generated" )
+    parser.add_argument( "--generate-print",     action="store_true", help="generate pretty printing methods and the 'cmd' executable" )
+    parser.add_argument( "--generate-columns",   action="store_true", help="generate a columnar (struct of arrays) decoder for each struct" )
+    parser.add_argument( "--generate-json",      action="store_true", help="generate streaming JSON transcoders, which convert serialized structs to JSON and back" )
+    parser.add_argument( "--generate-capi",      action="store_true", help="generate an 'extern \"C\"' API, built as the shared library 'catbuffer_c', and a Python 'ctypes' loader for it" )
+    parser.add_argument( "--generate-benchmark", action="store_true", help="generate a benchmark executable driven by test vector payloads" )
+    parser.add_argument( "--generate-python",    action="store_true", help="generate a pure Python module which deserializes and serializes the structs" )
+    parser.add_argument( "--generate-numpy",     action="store_true", help="generate NumPy structured dtypes for all fixed size structs (implies --generate-python)" )
+    parser.add_argument( "--include",            default="", metavar="DIR", help="the root directory of the imports of a .cats input file (default: the directory of the input file)" )
+    parser.add_argument( "--no-schema-cache",    action="store_true", help="parse and convert a .cats input file without caching the result in the output folder" )
+    parser.add_argument( "--stats",              action="store_true", help="print the serialized size, alignment, nesting depth, etc. of every struct" )
+    parser.add_argument( "--roots",              type=lambda value: value.split(","), default=[], metavar="TYPE,...", help="only generate the given types (or struct_type groups) and the types they depend on" )
+    parser.add_argument( "--header-only",        action="store_true", help="generate the struct methods inline in the headers and declare the classes 'final'" )
+    parser.add_argument( "--backend",            choices=["code", "table"], default="code", help="generate (de)serialization code per struct, or field tables which are interpreted by 'TableCodec' (default: code)" )
+    parser.add_argument( "--parallel-decode",    action="store_true", help="deserialize the elements of large 'array_sized' fields (e.g. aggregate transactions) on a thread pool" )
+    parser.add_argument( "--pch",                action="store_true", help="precompile the headers which are included by all generated files (needs CMake 3.16)" )
+    parser.add_argument( "--unity-shards",       type=int, default=0, metavar="N", help="build the generated C++ files as N amalgamated translation units (unity build)" )
+    args = parser.parse_args()
+
+    if args.unity_shards < 0:
+        parser.error( "--unity-shards must not be negative" )
+
+    if args.header_only and "table" == args.backend:
+        parser.error( "--header-only can not be used with --backend table" )
+
+    if args.parallel_decode and "table" == args.backend:
+        parser.error( "--parallel-decode can not be used with --backend table" )
 
 
     # Check if .yaml input file exists
-    input_file_name = sys.argv[1]
+    input_file_name = args.input_file
 
     my_file = Path(input_file_name)
     if not my_file.is_file():
@@ -115,7 +256,7 @@ def main():
 
 
     # Create output folder
-    output_folder = sys.argv[2]
+    output_folder = args.output_folder
     print(f"Creating output folder:{output_folder}\n")
     Path( output_folder ).mkdir( parents=True, exist_ok=True )
 
@@ -133,14 +274,7 @@ def main():
 
 
     # Generate pretty print or not
-    generate_print_methods = False
-
-    if len(sys.argv) == 4:
-       if( sys.argv[3] == "--generate-print" ):
-           generate_print_methods = True
-       else:
-           print(f"Error: unknown argument '{sys.argv[3]}'")
-           exit(1)
+    generate_print_methods = args.generate_print
 
 
     # Copy build file
@@ -158,12 +292,84 @@ def main():
         shutil.copy("cpp_build_files/CMakeLists_with_cmd.txt", output_folder+"/CMakeLists.txt")
 
 
-    # Read YAML file
-    print(f"Reading YAML file: {input_file_name}\n")
-    with open(input_file_name, 'r') as stream:
-        data_loaded = yaml.safe_load(stream)
+    # Remove table interpreter, which is only used by the table backend
+    if "table" != args.backend:
+        Path(output_folder+"/static_src/TableCodec.cpp").unlink()
+        Path(output_folder+"/static_src/TableCodec.h").unlink()
+
+
+    # Remove thread pool, or link it with the threads library
+    if not args.parallel_decode:
+        Path(output_folder+"/static_src/ParallelDecode.cpp").unlink()
+        Path(output_folder+"/static_src/ParallelDecode.h").unlink()
+    else:
+        with open( "cpp_build_files/CMakeLists_parallel.txt", "r" ) as src, open( output_folder+"/CMakeLists.txt", "a" ) as dst:
+            dst.write( "\n" + src.read() )
+
+
+    # Add benchmark executable to build file
+    benchmark_folder = ""
+    if args.generate_benchmark:
+        benchmark_folder = output_folder+"/benchmark"
+        Path( benchmark_folder ).mkdir( parents=True, exist_ok=True )
+
+        with open( "cpp_build_files/CMakeLists_benchmark.txt", "r" ) as src, open( output_folder+"/CMakeLists.txt", "a" ) as dst:
+            dst.write( "\n" + src.read() )
+
+
+    # Add precompiled header to build file
+    if args.pch:
+        with open( "cpp_build_files/CMakeLists_pch.txt", "r" ) as src, open( output_folder+"/CMakeLists.txt", "a" ) as dst:
+            dst.write( "\n" + src.read() )
+
+
+    # Add shared library with C API to build file
+    capi_folder = ""
+    ffi_folder  = ""
+    if args.generate_capi:
+        capi_folder = gen_output_folder+"/capi"
+        ffi_folder  = output_folder+"/python"
+        Path( capi_folder ).mkdir( parents=True, exist_ok=True )
+        Path( ffi_folder ).mkdir( parents=True, exist_ok=True )
+
+        with open( "cpp_build_files/CMakeLists_capi.txt", "r" ) as src, open( output_folder+"/CMakeLists.txt", "a" ) as dst:
+            dst.write( "\n" + src.read() )
+
+
+    # Create Python codec folder
+    python_folder = ""
+    if args.generate_python or args.generate_numpy:
+        python_folder = output_folder+"/python"
+        Path( python_folder ).mkdir( parents=True, exist_ok=True )
+
+
+    # Read YAML file, or parse and convert catbuffer schema
+    if input_file_name.endswith(".cats"):
+        data_loaded = load_schema( input_file_name, args.include or str(my_file.parent), "" if args.no_schema_cache else output_folder+"/.schema_cache" )
+    else:
+        print(f"Reading YAML file: {input_file_name}\n")
+        with open(input_file_name, 'r') as stream:
+            data_loaded = yaml.safe_load(stream)
+
+
+    # Prune types which are not needed by the root types
+    if args.roots:
+        result, result_str, reachable = YamlDependencyChecker.reachable_types( data_loaded, args.roots )
+        if result != YamlDependencyCheckerResult.OK:
+            print(result_str)
+            exit(1)
+
+        print(f"Generating {len(reachable)} of {len(data_loaded)} types needed by: {', '.join(args.roots)}\n")
+        data_loaded = [ elem for elem in data_loaded if elem["name"] in reachable ]
+
+    generate( data_loaded, gen_output_folder, generate_print_methods, benchmark_folder, python_folder, args.generate_numpy, args.generate_columns, args.header_only, args.stats, args.backend, args.generate_json, capi_folder, ffi_folder, args.parallel_decode )
+
 
-    generate( data_loaded, gen_output_folder, generate_print_methods)
+    # Amalgamate generated files into unity build shards
+    if args.unity_shards:
+        print(f"Generating {args.unity_shards} unity build shards")
+        unity = CppUnityBuildGenerator( gen_output_folder, args.unity_shards )
+        unity.write_files( output_folder+"/CMakeLists.txt" )
 
 
 
@@ -0,0 +1,245 @@
+import concurrent.futures
+import importlib.util
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import types
+import typing
+
+import yaml
+
+
+
+class GeneratedCode():
+    """
+    The code generated for the symbol schema with a set of generator
+    options, which the unit tests compile and run test programs against,
+    or import as Python modules. The code is generated once per set of
+    options and shared by all tests:
+
+        ----------------------------------------------------------------------------------------
+        code   = GeneratedCode.get( "--backend", "table" )
+        output = code.run( program, payload.hex() )  # compiles and runs the C++ source 'program'
+
+        codec  = GeneratedCode.get( "--generate-python" ).module( "catbuffer" )
+        ----------------------------------------------------------------------------------------
+
+    Tests which need the same options share one build. Only the generated
+    and static sources which a program includes (directly or indirectly)
+    are compiled, and their object files are kept for the next program.
+
+    Tests which compile code are skipped without a compiler:
+
+        ----------------------------------------------------------------------------------------
+        @unittest.skipUnless( GeneratedCode.compiler, "needs g++" )
+        ----------------------------------------------------------------------------------------
+    """
+
+    compiler = shutil.which( "g++" )
+    flags    = [ "-std=c++11", "-Wall", "-Werror", "-Wextra", "-pedantic", "-fPIC", "-pthread" ]
+
+    __instances : typing.Dict[typing.Tuple[str, ...], "GeneratedCode"] = {}
+
+
+
+    @classmethod
+    def get( cls, *options: str ) -> "GeneratedCode":
+        """
+        Returns the code generated with 'options' (the command line options
+        of the generator, none for the plain (de)serialization code).
+        """
+
+        if options not in cls.__instances:
+            cls.__instances[options] = GeneratedCode( options )
+
+        return cls.__instances[options]
+
+
+
+    @staticmethod
+    def payloads( builder: str = "" ) -> typing.List[bytes]:
+        """
+        Returns the payloads of the symbol test vectors, or only the ones of
+        a builder (e.g. 'TransferTransactionBuilder').
+        """
+
+        with open( "test_vectors/symbol_transactions.yml", "r" ) as f:
+            vectors = yaml.safe_load( f )
+
+        return [ bytes.fromhex( elem["payload"] ) for elem in vectors if not builder or builder == elem["builder"] ]
+
+
+
+    def __init__( self, options: typing.Tuple[str, ...] ) -> None:
+        self.__tmp_dir = tempfile.TemporaryDirectory()  # removed when the tests exit
+        self.folder    = self.__tmp_dir.name
+
+        self.__include_dirs = [ f'{self.folder}/generated_src', f'{self.folder}/static_src' ]
+        self.__objects : typing.Dict[str, str] = {}  # source file -> object file
+        self.__modules : typing.Dict[str, types.ModuleType] = {}  # imported Python modules
+        self.__programs = 0
+
+        result = subprocess.run( [ sys.executable, "-m", "generator", "yaml_test_inputs/symbol-all-transactions.yaml", self.folder, *options ],
+                                 capture_output=True, text=True )
+        if result.returncode:
+            raise RuntimeError( f'Generating with {" ".join( options )} failed:\n{result.stdout}{result.stderr}' )
+
+
+
+    def read( self, file_name: str ) -> str:
+        """
+        Returns the contents of a file in the output folder, e.g. 'generated_src/json.cpp'.
+        """
+
+        with open( f'{self.folder}/{file_name}', "r" ) as f:
+            return f.read()
+
+
+
+    def module( self, name: str ) -> types.ModuleType:
+        """
+        Imports a generated Python module of the 'python' folder, e.g.
+        'catbuffer' or 'catbuffer_dtypes'.
+        """
+
+        if name not in self.__modules:
+            spec   = importlib.util.spec_from_file_location( name, f'{self.folder}/python/{name}.py' )
+            module = importlib.util.module_from_spec( spec )
+            spec.loader.exec_module( module )
+            self.__modules[name] = module
+
+        return self.__modules[name]
+
+
+
+    def run( self, program: str, *args: str ) -> str:
+        """
+        Compiles a C++ program against the generated code, runs it with 'args'
+        and returns its output. Fails if it does not compile or does not
+        return 0.
+        """
+
+        return self.run_executable( self.build( program ), *args )
+
+
+
+    @staticmethod
+    def run_executable( executable: str, *args: str ) -> str:
+        """
+        Runs a program built by 'build()' with 'args' and returns its output.
+        Fails if it does not return 0.
+        """
+
+        result = subprocess.run( [ executable, *args ], capture_output=True, text=True, timeout=120 )
+        if result.returncode:
+            raise AssertionError( f'Test program returned {result.returncode}:\n{result.stdout}{result.stderr}' )
+
+        return result.stdout
+
+
+
+    def build( self, program: str ) -> str:
+        """
+        Compiles a C++ program against the generated code, and returns the
+        path of the executable.
+        """
+
+        self.__programs += 1
+        source = f'{self.folder}/test_program_{self.__programs}.cpp'
+        with open( source, "w" ) as f:
+            f.write( program )
+
+        return self.build_file( source )
+
+
+
+    def build_file( self, source: str ) -> str:
+        """
+        Compiles a C++ file (e.g. 'benchmark/benchmark.cpp' in the output
+        folder) with the sources it includes, and links them to an
+        executable, whose path is returned.
+        """
+
+        source     = os.path.join( self.folder, source )
+        executable = os.path.splitext( source )[0]
+        self.__link( [ source ], [ "-o", executable ] )
+        return executable
+
+
+
+    def library( self, source: str ) -> str:
+        """
+        Compiles a C++ file (e.g. 'generated_src/capi/catbuffer_c.cpp') with the
+        sources it includes to a shared library, whose path is returned.
+        """
+
+        source  = os.path.join( self.folder, source )
+        library = os.path.splitext( source )[0] + ".so"
+        self.__link( [ source ], [ "-shared", "-o", library ] )
+        return library
+
+
+
+    def __link( self, sources: typing.List[str], link_args: typing.List[str] ) -> None:
+        sources = self.__included_sources( sources )
+        missing = [ source for source in sources if source not in self.__objects ]
+
+        with concurrent.futures.ThreadPoolExecutor( os.cpu_count() or 1 ) as executor:
+            for source, object_file in zip( missing, executor.map( self.__compile, missing ) ):
+                self.__objects[source] = object_file
+
+        self.__call( [ self.compiler, *self.flags, *[ self.__objects[source] for source in sources ], *link_args ] )
+
+
+
+    def __compile( self, source: str ) -> str:
+        object_file = f'{source}.o'
+        self.__call( [ self.compiler, *self.flags, *[ f'-I{folder}' for folder in self.__include_dirs ], "-c", source, "-o", object_file ] )
+        return object_file
+
+
+
+    def __call( self, command: typing.List[str] ) -> None:
+        result = subprocess.run( command, capture_output=True, text=True )
+        if result.returncode:
+            raise AssertionError( f'{" ".join( command )}\n{result.stdout}{result.stderr}' )
+
+
+
+    def __included_sources( self, sources: typing.List[str] ) -> typing.List[str]:
+        """
+        Returns 'sources' and the .cpp files of all headers which they include
+        directly or indirectly.
+        """
+
+        found   = list( sources )
+        visited = set()
+        pending = list( sources )
+
+        while pending:
+            file_path = pending.pop()
+            if file_path in visited:
+                continue
+            visited.add( file_path )
+
+            with open( file_path, "r" ) as f:
+                includes = re.findall( r'^\s*#include "([^"]+)"', f.read(), re.MULTILINE )
+
+            for include in includes:
+                for folder in [ os.path.dirname( file_path ), *self.__include_dirs ]:
+                    header = os.path.normpath( os.path.join( folder, include ) )
+                    if not os.path.isfile( header ):
+                        continue
+
+                    pending.append( header )
+
+                    source = os.path.splitext( header )[0] + ".cpp"
+                    if os.path.isfile( source ) and source not in found:
+                        found.append( source )
+                        pending.append( source )
+                    break
+
+        return found
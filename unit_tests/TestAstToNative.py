@@ -0,0 +1,130 @@
+import contextlib
+import io
+import unittest
+
+try:
+    from catparser.AstPostProcessor import AstPostProcessor
+    from catparser.CatsLarkParser import create_cats_lark_parser
+    from generator.AstToNativeConverter import AstToNativeError, ast_to_native
+except ImportError:
+    create_cats_lark_parser = None
+
+
+
+schema = (
+    "using Amount = uint64\n"
+    "using Hash256 = binary_fixed(32)\n"
+    "\n"
+    "enum TransactionType : uint16\n"
+    "\tTRANSFER = 0x4154\n"
+    "\tMOSAIC_SUPPLY_CHANGE = 0x424D\n"
+    "\n"
+    "enum MosaicFlags : uint8\n"
+    "\tNONE = 0x00\n"
+    "\tTRANSFERABLE = 0x02\n"
+    "\n"
+    "struct Mosaic\n"
+    "\tamount = Amount\n"
+    "\tflags = MosaicFlags\n"
+    "\n"
+    "@size(size)\n"
+    "@initializes(version, TRANSACTION_VERSION)\n"
+    "@initializes(type, TRANSACTION_TYPE)\n"
+    "@discriminator(type, version)\n"
+    "abstract struct Transaction\n"
+    "\tsize = uint32\n"
+    "\tversion = uint8\n"
+    "\ttype = TransactionType\n"
+    "\tfee = Amount\n"
+    "\n"
+    "struct TransferTransaction\n"
+    "\tTRANSACTION_VERSION = make_const(uint8, 1)\n"
+    "\tTRANSACTION_TYPE = make_const(TransactionType, TRANSFER)\n"
+    "\n"
+    "\tinline Transaction\n"
+    "\n"
+    "\thash = Hash256\n"
+    "\tmosaics_count = uint8\n"
+    "\tmosaics = array(Mosaic, mosaics_count)\n"
+    "\tmessage = array(uint8, __FILL__)\n"
+    "\n"
+    "struct Block\n"
+    "\ttransaction_size = sizeof(uint32, transaction)\n"
+    "\ttransaction = Transaction\n"
+    "\tpayload_size = uint32\n"
+    "\t@is_byte_constrained\n"
+    "\t@alignment(8)\n"
+    "\ttransactions = array(Transaction, payload_size)\n"
+)
+
+
+# output of the 'ast_to_native()' function, before it was rewritten as 'AstToNativeConverter'
+expected = [
+    { "name": "Amount", "type": "alias uint64" },
+    { "name": "Hash256", "size": 32, "type": "alias array uint8" },
+    { "name": "TransactionType", "type": "enum uint16", "values": [ { "name": "TRANSFER", "value": 0x4154 }, { "name": "MOSAIC_SUPPLY_CHANGE", "value": 0x424D } ] },
+    { "name": "MosaicFlags", "type": "enum uint8", "values": [ { "name": "NONE", "value": 0x00 }, { "name": "TRANSFERABLE", "value": 0x02 } ] },
+    { "name": "TransactionGroup", "type": "enum uint16", "values": [ { "name": "TRANSFER", "value": 0x4154 } ] },
+    { "name": "Mosaic", "type": "struct", "layout": [
+        { "name": "amount", "type": "Amount" },
+        { "name": "flags",  "type": "MosaicFlags" } ] },
+    { "name": "Transaction", "type": "struct", "layout": [
+        { "name": "size",    "type": " uint32" },
+        { "name": "version", "type": " uint8" },
+        { "name": "type",    "type": "TransactionGroup" },
+        { "name": "fee",     "type": "Amount" } ] },
+    { "name": "TransferTransaction", "type": "struct", "layout": [
+        { "name": "size",          "type": " uint32" },
+        { "name": "version",       "type": " uint8" },
+        { "name": "type",          "type": "TransactionType" },
+        { "name": "fee",           "type": "Amount" },
+        { "name": "hash",          "type": "Hash256" },
+        { "name": "mosaics_count", "type": " uint8" },
+        { "name": "mosaics",       "type": "array Mosaic", "size": "mosaics_count" },
+        { "name": "message",       "type": "array_fill uint8" },
+        { "version_field": "version", "type": "struct_type TransactionGroup", "value": "TRANSFER @1", "type_field": "type", "header": "Transaction" } ] },
+    { "name": "Block", "type": "struct", "layout": [
+        { "name": "transaction_size", "type": " uint32" },
+        { "name": "transaction",      "size": "transaction_size", "type": "array_sized Transaction", "header_type_field": "type", "header_version_field": "version" },
+        { "name": "payload_size",     "type": " uint32" },
+        { "name": "transactions",     "type": "array_sized Transaction", "size": "payload_size", "header_type_field": "type", "header_version_field": "version", "align": 8 } ] },
+]
+
+
+
+@unittest.skipUnless( create_cats_lark_parser, "catparser not installed" )
+class TestAstToNative( unittest.TestCase ):
+
+    def convert( self, schema_text: str ) -> list:
+        processor = AstPostProcessor( create_cats_lark_parser().parse( schema_text ).children )
+        processor.apply_attributes()
+        processor.expand_named_inlines()
+        processor.expand_unnamed_inlines()
+
+        with contextlib.redirect_stdout( io.StringIO() ):
+            return ast_to_native( processor.type_descriptors )
+
+
+    def test_output_unchanged(self):
+        self.assertEqual( expected, self.convert( schema ) )
+
+
+    def test_all_errors_reported(self):
+        invalid_schema  = schema
+        invalid_schema += "\nstruct Envelope\n\ttransaction = Transaction\n"                      # abstract field without sizeof field
+        invalid_schema += "\nstruct SupplyTransaction\n"                                           # no TRANSACTION_VERSION
+        invalid_schema += "\tTRANSACTION_TYPE = make_const(TransactionType, MOSAIC_SUPPLY_CHANGE)\n"
+        invalid_schema += "\n\tinline Transaction\n"
+
+        with self.assertRaises( AstToNativeError ) as context:
+            self.convert( invalid_schema )
+
+        self.assertEqual( context.exception.errors, [
+            "Error: No sizeof field for field 'transaction' in struct 'Envelope'!",
+            'Error: Did not find type or version field for struct "SupplyTransaction"!',
+        ] )
+
+
+
+if __name__ == '__main__':
+    unittest.main()
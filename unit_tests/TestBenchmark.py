@@ -0,0 +1,24 @@
+import os
+import subprocess
+import unittest
+
+from unit_tests.GeneratedCode import GeneratedCode
+
+
+
+@unittest.skipUnless( GeneratedCode.compiler, "needs g++" )
+class TestBenchmark( unittest.TestCase ):
+
+    def test_roots_without_groups(self):
+        executable = GeneratedCode.get( "--roots", "Mosaic", "--generate-benchmark" ).build_file( "benchmark/benchmark.cpp" )
+        result     = subprocess.run( [ executable, os.path.abspath( "test_vectors/symbol_transactions.yml" ) ], capture_output=True, text=True, timeout=120 )
+
+        # without groups no payload can be decoded
+        self.assertEqual( 1, result.returncode )
+        self.assertIn( "Warning: Skipping payload", result.stderr )
+        self.assertIn( "Error: No payloads found", result.stderr )
+
+
+
+if __name__ == '__main__':
+    unittest.main()
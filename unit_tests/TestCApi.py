@@ -0,0 +1,75 @@
+import struct
+import unittest
+
+import yaml
+
+from unit_tests.GeneratedCode import GeneratedCode
+
+
+
+@unittest.skipUnless( GeneratedCode.compiler, "needs g++" )
+class TestCApi( unittest.TestCase ):
+
+    @classmethod
+    def setUpClass(cls):
+        code    = GeneratedCode.get( "--generate-capi" )
+        cls.ffi = code.module( "catbuffer_ffi" )
+        cls.lib = cls.ffi.load( code.library( "generated_src/capi/catbuffer_c.cpp" ) )
+
+        cls.payloads = GeneratedCode.payloads()
+
+
+    def test_decode_batch(self):
+        objects = self.lib.TransactionType.decode_batch( b"".join( self.payloads ), [ len( payload ) for payload in self.payloads ] )
+
+        self.assertEqual( len( self.payloads ), len( objects ) )
+        for payload, obj in zip( self.payloads, objects ):
+            with self.subTest( payload=payload.hex() ):
+                self.assertEqual( struct.unpack_from( "<H", payload, 110 )[0], obj.type[0] )
+                self.assertEqual( payload, obj.serialize() )
+
+
+    def test_group_names(self):
+        for payload in self.payloads:
+            type, version = self.lib.TransactionType.decode( payload ).type
+            self.assertIn( type, self.ffi.TransactionType.classes )
+            self.assertEqual( payload[108], version )
+
+        self.assertEqual( "TransferTransaction", self.ffi.TransactionType.classes[0x4154] )
+
+
+    def test_invalid_payload_rejected(self):
+        for payload in self.payloads:
+            with self.subTest( payload=payload.hex() ):
+                self.assertEqual( len( payload ), self.lib.TransactionType.validate( payload ) )
+                with self.assertRaises( self.ffi.CatbufferError ):
+                    self.lib.TransactionType.validate( payload[:-1] )
+
+
+    def test_read_field(self):
+        for payload in self.payloads:
+            with self.subTest( payload=payload.hex() ):
+                self.assertEqual( struct.unpack_from( "<Q", payload, 112 )[0], self.lib.read_field( "Transaction", "fee", payload ) )
+                self.assertEqual( payload[8:72], self.lib.read_field( "Transaction", "signature", payload ) )
+
+
+    def test_all_structs_found(self):
+        with open( "yaml_test_inputs/symbol-all-transactions.yaml", "r" ) as f:
+            structs = [ elem["name"] for elem in yaml.safe_load( f ) if "struct" == elem["type"] ]
+
+        for struct_name in structs:
+            with self.subTest( struct=struct_name ):
+                self.lib.fields( struct_name )
+
+        fields, fixed_prefix_size = self.lib.fields( "Transaction" )
+        self.assertEqual( ( 112, 8, self.ffi.UNSIGNED ), fields["fee"] )
+        self.assertEqual( ( 8, 64, self.ffi.BYTES ), fields["signature"] )
+        self.assertEqual( 128, fixed_prefix_size )
+
+        with self.assertRaises( KeyError ):
+            self.lib.fields( "Unknown" )
+
+
+
+if __name__ == '__main__':
+    unittest.main()
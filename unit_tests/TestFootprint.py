@@ -0,0 +1,65 @@
+import unittest
+
+from unit_tests.GeneratedCode import GeneratedCode
+
+
+
+program = r'''
+#include <cstdio>
+#include "AggregateTransactionBody.h"
+#include "EmbeddedTransferTransaction.h"
+
+int main()
+{
+  // vectors count with their capacity, array size fields have no heap memory
+  TransferTransactionBody body;
+  body.mMosaics.resize( 3 );
+  body.mMessage.assign( 100, 'x' );
+  printf( "transfer %zu %zu\n", body.HeapBytes(), body.mMosaics.capacity()*sizeof(UnresolvedMosaic) + body.mMessage.capacity() );
+
+  // polymorphic elements count with the size of their actual class
+  AggregateTransactionBody     aggregate;
+  EmbeddedTransferTransaction* transfer = new EmbeddedTransferTransaction();
+  transfer->mTransferTransactionBody.mMessage.assign( 200, 'x' );
+  aggregate.mTransactions.emplace_back( transfer );
+  aggregate.mCosignatures.resize( 2 );
+  printf( "aggregate %zu %zu\n", aggregate.HeapBytes(), aggregate.mTransactions.capacity()*sizeof(std::unique_ptr<ICatbuffer>) + sizeof(EmbeddedTransferTransaction) +
+                                                        transfer->mTransferTransactionBody.mMessage.capacity() + aggregate.mCosignatures.capacity()*sizeof(Cosignature) );
+
+  // fixed size structs have no heap memory
+  std::unique_ptr<ICatbuffer> mosaic( new UnresolvedMosaic() );
+  printf( "fixed %zu %zu\n", mosaic->TotalFootprint(), sizeof(UnresolvedMosaic) );
+  printf( "name %s\n", mosaic->TypeName() );
+  return 0;
+}
+'''
+
+
+
+@unittest.skipUnless( GeneratedCode.compiler, "needs g++" )
+class TestFootprint( unittest.TestCase ):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.output = { line.split()[0]: line.split()[1:] for line in GeneratedCode.get( "--generate-print" ).run( program ).splitlines() }
+
+
+    def test_vector_capacities_counted(self):
+        actual, expected = self.output["transfer"]
+        self.assertEqual( expected, actual )
+
+
+    def test_polymorphic_elements_counted_with_class_size(self):
+        actual, expected = self.output["aggregate"]
+        self.assertEqual( expected, actual )
+
+
+    def test_fixed_size_struct(self):
+        actual, expected = self.output["fixed"]
+        self.assertEqual( expected, actual )
+        self.assertEqual( [ "UnresolvedMosaic" ], self.output["name"] )
+
+
+
+if __name__ == '__main__':
+    unittest.main()
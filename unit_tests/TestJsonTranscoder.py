@@ -0,0 +1,95 @@
+import json
+import struct
+import unittest
+
+from unit_tests.GeneratedCode import GeneratedCode
+
+
+
+program = r'''
+#include <cstdio>
+#include "Codec.h"
+#include "json.h"
+
+int main( int argc, char* argv[] )
+{
+  for( int i=1; i<argc; ++i )
+  {
+    std::vector<uint8_t> payload;
+    Codec::HexDecode( argv[i], payload );
+
+    std::string json;
+    TextWriter  out( json );
+    RawBuffer   buffer( payload.data(), payload.size() );
+    bool succ = to_json_TransactionType( buffer, out ) && 0 == buffer.RemainingSize();
+
+    std::vector<uint8_t> transcoded( payload.size() );
+    JsonReader in( json.data(), json.size() );
+    RawBuffer  transcodedBuffer( transcoded.data(), transcoded.size() );
+    succ = succ && from_json_TransactionType( in, transcodedBuffer ) && in.AtEnd() && 0 == transcodedBuffer.RemainingSize();
+
+    printf( "%d %s\n", succ && transcoded == payload, json.c_str() );
+  }
+  return 0;
+}
+'''
+
+
+
+@unittest.skipUnless( GeneratedCode.compiler, "needs g++" )
+class TestJsonTranscoder( unittest.TestCase ):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.payloads = GeneratedCode.payloads()
+        output       = GeneratedCode.get( "--generate-json" ).run( program, *[ payload.hex() for payload in cls.payloads ] )
+        cls.results  = [ line.split( " ", 1 ) for line in output.splitlines() ]
+
+
+    def documents( self, builder: str ) -> list:
+        payloads = GeneratedCode.payloads( builder )
+        return [ ( payload, json.loads( result[1] ) ) for payload, result in zip( self.payloads, self.results ) if payload in payloads ]
+
+
+    def test_round_trip(self):
+        self.assertEqual( len( self.payloads ), len( self.results ) )
+        for payload, ( round_trip, document ) in zip( self.payloads, self.results ):
+            with self.subTest( payload=payload.hex() ):
+                self.assertEqual( "1", round_trip, document )
+                json.loads( document )
+
+
+    def test_field_values(self):
+        for payload, document in self.documents( "TransferTransactionBuilder" ):
+            with self.subTest( payload=payload.hex() ):
+                header = document["Transaction"]
+                self.assertEqual( "TRANSFER", header["type"] )
+                self.assertEqual( len( payload ), header["SizePrefixedEntity"]["size"] )
+                self.assertEqual( str( struct.unpack_from( "<Q", payload, 120 )[0] ), header["deadline"] )
+
+                # the array sizes are left out, and filled in from the arrays
+                message_size, mosaics_count = struct.unpack_from( "<HB", payload, 152 )
+                mosaics = [ struct.unpack_from( "<QQ", payload, 160 + 16*i ) for i in range( mosaics_count ) ]
+                message = payload[160 + 16*mosaics_count:]
+
+                body = document["TransferTransactionBody"]
+                self.assertEqual( [ "recipient_address", "mosaics", "message" ], list( body.keys() ) )
+                self.assertEqual( payload[128:152].hex().upper(), body["recipient_address"] )
+                self.assertEqual( [ { "mosaic_id": str( mosaic_id ), "amount": str( amount ) } for mosaic_id, amount in mosaics ], body["mosaics"] )
+                self.assertEqual( message_size, len( message ) )
+                self.assertEqual( message.hex().upper(), body["message"] )
+
+
+    def test_embedded_transactions(self):
+        types = set()
+        for payload, document in self.documents( "AggregateCompleteTransactionBuilder" ):
+            with self.subTest( payload=payload.hex() ):
+                transactions = document["AggregateTransactionBody"]["transactions"]
+                types.update( transaction["EmbeddedTransaction"]["type"] for transaction in transactions )
+
+        self.assertIn( "TRANSFER", types )
+
+
+
+if __name__ == '__main__':
+    unittest.main()
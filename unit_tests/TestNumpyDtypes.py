@@ -0,0 +1,74 @@
+import unittest
+
+from unit_tests.GeneratedCode import GeneratedCode
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+
+@unittest.skipUnless( numpy, "numpy not installed" )
+class TestNumpyDtypes( unittest.TestCase ):
+
+    @classmethod
+    def setUpClass(cls):
+        code         = GeneratedCode.get( "--generate-numpy" )
+        cls.codec    = code.module( "catbuffer" )
+        cls.dtypes   = code.module( "catbuffer_dtypes" )
+        cls.payloads = GeneratedCode.payloads()
+
+
+    def test_fixed_size_only(self):
+        self.assertEqual( self.dtypes.Mosaic.itemsize, 16 )
+        self.assertEqual( self.dtypes.Transaction.itemsize, 128 )
+        self.assertNotIn( "TransferTransaction", self.dtypes.DTYPES )
+        self.assertNotIn( "AggregateTransaction", self.dtypes.DTYPES )
+
+
+    def test_itemsize_equals_serialized_size(self):
+        for class_name, dtype in self.dtypes.DTYPES.items():
+            self.assertEqual( dtype.itemsize, len( getattr( self.codec, class_name )().serialize() ), class_name )
+
+
+    def test_fields_equal_codec(self):
+        tested = 0
+
+        for payload in self.payloads:
+            tx         = self.codec.deserialize_TransactionType( payload )
+            class_name = type(tx).__name__
+            if class_name not in self.dtypes.DTYPES:
+                continue
+
+            record = numpy.frombuffer( payload, dtype=self.dtypes.DTYPES[class_name] )[0]
+            for name in record.dtype.names:
+                value, expected = record[name], getattr( tx, name )
+
+                if record.dtype[name].names:
+                    self.assertEqual( value.tobytes(), expected.serialize() )  # nested struct
+                elif value.shape:
+                    self.assertEqual( value.tobytes(), bytes(expected) )       # alias array
+                else:
+                    self.assertEqual( int(value), expected )
+
+            tested += 1
+
+        self.assertGreater( tested, 0 )
+
+
+    def test_many_records(self):
+        mosaics = [ self.codec.Mosaic() for _ in range(3) ]
+        for i, mosaic in enumerate( mosaics ):
+            mosaic.mosaic_id = i
+            mosaic.amount    = 1000 + i
+
+        records = numpy.frombuffer( b"".join( mosaic.serialize() for mosaic in mosaics ), dtype=self.dtypes.Mosaic )
+
+        self.assertEqual( list(records["mosaic_id"]), [ 0, 1, 2 ] )
+        self.assertEqual( int(records["amount"].sum()), 3003 )
+
+
+
+if __name__ == '__main__':
+    unittest.main()
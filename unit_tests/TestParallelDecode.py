@@ -0,0 +1,87 @@
+import unittest
+
+from unit_tests.GeneratedCode import GeneratedCode
+
+
+
+program = r'''
+#include <cstdio>
+#include "AggregateTransactionBody.h"
+#include "Codec.h"
+#include "EmbeddedTransaction.h"
+#include "ParallelDecode.h"
+#include "Transaction.h"
+#include "converters.h"
+
+static bool Decode( std::vector<uint8_t>& payload, std::vector<uint8_t>& serialized )
+{
+  std::unique_ptr<ICatbuffer> catbuf = create_type_TransactionType( Transaction::ReadType( payload.data() ), Transaction::ReadVersion( payload.data() ) );
+  RawBuffer buffer( payload.data(), payload.size() );
+  return catbuf && catbuf->Deserialize( buffer ) && 0 == buffer.RemainingSize() && catbuf->SerializeTo( serialized );
+}
+
+int main( int argc, char* argv[] )
+{
+  // all arrays are decoded in parallel
+  ParallelDecode::SetThreads( 4 );
+  ParallelDecode::SetMinBytes( 0 );
+
+  for( int i=1; i<argc; ++i )
+  {
+    std::vector<uint8_t> payload;
+    Codec::HexDecode( argv[i], payload );
+
+    std::vector<uint8_t> serialized;
+    const bool decoded = Decode( payload, serialized );
+
+    // an unknown type of an embedded transaction fails the decoding on the caller
+    const size_t         offsetType  = Transaction::FIXED_PREFIX_SIZE + AggregateTransactionBody::FIXED_PREFIX_SIZE + EmbeddedTransaction::OFFSET_TYPE;
+    const uint32_t       payloadSize = AggregateTransactionBody::ReadPayload_size( payload.data() + Transaction::FIXED_PREFIX_SIZE );
+    std::vector<uint8_t> corrupted( payload );
+    std::vector<uint8_t> unused;
+    bool rejected = true;
+    if( 0 < payloadSize )
+    {
+      corrupted[offsetType]   = 0xFF;
+      corrupted[offsetType+1] = 0xFF;
+      rejected = !Decode( corrupted, unused );
+    }
+
+    printf( "%d %d %d %u\n", decoded, serialized == payload, rejected, payloadSize );
+  }
+  return 0;
+}
+'''
+
+
+
+@unittest.skipUnless( GeneratedCode.compiler, "needs g++" )
+class TestParallelDecode( unittest.TestCase ):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.payloads = GeneratedCode.payloads( "AggregateBondedTransactionBuilder" ) + GeneratedCode.payloads( "AggregateCompleteTransactionBuilder" )
+        output       = GeneratedCode.get( "--parallel-decode" ).run( program, *[ payload.hex() for payload in cls.payloads ] )
+        cls.results  = [ line.split() for line in output.splitlines() ]
+
+
+    def test_round_trip(self):
+        self.assertEqual( len( self.payloads ), len( self.results ) )
+        for payload, result in zip( self.payloads, self.results ):
+            with self.subTest( payload=payload.hex() ):
+                self.assertEqual( [ "1", "1" ], result[0:2] )
+
+
+    def test_element_error_rejected(self):
+        embedded = 0
+        for payload, result in zip( self.payloads, self.results ):
+            with self.subTest( payload=payload.hex() ):
+                self.assertEqual( "1", result[2] )
+                embedded += 0 < int( result[3] )
+
+        self.assertLess( 0, embedded )
+
+
+
+if __name__ == '__main__':
+    unittest.main()
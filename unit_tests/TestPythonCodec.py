@@ -0,0 +1,73 @@
+import unittest
+
+from unit_tests.GeneratedCode import GeneratedCode
+
+
+
+class TestPythonCodec( unittest.TestCase ):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.module   = GeneratedCode.get( "--generate-python" ).module( "catbuffer" )
+        cls.payloads = GeneratedCode.payloads()
+
+
+    def test_round_trip(self):
+        for payload in self.payloads:
+            tx = self.module.deserialize_TransactionType( payload )
+            self.assertEqual( tx.serialize(), payload )
+
+
+    def test_decode_fields(self):
+        tx = self.module.deserialize_TransactionType( self.payloads[0] )
+
+        self.assertIsInstance( tx, self.module.MosaicMetadataTransaction )
+        self.assertEqual( tx.type, self.module.TransactionType.MOSAIC_METADATA )
+        self.assertEqual( tx.size, len(self.payloads[0]) )
+        self.assertEqual( bytes(tx.value), b"123ABC" )
+
+
+    def test_byte_fields_are_views(self):
+        payload = self.payloads[0]
+        tx      = self.module.deserialize_TransactionType( payload )
+
+        for field in [ tx.signature, tx.signer_public_key, tx.value ]:
+            self.assertIsInstance( field, memoryview )
+            self.assertIs( field.obj, payload )
+
+        self.assertEqual( bytes(tx.signature), payload[8:72] )
+
+        tx.signature = bytes( 64 )
+        self.assertEqual( tx.serialize(), payload[:8] + bytes( 64 ) + payload[72:] )
+
+
+    def test_aggregate(self):
+        tx = self.module.deserialize_TransactionType( self.payloads[2] )
+
+        self.assertIsInstance( tx, self.module.AggregateBondedTransaction )
+        self.assertIsInstance( tx.transactions[0], self.module.EmbeddedMosaicMetadataTransaction )
+
+
+    def test_modify(self):
+        tx     = self.module.deserialize_TransactionType( self.payloads[0] )
+        tx.fee = 1234
+
+        self.assertEqual( self.module.deserialize_TransactionType( tx.serialize() ).fee, 1234 )
+
+
+    def test_create_type(self):
+        tx = self.module.create_type_TransactionType( self.module.TransactionType.TRANSFER, 1 )
+
+        self.assertIsInstance( tx, self.module.TransferTransaction )
+        self.assertIsNone( self.module.create_type_TransactionType( 0, 1 ) )
+
+
+    def test_truncated(self):
+        for payload in self.payloads[:10]:
+            with self.assertRaises( self.module.DecodeError ):
+                self.module.deserialize_TransactionType( payload[:-1] )
+
+
+
+if __name__ == '__main__':
+    unittest.main()
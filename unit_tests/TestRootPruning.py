@@ -0,0 +1,62 @@
+import unittest
+
+from generator.YamlDependencyChecker import YamlDependencyChecker, YamlDependencyCheckerResult
+
+class TestRootPruning( unittest.TestCase ):
+
+    input_data = [
+        { 'name': 'Amount',         'type': 'alias uint64' },
+        { 'name': 'Height',         'type': 'alias uint64' },
+        { 'name': 'ItemType',       'type': 'enum uint8', 'values': [] },
+        { 'name': 'Header',         'type': 'struct', 'layout': [ { 'name': 'type',   'type': 'ItemType' } ] },
+        { 'name': 'Mosaic',         'type': 'struct', 'layout': [ { 'name': 'amount', 'type': 'Amount' } ] },
+        { 'name': 'ItemA',          'type': 'struct', 'layout': [ { 'type': 'struct_type ItemType', 'value': 'A @1', 'header': 'Header', 'type_field': 'type' },
+                                                                  { 'type': 'inline Header' },
+                                                                  { 'name': 'mosaics', 'type': 'array Mosaic', 'size': 'count' } ] },
+        { 'name': 'ItemB',          'type': 'struct', 'layout': [ { 'type': 'struct_type ItemType', 'value': 'B @1', 'header': 'Header', 'type_field': 'type' },
+                                                                  { 'type': 'inline Header' },
+                                                                  { 'name': 'height', 'type': 'Height' } ] },
+        { 'name': 'Container',      'type': 'struct', 'layout': [ { 'name': 'size',  'type': 'uint32' },
+                                                                  { 'name': 'items', 'type': 'array_sized Header', 'size': 'size', 'header_type_field': 'type' } ] },
+    ]
+
+
+    def test_closure_of_struct(self):
+        result, _, reachable = YamlDependencyChecker.reachable_types( self.input_data, [ 'ItemA' ] )
+
+        self.assertEqual( result, YamlDependencyCheckerResult.OK )
+        self.assertEqual( reachable, { 'ItemA', 'Header', 'ItemType', 'Mosaic', 'Amount' } )
+
+
+    def test_array_sized_depends_on_group(self):
+        result, _, reachable = YamlDependencyChecker.reachable_types( self.input_data, [ 'Container' ] )
+
+        self.assertEqual( result, YamlDependencyCheckerResult.OK )
+        self.assertEqual( reachable, { 'Container', 'Header', 'ItemType', 'ItemA', 'ItemB', 'Mosaic', 'Amount', 'Height' } )
+
+
+    def test_group_enum_root(self):
+        result, _, reachable = YamlDependencyChecker.reachable_types( self.input_data, [ 'ItemType' ] )
+
+        self.assertEqual( result, YamlDependencyCheckerResult.OK )
+        self.assertNotIn( 'Container', reachable )
+        self.assertTrue( { 'ItemA', 'ItemB' } <= reachable )
+
+
+    def test_enum_field_does_not_depend_on_group(self):
+        result, _, reachable = YamlDependencyChecker.reachable_types( self.input_data, [ 'Header' ] )
+
+        self.assertEqual( result, YamlDependencyCheckerResult.OK )
+        self.assertEqual( reachable, { 'Header', 'ItemType' } )
+
+
+    def test_unknown_root(self):
+        result, _, reachable = YamlDependencyChecker.reachable_types( self.input_data, [ 'ItemC' ] )
+
+        self.assertEqual( result, YamlDependencyCheckerResult.ROOT_TYPE_NOT_DECLARED )
+        self.assertEqual( reachable, set() )
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import contextlib
+import io
+import tempfile
+import unittest
+from pathlib import Path
+
+try:
+    from generator.SchemaCache import SchemaCache
+except ImportError:
+    SchemaCache = None
+
+
+
+schema_files = {
+    "types.cats": (
+        "using Amount = uint64\n"
+        "\n"
+        "enum TransactionType : uint16\n"
+        "\tTRANSFER = 0x4154\n"
+    ),
+    "transaction.cats": (
+        'import "types.cats"\n'
+        "\n"
+        "@size(size)\n"
+        "@initializes(version, TRANSACTION_VERSION)\n"
+        "@initializes(type, TRANSACTION_TYPE)\n"
+        "@discriminator(type, version)\n"
+        "abstract struct Transaction\n"
+        "\tsize = uint32\n"
+        "\tversion = uint8\n"
+        "\ttype = TransactionType\n"
+        "\tfee = Amount\n"
+    ),
+    "transfer.cats": (
+        'import "transaction.cats"\n'
+        "\n"
+        "struct TransferTransaction\n"
+        "\tTRANSACTION_VERSION = make_const(uint8, 1)\n"
+        "\tTRANSACTION_TYPE = make_const(TransactionType, TRANSFER)\n"
+        "\n"
+        "\tinline Transaction\n"
+        "\n"
+        "\tmessage_size = uint16\n"
+        "\tmessage = array(uint8, message_size)\n"
+    ),
+}
+
+
+
+@unittest.skipUnless( SchemaCache, "catparser not installed" )
+class TestSchemaCache( unittest.TestCase ):
+
+    def setUp(self):
+        self.tmp_dir    = tempfile.TemporaryDirectory()
+        self.schema_dir = Path( self.tmp_dir.name )
+        self.cache_path = str( self.schema_dir / "cache" )
+
+        for name, contents in schema_files.items():
+            ( self.schema_dir / name ).write_text( contents )
+
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+
+    def load(self):
+        cache = SchemaCache( self.cache_path )
+        with contextlib.redirect_stdout( io.StringIO() ):
+            input_data = cache.load( str( self.schema_dir / "transfer.cats" ), str( self.schema_dir ) )
+        cache.save()
+        return cache, input_data
+
+
+    def test_convert(self):
+        cache, input_data = self.load()
+        names = [ elem["name"] for elem in input_data ]
+
+        self.assertFalse( cache.hit )
+        self.assertEqual( len(cache.parsed_files), 3 )
+        self.assertIn( "TransferTransaction", names )
+        self.assertIn( "Amount", names )
+
+
+    def test_unchanged_schema_is_cached(self):
+        _, first_data      = self.load()
+        cache, second_data = self.load()
+
+        self.assertTrue( cache.hit )
+        self.assertEqual( cache.parsed_files, [] )
+        self.assertEqual( first_data, second_data )
+
+
+    def test_only_changed_file_is_parsed(self):
+        self.load()
+        ( self.schema_dir / "types.cats" ).write_text( schema_files["types.cats"] + "\nusing Height = uint64\n" )
+
+        cache, input_data = self.load()
+
+        self.assertFalse( cache.hit )
+        self.assertEqual( cache.parsed_files, [ str( self.schema_dir / "types.cats" ) ] )
+        self.assertIn( "Height", [ elem["name"] for elem in input_data ] )
+
+
+
+if __name__ == '__main__':
+    unittest.main()
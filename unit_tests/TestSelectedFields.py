@@ -0,0 +1,117 @@
+import unittest
+
+from unit_tests.GeneratedCode import GeneratedCode
+
+
+
+program = r'''
+#include <cstdio>
+#include <cstring>
+#include "Codec.h"
+#include "AggregateCompleteTransaction.h"
+#include "TransferTransaction.h"
+
+static std::vector<uint8_t> Bytes( ICatbuffer& catbuf )
+{
+  std::vector<uint8_t> bytes;
+  catbuf.SerializeTo( bytes );
+  return bytes;
+}
+
+static void Aggregate( std::vector<uint8_t>& payload )
+{
+  AggregateCompleteTransaction full;
+  RawBuffer fullBuf( payload.data(), payload.size() );
+  printf( "deserialized %d\n", full.Deserialize( fullBuf ) );
+
+  // the embedded transactions are skipped by the payload size
+  AggregateCompleteTransaction selected;
+  RawBuffer buf( payload.data(), payload.size() );
+  printf( "selected %d\n",     selected.DeserializeSelected( buf, AggregateCompleteTransaction::FIELD_COSIGNATURES ) );
+  printf( "consumed %d\n",     0 == buf.RemainingSize() );
+  printf( "transactions %d\n", selected.mAggregateTransactionBody.mTransactions.empty() );
+
+  bool cosignatures = full.mAggregateTransactionBody.mCosignatures.size() == selected.mAggregateTransactionBody.mCosignatures.size();
+  for( size_t i=0; cosignatures && i<full.mAggregateTransactionBody.mCosignatures.size(); ++i )
+  {
+    cosignatures = Bytes( full.mAggregateTransactionBody.mCosignatures[i] ) == Bytes( selected.mAggregateTransactionBody.mCosignatures[i] );
+  }
+  printf( "cosignatures %d\n", cosignatures );
+}
+
+int main( int, char* argv[] )
+{
+  std::vector<uint8_t> payload;
+  Codec::HexDecode( argv[2], payload );
+  if( std::string( argv[1] ) == "aggregate" )
+  {
+    Aggregate( payload );
+    return 0;
+  }
+
+  TransferTransaction full;
+  RawBuffer fullBuf( payload.data(), payload.size() );
+  printf( "deserialized %d\n", full.Deserialize( fullBuf ) );
+
+  // fields of inline members are selected by the bits of the outer struct
+  TransferTransaction selected;
+  selected.mTransaction.mFee                   = 7;
+  selected.mTransferTransactionBody.mMessage   = { 1, 2, 3 };
+  const uint64_t mask                          = TransferTransaction::FIELD_DEADLINE | TransferTransaction::FIELD_RECIPIENT_ADDRESS | TransferTransaction::FIELD_MOSAICS;
+
+  RawBuffer buf( payload.data(), payload.size() );
+  printf( "selected %d\n",  selected.DeserializeSelected( buf, mask ) );
+  printf( "consumed %d\n",  0 == buf.RemainingSize() );
+  printf( "deadline %d\n",  full.mTransaction.mDeadline == selected.mTransaction.mDeadline );
+  printf( "recipient %d\n", 0 == memcmp( &full.mTransferTransactionBody.mRecipient_address, &selected.mTransferTransactionBody.mRecipient_address, sizeof(UnresolvedAddress) ) );
+
+  bool mosaics = full.mTransferTransactionBody.mMosaics.size() == selected.mTransferTransactionBody.mMosaics.size();
+  for( size_t i=0; mosaics && i<full.mTransferTransactionBody.mMosaics.size(); ++i )
+  {
+    mosaics = full.mTransferTransactionBody.mMosaics[i].mMosaic_id == selected.mTransferTransactionBody.mMosaics[i].mMosaic_id &&
+              full.mTransferTransactionBody.mMosaics[i].mAmount    == selected.mTransferTransactionBody.mMosaics[i].mAmount;
+  }
+  printf( "mosaics %d\n", mosaics );
+
+  // unselected fields keep their values
+  printf( "fee %d\n",     7 == selected.mTransaction.mFee );
+  printf( "message %d\n", std::vector<uint8_t>{ 1, 2, 3 } == selected.mTransferTransactionBody.mMessage );
+
+  // skipped fields are still checked against the buffer size
+  RawBuffer truncated( payload.data(), payload.size() - 1 );
+  printf( "truncated %d\n", !selected.DeserializeSelected( truncated, TransferTransaction::FIELD_FEE ) );
+  return 0;
+}
+'''
+
+
+
+@unittest.skipUnless( GeneratedCode.compiler, "needs g++" )
+class TestSelectedFields( unittest.TestCase ):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.executable = GeneratedCode.get().build( program )
+
+
+    def check( self, kind: str, builder: str, last_check: str ) -> None:
+        for payload in GeneratedCode.payloads( builder ):
+            with self.subTest( payload=payload.hex() ):
+                output = GeneratedCode.run_executable( self.executable, kind, payload.hex() )
+                checks = dict( line.split() for line in output.splitlines() )
+
+                self.assertEqual( { name: "1" for name in checks }, checks )
+                self.assertIn( last_check, checks )
+
+
+    def test_inline_fields_selected(self):
+        self.check( "transfer", "TransferTransactionBuilder", "truncated" )
+
+
+    def test_unselected_arrays_skipped(self):
+        self.check( "aggregate", "AggregateCompleteTransactionBuilder", "cosignatures" )
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+import struct
+import unittest
+
+from unit_tests.GeneratedCode import GeneratedCode
+
+
+
+program = r'''
+#include <cstdio>
+#include "Codec.h"
+#include "Transaction.h"
+#include "TransferTransaction.h"
+#include "converters.h"
+
+int main( int argc, char* argv[] )
+{
+  for( int i=1; i<argc; ++i )
+  {
+    std::vector<uint8_t> payload;
+    Codec::HexDecode( argv[i], payload );
+    const TransactionType type    = Transaction::ReadType( payload.data() );
+    const uint8_t         version = Transaction::ReadVersion( payload.data() );
+
+    std::unique_ptr<ICatbuffer> catbuf = create_type_TransactionType( type, version );
+    RawBuffer buffer( payload.data(), payload.size() );
+    const bool decoded = catbuf && catbuf->Deserialize( buffer ) && 0 == buffer.RemainingSize();
+
+    std::vector<uint8_t> serialized;
+    const bool encoded = decoded && catbuf->Size() == payload.size() && catbuf->SerializeTo( serialized ) && serialized == payload;
+
+    RawBuffer skipBuffer( payload.data(), payload.size() );
+    const bool skipped = skip_type_TransactionType( type, version, skipBuffer ) && 0 == skipBuffer.RemainingSize();
+
+    // every field is checked against the buffer size
+    RawBuffer truncated( payload.data(), payload.size() - 1 );
+    RawBuffer truncatedSkip( payload.data(), payload.size() - 1 );
+    const bool rejected = !create_type_TransactionType( type, version )->Deserialize( truncated ) &&
+                          !skip_type_TransactionType( type, version, truncatedSkip );
+
+    // fields are placed at the offsets of the table layout
+    unsigned long long deadline = 0;
+    size_t             message  = 0;
+    size_t             mosaics  = 0;
+    if( TransactionType::TRANSFER == type )
+    {
+      const TransferTransaction& transfer = static_cast<TransferTransaction&>( *catbuf );
+      deadline = transfer.mTransaction.mDeadline;
+      message  = transfer.mTransferTransactionBody.mMessage.size();
+      mosaics  = transfer.mTransferTransactionBody.mMosaics.size();
+    }
+
+    printf( "%d %d %d %d %d %llu %zu %zu\n", i-1, decoded, encoded, skipped, rejected, deadline, message, mosaics );
+  }
+  return 0;
+}
+'''
+
+
+
+@unittest.skipUnless( GeneratedCode.compiler, "needs g++" )
+class TestTableBackend( unittest.TestCase ):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.payloads = GeneratedCode.payloads()
+        output       = GeneratedCode.get( "--backend", "table" ).run( program, *[ payload.hex() for payload in cls.payloads ] )
+        cls.results  = [ line.split()[1:] for line in output.splitlines() ]
+
+
+    def test_round_trip(self):
+        self.assertEqual( len( self.payloads ), len( self.results ) )
+        for payload, result in zip( self.payloads, self.results ):
+            with self.subTest( payload=payload.hex() ):
+                self.assertEqual( [ "1", "1" ], result[0:2] )
+
+
+    def test_skip_consumes_payload(self):
+        for payload, result in zip( self.payloads, self.results ):
+            with self.subTest( payload=payload.hex() ):
+                self.assertEqual( "1", result[2] )
+
+
+    def test_truncated_payload_rejected(self):
+        for payload, result in zip( self.payloads, self.results ):
+            with self.subTest( payload=payload.hex() ):
+                self.assertEqual( "1", result[3] )
+
+
+    def test_field_values(self):
+        transfers = GeneratedCode.payloads( "TransferTransactionBuilder" )
+        for payload, result in zip( self.payloads, self.results ):
+            if payload in transfers:
+                with self.subTest( payload=payload.hex() ):
+                    deadline, message_size = struct.unpack_from( "<Q", payload, 120 )[0], struct.unpack_from( "<H", payload, 152 )[0]
+                    self.assertEqual( [ str( deadline ), str( message_size ), str( payload[154] ) ], result[4:] )
+
+
+
+if __name__ == '__main__':
+    unittest.main()
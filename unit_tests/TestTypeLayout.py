@@ -0,0 +1,74 @@
+import contextlib
+import io
+import unittest
+
+import yaml
+
+from generator.__main__ import declare_schema
+from unit_tests.GeneratedCode import GeneratedCode
+
+
+
+class TestTypeLayout( unittest.TestCase ):
+
+    @classmethod
+    def setUpClass(cls):
+        with open( "yaml_test_inputs/symbol-all-transactions.yaml", "r" ) as f:
+            input_data = yaml.safe_load( f )
+
+        with contextlib.redirect_stdout( io.StringIO() ):
+            _, cls.class_decls, cls.layouts = declare_schema( input_data )
+
+        # Python codec, for checking the sizes against real payloads
+        cls.module   = GeneratedCode.get( "--generate-python" ).module( "catbuffer" )
+        cls.payloads = GeneratedCode.payloads()
+
+
+    def test_fixed_size_struct(self):
+        layout = self.layouts.layout( "Transaction" )
+
+        self.assertTrue( layout.fixed )
+        self.assertTrue( layout.trivially_copyable )
+        self.assertEqual( layout.min_size, 128 )
+        self.assertEqual( layout.alignment, 8 )
+        self.assertEqual( self.layouts.type_size( "Transaction" ), 128 )
+
+
+    def test_variable_size_struct(self):
+        layout = self.layouts.layout( "TransferTransaction" )
+
+        self.assertFalse( layout.fixed )
+        self.assertFalse( layout.trivially_copyable )
+        self.assertIsNone( self.layouts.type_size( "TransferTransaction" ) )
+        self.assertEqual( layout.min_size, self.layouts.type_size( "Transaction" ) + 32 )
+
+
+    def test_polymorphic_struct(self):
+        layout  = self.layouts.layout( "AggregateTransactionBody" )
+        members = [ decl for decl in self.class_decls.values() if "EmbeddedTransaction" == decl.group_header ]
+
+        self.assertEqual( layout.fan_out, len(members) )
+        self.assertIsNone( layout.max_size )
+        self.assertEqual( self.layouts.layout( "AggregateBondedTransaction" ).depth, layout.depth + 1 )
+
+
+    def test_payload_sizes_within_bounds(self):
+        for payload in self.payloads:
+            tx     = self.module.deserialize_TransactionType( payload )
+            layout = self.layouts.layout( type(tx).__name__ )
+
+            self.assertLessEqual( layout.min_size, len(payload) )
+            if layout.max_size is not None:
+                self.assertLessEqual( len(payload), layout.max_size )
+
+
+    def test_report(self):
+        report = self.layouts.report()
+
+        self.assertIn( "Transaction", report )
+        self.assertIn( f"{len(self.class_decls)} structs", report )
+
+
+
+if __name__ == '__main__':
+    unittest.main()